@@ -1,2706 +1,3450 @@
-import sys
-import os
-from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QLabel, QScrollArea, QFileDialog,
-    QSlider, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QMessageBox,
-    QTabWidget, QShortcut, QSpinBox, QCheckBox, QGroupBox, QGridLayout,
-    QInputDialog, QSizePolicy, QAction, QWidgetAction
-)
-from PyQt5.QtGui import QPixmap, QImage, QKeySequence, QPainter, QPen, QPalette, QColor, QIcon, QMouseEvent
-from PyQt5.QtCore import Qt, pyqtSignal, QSize, QTimer, QPoint, pyqtSlot
-import cv2
-import numpy as np
-import qdarkstyle
-
-class CustomTitleBar(QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.parent = parent
-        self.init_ui()
-        self.start = QPoint(0, 0)
-        self.pressing = False
-        self.is_dark = False  # Track current theme
-
-    def init_ui(self):
-        # Set the height of the title bar
-        self.setFixedHeight(40)
-        self.setStyleSheet("""
-            QWidget {
-                background-color: #2b2b2b; /* Dark background by default */
-            }
-            QPushButton {
-                border: none;
-                color: white;
-                background-color: transparent;
-                font-size: 16px;
-            }
-            QPushButton:hover {
-                background-color: #3c3c3c;
-            }
-            QLabel {
-                color: white;
-                font-size: 14px;
-                background-color: transparent; /* Ensure transparent background */
-            }
-        """)
-
-        # Layout for the title bar
-        layout = QHBoxLayout()
-        layout.setContentsMargins(10, 0, 10, 0)
-        layout.setSpacing(10)
-
-        # Title Label
-        self.title = QLabel("ImageCraft")
-        self.title.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
-        # Removed separate stylesheet for QLabel to inherit from parent
-        layout.addWidget(self.title)
-
-        layout.addStretch()
-
-        # Minimize Button
-        self.btn_minimize = QPushButton("-")
-        self.btn_minimize.setFixedSize(30, 30)
-        self.btn_minimize.clicked.connect(self.minimize_window)
-        layout.addWidget(self.btn_minimize)
-
-        # Maximize/Restore Button
-        self.btn_maximize = QPushButton("□")
-        self.btn_maximize.setFixedSize(30, 30)
-        self.btn_maximize.clicked.connect(self.maximize_restore_window)
-        layout.addWidget(self.btn_maximize)
-
-        # Close Button
-        self.btn_close = QPushButton("×")
-        self.btn_close.setFixedSize(30, 30)
-        self.btn_close.clicked.connect(self.close_window)
-        layout.addWidget(self.btn_close)
-
-        self.setLayout(layout)
-
-    def minimize_window(self):
-        self.parent.showMinimized()
-
-    def maximize_restore_window(self):
-        if self.parent.isMaximized():
-            self.parent.showNormal()
-            self.btn_maximize.setText("□")
-        else:
-            self.parent.showMaximized()
-            self.btn_maximize.setText("❐")
-
-    def close_window(self):
-        self.parent.close()
-
-    # Enable window dragging
-    def mousePressEvent(self, event: QMouseEvent):
-        if event.button() == Qt.LeftButton:
-            self.pressing = True
-            self.start = event.globalPos() - self.parent.frameGeometry().topLeft()
-            event.accept()
-
-    def mouseMoveEvent(self, event: QMouseEvent):
-        if self.pressing:
-            self.parent.move(event.globalPos() - self.start)
-            event.accept()
-
-    def mouseReleaseEvent(self, event: QMouseEvent):
-        self.pressing = False
-
-    @pyqtSlot(bool)
-    def set_dark_mode(self, is_dark):
-        """
-        Update the title bar's stylesheet based on the theme.
-        """
-        self.is_dark = is_dark
-        if self.is_dark:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #2b2b2b; /* Dark background */
-                }
-                QPushButton {
-                    border: none;
-                    color: white;
-                    background-color: transparent;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: #3c3c3c;
-                }
-                QLabel {
-                    color: white;
-                    font-size: 14px;
-                    background-color: transparent; /* Ensure transparent background */
-                }
-            """)
-        else:
-            self.setStyleSheet("""
-                QWidget {
-                    background-color: #f0f0f0; /* Light grey background */
-                }
-                QPushButton {
-                    border: none;
-                    color: black;
-                    background-color: transparent;
-                    font-size: 16px;
-                }
-                QPushButton:hover {
-                    background-color: #d0d0d0;
-                }
-                QLabel {
-                    color: black;
-                    font-size: 14px;
-                    background-color: transparent; /* Transparent background */
-                }
-            """)
-
-class ComprehensiveImageEditor(QMainWindow):
-    # Define the Dark Mode stylesheet without using the universal selector
-    DARK_MODE_STYLESHEET = """
-    /* Main Window */
-    QMainWindow {
-        background-color: #2b2b2b;
-        color: #ffffff;
-    }
-
-    /* Menu Bar */
-    QMenuBar {
-        background-color: #2b2b2b;
-        color: #ffffff;
-    }
-    QMenuBar::item:selected {
-        background-color: #3c3c3c;
-    }
-
-    /* Menus */
-    QMenu {
-        background-color: #2b2b2b;
-        color: #ffffff;
-    }
-    QMenu::item:selected {
-        background-color: #3c3c3c;
-    }
-
-    /* Push Buttons */
-    QPushButton {
-        background-color: #3c3c3c;
-        color: #ffffff;
-        border: 1px solid #555555;
-        padding: 3px 6px;  /* Reduced padding */
-        border-radius: 4px;
-    }
-    QPushButton:hover {
-        background-color: #5c5c5c;
-    }
-
-    /* Sliders */
-    QSlider::groove:horizontal {
-        border: 1px solid #bbb;
-        background: #3c3c3c;
-        height: 6px;  /* Reduced height */
-        border-radius: 3px;
-    }
-    QSlider::handle:horizontal {
-        background: #5c5c5c;
-        border: 1px solid #5c5c5c;
-        width: 12px;  /* Reduced width */
-        margin: -3px 0;  /* Adjusted margin */
-        border-radius: 6px;  /* Adjusted radius */
-    }
-
-    /* Checkboxes */
-    QCheckBox {
-        spacing: 4px;  /* Reduced spacing */
-    }
-
-    /* Spin Boxes */
-    QSpinBox {
-        background-color: #3c3c3c;
-        border: 1px solid #555555;
-        border-radius: 4px;
-        padding: 1px 3px;  /* Reduced padding */
-        color: #ffffff;
-    }
-
-    /* Labels */
-    QLabel {
-        color: #ffffff;
-    }
-
-    /* Tab Widget Pane */
-    QTabWidget::pane {
-        border: 1px solid #555555;
-    }
-
-    /* Tab Bar */
-    QTabBar::tab {
-        background-color: #3c3c3c;
-        color: #ffffff;
-        padding: 8px;  /* Reduced padding */
-        margin: 1px;  /* Reduced margin */
-    }
-    QTabBar::tab:selected {
-        background-color: #5c5c5c;
-    }
-
-    /* Group Boxes */
-    QGroupBox {
-        border: 1px solid #555555;
-        border-radius: 5px;
-        margin-top: 0; /* Remove margin-top */
-    }
-    QGroupBox::title {
-        subcontrol-origin: margin;
-        subcontrol-position: top center;
-        padding: 0 3px;
-    }
-
-    /* Scroll Areas */
-    QScrollArea {
-        background-color: #2b2b2b;
-    }
-
-    /* Preview Label Specific Styling */
-    QLabel#PreviewLabel {
-        background-color: #1e1e1e;
-        border: 1px solid #555555;
-        color: #ffffff;
-        font-size: 14px;
-        text-align: center;
-    }
-    """
-
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle('ImageCraft')
-        self.setGeometry(100, 100, 800, 600)  # Initial window size
-        self.setMinimumSize(800, 600)  # Prevent window from being too small
-        self.setWindowFlags(Qt.FramelessWindowHint)  # Remove OS title bar
-
-        # Main widget and layout
-        self.main_widget = QWidget()
-        self.main_layout = QVBoxLayout()
-        self.main_layout.setContentsMargins(0, 0, 0, 0)
-        self.main_layout.setSpacing(0)
-        self.main_widget.setLayout(self.main_layout)
-        self.setCentralWidget(self.main_widget)
-
-        # Add custom title bar
-        self.title_bar = CustomTitleBar(self)
-        self.main_layout.addWidget(self.title_bar)
-
-        # Initialize tabs
-        self.tabs = QTabWidget()
-        self.main_layout.addWidget(self.tabs)
-
-        # Image Transformation tab
-        self.transformation_tab = ImageTransformationTab()
-        self.tabs.addTab(self.transformation_tab, "Image Transformation")
-
-        # HCT and Auto Labeling tab
-        self.hct_tab = HCTAutoLabelTab()
-        self.tabs.addTab(self.hct_tab, "HCT and Auto Labeling")
-
-        # Image Augmentation tab
-        self.augmentation_tab = ImageAugmentationTab()
-        self.tabs.addTab(self.augmentation_tab, "Image Augmentation")
-
-        # Initialize Menu
-        self.init_menu()
-
-        # Initialize Keyboard Shortcuts
-        self.init_shortcuts()
-
-        # Initialize Status Bar
-        self.statusBar().showMessage("Ready")
-
-        # Set focus to the main window
-        self.setFocusPolicy(Qt.StrongFocus)
-        self.setFocus()
-
-        # **Set initial theme to light mode**
-        self.title_bar.set_dark_mode(False)
-
-        logging.debug("ComprehensiveImageEditor initialized successfully.")
-
-
-    def init_menu(self):
-        menu_bar = self.menuBar()
-
-        # File Menu
-        file_menu = menu_bar.addMenu('File')
-
-        load_image_action = QAction('Load Image', self)
-        load_image_action.triggered.connect(self.load_image)
-        file_menu.addAction(load_image_action)
-
-        load_folder_action = QAction('Load Folder', self)
-        load_folder_action.triggered.connect(self.load_folder)
-        file_menu.addAction(load_folder_action)
-
-        save_image_action = QAction('Save Image', self)
-        save_image_action.triggered.connect(self.save_image)
-        file_menu.addAction(save_image_action)
-
-        save_all_action = QAction('Save All', self)
-        save_all_action.triggered.connect(self.save_all)
-        file_menu.addAction(save_all_action)
-
-        exit_action = QAction('Exit', self)
-        exit_action.triggered.connect(self.close)
-        file_menu.addAction(exit_action)
-
-        # Theme Menu
-        theme_menu = menu_bar.addMenu('Theme')
-
-        dark_mode_action = QAction('Dark Mode', self, checkable=True)
-        dark_mode_action.setStatusTip('Toggle Dark Mode')
-        dark_mode_action.setChecked(False)  # Ensure it's unchecked by default
-        dark_mode_action.toggled.connect(self.toggle_dark_mode)  # Connect to toggled(bool)
-        theme_menu.addAction(dark_mode_action)
-
-        # Help Menu
-        help_menu = menu_bar.addMenu('Help')
-        help_action = QAction('Help', self)
-        help_action.triggered.connect(self.show_help)
-        help_menu.addAction(help_action)
-
-        logging.debug("Menu initialized successfully.")
-
-    def init_shortcuts(self):
-
-        # 1. Load Image: Ctrl+O
-        load_image_action = QAction("Load Image", self)
-        load_image_action.setShortcut(QKeySequence("Ctrl+O"))
-        load_image_action.triggered.connect(self.load_image)
-        load_image_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(load_image_action)
-
-        # 2. Load Folder: Ctrl+Shift+O
-        load_folder_action = QAction("Load Folder", self)
-        load_folder_action.setShortcut(QKeySequence("Ctrl+Shift+O"))
-        load_folder_action.triggered.connect(self.load_folder)  # Connect to load_folder method
-        load_folder_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(load_folder_action)
-
-        # 3. Save Image: Ctrl+S
-        save_image_action = QAction("Save Image", self)
-        save_image_action.setShortcut(QKeySequence("Ctrl+S"))
-        save_image_action.triggered.connect(self.save_image)
-        save_image_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(save_image_action)
-
-        # 4. Save All: Ctrl+Shift+S
-        save_all_action = QAction("Save All", self)
-        save_all_action.setShortcut(QKeySequence("Ctrl+Shift+S"))
-        save_all_action.triggered.connect(self.save_all)
-        save_all_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(save_all_action)
-
-        # 5. Quit Application: Ctrl+Q
-        quit_action = QAction("Quit", self)
-        quit_action.setShortcut(QKeySequence("Ctrl+Q"))
-        quit_action.triggered.connect(self.close)
-        quit_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(quit_action)
-
-        # 6. Zoom In: Ctrl++
-        zoom_in_action = QAction("Zoom In", self)
-        zoom_in_action.setShortcut(QKeySequence("Ctrl++"))
-        zoom_in_action.triggered.connect(self.zoom_in)
-        zoom_in_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(zoom_in_action)
-
-        # 7. Zoom Out: Ctrl+-
-        zoom_out_action = QAction("Zoom Out", self)
-        zoom_out_action.setShortcut(QKeySequence("Ctrl+-"))
-        zoom_out_action.triggered.connect(self.zoom_out)
-        zoom_out_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(zoom_out_action)
-
-        # 8. Previous Image: A
-        prev_image_action = QAction("Previous Image", self)
-        prev_image_action.setShortcut(QKeySequence("A"))
-        prev_image_action.triggered.connect(self.previous_image)
-        prev_image_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(prev_image_action)
-
-        # 9. Next Image: D
-        next_image_action = QAction("Next Image", self)
-        next_image_action.setShortcut(QKeySequence("D"))
-        next_image_action.triggered.connect(self.next_image)
-        next_image_action.setShortcutContext(Qt.ApplicationShortcut)
-        self.addAction(next_image_action)
-
-        logging.debug("Keyboard shortcuts initialized successfully.")
-
-    def toggle_dark_mode(self, checked):
-        try:
-            if checked:
-                QApplication.instance().setStyleSheet(self.DARK_MODE_STYLESHEET)
-                self.statusBar().showMessage("Dark Mode Enabled", 2000)
-                logging.info("Dark Mode Enabled")
-            else:
-                QApplication.instance().setStyleSheet("")  # Revert to default light mode
-                self.statusBar().showMessage("Dark Mode Disabled", 2000)
-                logging.info("Dark Mode Disabled")
-
-            # **Begin: Option 1 Implementation**
-            # Append styles for QMessageBox to ensure white background and black text
-            QMessageBox_stylesheet = """
-            QMessageBox {
-                background-color: white;
-                color: black;
-            }
-            QMessageBox QLabel {
-                color: black;
-            }
-            QMessageBox QPushButton {
-                background-color: #3c3c3c;
-                color: #ffffff;
-            }
-            """
-            # Apply the QMessageBox styles on top of the existing stylesheet
-            QApplication.instance().setStyleSheet(QApplication.instance().styleSheet() + QMessageBox_stylesheet)
-            logging.debug("QMessageBox styles applied to maintain readability.")
-
-            # **End: Option 1 Implementation**
-
-            # Invalidate and activate each tab's layout if it exists
-            for index in range(self.tabs.count()):
-                tab = self.tabs.widget(index)
-                if tab.layout() is not None:
-                    tab.layout().invalidate()
-                    tab.layout().activate()
-                else:
-                    logging.warning(f"Tab at index {index} does not have a layout.")
-
-            # Refresh the UI to apply changes
-            self.repaint()
-
-            # Log widget sizes for debugging
-            self.log_widget_sizes()
-
-            # **Update the title bar's style**
-            self.title_bar.set_dark_mode(checked)
-
-            logging.debug("Dark mode toggled successfully.")
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to toggle dark mode: {e}")
-            logging.error(f"Failed to toggle dark mode: {e}")
-
-    def log_widget_sizes(self):
-        logging.debug(f"Main Window Size: {self.size()}")
-        logging.debug(f"Tabs Size: {self.tabs.size()}")
-        for index in range(self.tabs.count()):
-            tab = self.tabs.widget(index)
-            logging.debug(f"Tab {index} Size: {tab.size()}")
-            for child in tab.findChildren(QWidget):
-                logging.debug(f"  Widget '{child.objectName()}' Size: {child.size()}")
-
-    def get_active_tab(self):
-        """Returns the currently active tab widget."""
-        return self.tabs.currentWidget()
-
-    def load_image(self):
-        # Delegate load image functionality to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'load_image'):
-            current_tab.load_image()
-            self.statusBar().showMessage("Image loaded.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Load Image action is not available in the current tab.")
-
-    def load_folder(self):
-        # Delegate load folder functionality to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'load_folder'):
-            current_tab.load_folder()
-            self.statusBar().showMessage("Folder loaded.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Load Folder action is not available in the current tab.")
-
-    def save_image(self):
-        # Delegate save image functionality to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'save_image'):
-            current_tab.save_image()
-            self.statusBar().showMessage("Image saved.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Save Image action is not available in the current tab.")
-
-    def save_all(self):
-        # Delegate save all functionality to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'save_all'):
-            current_tab.save_all()
-            self.statusBar().showMessage("All images saved.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Save All action is not available in the current tab.")
-
-    def next_image(self):
-        # Delegate next image action to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'next_image'):
-            print("Shortcut: Next Image triggered")
-            current_tab.next_image()
-            self.statusBar().showMessage("Next Image triggered via shortcut.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Next Image action is not available in the current tab.")
-
-    def previous_image(self):
-        # Delegate previous image action to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'previous_image'):
-            print("Shortcut: Previous Image triggered")
-            current_tab.previous_image()
-            self.statusBar().showMessage("Previous Image triggered via shortcut.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Previous Image action is not available in the current tab.")
-
-    def zoom_in(self):
-        # Delegate zoom in action to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'zoom_in'):
-            print("Shortcut: Zoom In triggered")
-            current_tab.zoom_in()
-            self.statusBar().showMessage("Zoom In triggered via shortcut.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Zoom In action is not available in the current tab.")
-
-    def zoom_out(self):
-        # Delegate zoom out action to the active tab
-        current_tab = self.get_active_tab()
-        if hasattr(current_tab, 'zoom_out'):
-            print("Shortcut: Zoom Out triggered")
-            current_tab.zoom_out()
-            self.statusBar().showMessage("Zoom Out triggered via shortcut.", 2000)
-        else:
-            QMessageBox.warning(self, "Action Not Available", "Zoom Out action is not available in the current tab.")
-
-    def show_help(self):
-        # Show help information
-        help_text = """
-        
-        Welcome To ImageCraft ! :
-        
-        This is a comprehensive image editor that combines:
-        - Image Transformation (Perspective, Translation, Cropping) etc...
-        - Hough Circle Transform with Auto Labeling
-        - Image Augmentation ( Based On YOLO Augmentations )
-
-        Use the tabs to switch between functionalities.
-        
-        A Dark Mode Is Available For Your Convenience , Activate It In "Theme" .
-
-        Keyboard Shortcuts:
-        - Next Image: D
-        - Previous Image: A
-        - Zoom In: Ctrl + +
-        - Zoom Out: Ctrl + -
-        - Load Image: Ctrl+O
-        - Load Folder: Ctrl+Shift+O
-        - Save Image: Ctrl+S
-        - Save All: Ctrl+Shift+S
-        - Quit Application: Ctrl+Q
-        
-        Important Warning : If you save your work in the same folder each time, 
-        you risk overwriting previous files. To prevent this, 
-        always create a separate folder for each image set, 
-        especially when using different types of augmentation. 
-        This will help you keep your work organized and avoid any loss of data.
-        
-        
-        Tool Developer : Saeed Sameeh Abualnaaj - Junior Computer Vision Engineer 
-        """
-        QMessageBox.information(self, "Help", help_text)
-
-
-
-class ImageTransformationTab(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setFocusPolicy(Qt.StrongFocus)
-
-        # Initialize variables
-        self.img = None
-        self.transformed_img = None
-        self.scale_factor = 1.0
-        self.lines = []
-        self.file_paths = []
-        self.current_index = -1
-
-        # Setup UI
-        self.init_ui()
-
-    def init_ui(self):
-        # Main layout
-        main_layout = QHBoxLayout()
-        self.setLayout(main_layout)
-
-        # Image display
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.image_label = QLabel("Load an image to begin.")
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setStyleSheet("QLabel { background-color : lightgray; }")
-        self.image_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        self.scroll_area.setWidget(self.image_label)
-        main_layout.addWidget(self.scroll_area, 3)
-
-        # Controls layout
-        controls_widget = QWidget()
-        controls_widget.setMaximumWidth(300)
-        controls_layout = QVBoxLayout()
-        controls_layout.setContentsMargins(5, 5, 5, 5)
-        controls_widget.setLayout(controls_layout)
-        controls_widget.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
-        main_layout.addWidget(controls_widget, 1)
-
-        # Buttons
-        buttons_group = QGroupBox("Controls")
-        buttons_layout = QGridLayout()
-        buttons_layout.setSpacing(5)
-        buttons_layout.setContentsMargins(0, 0, 0, 0)
-        buttons_group.setLayout(buttons_layout)
-        controls_layout.addWidget(buttons_group)
-
-        buttons = [
-            ("Load Image", self.load_image),
-            ("Load Folder", self.load_folder),
-            ("Save Image", self.save_image),
-            ("Save All", self.save_all),
-            ("Apply", self.apply_transformation),
-            ("Apply to All", self.apply_transformation_to_all),
-            ("Reset Image", self.reset_image),
-            ("Reset All", self.reset_all),
-            ("Zoom In", self.zoom_in),
-            ("Zoom Out", self.zoom_out),
-            ("Draw Lines", self.draw_lines),
-            ("Remove Lines", self.remove_lines),
-            ("Previous (A)", self.previous_image),
-            ("Next (D)", self.next_image)
-        ]
-
-        columns = 2
-        for i, (text, method) in enumerate(buttons):
-            button = QPushButton(text)
-            button.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
-            button.setMaximumWidth(140)
-            button.clicked.connect(method)
-            row = i // columns
-            col = i % columns
-            buttons_layout.addWidget(button, row, col)
-
-        # Image info label
-        self.image_info_label = QLabel("No images loaded.")
-        self.image_info_label.setAlignment(Qt.AlignCenter)
-        controls_layout.addWidget(self.image_info_label)
-
-        # Sliders and Controls
-        self.init_sliders(controls_layout)
-
-    def init_sliders(self, controls_layout):
-        # Helper function to create sliders
-        def create_slider(label_text, min_val, max_val, default, tick_interval):
-            layout = QHBoxLayout()
-            layout.setContentsMargins(0, 0, 0, 0)
-            layout.setSpacing(5)
-            label = QLabel(label_text)
-            label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            slider = QSlider(Qt.Horizontal)
-            slider.setMinimum(min_val)
-            slider.setMaximum(max_val)
-            slider.setValue(default)
-            slider.setTickPosition(QSlider.TicksBelow)
-            slider.setTickInterval(tick_interval)
-            slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            value_label = QLabel(str(default))
-            value_label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-            slider.valueChanged.connect(lambda value, lbl=value_label: lbl.setText(str(value)))
-            slider.valueChanged.connect(self.update_transformation)
-            layout.addWidget(label)
-            layout.addWidget(slider)
-            layout.addWidget(value_label)
-            return slider, value_label, layout
-
-        # 1. Perspective Controls
-        perspective_group = QGroupBox("Perspective Controls")
-        perspective_layout = QVBoxLayout()
-        perspective_layout.setContentsMargins(5, 5, 5, 5)
-        perspective_layout.setSpacing(5)
-        perspective_group.setLayout(perspective_layout)
-        controls_layout.addWidget(perspective_group)
-
-        # Corner Sliders
-        self.corners = []
-        corner_labels = ["Top-Left (X)", "Top-Left (Y)",
-                         "Top-Right (X)", "Top-Right (Y)",
-                         "Bottom-Right (X)", "Bottom-Right (Y)",
-                         "Bottom-Left (X)", "Bottom-Left (Y)"]
-        corner_default_values = [0, 0, 1920, 0, 1920, 1080, 0, 1080]
-
-        for i, label in enumerate(corner_labels):
-            # Adjust max_val based on whether it's X or Y
-            max_val = 1920 if 'X' in label else 1080
-            slider, value_label, slider_layout = create_slider(
-                label_text=label,
-                min_val=0,
-                max_val=max_val,
-                default=corner_default_values[i],
-                tick_interval=100
-            )
-            perspective_layout.addLayout(slider_layout)
-            self.corners.append(slider)
-
-        # 2. Transformation Controls
-        transformation_group = QGroupBox("Transformation Controls")
-        transformation_layout = QVBoxLayout()
-        transformation_layout.setContentsMargins(5, 5, 5, 5)
-        transformation_layout.setSpacing(5)
-        transformation_group.setLayout(transformation_layout)
-        controls_layout.addWidget(transformation_group)
-
-        # X Translation
-        self.x_translation_slider, self.x_translation_value_label, x_trans_layout = create_slider(
-            label_text="X Translation:",
-            min_val=-500,
-            max_val=500,
-            default=0,
-            tick_interval=100
-        )
-        transformation_layout.addLayout(x_trans_layout)
-
-        # Y Translation
-        self.y_translation_slider, self.y_translation_value_label, y_trans_layout = create_slider(
-            label_text="Y Translation:",
-            min_val=-500,
-            max_val=500,
-            default=0,
-            tick_interval=100
-        )
-        transformation_layout.addLayout(y_trans_layout)
-
-        # Scale
-        self.scale_slider, self.scale_value_label, scale_layout = create_slider(
-            label_text="Scale (%):",
-            min_val=10,
-            max_val=500,
-            default=100,
-            tick_interval=10
-        )
-        transformation_layout.addLayout(scale_layout)
-
-        # Rotation
-        self.rotation_slider, self.rotation_value_label, rotation_layout = create_slider(
-            label_text="Rotation (°):",
-            min_val=-360,
-            max_val=360,
-            default=0,
-            tick_interval=30
-        )
-        transformation_layout.addLayout(rotation_layout)
-
-        # Crop X
-        self.crop_x_slider, self.crop_x_value_label, crop_x_layout = create_slider(
-            label_text="Crop X:",
-            min_val=0,
-            max_val=1920,
-            default=0,
-            tick_interval=100
-        )
-        transformation_layout.addLayout(crop_x_layout)
-
-        # Crop Y
-        self.crop_y_slider, self.crop_y_value_label, crop_y_layout = create_slider(
-            label_text="Crop Y:",
-            min_val=0,
-            max_val=1080,
-            default=0,
-            tick_interval=100
-        )
-        transformation_layout.addLayout(crop_y_layout)
-
-        # Crop Width
-        self.crop_width_slider, self.crop_width_value_label, crop_w_layout = create_slider(
-            label_text="Crop Width:",
-            min_val=1,
-            max_val=1920,
-            default=1920,
-            tick_interval=100
-        )
-        transformation_layout.addLayout(crop_w_layout)
-
-        # Crop Height
-        self.crop_height_slider, self.crop_height_value_label, crop_h_layout = create_slider(
-            label_text="Crop Height:",
-            min_val=1,
-            max_val=1080,
-            default=1080,
-            tick_interval=100
-        )
-        transformation_layout.addLayout(crop_h_layout)
-
-    def setup_shortcuts(self):
-        # Previous Image Shortcut (A key)
-        self.shortcut_prev = QShortcut(QKeySequence('A'), self)
-        self.shortcut_prev.setContext(Qt.ApplicationShortcut)
-        self.shortcut_prev.activated.connect(self.previous_image)
-
-        # Next Image Shortcut (D key)
-        self.shortcut_next = QShortcut(QKeySequence('D'), self)
-        self.shortcut_next.setContext(Qt.ApplicationShortcut)
-        self.shortcut_next.activated.connect(self.next_image)
-
-        # Zoom In: Ctrl + +
-        self.shortcut_zoom_in = QShortcut(QKeySequence('Ctrl++'), self)
-        self.shortcut_zoom_in.setContext(Qt.ApplicationShortcut)
-        self.shortcut_zoom_in.activated.connect(self.zoom_in)
-
-        # Zoom Out: Ctrl + -
-        self.shortcut_zoom_out = QShortcut(QKeySequence('Ctrl+-'), self)
-        self.shortcut_zoom_out.setContext(Qt.ApplicationShortcut)
-        self.shortcut_zoom_out.activated.connect(self.zoom_out)
-
-    def load_image(self):
-        # Implement load image functionality
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Open Image", "", "Image files (*.jpg *.jpeg *.png)"
-        )
-        if file_path:
-            self.file_paths = [file_path]
-            self.current_index = 0
-            self.transformed_images = {}  # Reset transformed images
-            self.load_current_image()
-
-    def load_folder(self):
-        # Implement load folder functionality
-        folder_path = QFileDialog.getExistingDirectory(
-            self, "Select Folder", ""
-        )
-        if folder_path:
-            supported_formats = (".jpg", ".jpeg", ".png")
-            self.file_paths = [
-                os.path.join(folder_path, f)
-                for f in os.listdir(folder_path)
-                if f.lower().endswith(supported_formats)
-            ]
-            if not self.file_paths:
-                QMessageBox.warning(self, "No Images", "No images found in the selected folder.")
-                return
-            self.current_index = 0
-            self.transformed_images = {}  # Reset transformed images
-            self.load_current_image()
-
-    def load_current_image(self):
-        if 0 <= self.current_index < len(self.file_paths):
-            file_path = self.file_paths[self.current_index]
-            if file_path in self.transformed_images:
-                # Use the transformed image if available
-                self.transformed_img = self.transformed_images[file_path]
-                try:
-                    # Display the transformed image directly
-                    self.update_display_image(self.transformed_img)
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Failed to display transformed image: {e}")
-                    self.image_label.setText("Failed to display image.")
-                    self.image_info_label.setText("No images loaded.")
-            else:
-                try:
-                    self.img = cv2.imread(file_path)
-                    if self.img is None:
-                        raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
-                    self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2RGB)
-                    self.transformed_img = None
-                    # Reset transformation-related variables
-                    self.lines = []
-                    self.reset_sliders()
-                    self.update_display_image(self.img)
-                    self.update_image_info()
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Failed to load image: {file_path}\n{e}")
-                    self.img = None
-                    self.transformed_img = None
-                    self.image_label.setText("Failed to load image.")
-                    self.image_info_label.setText("No images loaded.")
-        else:
-            QMessageBox.warning(self, "Index Error", "Image index out of range.")
-
-    def update_display_image(self, img):
-        if img is None:
-            self.image_label.setText("No image to display.")
-            return
-        img = np.require(img, np.uint8, 'C')
-        height, width, channel = img.shape
-        bytes_per_line = 3 * width
-        try:
-            q_img = QImage(img.data, width, height, bytes_per_line, QImage.Format_RGB888).copy()
-            if q_img.isNull():
-                raise ValueError("QImage is null. Possibly unsupported image format.")
-            pixmap = QPixmap.fromImage(q_img)
-        except Exception as e:
-            QMessageBox.critical(self, "Image Error", f"Failed to convert image for display: {e}")
-            self.image_label.setText("Failed to display image.")
-            return
-
-        scaled_pixmap = pixmap.scaled(
-            int(pixmap.width() * self.scale_factor),
-            int(pixmap.height() * self.scale_factor),
-            Qt.KeepAspectRatio,
-            Qt.SmoothTransformation
-        )
-
-        if self.lines:
-            painter = QPainter(scaled_pixmap)
-            pen = QPen(Qt.black, 3)
-            painter.setPen(pen)
-            for line_y in self.lines:
-                scaled_y = int(line_y * self.scale_factor)
-                if 0 <= scaled_y <= scaled_pixmap.height():
-                    painter.drawLine(0, scaled_y, scaled_pixmap.width(), scaled_y)
-            painter.end()
-
-        self.image_label.setPixmap(scaled_pixmap)
-        self.image_label.adjustSize()
-
-    def apply_transformation(self):
-        if self.img is None:
-            QMessageBox.warning(self, "No Image", "No image loaded to apply transformations.")
-            return
-
-        try:
-            # Apply transformations
-            transformed_img = self.apply_transformations(self.img.copy())
-            self.transformed_img = transformed_img
-            self.transformed_images[self.file_paths[self.current_index]] = transformed_img
-            self.update_display_image(self.transformed_img)
-        except Exception as e:
-            QMessageBox.critical(self, "Transformation Error", f"An error occurred during transformation:\n{e}")
-
-    def apply_transformation_to_all(self):
-        if len(self.file_paths) == 0:
-            QMessageBox.warning(self, "No Images", "No images loaded to apply transformations.")
-            return
-
-        self.transformed_images = {}  # Reset transformed images
-
-        for idx, file_path in enumerate(self.file_paths):
-            try:
-                img = cv2.imread(file_path)
-                if img is None:
-                    raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
-                img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-                # Apply transformations on a copy to prevent altering the original image
-                transformed_img = self.apply_transformations(img.copy())
-
-                # Store the transformed image
-                self.transformed_images[file_path] = transformed_img
-
-            except Exception as e:
-                QMessageBox.warning(self, "Error", f"Failed to process image {os.path.basename(file_path)}: {e}")
-
-        QMessageBox.information(self, "Transformation Applied", "Transformations have been applied to all images.")
-
-        # Update the current image display if necessary
-        self.load_current_image()
-
-    def apply_transformations(self, img):
-        src_points = np.array([
-            [self.corners[0].value(), self.corners[1].value()],
-            [self.corners[2].value(), self.corners[3].value()],
-            [self.corners[4].value(), self.corners[5].value()],
-            [self.corners[6].value(), self.corners[7].value()]
-        ], dtype="float32")
-
-        if not self.validate_points(src_points):
-            raise ValueError("Invalid perspective points.")
-
-        # Apply perspective transformation
-        transformed_img = self.perspective_transform(img, src_points)
-
-        # Apply translation
-        M_translate = np.float32([[1, 0, self.x_translation_slider.value()],
-                                  [0, 1, self.y_translation_slider.value()]])
-        transformed_img = cv2.warpAffine(transformed_img, M_translate,
-                                         (transformed_img.shape[1], transformed_img.shape[0]))
-
-        # Apply rotation and scaling
-        h, w = transformed_img.shape[:2]
-        center = (w // 2, h // 2)
-
-        scale = self.scale_slider.value() / 100  # Convert to float
-        rotation = self.rotation_slider.value()
-
-        M_rotate = cv2.getRotationMatrix2D(center, rotation, scale)
-        transformed_img = cv2.warpAffine(transformed_img, M_rotate, (w, h))
-
-        # Apply cropping
-        crop_x = int(self.crop_x_slider.value())
-        crop_y = int(self.crop_y_slider.value())
-        crop_w = int(self.crop_width_slider.value())
-        crop_h = int(self.crop_height_slider.value())
-
-        # Ensure crop dimensions are within the bounds of the image
-        crop_w = min(crop_w, transformed_img.shape[1] - crop_x)
-        crop_h = min(crop_h, transformed_img.shape[0] - crop_y)
-
-        if crop_x < 0 or crop_y < 0 or crop_w <= 0 or crop_h <= 0:
-            raise ValueError("Invalid crop dimensions.")
-
-        transformed_img = transformed_img[crop_y:crop_y + crop_h, crop_x:crop_x + crop_w]
-
-        return transformed_img
-
-    def validate_points(self, points):
-        try:
-            if points.shape != (4, 2):
-                return False
-            if len(np.unique(points, axis=0)) != 4:
-                return False
-            hull = cv2.convexHull(points)
-            return len(hull) == 4
-        except:
-            return False
-
-    def perspective_transform(self, img, src_points):
-        h, w = img.shape[:2]
-        dst_points = np.array([[0, 0], [w, 0], [w, h], [0, h]], dtype="float32")
-        try:
-            M = cv2.getPerspectiveTransform(src_points, dst_points)
-            transformed_img = cv2.warpPerspective(img, M, (w, h))
-            return transformed_img
-        except cv2.error as e:
-            raise ValueError(f"Perspective transformation failed: {e}")
-
-    def update_transformation(self):
-        pass  # Optional: Implement real-time transformation updates here
-
-    def reset_sliders(self):
-        # Reset sliders to their default values and adjust maximums based on image dimensions
-        img_to_use = self.transformed_img if self.transformed_img is not None else self.img
-        if img_to_use is not None:
-            img_height, img_width = img_to_use.shape[:2]
-        else:
-            img_height, img_width = 1080, 1920  # default
-
-        # Update corner sliders
-        for i, slider in enumerate(self.corners):
-            if i % 2 == 0:  # X sliders
-                slider.setMaximum(img_width)
-                if i in [0, 6]:  # Top-Left X and Bottom-Left X
-                    slider.setValue(0)
-                else:  # Top-Right X and Bottom-Right X
-                    slider.setValue(img_width)
-            else:  # Y sliders
-                slider.setMaximum(img_height)
-                if i in [1, 3]:  # Top-Left Y and Top-Right Y
-                    slider.setValue(0)
-                else:  # Bottom-Right Y and Bottom-Left Y
-                    slider.setValue(img_height)
-
-        # Update translation sliders
-        self.x_translation_slider.setMinimum(-img_width // 2)
-        self.x_translation_slider.setMaximum(img_width // 2)
-        self.x_translation_slider.setValue(0)
-
-        self.y_translation_slider.setMinimum(-img_height // 2)
-        self.y_translation_slider.setMaximum(img_height // 2)
-        self.y_translation_slider.setValue(0)
-
-        # Update scale slider
-        self.scale_slider.setValue(100)  # Default scale is 100%
-
-        # Update rotation slider
-        self.rotation_slider.setValue(0)
-
-        # Update crop sliders
-        self.crop_x_slider.setMaximum(img_width)
-        self.crop_x_slider.setValue(0)
-
-        self.crop_y_slider.setMaximum(img_height)
-        self.crop_y_slider.setValue(0)
-
-        self.crop_width_slider.setMaximum(img_width)
-        self.crop_width_slider.setValue(img_width)
-
-        self.crop_height_slider.setMaximum(img_height)
-        self.crop_height_slider.setValue(img_height)
-
-    def save_image(self):
-        if self.transformed_img is None:
-            QMessageBox.critical(self, "Error", "No transformed image to save!")
-            return
-
-        save_path, _ = QFileDialog.getSaveFileName(
-            self, "Save Image", "", "PNG files (*.png);;JPEG files (*.jpg *.jpeg)"
-        )
-        if save_path:
-            try:
-                transformed_img_bgr = cv2.cvtColor(self.transformed_img, cv2.COLOR_RGB2BGR)
-                cv2.imwrite(save_path, transformed_img_bgr)
-                QMessageBox.information(self, "Saved", f"Image saved to {save_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Save Error", f"Failed to save image: {e}")
-
-    def save_all(self):
-        if not self.file_paths:
-            QMessageBox.warning(self, "No Images", "No images loaded to save.")
-            return
-
-        if not self.transformed_images:
-            QMessageBox.warning(self, "No Transformations", "No transformations applied to save.")
-            return
-
-        save_folder = QFileDialog.getExistingDirectory(
-            self, "Select Save Folder", ""
-        )
-        if not save_folder:
-            return
-
-        for file_path, transformed_img in self.transformed_images.items():
-            try:
-                save_path = os.path.join(save_folder, os.path.basename(file_path))
-                transformed_img_bgr = cv2.cvtColor(transformed_img, cv2.COLOR_RGB2BGR)
-                cv2.imwrite(save_path, transformed_img_bgr)
-            except Exception as e:
-                QMessageBox.warning(self, "Save Error", f"Failed to save image {file_path}: {e}")
-                continue
-
-        QMessageBox.information(self, "Save All", "All transformed images have been saved successfully.")
-
-    def update_image_info(self):
-        if self.file_paths:
-            self.image_info_label.setText(
-                f"Image {self.current_index + 1} of {len(self.file_paths)}"
-            )
-        else:
-            self.image_info_label.setText("No images loaded.")
-
-    def reset_image(self):
-        if self.file_paths and self.current_index >= 0:
-            # Remove any transformed image for current image
-            file_path = self.file_paths[self.current_index]
-            if file_path in self.transformed_images:
-                del self.transformed_images[file_path]
-            self.transformed_img = None
-            self.lines = []
-            self.reset_sliders()
-            self.load_current_image()
-        else:
-            QMessageBox.warning(self, "No Image", "No image loaded to reset.")
-
-    def reset_all(self):
-        if not self.file_paths:
-            return
-        self.transformed_images = {}
-        self.transformed_img = None
-        self.lines = []
-        self.reset_sliders()
-        self.load_current_image()
-
-    def draw_lines(self):
-        if self.img is None and self.transformed_img is None:
-            QMessageBox.critical(self, "Error", "No image loaded!")
-            return
-
-        img_to_draw = self.transformed_img if self.transformed_img is not None else self.img
-        h, w = img_to_draw.shape[:2]
-
-        line_y, ok = QInputDialog.getInt(
-            self, "Draw Line", f"Enter the Y position for the line (0 to {h}):", 0, 0, h, 1
-        )
-        if ok:
-            if 0 <= line_y <= h:
-                self.lines.append(line_y)
-                self.update_display_image(img_to_draw)
-            else:
-                QMessageBox.warning(self, "Invalid Input", f"Y position must be between 0 and {h}.")
-
-    def remove_lines(self):
-        self.lines.clear()
-        self.update_display_image(self.img if self.transformed_img is None else self.transformed_img)
-
-    def zoom_in(self):
-        if self.scale_factor < 5.0:
-            self.scale_factor *= 1.1
-            self.update_display_image(self.transformed_img or self.img)
-
-    def zoom_out(self):
-        if self.scale_factor > 0.1:
-            self.scale_factor /= 1.1
-            self.update_display_image(self.transformed_img or self.img)
-
-    def next_image(self):
-        if not self.file_paths:
-            QMessageBox.warning(self, "No Images", "No images loaded.")
-            return
-
-        if self.current_index < len(self.file_paths) - 1:
-            self.current_index += 1
-            self.load_current_image()
-        else:
-            QMessageBox.information(self, "End", "This is the last image.")
-
-    def previous_image(self):
-        if not self.file_paths:
-            QMessageBox.warning(self, "No Images", "No images loaded.")
-            return
-
-        if self.current_index > 0:
-            self.current_index -= 1
-            self.load_current_image()
-        else:
-            QMessageBox.information(self, "Start", "This is the first image.")
-
-
-
-class HCTAutoLabelTab(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setFocusPolicy(Qt.StrongFocus)
-
-        # Initialize variables
-        self.image = None
-        self.original_image = None
-        self.processed_images = {}
-        self.image_dir = ''
-        self.current_image_path = ''
-        self.zoom_level = 1.0
-        self.image_list = []
-        self.current_image_index = 0
-        self.bounding_boxes = {}
-        self.offset = 10
-
-        # Setup UI
-        self.init_ui()
-
-    def init_ui(self):
-        # Main layout
-        main_layout = QVBoxLayout()
-        self.setLayout(main_layout)
-
-        # Image display
-        self.image_label = QLabel()
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setFocusPolicy(Qt.NoFocus)  # Prevent label from stealing focus
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setWidget(self.image_label)
-        main_layout.addWidget(self.scroll_area, stretch=5)
-
-        # Buttons and sliders
-        self.create_buttons(main_layout)
-        self.create_sliders(main_layout)
-
-        # Setup keyboard shortcuts
-        #self.setup_shortcuts()
-
-        # Set focus policy and focus
-        self.setFocusPolicy(Qt.StrongFocus)
-        self.setFocus()
-
-    """
-    def setup_shortcuts(self):
-        # Previous Image Shortcut (A key)
-        self.shortcut_prev = QShortcut(QKeySequence('A'), self)
-        self.shortcut_prev.setContext(Qt.ApplicationShortcut)
-        self.shortcut_prev.activated.connect(self.previous_image)
-
-        # Next Image Shortcut (D key)
-        self.shortcut_next = QShortcut(QKeySequence('D'), self)
-        self.shortcut_next.setContext(Qt.ApplicationShortcut)
-        self.shortcut_next.activated.connect(self.next_image)
-
-        # Zoom In: Ctrl + +
-        self.shortcut_zoom_in = QShortcut(QKeySequence('Ctrl++'), self)
-        self.shortcut_zoom_in.setContext(Qt.ApplicationShortcut)
-        self.shortcut_zoom_in.activated.connect(self.zoom_in)
-
-        # Zoom Out: Ctrl + -
-        self.shortcut_zoom_out = QShortcut(QKeySequence('Ctrl+-'), self)
-        self.shortcut_zoom_out.setContext(Qt.ApplicationShortcut)
-        self.shortcut_zoom_out.activated.connect(self.zoom_out)
-    """
-
-    def create_buttons(self, layout):
-        # Buttons layout with two rows using QHBoxLayout
-        buttons_layout = QVBoxLayout()
-
-        # First row of buttons
-        button_row1 = QHBoxLayout()
-        button_row1.setSpacing(5)
-
-        buttons1 = [
-            ('Zoom In', self.zoom_in),
-            ('Zoom Out', self.zoom_out),
-            ('Load Image', self.load_image),
-            ('Save Image', self.save_image),
-            ('Reset Image', self.reset_image),
-            ('Reset All', self.reset_all)
-        ]
-
-        for text, method in buttons1:
-            button = QPushButton(text)
-            button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            button.clicked.connect(method)
-            button_row1.addWidget(button)
-
-        buttons_layout.addLayout(button_row1)
-
-        # Second row of buttons
-        button_row2 = QHBoxLayout()
-        button_row2.setSpacing(5)
-
-        buttons2 = [
-            ('Apply HCT', self.apply_hct),
-            ('Apply HCT To All', self.apply_hct_all),
-            ('Apply HCT with BBoxes', self.apply_hct_with_bboxes),
-            ('Apply HCT with BBoxes To All', self.apply_hct_with_bboxes_all),
-            ('Save All', self.save_all),
-            ('Save Annotations', self.save_annotations),
-            ('Save All Annotations', self.save_all_annotations),
-            ('Reset Sliders', self.reset_sliders),
-            ('Load/Open Directory', self.load_directory),
-            ('Previous', self.previous_image),
-            ('Next', self.next_image),
-            ('?', self.show_help)
-        ]
-
-        for text, method in buttons2:
-            button = QPushButton(text)
-            button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            button.clicked.connect(method)
-            button_row2.addWidget(button)
-
-        buttons_layout.addLayout(button_row2)
-
-        layout.addLayout(buttons_layout)
-
-    def create_sliders(self, layout):
-        # Sliders layout
-        slider_layout = QVBoxLayout()
-
-        # Adjust dp_slider for floating-point values
-        sliders = [
-            # Label, Attribute name, Default, Min, Max, Step, Mapping Function
-            ('dp - Inverse ratio of resolution', 'dp', 100, 10, 1000, 10, lambda x: x / 100.0),
-            ('minDist - Min distance between circles', 'minDist', 20, 1, 500, 10, lambda x: x),
-            ('param1 - Upper threshold for Canny', 'param1', 50, 1, 300, 10, lambda x: x),
-            ('param2 - Threshold for center detection', 'param2', 30, 1, 100, 5, lambda x: x),
-            ('minRadius - Minimum circle radius', 'minRadius', 0, 0, 100, 5, lambda x: x),
-            ('maxRadius - Maximum circle radius', 'maxRadius', 0, 0, 200, 10, lambda x: x)
-        ]
-
-        for i, (label_text, attr, default, min_val, max_val, tick_interval, mapping) in enumerate(sliders):
-            slider, value_label, slider_layout_inner = self.create_slider(label_text, min_val, max_val, default, tick_interval, mapping)
-            slider_layout.addLayout(slider_layout_inner)
-            setattr(self, f"{attr}_slider", slider)
-            setattr(self, f"{attr}_value_label", value_label)
-
-        # Class number selector
-        class_layout = QHBoxLayout()
-        class_label = QLabel('Class Number')
-        class_label.setFixedWidth(250)
-        class_layout.addWidget(class_label)
-        self.class_number_selector = QSpinBox()
-        self.class_number_selector.setMinimum(0)
-        self.class_number_selector.setMaximum(99)
-        self.class_number_selector.setValue(0)
-        class_layout.addWidget(self.class_number_selector)
-        class_value_label = QLabel(str(self.class_number_selector.value()))
-        class_value_label.setFixedWidth(50)
-        class_layout.addWidget(class_value_label)
-        self.class_number_selector.valueChanged.connect(lambda value: class_value_label.setText(str(value)))
-        slider_layout.addLayout(class_layout)
-
-        # Offset input for bounding boxes
-        offset_layout = QHBoxLayout()
-        offset_label = QLabel('Bounding Box Offset (pixels)')
-        offset_label.setFixedWidth(250)
-        offset_layout.addWidget(offset_label)
-        self.offset_input = QSpinBox()
-        self.offset_input.setMinimum(0)
-        self.offset_input.setMaximum(100)
-        self.offset_input.setValue(self.offset)
-        offset_layout.addWidget(self.offset_input)
-        offset_value_label = QLabel(str(self.offset_input.value()))
-        offset_value_label.setFixedWidth(50)
-        offset_layout.addWidget(offset_value_label)
-        self.offset_input.valueChanged.connect(
-            lambda value: (offset_value_label.setText(str(value)), self.set_offset(value))
-        )
-        slider_layout.addLayout(offset_layout)
-
-        layout.addLayout(slider_layout)
-
-    def create_slider(self, label_text, min_val, max_val, default, tick_interval, mapping):
-        layout = QHBoxLayout()
-        layout.setContentsMargins(0, 0, 0, 0)
-        layout.setSpacing(5)
-        label = QLabel(label_text)
-        label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        slider = QSlider(Qt.Horizontal)
-        slider.setMinimum(min_val)
-        slider.setMaximum(max_val)
-        slider.setValue(default)
-        slider.setTickPosition(QSlider.TicksBelow)
-        slider.setTickInterval(tick_interval)
-        slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-        value_label = QLabel(str(mapping(default)))
-        value_label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-        slider.valueChanged.connect(lambda value, lbl=value_label, m=mapping: lbl.setText(str(m(value))))
-        slider.valueChanged.connect(lambda value, m=mapping: self.update_transformation_parameters())
-        layout.addWidget(label)
-        layout.addWidget(slider)
-        layout.addWidget(value_label)
-        return slider, value_label, layout
-
-    def update_transformation_parameters(self):
-        # Placeholder for any real-time updates if needed
-        pass
-
-    def set_offset(self, value):
-        self.offset = value
-
-    def load_image(self):
-        file_path, _ = QFileDialog.getOpenFileName(
-            self, "Load Image", "", "Images (*.png *.jpg *.jpeg *.bmp)"
-        )
-        if file_path:
-            # Reset image_list to contain only the selected single image
-            self.image_list = [file_path]
-            self.current_image_index = 0
-            self.augmented_images = [None] * len(self.image_list)
-            self.load_current_image()
-
-    def load_directory(self):
-        directory = QFileDialog.getExistingDirectory(self, "Load Directory", "")
-        if directory:
-            self.image_dir = directory
-            supported_formats = ['.png', '.jpg', '.jpeg', '.bmp']
-            self.image_list = [
-                os.path.join(directory, f) for f in os.listdir(directory)
-                if os.path.splitext(f)[1].lower() in supported_formats
-            ]
-            if self.image_list:
-                self.current_image_index = 0
-                self.augmented_images = [None] * len(self.image_list)
-                self.load_current_image()
-            else:
-                QMessageBox.warning(self, "No Images", "No supported images found in the directory.")
-
-    def load_current_image(self):
-        if self.image_list:
-            self.current_image_path = self.image_list[self.current_image_index]
-            if self.current_image_path in self.processed_images:
-                self.image = self.processed_images[self.current_image_path].copy()
-                self.original_image = self.image.copy()
-                self.display_image(self.image)
-            else:
-                self.original_image = cv2.imread(self.current_image_path)
-                if self.original_image is not None:
-                    self.original_image = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2RGB)
-                    self.image = self.original_image.copy()
-                    self.processed_images[self.current_image_path] = self.image.copy()
-                    self.display_image(self.image)
-                else:
-                    QMessageBox.critical(self, "Error", f"Failed to load image: {os.path.basename(self.current_image_path)}")
-
-    def display_image(self, image):
-        try:
-            height, width, channel = image.shape
-            bytes_per_line = 3 * width
-            qimage = QImage(
-                image.data, width, height, bytes_per_line, QImage.Format_RGB888
-            )
-            pixmap = QPixmap.fromImage(qimage).scaled(
-                int(width * self.zoom_level),
-                int(height * self.zoom_level),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-            self.image_label.setPixmap(pixmap)
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to display image: {e}")
-
-    def resizeEvent(self, event):
-        # Update the displayed image size when the window is resized
-        if self.image is not None:
-            self.display_image(self.image)
-        super().resizeEvent(event)
-
-    def zoom_in(self):
-        if self.image is not None:
-            self.zoom_level *= 1.25
-            self.display_image(self.image)
-
-    def zoom_out(self):
-        if self.image is not None:
-            self.zoom_level /= 1.25
-            self.display_image(self.image)
-
-    def reset_image(self):
-        if not self.image_list or self.current_image_index < 0:
-            QMessageBox.warning(self, "No Image", "No image loaded to reset.")
-            return
-
-        try:
-            # Reset the current image to the original image
-            path = self.image_list[self.current_image_index]
-            original_img = cv2.imread(path)
-
-            if original_img is None:
-                raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
-
-            # Check if the image is too large
-            if original_img.shape[0] > 5000 or original_img.shape[1] > 5000:
-                raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
-
-            # Convert BGR to RGB
-            original_img = cv2.cvtColor(original_img, cv2.COLOR_BGR2RGB)
-            self.current_image = original_img.copy()  # Set current image to the original
-            self.processed_images[path] = original_img.copy()  # Reset processed images
-
-            self.display_image(self.current_image)  # Display the reset image
-            QMessageBox.information(self, "Reset Image", "Image has been reset to its original state.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to reset image: {e}")
-
-    def reset_all(self):
-        if self.image_list:
-            try:
-                # Do not reset zoom level to preserve current zoom
-                for idx, path in enumerate(self.image_list):
-                    original = cv2.imread(path)
-                    if original is not None:
-                        original = cv2.cvtColor(original, cv2.COLOR_BGR2RGB)
-                        self.processed_images[path] = original.copy()
-                        self.augmented_images[idx] = original.copy()
-                self.load_current_image()
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to reset all images: {e}")
-
-    def apply_hct(self):
-        if self.image is not None:
-            try:
-                # Convert to grayscale for HoughCircles
-                gray = cv2.cvtColor(self.image, cv2.COLOR_RGB2GRAY)
-                gray = cv2.medianBlur(gray, 5)
-
-                # Get parameters from sliders
-                dp = getattr(self, 'dp_slider').value() / 100.0  # Adjusted for float
-                minDist = getattr(self, 'minDist_slider').value()
-                param1 = getattr(self, 'param1_slider').value()
-                param2 = getattr(self, 'param2_slider').value()
-                minRadius = getattr(self, 'minRadius_slider').value()
-                maxRadius = getattr(self, 'maxRadius_slider').value()
-
-                # Detect circles using HoughCircles
-                circles = cv2.HoughCircles(
-                    gray, cv2.HOUGH_GRADIENT, dp=dp, minDist=minDist,
-                    param1=param1, param2=param2, minRadius=minRadius, maxRadius=maxRadius
-                )
-
-                if circles is not None:
-                    circles = np.uint16(np.around(circles))
-                    for i in circles[0, :]:
-                        # Draw the outer circle
-                        cv2.circle(self.image, (i[0], i[1]), i[2], (0, 255, 0), 2)
-                        # Draw the center of the circle
-                        cv2.circle(self.image, (i[0], i[1]), 2, (0, 0, 255), 3)
-                    self.processed_images[self.current_image_path] = self.image.copy()
-                    self.display_image(self.image)
-                else:
-                    QMessageBox.information(self, "No Circles", "No circles were detected with the current parameters.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to apply HCT: {e}")
-
-    def apply_hct_all(self):
-        if self.image_list:
-            for path in self.image_list:
-                try:
-                    img = cv2.imread(path)
-                    if img is not None:
-                        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                        gray = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
-                        gray = cv2.medianBlur(gray, 5)
-
-                        dp = getattr(self, 'dp_slider').value() / 100.0  # Adjusted for float
-                        minDist = getattr(self, 'minDist_slider').value()
-                        param1 = getattr(self, 'param1_slider').value()
-                        param2 = getattr(self, 'param2_slider').value()
-                        minRadius = getattr(self, 'minRadius_slider').value()
-                        maxRadius = getattr(self, 'maxRadius_slider').value()
-
-                        circles = cv2.HoughCircles(
-                            gray, cv2.HOUGH_GRADIENT, dp=dp, minDist=minDist,
-                            param1=param1, param2=param2, minRadius=minRadius, maxRadius=maxRadius
-                        )
-
-                        if circles is not None:
-                            circles = np.uint16(np.around(circles))
-                            for i in circles[0, :]:
-                                cv2.circle(img_rgb, (i[0], i[1]), i[2], (0, 255, 0), 2)
-                                cv2.circle(img_rgb, (i[0], i[1]), 2, (0, 0, 255), 3)
-                        self.processed_images[path] = img_rgb.copy()
-                    else:
-                        QMessageBox.warning(self, "Error", f"Failed to read image {os.path.basename(path)}")
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", f"Failed to apply HCT to {os.path.basename(path)}: {e}")
-            self.load_current_image()
-
-    def apply_hct_with_bboxes(self):
-        if self.image is not None:
-            try:
-                # Convert to grayscale for HoughCircles
-                gray = cv2.cvtColor(self.image, cv2.COLOR_RGB2GRAY)
-                gray = cv2.medianBlur(gray, 5)
-
-                # Get parameters from sliders
-                dp = getattr(self, 'dp_slider').value() / 100.0  # Adjusted for float
-                minDist = getattr(self, 'minDist_slider').value()
-                param1 = getattr(self, 'param1_slider').value()
-                param2 = getattr(self, 'param2_slider').value()
-                minRadius = getattr(self, 'minRadius_slider').value()
-                maxRadius = getattr(self, 'maxRadius_slider').value()
-
-                # Detect circles using HoughCircles
-                circles = cv2.HoughCircles(
-                    gray, cv2.HOUGH_GRADIENT, dp=dp, minDist=minDist,
-                    param1=param1, param2=param2, minRadius=minRadius, maxRadius=maxRadius
-                )
-
-                if circles is not None:
-                    circles = np.uint16(np.around(circles))
-                    for i in circles[0, :]:
-                        # Draw the outer circle
-                        cv2.circle(self.image, (i[0], i[1]), i[2], (0, 255, 0), 2)
-                        # Draw the center of the circle
-                        cv2.circle(self.image, (i[0], i[1]), 2, (0, 0, 255), 3)
-
-                        # Define bounding box with offset
-                        x = max(i[0] - i[2] - self.offset, 0)
-                        y = max(i[1] - i[2] - self.offset, 0)
-                        w = min(2 * i[2] + 2 * self.offset, self.image.shape[1] - x)
-                        h_box = min(2 * i[2] + 2 * self.offset, self.image.shape[0] - y)
-
-                        # Draw bounding box
-                        cv2.rectangle(self.image, (x, y), (x + w, y + h_box), (255, 0, 0), 2)
-
-                        # Store bounding box with class number
-                        class_num = self.class_number_selector.value()
-                        if self.current_image_path not in self.bounding_boxes:
-                            self.bounding_boxes[self.current_image_path] = []
-                        self.bounding_boxes[self.current_image_path].append((x, y, w, h_box, class_num))
-
-                    self.processed_images[self.current_image_path] = self.image.copy()
-                    self.display_image(self.image)
-                else:
-                    QMessageBox.information(self, "No Circles", "No circles were detected with the current parameters.")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to apply HCT with bounding boxes: {e}")
-
-    def apply_hct_with_bboxes_all(self):
-        if self.image_list:
-            for path in self.image_list:
-                try:
-                    img = cv2.imread(path)
-                    if img is not None:
-                        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                        gray = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2GRAY)
-                        gray = cv2.medianBlur(gray, 5)
-
-                        dp = getattr(self, 'dp_slider').value() / 100.0  # Adjusted for float
-                        minDist = getattr(self, 'minDist_slider').value()
-                        param1 = getattr(self, 'param1_slider').value()
-                        param2 = getattr(self, 'param2_slider').value()
-                        minRadius = getattr(self, 'minRadius_slider').value()
-                        maxRadius = getattr(self, 'maxRadius_slider').value()
-
-                        circles = cv2.HoughCircles(
-                            gray, cv2.HOUGH_GRADIENT, dp=dp, minDist=minDist,
-                            param1=param1, param2=param2, minRadius=minRadius, maxRadius=maxRadius
-                        )
-
-                        if circles is not None:
-                            circles = np.uint16(np.around(circles))
-                            for i in circles[0, :]:
-                                cv2.circle(img_rgb, (i[0], i[1]), i[2], (0, 255, 0), 2)
-                                cv2.circle(img_rgb, (i[0], i[1]), 2, (0, 0, 255), 3)
-
-                                # Define bounding box with offset
-                                x = max(i[0] - i[2] - self.offset, 0)
-                                y = max(i[1] - i[2] - self.offset, 0)
-                                w = min(2 * i[2] + 2 * self.offset, img_rgb.shape[1] - x)
-                                h_box = min(2 * i[2] + 2 * self.offset, img_rgb.shape[0] - y)
-
-                                # Draw bounding box
-                                cv2.rectangle(img_rgb, (x, y), (x + w, y + h_box), (255, 0, 0), 2)
-
-                                # Store bounding box with class number
-                                class_num = self.class_number_selector.value()
-                                if path not in self.bounding_boxes:
-                                    self.bounding_boxes[path] = []
-                                self.bounding_boxes[path].append((x, y, w, h_box, class_num))
-
-                        self.processed_images[path] = img_rgb.copy()
-                    else:
-                        QMessageBox.warning(self, "Error", f"Failed to read image {os.path.basename(path)}")
-                except Exception as e:
-                    QMessageBox.warning(self, "Error", f"Failed to apply HCT with bounding boxes to {os.path.basename(path)}: {e}")
-            self.load_current_image()
-
-    def save_image(self):
-        if self.image is not None:
-            save_path, _ = QFileDialog.getSaveFileName(
-                self, "Save Image", "", "PNG files (*.png);;JPEG files (*.jpg *.jpeg);;BMP files (*.bmp)"
-            )
-            if save_path:
-                try:
-                    # Convert RGB to BGR before saving with OpenCV
-                    img_bgr = cv2.cvtColor(self.image, cv2.COLOR_RGB2BGR)
-                    cv2.imwrite(save_path, img_bgr)
-                    QMessageBox.information(self, "Saved", f"Image saved to {save_path}")
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Failed to save image: {e}")
-
-    def save_all(self):
-        if not self.image_list:
-            QMessageBox.warning(self, "No Images", "No images loaded to save.")
-            return
-
-        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", "")
-        if not save_folder:
-            return
-
-        try:
-            for path in self.image_list:
-                transformed_img = self.processed_images.get(path, None)
-                if transformed_img is not None:
-                    save_path = os.path.join(save_folder, os.path.basename(path))
-                    # Convert RGB to BGR before saving
-                    img_bgr = cv2.cvtColor(transformed_img, cv2.COLOR_RGB2BGR)
-                    cv2.imwrite(save_path, img_bgr)
-            QMessageBox.information(self, "Save All", "All images have been saved successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save all images: {e}")
-
-    def save_annotations(self):
-        if not self.bounding_boxes.get(self.current_image_path, []):
-            QMessageBox.warning(self, "No Annotations", "No annotations to save.")
-            return
-
-        save_path, _ = QFileDialog.getSaveFileName(
-            self, "Save Annotations", "", "Text files (*.txt)"
-        )
-        if save_path:
-            try:
-                with open(save_path, 'w') as f:
-                    # Ensure the image is loaded to get dimensions
-                    if self.image is not None:
-                        image_height, image_width = self.image.shape[:2]
-                    else:
-                        raise ValueError("No image loaded to retrieve dimensions.")
-
-                    for box in self.bounding_boxes[self.current_image_path]:
-                        x, y, w, h_box, class_num = box
-
-                        # Calculate normalized coordinates
-                        x_center = (x + w / 2.0) / image_width
-                        y_center = (y + h_box / 2.0) / image_height
-                        width_norm = w / image_width
-                        height_norm = h_box / image_height
-
-                        # Write in YOLO format
-                        f.write(f"{class_num} {x_center:.6f} {y_center:.6f} {width_norm:.6f} {height_norm:.6f}\n")
-                QMessageBox.information(self, "Saved", f"Annotations saved to {save_path}")
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to save annotations:\n{e}")
-
-    def save_all_annotations(self):
-        if not self.bounding_boxes:
-            QMessageBox.warning(self, "No Annotations", "No annotations to save.")
-            return
-
-        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder for Annotations", "")
-        if not save_folder:
-            return
-
-        try:
-            for path, boxes in self.bounding_boxes.items():
-                annotation_path = os.path.join(save_folder, os.path.splitext(os.path.basename(path))[0] + ".txt")
-                with open(annotation_path, 'w') as f:
-                    # Retrieve the processed image to get dimensions
-                    if path in self.processed_images and self.processed_images[path] is not None:
-                        image_height, image_width = self.processed_images[path].shape[:2]
-                    else:
-                        # Attempt to load the image to get dimensions
-                        img = cv2.imread(path)
-                        if img is not None:
-                            image_height, image_width = img.shape[:2]
-                        else:
-                            raise ValueError(f"Cannot load image {path} to get dimensions.")
-
-                    for box in boxes:
-                        x, y, w, h_box, class_num = box
-
-                        # Calculate normalized coordinates
-                        x_center = (x + w / 2.0) / image_width
-                        y_center = (y + h_box / 2.0) / image_height
-                        width_norm = w / image_width
-                        height_norm = h_box / image_height
-
-                        # Write in YOLO format
-                        f.write(f"{class_num} {x_center:.6f} {y_center:.6f} {width_norm:.6f} {height_norm:.6f}\n")
-            QMessageBox.information(self, "Save All Annotations", "All annotations have been saved successfully.")
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save annotations for some images:\n{e}")
-
-    def reset_sliders(self):
-        sliders = ['dp', 'minDist', 'param1', 'param2', 'minRadius', 'maxRadius']
-        defaults = [100, 20, 50, 30, 0, 0]  # dp default adjusted to 100 (1.0)
-        for slider, default in zip(sliders, defaults):
-            getattr(self, f"{slider}_slider").setValue(default)
-        self.class_number_selector.setValue(0)
-        self.offset_input.setValue(10)
-        QMessageBox.information(self, "Sliders Reset", "All sliders have been reset to default values.")
-
-    def show_help(self):
-        help_text = (
-            "HCT & Auto Labeling Help:\n\n"
-            "Use the buttons to perform various actions such as loading images, applying HCT transformations, "
-            "saving images and annotations, and navigating through images.\n\n"
-            "Adjust the sliders to set parameters for HCT transformations.\n"
-            "Use the 'Apply' buttons to apply transformations to the current image or all images.\n"
-            "Save your work using the 'Save' buttons.\n\n"
-            "Keyboard Shortcuts:\n"
-            "- Press 'A' to go to the previous image.\n"
-            "- Press 'D' to go to the next image.\n"
-            "- Zoom In: Ctrl + +\n"
-            "- Zoom Out: Ctrl + -\n\n"
-            "Bounding Boxes:\n"
-            "- 'Apply HCT with BBoxes' will detect circles and draw bounding boxes around them.\n"
-            "- Adjust the 'Bounding Box Offset' to change the size of the bounding boxes.\n"
-            "- Set the 'Class Number' for each bounding box."
-        )
-        QMessageBox.information(self, "Help", help_text)
-
-    def previous_image(self):
-        if self.image_list:
-            if self.current_image_index > 0:
-                self.current_image_index -= 1
-                self.load_current_image()
-            else:
-                QMessageBox.information(self, "Start", "This is the first image.")
-        else:
-            QMessageBox.warning(self, "No Images", "No images loaded.")
-
-    def next_image(self):
-        if self.image_list:
-            if self.current_image_index < len(self.image_list) - 1:
-                self.current_image_index += 1
-                self.load_current_image()
-            else:
-                QMessageBox.information(self, "End", "This is the last image.")
-        else:
-            QMessageBox.warning(self, "No Images", "No images loaded.")
-
-
-import sys
-import os
-import cv2
-import numpy as np
-import logging
-from PyQt5.QtWidgets import (
-    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
-    QScrollArea, QSlider, QSpinBox, QCheckBox, QFileDialog,
-    QMessageBox, QSizePolicy
-)
-from PyQt5.QtGui import QImage, QPixmap
-from PyQt5.QtCore import Qt
-
-# Configure logging
-logging.basicConfig(level=logging.DEBUG, filename='app.log',
-                    format='%(asctime)s - %(levelname)s - %(message)s')
-
-class ImageAugmentationTab(QWidget):
-    def __init__(self):
-        super().__init__()
-        self.setFocusPolicy(Qt.StrongFocus)
-
-        # Initialize variables
-        self.original_image = None
-        self.current_image = None
-        self.image_list = []
-        self.current_image_index = 0
-        self.zoom_level = 1.0
-        self.image_dir = ''
-        self.augmented_images = []
-        self.processed_images = {}
-
-        # Setup UI
-        self.init_ui()
-
-    def init_ui(self):
-        try:
-            main_layout = QVBoxLayout()
-            self.setLayout(main_layout)
-
-            # Image display
-            self.image_label = QLabel()
-            self.image_label.setAlignment(Qt.AlignCenter)
-            self.image_label.setFocusPolicy(Qt.NoFocus)
-            self.scroll_area = QScrollArea()
-            self.scroll_area.setWidgetResizable(True)
-            self.scroll_area.setWidget(self.image_label)
-            main_layout.addWidget(self.scroll_area, stretch=8)
-
-            # Buttons and sliders
-            self.create_buttons(main_layout)
-            self.create_sliders(layout=main_layout)
-
-            logging.debug("ImageAugmentationTab UI initialized successfully.")
-        except Exception as e:
-            logging.error(f"Failed to initialize UI: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to initialize UI: {e}")
-
-    def create_buttons(self, layout):
-        try:
-            button_row = QHBoxLayout()
-            button_row.setSpacing(5)
-
-            buttons = [
-                ('Load Image', self.load_image),
-                ('Load Directory', self.load_directory),
-                ('Apply AUG', self.apply_augmentation),
-                ('Apply AUG To All', self.apply_augmentation_all),
-                ('Save Image', self.save_image),
-                ('Save All', self.save_all_images),
-                ('Reset Image', self.reset_image),
-                ('Reset All', self.reset_all_images),
-                ('Reset Sliders', self.reset_sliders),
-                ('Previous', self.previous_image),
-                ('Next', self.next_image),
-                ('Zoom In', self.zoom_in),
-                ('Zoom Out', self.zoom_out),
-                ('?', self.show_help)
-            ]
-
-            for text, method in buttons:
-                button = QPushButton(text)
-                if text == '?':
-                    button.setFixedSize(30, 30)
-                    button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
-                    button.setToolTip("Show Help")
-                    button.setStyleSheet("font-weight: bold;")
-                else:
-                    button.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
-                    button.setToolTip(f"{text} Button")
-
-                # Connect button to method
-                try:
-                    button.clicked.connect(method)
-                except AttributeError as attr_err:
-                    logging.error(f"Failed to connect button '{text}' to method '{method}': {attr_err}")
-                    QMessageBox.critical(self, "Error", f"Failed to connect button '{text}' to its function.")
-                    return
-
-                button_row.addWidget(button)
-
-            button_row.addStretch()
-            layout.addLayout(button_row)
-
-            logging.debug("Buttons created and connected successfully.")
-        except Exception as e:
-            logging.error(f"Failed to create buttons: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to create buttons: {e}")
-
-    def create_sliders(self, layout):
-        try:
-            slider_layout = QVBoxLayout()
-            slider_layout.setSpacing(5)
-
-            # Define slider configurations
-            sliders_info = [
-                {'name': 'white_balance', 'label': 'White Balance', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
-                {'name': 'hsv_h', 'label': 'HSV Hue', 'min': -180, 'max': 180, 'default': 0, 'factor': 1},
-                {'name': 'hsv_s', 'label': 'HSV Saturation', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
-                {'name': 'hsv_v', 'label': 'HSV Value', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
-                {'name': 'degrees', 'label': 'Rotation Degrees', 'min': -180, 'max': 180, 'default': 0, 'factor': 1},
-                {'name': 'translate', 'label': 'Translate', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
-                {'name': 'scale', 'label': 'Scale (%)', 'min': 50, 'max': 150, 'default': 100, 'factor': 1},
-                {'name': 'shear', 'label': 'Shear', 'min': -45, 'max': 45, 'default': 0, 'factor': 1},
-                {'name': 'noise', 'label': 'Noise Level', 'min': 0, 'max': 100, 'default': 0, 'factor': 1},
-            ]
-
-            for info in sliders_info:
-                slider = QSlider(Qt.Horizontal)
-                slider.setMinimum(info['min'])
-                slider.setMaximum(info['max'])
-                slider.setValue(info['default'])
-                slider.setObjectName(info['name'])
-                slider.setTickPosition(QSlider.TicksBelow)
-                slider.setTickInterval((info['max'] - info['min']) // 10)
-
-                value_label = QLabel(f"{info['default'] * info['factor']:.2f}")
-                value_label.setFixedWidth(60)
-
-                # Connect slider to update label
-                slider.valueChanged.connect(
-                    lambda value, s=slider, l=value_label, f=info['factor']: self.update_value_label(s, l, f)
-                )
-
-                h_layout = QHBoxLayout()
-                param_label = QLabel(info['label'])
-                param_label.setFixedWidth(150)
-                h_layout.addWidget(param_label)
-                h_layout.addWidget(slider)
-                h_layout.addWidget(value_label)
-                slider_layout.addLayout(h_layout)
-
-                # Assign sliders and labels to attributes
-                setattr(self, f"{info['name']}_slider", slider)
-                setattr(self, f"{info['name']}_value_label", value_label)
-
-            # Combine Flip Checkboxes and Padding Controls in the Same Row
-            combined_layout = QHBoxLayout()
-            combined_layout.setSpacing(10)  # Minimal spacing
-
-            # Flip Checkboxes
-            flip_layout = QHBoxLayout()
-            flip_layout.setSpacing(5)
-            self.flipud_checkbox = QCheckBox('Flip Up-Down')
-            self.fliplr_checkbox = QCheckBox('Flip Left-Right')
-            flip_layout.addWidget(self.flipud_checkbox)
-            flip_layout.addWidget(self.fliplr_checkbox)
-
-            # Padding Controls
-            padding_layout = QHBoxLayout()
-            padding_layout.setSpacing(5)
-
-            self.padding_checkbox = QCheckBox("Add Padding")
-            self.padding_checkbox.stateChanged.connect(self.toggle_padding)
-            padding_layout.addWidget(self.padding_checkbox)
-
-            padding_width_label = QLabel("Width (px):")
-            padding_layout.addWidget(padding_width_label)
-
-            self.padding_width_spin = QSpinBox()
-            self.padding_width_spin.setMinimum(0)
-            self.padding_width_spin.setMaximum(10000)  # Allow large padding if needed
-            self.padding_width_spin.setValue(0)
-            self.padding_width_spin.setEnabled(False)
-            padding_layout.addWidget(self.padding_width_spin)
-
-            padding_height_label = QLabel("Height (px):")
-            padding_layout.addWidget(padding_height_label)
-
-            self.padding_height_spin = QSpinBox()
-            self.padding_height_spin.setMinimum(0)
-            self.padding_height_spin.setMaximum(10000)  # Allow large padding if needed
-            self.padding_height_spin.setValue(0)
-            self.padding_height_spin.setEnabled(False)
-            padding_layout.addWidget(self.padding_height_spin)
-
-            # Add Flip and Padding to Combined Layout
-            combined_layout.addLayout(flip_layout)
-            combined_layout.addStretch()
-            combined_layout.addLayout(padding_layout)
-
-            slider_layout.addLayout(combined_layout)
-            layout.addLayout(slider_layout)
-
-            logging.debug("Sliders created and connected successfully.")
-        except Exception as e:
-            logging.error(f"Failed to create sliders: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to create sliders: {e}")
-
-    def update_value_label(self, slider, label, factor):
-        try:
-            value = slider.value() * factor
-            label.setText(f"{value:.2f}")
-        except Exception as e:
-            logging.error(f"Failed to update slider label: {e}")
-            label.setText("Error")
-
-    def toggle_padding(self, state):
-        try:
-            enabled = state == Qt.Checked
-            self.padding_width_spin.setEnabled(enabled)
-            self.padding_height_spin.setEnabled(enabled)
-            logging.debug(f"Padding toggled: {'Enabled' if enabled else 'Disabled'}.")
-        except Exception as e:
-            logging.error(f"Failed to toggle padding: {e}")
-
-    def load_image(self):
-        try:
-            file_path, _ = QFileDialog.getOpenFileName(
-                self, "Load Image", "", "Images (*.png *.jpg *.jpeg *.bmp)"
-            )
-            if file_path:
-                logging.debug(f"Loading image from {file_path}")
-                self.original_image = cv2.imread(file_path)
-                if self.original_image is None:
-                    raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
-                if self.original_image.shape[0] > 5000 or self.original_image.shape[1] > 5000:
-                    raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
-                self.original_image = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2RGB)
-                self.current_image = self.original_image.copy()
-                self.image_list = [file_path]
-                self.current_image_index = 0
-                self.augmented_images = [None]  # Initialize with None
-                self.display_image(self.current_image)
-                logging.debug("Image loaded and displayed successfully.")
-        except Exception as e:
-            logging.error(f"Failed to load image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to load image: {e}")
-
-    def load_directory(self):
-        try:
-            directory = QFileDialog.getExistingDirectory(self, "Load Directory", "")
-            if directory:
-                logging.debug(f"Loading directory: {directory}")
-                supported_formats = ['.png', '.jpg', '.jpeg', '.bmp']
-                self.image_list = [
-                    os.path.join(directory, f) for f in os.listdir(directory)
-                    if os.path.splitext(f)[1].lower() in supported_formats
-                ]
-                if self.image_list:
-                    self.current_image_index = 0
-                    self.augmented_images = [None] * len(self.image_list)
-                    self.load_current_image()
-                    logging.debug("Directory loaded successfully.")
-                else:
-                    QMessageBox.warning(self, "No Images", "No supported images found in the directory.")
-        except Exception as e:
-            logging.error(f"Failed to load directory: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to load directory: {e}")
-
-    def load_current_image(self):
-        try:
-            if self.image_list:
-                self.current_image_path = self.image_list[self.current_image_index]
-                logging.debug(f"Loading current image: {self.current_image_path}")
-                if self.augmented_images[self.current_image_index] is not None:
-                    self.current_image = self.augmented_images[self.current_image_index].copy()
-                    self.display_image(self.current_image)
-                else:
-                    self.original_image = cv2.imread(self.current_image_path)
-                    if self.original_image is None:
-                        raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
-                    if self.original_image.shape[0] > 5000 or self.original_image.shape[1] > 5000:
-                        raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
-                    self.original_image = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2RGB)
-                    self.current_image = self.original_image.copy()
-                    self.augmented_images[self.current_image_index] = self.current_image.copy()
-                    self.display_image(self.current_image)
-                logging.debug("Current image loaded and displayed successfully.")
-        except Exception as e:
-            logging.error(f"Failed to load current image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to load image: {e}")
-
-    def display_image(self, image):
-        try:
-            if image is None:
-                raise ValueError("Image is None.")
-            if len(image.shape) != 3 or image.shape[2] != 3:
-                raise ValueError("Image must be a 3-channel RGB image.")
-
-            height, width, channel = image.shape
-            bytes_per_line = 3 * width
-
-            if not image.flags['C_CONTIGUOUS']:
-                image = np.ascontiguousarray(image)
-
-            qimage = QImage(
-                image.data, width, height, bytes_per_line, QImage.Format_RGB888
-            )
-            if qimage.isNull():
-                raise ValueError("QImage is null. Possibly unsupported image format.")
-
-            pixmap = QPixmap.fromImage(qimage)
-            # Limit zoom to prevent excessive scaling
-            if self.zoom_level > 5.0:
-                self.zoom_level = 5.0
-            elif self.zoom_level < 0.1:
-                self.zoom_level = 0.1
-
-            scaled_pixmap = pixmap.scaled(
-                int(width * self.zoom_level),
-                int(height * self.zoom_level),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            )
-
-            self.image_label.setPixmap(scaled_pixmap)
-            self.image_label.adjustSize()
-            logging.debug("Image displayed successfully.")
-        except Exception as e:
-            logging.error(f"Failed to display image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to display image: {e}")
-
-    def apply_augmentation(self):
-        try:
-            if not self.image_list:
-                QMessageBox.warning(self, "No Image", "No image loaded to apply augmentations.")
-                return
-
-            # Start with the original image to prevent cumulative transformations
-            path = self.image_list[self.current_image_index]
-            original_img = cv2.imread(path)
-            if original_img is None:
-                raise ValueError("Original image data is None. Possibly unsupported image format or corrupted file.")
-            if original_img.shape[0] > 5000 or original_img.shape[1] > 5000:
-                raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
-            original_img = cv2.cvtColor(original_img, cv2.COLOR_BGR2RGB)
-
-            img = original_img.copy()
-
-            # Apply white balance
-            wb_value = self.white_balance_slider.value()
-            if wb_value != 0:
-                if wb_value > 0:
-                    img = cv2.convertScaleAbs(img, alpha=1, beta=wb_value * 2.55)
-                elif wb_value < 0:
-                    factor = 1 + (wb_value / 100.0)
-                    img = cv2.convertScaleAbs(img, alpha=factor, beta=0)
-
-            # Apply HSV adjustments
-            hsv_h = self.hsv_h_slider.value()
-            hsv_s = self.hsv_s_slider.value() / 100.0  # Scale saturation
-            hsv_v = self.hsv_v_slider.value() / 100.0  # Scale value
-            if hsv_h != 0 or hsv_s != 0 or hsv_v != 0:
-                hsv = cv2.cvtColor(img, cv2.COLOR_RGB2HSV).astype(float)
-                hsv[:, :, 0] = (hsv[:, :, 0] + hsv_h) % 180
-                hsv[:, :, 1] = np.clip(hsv[:, :, 1] * (1 + hsv_s), 0, 255)
-                hsv[:, :, 2] = np.clip(hsv[:, :, 2] * (1 + hsv_v), 0, 255)
-                hsv = hsv.astype(np.uint8)
-                img = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-
-            # Apply rotation
-            degrees = self.degrees_slider.value()
-            if degrees != 0:
-                (h, w) = img.shape[:2]
-                center = (w // 2, h // 2)
-                M = cv2.getRotationMatrix2D(center, degrees, 1.0)
-                img = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
-
-            # Apply translation
-            translate = self.translate_slider.value()
-            if translate != 0:
-                M = np.float32([[1, 0, translate], [0, 1, translate]])
-                (h, w) = img.shape[:2]
-                img = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
-
-            # Apply scaling
-            scale = self.scale_slider.value() / 100.0
-            if scale != 1.0:
-                img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
-
-            # Apply shear
-            shear = self.shear_slider.value()
-            if shear != 0:
-                shear_rad = np.radians(shear)
-                M = np.float32([
-                    [1, np.tan(shear_rad), 0],
-                    [0, 1, 0]
-                ])
-                (h, w) = img.shape[:2]
-                new_width = w + int(abs(np.tan(shear_rad)) * h)
-                img = cv2.warpAffine(img, M, (new_width, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
-
-            # Apply noise
-            noise_level = self.noise_slider.value()
-            if noise_level > 0:
-                noise = np.random.randint(0, noise_level, img.shape, dtype='uint8')
-                img = cv2.add(img, noise)
-
-            # Apply flipping
-            if self.flipud_checkbox.isChecked():
-                img = cv2.flip(img, 0)  # Flip vertically
-            if self.fliplr_checkbox.isChecked():
-                img = cv2.flip(img, 1)  # Flip horizontally
-
-            # Apply padding if enabled
-            if self.padding_checkbox.isChecked():
-                desired_width = self.padding_width_spin.value()
-                desired_height = self.padding_height_spin.value()
-
-                if desired_width < img.shape[1] or desired_height < img.shape[0]:
-                    QMessageBox.warning(self, "Invalid Padding", "Desired padding dimensions must be greater than or equal to the current image dimensions.")
-                else:
-                    img = self.apply_padding(img, desired_width, desired_height)
-
-            # Update augmented_images list
-            self.augmented_images[self.current_image_index] = img.copy()
-            self.current_image = img.copy()
-            self.display_image(self.current_image)
-            logging.debug("Augmentation applied successfully.")
-            QMessageBox.information(self, "Augmentation Applied", "Augmentations have been applied to the current image.")
-        except Exception as e:
-            logging.error(f"Failed to apply augmentation: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to apply augmentation: {e}")
-
-    def apply_augmentation_all(self):
-        try:
-            if not self.image_list:
-                QMessageBox.warning(self, "No Images", "No images loaded to apply augmentations.")
-                return
-
-            for idx, path in enumerate(self.image_list):
-                img = cv2.imread(path)
-                if img is not None:
-                    if img.shape[0] > 5000 or img.shape[1] > 5000:
-                        logging.warning(f"Image {path} exceeds maximum dimensions. Skipping.")
-                        continue
-                    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-
-                    # Start with the original image to prevent cumulative transformations
-                    aug_img = img_rgb.copy()
-
-                    # Apply white balance
-                    wb_value = self.white_balance_slider.value()
-                    if wb_value != 0:
-                        if wb_value > 0:
-                            aug_img = cv2.convertScaleAbs(aug_img, alpha=1, beta=wb_value * 2.55)
-                        elif wb_value < 0:
-                            factor = 1 + (wb_value / 100.0)
-                            aug_img = cv2.convertScaleAbs(aug_img, alpha=factor, beta=0)
-
-                    # Apply HSV adjustments
-                    hsv_h = self.hsv_h_slider.value()
-                    hsv_s = self.hsv_s_slider.value() / 100.0  # Scale saturation
-                    hsv_v = self.hsv_v_slider.value() / 100.0  # Scale value
-                    if hsv_h != 0 or hsv_s != 0 or hsv_v != 0:
-                        hsv = cv2.cvtColor(aug_img, cv2.COLOR_RGB2HSV).astype(float)
-                        hsv[:, :, 0] = (hsv[:, :, 0] + hsv_h) % 180
-                        hsv[:, :, 1] = np.clip(hsv[:, :, 1] * (1 + hsv_s), 0, 255)
-                        hsv[:, :, 2] = np.clip(hsv[:, :, 2] * (1 + hsv_v), 0, 255)
-                        hsv = hsv.astype(np.uint8)
-                        aug_img = cv2.cvtColor(hsv, cv2.COLOR_HSV2RGB)
-
-                    # Apply rotation
-                    degrees = self.degrees_slider.value()
-                    if degrees != 0:
-                        (h, w) = aug_img.shape[:2]
-                        center = (w // 2, h // 2)
-                        M = cv2.getRotationMatrix2D(center, degrees, 1.0)
-                        aug_img = cv2.warpAffine(aug_img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
-
-                    # Apply translation
-                    translate = self.translate_slider.value()
-                    if translate != 0:
-                        M = np.float32([[1, 0, translate], [0, 1, translate]])
-                        (h, w) = aug_img.shape[:2]
-                        aug_img = cv2.warpAffine(aug_img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
-
-                    # Apply scaling
-                    scale = self.scale_slider.value() / 100.0
-                    if scale != 1.0:
-                        aug_img = cv2.resize(aug_img, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
-
-                    # Apply shear
-                    shear = self.shear_slider.value()
-                    if shear != 0:
-                        shear_rad = np.radians(shear)
-                        M = np.float32([
-                            [1, np.tan(shear_rad), 0],
-                            [0, 1, 0]
-                        ])
-                        (h, w) = aug_img.shape[:2]
-                        new_width = w + int(abs(np.tan(shear_rad)) * h)
-                        aug_img = cv2.warpAffine(aug_img, M, (new_width, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
-
-                    # Apply noise
-                    noise_level = self.noise_slider.value()
-                    if noise_level > 0:
-                        noise = np.random.randint(0, noise_level, aug_img.shape, dtype='uint8')
-                        aug_img = cv2.add(aug_img, noise)
-
-                    # Apply flipping
-                    if self.flipud_checkbox.isChecked():
-                        aug_img = cv2.flip(aug_img, 0)  # Flip vertically
-                    if self.fliplr_checkbox.isChecked():
-                        aug_img = cv2.flip(aug_img, 1)  # Flip horizontally
-
-                    # Apply padding if enabled
-                    if self.padding_checkbox.isChecked():
-                        desired_width = self.padding_width_spin.value()
-                        desired_height = self.padding_height_spin.value()
-
-                        if desired_width < aug_img.shape[1] or desired_height < aug_img.shape[0]:
-                            logging.warning(f"Desired padding dimensions for image {path} are smaller than current dimensions. Skipping padding.")
-                        else:
-                            aug_img = self.apply_padding(aug_img, desired_width, desired_height)
-
-                    # Update augmented_images list
-                    self.augmented_images[idx] = aug_img.copy()
-                    logging.debug(f"Augmentation applied to image: {path}")
-                else:
-                    logging.warning(f"Failed to read image {path}. Skipping.")
-
-            self.load_current_image()
-            QMessageBox.information(self, "Augmentation Applied", "Augmentations have been applied to all images.")
-            logging.debug("Augmentation applied to all images successfully.")
-        except Exception as e:
-            logging.error(f"Failed to apply augmentation to all images: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to apply augmentation to all images: {e}")
-
-    def apply_padding(self, img, desired_width, desired_height):
-        try:
-            original_height, original_width = img.shape[:2]
-
-            # Calculate required padding
-            pad_width = max(desired_width - original_width, 0)
-            pad_height = max(desired_height - original_height, 0)
-
-            pad_left = pad_width // 2
-            pad_right = pad_width - pad_left
-            pad_top = pad_height // 2
-            pad_bottom = pad_height - pad_top
-
-            if pad_width > 0 or pad_height > 0:
-                img = cv2.copyMakeBorder(
-                    img,
-                    top=pad_top,
-                    bottom=pad_bottom,
-                    left=pad_left,
-                    right=pad_right,
-                    borderType=cv2.BORDER_CONSTANT,
-                    value=[255, 255, 255]  # White padding
-                )
-                logging.debug(f"Applied padding: Left={pad_left}px, Right={pad_right}px, Top={pad_top}px, Bottom={pad_bottom}px")
-            else:
-                logging.debug("No padding applied as desired size is smaller or equal to original size.")
-
-            return img
-        except Exception as e:
-            logging.error(f"Failed to apply padding: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to apply padding: {e}")
-            return img  # Return original image if padding fails
-
-    def save_image(self):
-        try:
-            if self.current_image is None:
-                QMessageBox.warning(self, "No Image", "No augmented image to save.")
-                return
-            save_path, _ = QFileDialog.getSaveFileName(
-                self, "Save Augmented Image", "", "PNG files (*.png);;JPEG files (*.jpg *.jpeg);;BMP files (*.bmp)"
-            )
-            if save_path:
-                img_bgr = cv2.cvtColor(self.current_image, cv2.COLOR_RGB2BGR)
-                cv2.imwrite(save_path, img_bgr)
-                QMessageBox.information(self, "Saved", f"Image saved to {save_path}")
-                logging.debug(f"Image saved to {save_path}")
-        except Exception as e:
-            logging.error(f"Failed to save image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to save image: {e}")
-
-    def save_all_images(self):
-        try:
-            if not self.image_list:
-                QMessageBox.warning(self, "No Images", "No images loaded to save.")
-                return
-
-            save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", "")
-            if not save_folder:
-                return
-
-            for idx, path in enumerate(self.image_list):
-                if idx < len(self.augmented_images) and self.augmented_images[idx] is not None:
-                    img_rgb = self.augmented_images[idx]
-                else:
-                    img = cv2.imread(path)
-                    if img is not None:
-                        img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    else:
-                        logging.warning(f"Failed to read image {path}. Skipping.")
-                        continue
-
-                img_bgr = cv2.cvtColor(img_rgb, cv2.COLOR_RGB2BGR)
-                save_path = os.path.join(save_folder, os.path.basename(path))
-                cv2.imwrite(save_path, img_bgr)
-                logging.debug(f"Image saved to {save_path}")
-
-            QMessageBox.information(self, "Save All", "All augmented images have been saved successfully.")
-            logging.debug("All augmented images saved successfully.")
-        except Exception as e:
-            logging.error(f"Failed to save all images: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to save all images: {e}")
-
-    def reset_image(self):
-        try:
-            if not self.image_list:
-                QMessageBox.warning(self, "No Image", "No image loaded to reset.")
-                return
-
-            # Reset the current image to original
-            path = self.image_list[self.current_image_index]
-            self.original_image = cv2.imread(path)
-            if self.original_image is None:
-                raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
-            if self.original_image.shape[0] > 5000 or self.original_image.shape[1] > 5000:
-                raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
-            self.original_image = cv2.cvtColor(self.original_image, cv2.COLOR_BGR2RGB)
-            self.current_image = self.original_image.copy()
-            self.augmented_images[self.current_image_index] = self.current_image.copy()
-            self.display_image(self.current_image)
-            QMessageBox.information(self, "Reset Image", "Image has been reset to its original state.")
-            logging.debug("Image reset to original successfully.")
-        except Exception as e:
-            logging.error(f"Failed to reset image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to reset image: {e}")
-
-    def reset_all_images(self):
-        try:
-            if not self.image_list:
-                QMessageBox.warning(self, "No Images", "No images loaded to reset.")
-                return
-
-            for idx, path in enumerate(self.image_list):
-                img = cv2.imread(path)
-                if img is not None:
-                    if img.shape[0] > 5000 or img.shape[1] > 5000:
-                        logging.warning(f"Image {path} exceeds maximum dimensions. Skipping.")
-                        continue
-                    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-                    self.augmented_images[idx] = img_rgb.copy()
-                    logging.debug(f"Image reset: {path}")
-                else:
-                    logging.warning(f"Failed to read image {path}. Skipping.")
-
-            self.load_current_image()
-            QMessageBox.information(self, "Reset All", "All images have been reset to their original state.")
-            logging.debug("All images reset successfully.")
-        except Exception as e:
-            logging.error(f"Failed to reset all images: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to reset all images: {e}")
-
-    def zoom_in(self):
-        try:
-            if self.current_image is not None:
-                self.zoom_level *= 1.25
-                if self.zoom_level > 5.0:
-                    self.zoom_level = 5.0
-                self.display_image(self.current_image)
-                logging.debug(f"Zoomed in to {self.zoom_level}x.")
-        except Exception as e:
-            logging.error(f"Failed to zoom in: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to zoom in: {e}")
-
-    def zoom_out(self):
-        try:
-            if self.current_image is not None:
-                self.zoom_level /= 1.25
-                if self.zoom_level < 0.1:
-                    self.zoom_level = 0.1
-                self.display_image(self.current_image)
-                logging.debug(f"Zoomed out to {self.zoom_level}x.")
-        except Exception as e:
-            logging.error(f"Failed to zoom out: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to zoom out: {e}")
-
-    def reset_sliders(self):
-        try:
-            # Reset all sliders to default values
-            self.white_balance_slider.setValue(0)
-            self.hsv_h_slider.setValue(0)
-            self.hsv_s_slider.setValue(0)
-            self.hsv_v_slider.setValue(0)
-            self.degrees_slider.setValue(0)
-            self.translate_slider.setValue(0)
-            self.scale_slider.setValue(100)
-            self.shear_slider.setValue(0)
-            self.noise_slider.setValue(0)
-
-            # Reset checkboxes
-            self.flipud_checkbox.setChecked(False)
-            self.fliplr_checkbox.setChecked(False)
-            self.padding_checkbox.setChecked(False)
-
-            # Reset padding spin boxes
-            self.padding_width_spin.setValue(0)
-            self.padding_height_spin.setValue(0)
-
-            # Reset zoom level
-            self.zoom_level = 1.0
-            if self.current_image is not None:
-                self.display_image(self.current_image)
-
-            QMessageBox.information(self, "Sliders Reset", "All sliders and controls have been reset to default values.")
-            logging.debug("All sliders and controls reset successfully.")
-        except Exception as e:
-            logging.error(f"Failed to reset sliders: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to reset sliders: {e}")
-
-    def show_help(self):
-        help_text = (
-            "Image Augmentation Help:\n\n"
-            "1. **Load Image**: Load a single image for augmentation.\n"
-            "2. **Load Directory**: Load all supported images from a directory.\n"
-            "3. **Apply AUG**: Apply the selected augmentations to the current image.\n"
-            "4. **Apply AUG To All**: Apply the selected augmentations to all loaded images.\n"
-            "5. **Save Image**: Save the augmented version of the current image.\n"
-            "6. **Save All**: Save all augmented images to a selected folder.\n"
-            "7. **Reset Image**: Reset the current image to its original state.\n"
-            "8. **Reset All**: Reset all images to their original states.\n"
-            "9. **Reset Sliders**: Reset all augmentation parameters to their default values.\n"
-            "10. **Previous/Next**: Navigate through loaded images.\n"
-            "11. **Zoom In/Out**: Adjust the zoom level of the displayed image.\n\n"
-            "**Augmentation Parameters:**\n"
-            "- **White Balance**: Adjust the overall White Balance of the image.\n"
-            "- **HSV Hue/Saturation/Value**: Modify the color properties.\n"
-            "- **Rotation Degrees**: Rotate the image by the specified degrees.\n"
-            "- **Translate**: Shift the image horizontally and vertically.\n"
-            "- **Scale (%)**: Resize the image by the specified percentage.\n"
-            "- **Shear**: Apply a shearing transformation.\n"
-            "- **Noise Level**: Add random noise to the image.\n\n"
-            "**Flipping Options:**\n"
-            "- **Flip Up-Down**: Vertically flip the image.\n"
-            "- **Flip Left-Right**: Horizontally flip the image.\n\n"
-            "**Padding:**\n"
-            "- **Add Padding**: When checked, specify the desired total width and height in pixels.\n"
-            "- **Width (px)** and **Height (px)**: Enter the desired total dimensions. The application will calculate the necessary padding to reach these sizes.\n\n"
-            "Ensure that the desired padding dimensions are greater than or equal to the original image dimensions to prevent unexpected behavior."
-        )
-        QMessageBox.information(self, "Help", help_text)
-        logging.debug("Help dialog shown.")
-
-    def previous_image(self):
-        try:
-            if self.image_list and self.current_image_index > 0:
-                self.current_image_index -= 1
-                self.load_current_image()
-                logging.debug(f"Moved to previous image: Index {self.current_image_index}")
-            else:
-                QMessageBox.information(self, "Start", "This is the first image.")
-        except Exception as e:
-            logging.error(f"Failed to go to previous image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to go to previous image: {e}")
-
-    def next_image(self):
-        try:
-            if self.image_list and self.current_image_index < len(self.image_list) - 1:
-                self.current_image_index += 1
-                self.load_current_image()
-                logging.debug(f"Moved to next image: Index {self.current_image_index}")
-            else:
-                QMessageBox.information(self, "End", "This is the last image.")
-        except Exception as e:
-            logging.error(f"Failed to go to next image: {e}")
-            QMessageBox.critical(self, "Error", f"Failed to go to next image: {e}")
-
-
-def main():
-    app = QApplication(sys.argv)
-    window = ComprehensiveImageEditor()
-    window.show()
-    sys.exit(app.exec_())
-
-
-if __name__ == '__main__':
-    main()
-
-
-
+import sys
+import os
+import threading
+import time
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QLabel, QScrollArea, QFileDialog,
+    QSlider, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, QMessageBox,
+    QTabWidget, QShortcut, QSpinBox, QCheckBox, QGroupBox, QGridLayout,
+    QInputDialog, QSizePolicy, QAction, QWidgetAction, QProgressDialog, QStyle, QStyleOption,
+    QComboBox
+)
+from PyQt5.QtGui import (
+    QPixmap, QImage, QKeySequence, QPainter, QPen, QPalette, QColor, QIcon, QMouseEvent, QPolygonF
+)
+from PyQt5.QtCore import Qt, pyqtSignal, QSize, QTimer, QPoint, QPointF, pyqtSlot, QThread, QRectF
+from collections import OrderedDict
+import cv2
+import numpy as np
+import qdarkstyle
+
+from imagecraft.augment import BORDER_MODES, augment_image, padding_was_skipped
+from imagecraft.batch import read_image, run_batch, write_image
+from imagecraft.boxes import BoxStore, box_tuples, boxes_from_circles
+from imagecraft.export import (
+    EXPORT_FORMATS, PATCH_MANIFEST_NAME, export_coco, export_voc, export_yolo, label_path, write_patch_manifest,
+    write_patches
+)
+from imagecraft.hct import (
+    DEFAULT_HCT_PARAMS, DETECTION_MODES, HCT_BACKENDS, circle_backend, detect_circles_in_file, detect_circles_in_frame,
+    detection_factors, draw_boxes, draw_circles, write_yolo_labels
+)
+from imagecraft.hough import clear_vote_cache
+from imagecraft.index import image_root, list_images, read_image_size, relative_image_path
+from imagecraft.params import load_params, save_params
+from imagecraft.prefetch import ImagePrefetcher
+from imagecraft.preprocess import DEFAULT_CACHE_DIR, PreprocessCache
+from imagecraft.roi import ROI_SCOPES, RoiSet
+from imagecraft.store import ImageStore
+from imagecraft.transform import (
+    RemapCache, TransformationParams, apply_transformations, apply_transformations_cached,
+    build_transformation_matrix, validate_points
+)
+from imagecraft.tune import (
+    Tuner, default_search_space, expand_grid, format_results, load_reference_set, pareto_frontier, rank_key
+)
+from imagecraft.video import VIDEO_FORMATS, label_video
+
+class CustomTitleBar(QWidget):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.parent = parent
+        self.init_ui()
+        self.start = QPoint(0, 0)
+        self.pressing = False
+        self.is_dark = False  # Track current theme
+
+    def init_ui(self):
+        # Set the height of the title bar
+        self.setFixedHeight(40)
+        self.setStyleSheet("""
+            QWidget {
+                background-color: #2b2b2b; /* Dark background by default */
+            }
+            QPushButton {
+                border: none;
+                color: white;
+                background-color: transparent;
+                font-size: 16px;
+            }
+            QPushButton:hover {
+                background-color: #3c3c3c;
+            }
+            QLabel {
+                color: white;
+                font-size: 14px;
+                background-color: transparent; /* Ensure transparent background */
+            }
+        """)
+
+        # Layout for the title bar
+        layout = QHBoxLayout()
+        layout.setContentsMargins(10, 0, 10, 0)
+        layout.setSpacing(10)
+
+        # Title Label
+        self.title = QLabel("ImageCraft")
+        self.title.setAlignment(Qt.AlignVCenter | Qt.AlignLeft)
+        # Removed separate stylesheet for QLabel to inherit from parent
+        layout.addWidget(self.title)
+
+        layout.addStretch()
+
+        # Minimize Button
+        self.btn_minimize = QPushButton("-")
+        self.btn_minimize.setFixedSize(30, 30)
+        self.btn_minimize.clicked.connect(self.minimize_window)
+        layout.addWidget(self.btn_minimize)
+
+        # Maximize/Restore Button
+        self.btn_maximize = QPushButton("□")
+        self.btn_maximize.setFixedSize(30, 30)
+        self.btn_maximize.clicked.connect(self.maximize_restore_window)
+        layout.addWidget(self.btn_maximize)
+
+        # Close Button
+        self.btn_close = QPushButton("×")
+        self.btn_close.setFixedSize(30, 30)
+        self.btn_close.clicked.connect(self.close_window)
+        layout.addWidget(self.btn_close)
+
+        self.setLayout(layout)
+
+    def minimize_window(self):
+        self.parent.showMinimized()
+
+    def maximize_restore_window(self):
+        if self.parent.isMaximized():
+            self.parent.showNormal()
+            self.btn_maximize.setText("□")
+        else:
+            self.parent.showMaximized()
+            self.btn_maximize.setText("❐")
+
+    def close_window(self):
+        self.parent.close()
+
+    # Enable window dragging
+    def mousePressEvent(self, event: QMouseEvent):
+        if event.button() == Qt.LeftButton:
+            self.pressing = True
+            self.start = event.globalPos() - self.parent.frameGeometry().topLeft()
+            event.accept()
+
+    def mouseMoveEvent(self, event: QMouseEvent):
+        if self.pressing:
+            self.parent.move(event.globalPos() - self.start)
+            event.accept()
+
+    def mouseReleaseEvent(self, event: QMouseEvent):
+        self.pressing = False
+
+    @pyqtSlot(bool)
+    def set_dark_mode(self, is_dark):
+        """
+        Update the title bar's stylesheet based on the theme.
+        """
+        self.is_dark = is_dark
+        if self.is_dark:
+            self.setStyleSheet("""
+                QWidget {
+                    background-color: #2b2b2b; /* Dark background */
+                }
+                QPushButton {
+                    border: none;
+                    color: white;
+                    background-color: transparent;
+                    font-size: 16px;
+                }
+                QPushButton:hover {
+                    background-color: #3c3c3c;
+                }
+                QLabel {
+                    color: white;
+                    font-size: 14px;
+                    background-color: transparent; /* Ensure transparent background */
+                }
+            """)
+        else:
+            self.setStyleSheet("""
+                QWidget {
+                    background-color: #f0f0f0; /* Light grey background */
+                }
+                QPushButton {
+                    border: none;
+                    color: black;
+                    background-color: transparent;
+                    font-size: 16px;
+                }
+                QPushButton:hover {
+                    background-color: #d0d0d0;
+                }
+                QLabel {
+                    color: black;
+                    font-size: 14px;
+                    background-color: transparent; /* Transparent background */
+                }
+            """)
+
+class ComprehensiveImageEditor(QMainWindow):
+    # Define the Dark Mode stylesheet without using the universal selector
+    DARK_MODE_STYLESHEET = """
+    /* Main Window */
+    QMainWindow {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+
+    /* Menu Bar */
+    QMenuBar {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QMenuBar::item:selected {
+        background-color: #3c3c3c;
+    }
+
+    /* Menus */
+    QMenu {
+        background-color: #2b2b2b;
+        color: #ffffff;
+    }
+    QMenu::item:selected {
+        background-color: #3c3c3c;
+    }
+
+    /* Push Buttons */
+    QPushButton {
+        background-color: #3c3c3c;
+        color: #ffffff;
+        border: 1px solid #555555;
+        padding: 3px 6px;  /* Reduced padding */
+        border-radius: 4px;
+    }
+    QPushButton:hover {
+        background-color: #5c5c5c;
+    }
+
+    /* Sliders */
+    QSlider::groove:horizontal {
+        border: 1px solid #bbb;
+        background: #3c3c3c;
+        height: 6px;  /* Reduced height */
+        border-radius: 3px;
+    }
+    QSlider::handle:horizontal {
+        background: #5c5c5c;
+        border: 1px solid #5c5c5c;
+        width: 12px;  /* Reduced width */
+        margin: -3px 0;  /* Adjusted margin */
+        border-radius: 6px;  /* Adjusted radius */
+    }
+
+    /* Checkboxes */
+    QCheckBox {
+        spacing: 4px;  /* Reduced spacing */
+    }
+
+    /* Spin Boxes */
+    QSpinBox {
+        background-color: #3c3c3c;
+        border: 1px solid #555555;
+        border-radius: 4px;
+        padding: 1px 3px;  /* Reduced padding */
+        color: #ffffff;
+    }
+
+    /* Labels */
+    QLabel {
+        color: #ffffff;
+    }
+
+    /* Tab Widget Pane */
+    QTabWidget::pane {
+        border: 1px solid #555555;
+    }
+
+    /* Tab Bar */
+    QTabBar::tab {
+        background-color: #3c3c3c;
+        color: #ffffff;
+        padding: 8px;  /* Reduced padding */
+        margin: 1px;  /* Reduced margin */
+    }
+    QTabBar::tab:selected {
+        background-color: #5c5c5c;
+    }
+
+    /* Group Boxes */
+    QGroupBox {
+        border: 1px solid #555555;
+        border-radius: 5px;
+        margin-top: 0; /* Remove margin-top */
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top center;
+        padding: 0 3px;
+    }
+
+    /* Scroll Areas */
+    QScrollArea {
+        background-color: #2b2b2b;
+    }
+
+    /* Preview Label Specific Styling */
+    QLabel#PreviewLabel {
+        background-color: #1e1e1e;
+        border: 1px solid #555555;
+        color: #ffffff;
+        font-size: 14px;
+        text-align: center;
+    }
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle('ImageCraft')
+        self.setGeometry(100, 100, 800, 600)  # Initial window size
+        self.setMinimumSize(800, 600)  # Prevent window from being too small
+        self.setWindowFlags(Qt.FramelessWindowHint)  # Remove OS title bar
+
+        # Main widget and layout
+        self.main_widget = QWidget()
+        self.main_layout = QVBoxLayout()
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+        self.main_layout.setSpacing(0)
+        self.main_widget.setLayout(self.main_layout)
+        self.setCentralWidget(self.main_widget)
+
+        # Add custom title bar
+        self.title_bar = CustomTitleBar(self)
+        self.main_layout.addWidget(self.title_bar)
+
+        # Initialize tabs
+        self.tabs = QTabWidget()
+        self.main_layout.addWidget(self.tabs)
+
+        # Image Transformation tab
+        self.transformation_tab = ImageTransformationTab()
+        self.tabs.addTab(self.transformation_tab, "Image Transformation")
+
+        # HCT and Auto Labeling tab
+        self.hct_tab = HCTAutoLabelTab()
+        self.tabs.addTab(self.hct_tab, "HCT and Auto Labeling")
+
+        # Image Augmentation tab
+        self.augmentation_tab = ImageAugmentationTab()
+        self.tabs.addTab(self.augmentation_tab, "Image Augmentation")
+
+        # Initialize Menu
+        self.init_menu()
+
+        # Initialize Keyboard Shortcuts
+        self.init_shortcuts()
+
+        # Initialize Status Bar
+        self.statusBar().showMessage("Ready")
+
+        # Set focus to the main window
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setFocus()
+
+        # **Set initial theme to light mode**
+        self.title_bar.set_dark_mode(False)
+
+        logging.debug("ComprehensiveImageEditor initialized successfully.")
+
+
+    def init_menu(self):
+        menu_bar = self.menuBar()
+
+        # File Menu
+        file_menu = menu_bar.addMenu('File')
+
+        load_image_action = QAction('Load Image', self)
+        load_image_action.triggered.connect(self.load_image)
+        file_menu.addAction(load_image_action)
+
+        load_folder_action = QAction('Load Folder', self)
+        load_folder_action.triggered.connect(self.load_folder)
+        file_menu.addAction(load_folder_action)
+
+        include_subfolders_action = QAction('Include Subfolders', self, checkable=True)
+        include_subfolders_action.setStatusTip('Also load images from subfolders of the selected folder')
+        include_subfolders_action.toggled.connect(self.toggle_include_subfolders)
+        file_menu.addAction(include_subfolders_action)
+
+        save_image_action = QAction('Save Image', self)
+        save_image_action.triggered.connect(self.save_image)
+        file_menu.addAction(save_image_action)
+
+        save_all_action = QAction('Save All', self)
+        save_all_action.triggered.connect(self.save_all)
+        file_menu.addAction(save_all_action)
+
+        export_params_action = QAction('Export Batch Parameters', self)
+        export_params_action.triggered.connect(self.export_batch_parameters)
+        file_menu.addAction(export_params_action)
+
+        exit_action = QAction('Exit', self)
+        exit_action.triggered.connect(self.close)
+        file_menu.addAction(exit_action)
+
+        # Theme Menu
+        theme_menu = menu_bar.addMenu('Theme')
+
+        dark_mode_action = QAction('Dark Mode', self, checkable=True)
+        dark_mode_action.setStatusTip('Toggle Dark Mode')
+        dark_mode_action.setChecked(False)  # Ensure it's unchecked by default
+        dark_mode_action.toggled.connect(self.toggle_dark_mode)  # Connect to toggled(bool)
+        theme_menu.addAction(dark_mode_action)
+
+        # Help Menu
+        help_menu = menu_bar.addMenu('Help')
+        help_action = QAction('Help', self)
+        help_action.triggered.connect(self.show_help)
+        help_menu.addAction(help_action)
+
+        logging.debug("Menu initialized successfully.")
+
+    def init_shortcuts(self):
+
+        # 1. Load Image: Ctrl+O
+        load_image_action = QAction("Load Image", self)
+        load_image_action.setShortcut(QKeySequence("Ctrl+O"))
+        load_image_action.triggered.connect(self.load_image)
+        load_image_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(load_image_action)
+
+        # 2. Load Folder: Ctrl+Shift+O
+        load_folder_action = QAction("Load Folder", self)
+        load_folder_action.setShortcut(QKeySequence("Ctrl+Shift+O"))
+        load_folder_action.triggered.connect(self.load_folder)  # Connect to load_folder method
+        load_folder_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(load_folder_action)
+
+        # 3. Save Image: Ctrl+S
+        save_image_action = QAction("Save Image", self)
+        save_image_action.setShortcut(QKeySequence("Ctrl+S"))
+        save_image_action.triggered.connect(self.save_image)
+        save_image_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(save_image_action)
+
+        # 4. Save All: Ctrl+Shift+S
+        save_all_action = QAction("Save All", self)
+        save_all_action.setShortcut(QKeySequence("Ctrl+Shift+S"))
+        save_all_action.triggered.connect(self.save_all)
+        save_all_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(save_all_action)
+
+        # 5. Quit Application: Ctrl+Q
+        quit_action = QAction("Quit", self)
+        quit_action.setShortcut(QKeySequence("Ctrl+Q"))
+        quit_action.triggered.connect(self.close)
+        quit_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(quit_action)
+
+        # 6. Zoom In: Ctrl++
+        zoom_in_action = QAction("Zoom In", self)
+        zoom_in_action.setShortcut(QKeySequence("Ctrl++"))
+        zoom_in_action.triggered.connect(self.zoom_in)
+        zoom_in_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(zoom_in_action)
+
+        # 7. Zoom Out: Ctrl+-
+        zoom_out_action = QAction("Zoom Out", self)
+        zoom_out_action.setShortcut(QKeySequence("Ctrl+-"))
+        zoom_out_action.triggered.connect(self.zoom_out)
+        zoom_out_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(zoom_out_action)
+
+        # 8. Previous Image: A
+        prev_image_action = QAction("Previous Image", self)
+        prev_image_action.setShortcut(QKeySequence("A"))
+        prev_image_action.triggered.connect(self.previous_image)
+        prev_image_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(prev_image_action)
+
+        # 9. Next Image: D
+        next_image_action = QAction("Next Image", self)
+        next_image_action.setShortcut(QKeySequence("D"))
+        next_image_action.triggered.connect(self.next_image)
+        next_image_action.setShortcutContext(Qt.ApplicationShortcut)
+        self.addAction(next_image_action)
+
+        logging.debug("Keyboard shortcuts initialized successfully.")
+
+    def toggle_include_subfolders(self, checked):
+        for index in range(self.tabs.count()):
+            self.tabs.widget(index).include_subfolders = checked
+        self.statusBar().showMessage(f"Include Subfolders {'Enabled' if checked else 'Disabled'}", 2000)
+
+    def toggle_dark_mode(self, checked):
+        try:
+            if checked:
+                QApplication.instance().setStyleSheet(self.DARK_MODE_STYLESHEET)
+                self.statusBar().showMessage("Dark Mode Enabled", 2000)
+                logging.info("Dark Mode Enabled")
+            else:
+                QApplication.instance().setStyleSheet("")  # Revert to default light mode
+                self.statusBar().showMessage("Dark Mode Disabled", 2000)
+                logging.info("Dark Mode Disabled")
+
+            # **Begin: Option 1 Implementation**
+            # Append styles for QMessageBox to ensure white background and black text
+            QMessageBox_stylesheet = """
+            QMessageBox {
+                background-color: white;
+                color: black;
+            }
+            QMessageBox QLabel {
+                color: black;
+            }
+            QMessageBox QPushButton {
+                background-color: #3c3c3c;
+                color: #ffffff;
+            }
+            """
+            # Apply the QMessageBox styles on top of the existing stylesheet
+            QApplication.instance().setStyleSheet(QApplication.instance().styleSheet() + QMessageBox_stylesheet)
+            logging.debug("QMessageBox styles applied to maintain readability.")
+
+            # **End: Option 1 Implementation**
+
+            # Invalidate and activate each tab's layout if it exists
+            for index in range(self.tabs.count()):
+                tab = self.tabs.widget(index)
+                if tab.layout() is not None:
+                    tab.layout().invalidate()
+                    tab.layout().activate()
+                else:
+                    logging.warning(f"Tab at index {index} does not have a layout.")
+
+            # Refresh the UI to apply changes
+            self.repaint()
+
+            # Log widget sizes for debugging
+            self.log_widget_sizes()
+
+            # **Update the title bar's style**
+            self.title_bar.set_dark_mode(checked)
+
+            logging.debug("Dark mode toggled successfully.")
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to toggle dark mode: {e}")
+            logging.error(f"Failed to toggle dark mode: {e}")
+
+    def log_widget_sizes(self):
+        logging.debug(f"Main Window Size: {self.size()}")
+        logging.debug(f"Tabs Size: {self.tabs.size()}")
+        for index in range(self.tabs.count()):
+            tab = self.tabs.widget(index)
+            logging.debug(f"Tab {index} Size: {tab.size()}")
+            for child in tab.findChildren(QWidget):
+                logging.debug(f"  Widget '{child.objectName()}' Size: {child.size()}")
+
+    def get_active_tab(self):
+        """Returns the currently active tab widget."""
+        return self.tabs.currentWidget()
+
+    def load_image(self):
+        # Delegate load image functionality to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'load_image'):
+            current_tab.load_image()
+            self.statusBar().showMessage("Image loaded.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Load Image action is not available in the current tab.")
+
+    def load_folder(self):
+        # Delegate load folder functionality to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'load_folder'):
+            current_tab.load_folder()
+            self.statusBar().showMessage("Folder loaded.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Load Folder action is not available in the current tab.")
+
+    def save_image(self):
+        # Delegate save image functionality to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'save_image'):
+            current_tab.save_image()
+            self.statusBar().showMessage("Image saved.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Save Image action is not available in the current tab.")
+
+    def save_all(self):
+        # Delegate save all functionality to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'save_all'):
+            current_tab.save_all()
+            self.statusBar().showMessage("All images saved.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Save All action is not available in the current tab.")
+
+    def export_batch_parameters(self):
+        # Write the current settings of all tabs for "python -m imagecraft batch --params"
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Export Batch Parameters", "", "JSON files (*.json)"
+        )
+        if save_path:
+            try:
+                hct_params = dict(
+                    self.hct_tab.get_hct_params(),
+                    offset=self.hct_tab.offset,
+                    class_num=self.hct_tab.class_number_selector.value()
+                )
+                save_params(save_path, {
+                    'transform': self.transformation_tab.get_transformation_params()._asdict(),
+                    'hct': hct_params,
+                    'augment': self.augmentation_tab.get_augmentation_params(),
+                    'roi': self.hct_tab.rois.to_dict()
+                })
+                self.statusBar().showMessage(f"Batch parameters exported to {save_path}", 2000)
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to export batch parameters: {e}")
+
+    def next_image(self):
+        # Delegate next image action to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'next_image'):
+            print("Shortcut: Next Image triggered")
+            current_tab.next_image()
+            self.statusBar().showMessage("Next Image triggered via shortcut.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Next Image action is not available in the current tab.")
+
+    def previous_image(self):
+        # Delegate previous image action to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'previous_image'):
+            print("Shortcut: Previous Image triggered")
+            current_tab.previous_image()
+            self.statusBar().showMessage("Previous Image triggered via shortcut.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Previous Image action is not available in the current tab.")
+
+    def zoom_in(self):
+        # Delegate zoom in action to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'zoom_in'):
+            print("Shortcut: Zoom In triggered")
+            current_tab.zoom_in()
+            self.statusBar().showMessage("Zoom In triggered via shortcut.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Zoom In action is not available in the current tab.")
+
+    def zoom_out(self):
+        # Delegate zoom out action to the active tab
+        current_tab = self.get_active_tab()
+        if hasattr(current_tab, 'zoom_out'):
+            print("Shortcut: Zoom Out triggered")
+            current_tab.zoom_out()
+            self.statusBar().showMessage("Zoom Out triggered via shortcut.", 2000)
+        else:
+            QMessageBox.warning(self, "Action Not Available", "Zoom Out action is not available in the current tab.")
+
+    def show_help(self):
+        # Show help information
+        help_text = """
+        
+        Welcome To ImageCraft ! :
+        
+        This is a comprehensive image editor that combines:
+        - Image Transformation (Perspective, Translation, Cropping) etc...
+        - Hough Circle Transform with Auto Labeling
+        - Image Augmentation ( Based On YOLO Augmentations )
+
+        Use the tabs to switch between functionalities.
+        
+        A Dark Mode Is Available For Your Convenience , Activate It In "Theme" .
+
+        Keyboard Shortcuts:
+        - Next Image: D
+        - Previous Image: A
+        - Zoom In: Ctrl + +
+        - Zoom Out: Ctrl + -
+        - Load Image: Ctrl+O
+        - Load Folder: Ctrl+Shift+O
+        - Save Image: Ctrl+S
+        - Save All: Ctrl+Shift+S
+        - Quit Application: Ctrl+Q
+        
+        Important Warning : If you save your work in the same folder each time, 
+        you risk overwriting previous files. To prevent this, 
+        always create a separate folder for each image set, 
+        especially when using different types of augmentation. 
+        This will help you keep your work organized and avoid any loss of data.
+        
+        
+        Tool Developer : Saeed Sameeh Abualnaaj - Junior Computer Vision Engineer 
+        """
+        QMessageBox.information(self, "Help", help_text)
+
+
+
+class BatchWorker(QThread):
+    """
+    Runs process(path) for every path on the imagecraft.batch thread pool,
+    outside the GUI thread. Failures are collected instead of interrupting the batch.
+    """
+    result_ready = pyqtSignal(str, object)
+    progress = pyqtSignal(int, int, float)  # done, total, images per second
+    batch_finished = pyqtSignal(list, bool)  # [(path, error)], cancelled
+
+    # Results (full frames for some tabs) emitted but not yet taken by the GUI thread
+    MAX_PENDING_RESULTS = 4
+
+    def __init__(self, paths, process, max_workers=None, parent=None):
+        super().__init__(parent)
+        self.paths = list(paths)
+        self.process = process
+        self.max_workers = max_workers
+        self._cancelled = False
+        self._result_slots = None
+
+    def cancel(self):
+        self._cancelled = True
+
+    def connect_results(self, slot):
+        """
+        Deliver results to slot(path, result) in the GUI thread, at most
+        MAX_PENDING_RESULTS at a time: when the slot falls behind, the batch waits
+        instead of queueing every result in the event loop.
+        """
+        self._result_slots = threading.Semaphore(self.MAX_PENDING_RESULTS)
+
+        def deliver(path, result):
+            try:
+                slot(path, result)
+            finally:
+                self._result_slots.release()
+
+        self.result_ready.connect(deliver)
+
+    def wait_for_result_slot(self):
+        """
+        Take a result slot, or return False once the batch is cancelled, so it can end
+        even if the GUI thread is not taking results. Only a result that got a slot may
+        be emitted, as delivering it gives the slot back.
+        """
+        while not self._result_slots.acquire(timeout=0.1):
+            if self._cancelled:
+                return False
+        return True
+
+    def run(self):
+        failures = []
+        total = len(self.paths)
+        done = 0
+        start = time.perf_counter()
+
+        for path, result, error in run_batch(self.paths, self.process, self.max_workers,
+                                             is_cancelled=lambda: self._cancelled):
+            if error is not None:
+                failures.append((path, str(error)))
+            elif result is not None:
+                # Pausing here also pauses run_batch, which only hands out more paths as results are taken
+                if self._result_slots is None or self.wait_for_result_slot():
+                    self.result_ready.emit(path, result)
+            done += 1
+
+            elapsed = time.perf_counter() - start
+            self.progress.emit(done, total, done / elapsed if elapsed > 0 else 0.0)
+
+        self.batch_finished.emit(failures, self._cancelled)
+
+
+class BatchProgressDialog(QProgressDialog):
+    """
+    Progress, throughput and cancel button for a BatchWorker.
+    Shows a single failure report when the batch ends.
+    """
+    MAX_REPORTED_FAILURES = 20
+
+    def __init__(self, worker, title, parent=None):
+        super().__init__(f"{title}...", "Cancel", 0, len(worker.paths), parent)
+        self.title = title
+        self.setWindowTitle(title)
+        self.setWindowModality(Qt.WindowModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.canceled.connect(worker.cancel)
+        worker.progress.connect(self.update_progress)
+        worker.batch_finished.connect(self.show_report)
+
+    def update_progress(self, done, total, rate):
+        self.setValue(done)
+        self.setLabelText(f"{self.title}... {done} of {total} ({rate:.1f} images/s)")
+
+    def show_report(self, failures, cancelled):
+        done = self.value()
+        total = self.maximum()
+        self.close()
+        summary = f"Processed {done - len(failures)} of {total} images."
+        if cancelled:
+            summary = "Cancelled. " + summary
+        if failures:
+            lines = [f"{os.path.basename(path)}: {error}" for path, error in failures[:self.MAX_REPORTED_FAILURES]]
+            if len(failures) > self.MAX_REPORTED_FAILURES:
+                lines.append(f"... and {len(failures) - self.MAX_REPORTED_FAILURES} more")
+            QMessageBox.warning(
+                self.parent(), self.title,
+                f"{summary}\n\n{len(failures)} image(s) failed:\n" + "\n".join(lines)
+            )
+        else:
+            QMessageBox.information(self.parent(), self.title, summary)
+
+
+class TuneWorker(QThread):
+    """Runs an imagecraft.tune search outside the GUI thread."""
+    progress = pyqtSignal(int, int)  # trials done, trials in total
+    tuned = pyqtSignal(object)  # results of the final round
+    cancelled = pyqtSignal()  # stopped early; the partial results are not reported
+    failed = pyqtSignal(str)
+
+    def __init__(self, tuner, space, base, parent=None):
+        super().__init__(parent)
+        self.tuner = tuner
+        self.space = space
+        self.base = base
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            self.space['param1'] = self.tuner.usable_canny_thresholds(self.space['param1'])
+            configs = expand_grid(self.space, self.base)
+            results = self.tuner.successive_halving(
+                configs, progress=self.progress.emit, is_cancelled=lambda: self._cancelled
+            )
+            # A cancelled search stops on a rung scored on a subset of the images
+            if self._cancelled:
+                self.cancelled.emit()
+            else:
+                self.tuned.emit(results)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class VideoLabelWorker(QThread):
+    """Runs imagecraft.video.label_video outside the GUI thread."""
+    progress = pyqtSignal(int, int)  # frames done, frames in total
+    labelled = pyqtSignal(object)  # label_video statistics
+    failed = pyqtSignal(str)
+
+    def __init__(self, source, params, labels_dir, offset, class_num, frames_dir=None, backend='opencv', rois=None,
+                 parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.params = params
+        self.labels_dir = labels_dir
+        self.offset = offset
+        self.class_num = class_num
+        self.frames_dir = frames_dir
+        self.backend = backend
+        self.rois = rois
+        self._cancelled = False
+
+    def cancel(self):
+        self._cancelled = True
+
+    def run(self):
+        try:
+            stats = label_video(
+                self.source, self.params, self.labels_dir, self.offset, self.class_num, self.frames_dir,
+                backend=self.backend, progress=self.progress.emit, is_cancelled=lambda: self._cancelled, rois=self.rois
+            )
+            self.labelled.emit(stats)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+def start_batch_worker(parent, paths, process, title, on_result=None, on_finished=None):
+    """Create a BatchWorker with a progress dialog, connect the callbacks and start it."""
+    worker = BatchWorker(paths, process, parent=parent)
+    if on_result is not None:
+        worker.connect_results(on_result)
+    if on_finished is not None:
+        worker.batch_finished.connect(on_finished)
+    worker.progress_dialog = BatchProgressDialog(worker, title, parent)
+    worker.start()
+    return worker
+
+
+class ImageView(QWidget):
+    """
+    Zoomable image viewer for a QScrollArea. Keeps a lazily built mip pyramid of the
+    current image and paints only the tiles inside the exposed rect, taken from the
+    pyramid level closest to the zoom, so zoom and scroll cost depends on the viewport
+    size rather than the image size. Detections are an overlay painted on top at the
+    current zoom, so the image pixels are never drawn into. Regions of interest are
+    outlined the same way, and a new one can be drawn with the mouse after start_roi().
+    """
+    roi_drawn = pyqtSignal(object)  # {'rect': [x, y, w, h]} or {'polygon': [[x, y], ...]}, image pixels
+
+    TILE_SIZE = 256
+    MAX_CACHED_TILES = 256
+    MIN_LEVEL_SIZE = 64
+    # Same colours as hct.draw_circles: green circles, blue centres, red boxes
+    CIRCLE_COLOR = QColor(0, 255, 0)
+    CENTER_COLOR = QColor(0, 0, 255)
+    BOX_COLOR = QColor(255, 0, 0)
+    ROI_COLOR = QColor(255, 255, 0)
+
+    def __init__(self, text="", parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self._text = text
+        self._levels = []
+        self._tiles = OrderedDict()
+        self._zoom = 1.0
+        self._lines = []
+        self._circles = np.zeros((0, 3), np.float32)
+        self._boxes = np.zeros((0, 4), np.float32)
+        self._rois = []
+        self._roi_shape = None  # 'rect' or 'polygon' while an ROI is being drawn
+        self._roi_points = []   # Its points so far, in image pixels
+
+    def set_image(self, img):
+        """Show img (BGR or grayscale uint8). The pyramid is rebuilt lazily."""
+        self._levels = [np.require(img, np.uint8)] if img is not None else []
+        self._tiles.clear()
+        self._text = ""
+        self._update_size()
+
+    def setText(self, text):
+        self._levels = []
+        self._tiles.clear()
+        self._text = text
+        self._update_size()
+
+    def set_zoom(self, zoom):
+        self._zoom = zoom
+        self._update_size()
+
+    def set_lines(self, lines):
+        """Horizontal guide lines, in full-resolution image rows."""
+        self._lines = list(lines)
+        self.update()
+
+    def set_overlay(self, circles=None, boxes=None):
+        """
+        Circles (x, y, r) and boxes (x, y, w, h[, class]) to paint over the image, in
+        full-resolution image pixels; None clears them.
+        """
+        self._circles = np.zeros((0, 3), np.float32) if circles is None else (
+            np.asarray(circles, np.float32).reshape(-1, 3))
+        self._boxes = np.zeros((0, 4), np.float32) if boxes is None or len(boxes) == 0 else (
+            np.asarray(boxes, np.float32)[:, :4])
+        self.update()
+
+    def set_rois(self, rois):
+        """Regions of interest (see imagecraft.roi) to outline over the image."""
+        self._rois = list(rois)
+        self.update()
+
+    def start_roi(self, shape):
+        """
+        Draw an ROI with the mouse: drag for a 'rect'; click each corner of a 'polygon'
+        and double-click to close it. A right click cancels. Emits roi_drawn when done.
+        """
+        self._roi_shape = shape
+        self._roi_points = []
+        self.setCursor(Qt.CrossCursor)
+        self.update()
+
+    def cancel_roi(self):
+        self._roi_shape = None
+        self._roi_points = []
+        self.unsetCursor()
+        self.update()
+
+    def _image_geometry(self):
+        """Widget position of the image's top-left corner and widget pixels per image pixel."""
+        full_height, full_width = self._levels[0].shape[:2]
+        zoomed = self.zoomed_size()
+        ox = max(0, (self.width() - zoomed.width()) // 2)
+        oy = max(0, (self.height() - zoomed.height()) // 2)
+        return ox, oy, zoomed.width() / full_width, zoomed.height() / full_height
+
+    def _image_point(self, pos):
+        """pos in image pixels, clamped to the image."""
+        full_height, full_width = self._levels[0].shape[:2]
+        ox, oy, sx, sy = self._image_geometry()
+        x = min(max((pos.x() - ox) / sx, 0), full_width)
+        y = min(max((pos.y() - oy) / sy, 0), full_height)
+        return [int(round(x)), int(round(y))]
+
+    def mousePressEvent(self, event):
+        if self._roi_shape is None or not self._levels:
+            return super().mousePressEvent(event)
+        if event.button() == Qt.RightButton:
+            self.cancel_roi()
+        elif event.button() == Qt.LeftButton:
+            point = self._image_point(event.pos())
+            if self._roi_shape == 'rect':
+                self._roi_points = [point, point]
+            else:
+                self._roi_points.append(point)
+            self.update()
+
+    def mouseMoveEvent(self, event):
+        if self._roi_shape == 'rect' and self._roi_points:
+            self._roi_points[1] = self._image_point(event.pos())
+            self.update()
+        else:
+            super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._roi_shape == 'rect' and self._roi_points and event.button() == Qt.LeftButton:
+            (x0, y0), (x1, y1) = self._roi_points
+            self.cancel_roi()
+            if x0 != x1 and y0 != y1:
+                self.roi_drawn.emit({'rect': [min(x0, x1), min(y0, y1), abs(x1 - x0), abs(y1 - y0)]})
+        else:
+            super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        if self._roi_shape == 'polygon' and event.button() == Qt.LeftButton:
+            # The press before the double click usually added the last corner already
+            points = self._roi_points + [self._image_point(event.pos())]
+            points = [point for i, point in enumerate(points) if i == 0 or point != points[i - 1]]
+            if len(points) >= 3:
+                self.cancel_roi()
+                self.roi_drawn.emit({'polygon': points})
+        else:
+            super().mouseDoubleClickEvent(event)
+
+    def zoomed_size(self):
+        if not self._levels:
+            return QSize(0, 0)
+        height, width = self._levels[0].shape[:2]
+        return QSize(max(1, int(width * self._zoom)), max(1, int(height * self._zoom)))
+
+    def sizeHint(self):
+        return self.zoomed_size()
+
+    def _update_size(self):
+        self.setMinimumSize(self.zoomed_size())
+        self.updateGeometry()
+        self.update()
+
+    def _level(self, index):
+        while len(self._levels) <= index:
+            self._levels.append(cv2.pyrDown(self._levels[-1]))
+        return self._levels[index]
+
+    def _level_for_zoom(self):
+        # Largest level that is still at least as detailed as the screen
+        height, width = self._levels[0].shape[:2]
+        index = 0
+        while (self._zoom * 2 ** (index + 1) <= 1.0
+               and min(width, height) >> (index + 1) >= self.MIN_LEVEL_SIZE):
+            index += 1
+        return index
+
+    def _tile(self, index, tx, ty):
+        key = (index, tx, ty)
+        tile = self._tiles.get(key)
+        if tile is not None:
+            self._tiles.move_to_end(key)
+            return tile
+
+        level = self._level(index)
+        height, width = level.shape[:2]
+        size = self.TILE_SIZE
+        x0, y0 = tx * size, ty * size
+        x1, y1 = min(x0 + size, width), min(y0 + size, height)
+        # One pixel of margin so smooth scaling samples real neighbours at tile seams
+        mx0, my0 = max(x0 - 1, 0), max(y0 - 1, 0)
+        mx1, my1 = min(x1 + 1, width), min(y1 + 1, height)
+        data = np.ascontiguousarray(level[my0:my1, mx0:mx1])
+        if data.ndim == 2:
+            fmt = QImage.Format_Grayscale8
+        else:
+            # OpenCV's native channel order, so frames are shown without conversion
+            fmt = QImage.Format_BGR888
+        qimg = QImage(data.data, data.shape[1], data.shape[0], data.strides[0], fmt)
+        source = QRectF(x0 - mx0, y0 - my0, x1 - x0, y1 - y0)
+        tile = (qimg, data, source, (x0, y0, x1, y1))
+
+        self._tiles[key] = tile
+        if len(self._tiles) > self.MAX_CACHED_TILES:
+            self._tiles.popitem(last=False)
+        return tile
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        option = QStyleOption()
+        option.initFrom(self)
+        self.style().drawPrimitive(QStyle.PE_Widget, option, painter, self)
+
+        if not self._levels:
+            if self._text:
+                painter.drawText(self.rect(), Qt.AlignCenter, self._text)
+            painter.end()
+            return
+
+        full_height, full_width = self._levels[0].shape[:2]
+        zoomed = self.zoomed_size()
+        ox = max(0, (self.width() - zoomed.width()) // 2)
+        oy = max(0, (self.height() - zoomed.height()) // 2)
+
+        index = self._level_for_zoom()
+        level = self._level(index)
+        height, width = level.shape[:2]
+        # Widget pixels per level pixel on each axis
+        sx = zoomed.width() / width
+        sy = zoomed.height() / height
+
+        exposed = event.rect()
+        size = self.TILE_SIZE
+        tx0 = max(0, int((exposed.left() - ox) / sx) // size)
+        ty0 = max(0, int((exposed.top() - oy) / sy) // size)
+        tx1 = min((width - 1) // size, int((exposed.right() - ox) / sx) // size)
+        ty1 = min((height - 1) // size, int((exposed.bottom() - oy) / sy) // size)
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                qimg, _, source, (x0, y0, x1, y1) = self._tile(index, tx, ty)
+                target = QRectF(ox + x0 * sx, oy + y0 * sy, (x1 - x0) * sx, (y1 - y0) * sy)
+                painter.drawImage(target, qimg, source)
+
+        if self._lines:
+            painter.setPen(QPen(Qt.black, 3))
+            for line_y in self._lines:
+                y = int(line_y * zoomed.height() / full_height)
+                if 0 <= y <= zoomed.height():
+                    painter.drawLine(ox, oy + y, ox + zoomed.width(), oy + y)
+
+        if len(self._circles) or len(self._boxes):
+            self._paint_overlay(painter, exposed, ox, oy, zoomed.width() / full_width, zoomed.height() / full_height)
+        if self._rois or self._roi_points:
+            self._paint_rois(painter, ox, oy, zoomed.width() / full_width, zoomed.height() / full_height)
+        painter.end()
+
+    def _paint_rois(self, painter, ox, oy, sx, sy):
+        """Dashed outlines of the ROIs, and of the one being drawn."""
+        def polygon(points):
+            return QPolygonF([QPointF(ox + x * sx, oy + y * sy) for x, y in points])
+
+        painter.setBrush(Qt.NoBrush)
+        pen = QPen(self.ROI_COLOR, 2, Qt.DashLine)
+        painter.setPen(pen)
+        for roi in self._rois:
+            if 'rect' in roi:
+                x, y, w, h = roi['rect']
+                painter.drawRect(QRectF(ox + x * sx, oy + y * sy, w * sx, h * sy))
+            else:
+                painter.drawPolygon(polygon(roi['polygon']))
+        if self._roi_points:
+            pen.setStyle(Qt.SolidLine)
+            painter.setPen(pen)
+            if self._roi_shape == 'rect':
+                (x0, y0), (x1, y1) = self._roi_points
+                painter.drawRect(QRectF(ox + x0 * sx, oy + y0 * sy, (x1 - x0) * sx, (y1 - y0) * sy))
+            else:
+                painter.drawPolyline(polygon(self._roi_points))
+
+    def _paint_overlay(self, painter, exposed, ox, oy, sx, sy):
+        """Paint the overlay shapes that reach into the exposed rect, one batched call per kind."""
+        left, top = exposed.left() - ox, exposed.top() - oy
+        right, bottom = exposed.right() - ox, exposed.bottom() - oy
+        # Shapes are scaled here rather than through a painter transform, so outlines stay 2 px at any zoom
+        painter.setRenderHint(QPainter.Antialiasing, True)
+        painter.setBrush(Qt.NoBrush)
+
+        if len(self._boxes):
+            x, y = self._boxes[:, 0] * sx, self._boxes[:, 1] * sy
+            w, h = self._boxes[:, 2] * sx, self._boxes[:, 3] * sy
+            visible = (x <= right) & (x + w >= left) & (y <= bottom) & (y + h >= top)
+            painter.setPen(QPen(self.BOX_COLOR, 2))
+            painter.drawRects([
+                QRectF(ox + bx, oy + by, bw, bh)
+                for bx, by, bw, bh in zip(x[visible], y[visible], w[visible], h[visible])
+            ])
+
+        if len(self._circles):
+            cx, cy = self._circles[:, 0] * sx, self._circles[:, 1] * sy
+            rx, ry = self._circles[:, 2] * sx, self._circles[:, 2] * sy
+            visible = (cx + rx >= left) & (cx - rx <= right) & (cy + ry >= top) & (cy - ry <= bottom)
+            cx, cy, rx, ry = cx[visible] + ox, cy[visible] + oy, rx[visible], ry[visible]
+            painter.setPen(QPen(self.CIRCLE_COLOR, 2))
+            for x, y, a, b in zip(cx.tolist(), cy.tolist(), rx.tolist(), ry.tolist()):
+                painter.drawEllipse(QPointF(x, y), a, b)
+            pen = QPen(self.CENTER_COLOR, 5)
+            pen.setCapStyle(Qt.RoundCap)
+            painter.setPen(pen)
+            painter.drawPoints(QPolygonF([QPointF(x, y) for x, y in zip(cx.tolist(), cy.tolist())]))
+
+
+class ImageTransformationTab(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setFocusPolicy(Qt.StrongFocus)
+
+        # Initialize variables
+        self.img = None
+        self.transformed_img = None
+        self.scale_factor = 1.0
+        self.lines = []
+        self.file_paths = []
+        self.current_index = -1
+        # The loaded folder, whose subfolders exports mirror
+        self.image_dir = ''
+        self.transformed_images = ImageStore()
+        self.remap_cache = RemapCache()
+        self.prefetcher = ImagePrefetcher()
+        self.batch_worker = None
+        self.include_subfolders = False
+
+        # Setup UI
+        self.init_ui()
+
+    def init_ui(self):
+        # Main layout
+        main_layout = QHBoxLayout()
+        self.setLayout(main_layout)
+
+        # Image display
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.image_view = ImageView("Load an image to begin.")
+        self.image_view.setStyleSheet("ImageView { background-color : lightgray; }")
+        self.scroll_area.setWidget(self.image_view)
+        main_layout.addWidget(self.scroll_area, 3)
+
+        # Controls layout
+        controls_widget = QWidget()
+        controls_widget.setMaximumWidth(300)
+        controls_layout = QVBoxLayout()
+        controls_layout.setContentsMargins(5, 5, 5, 5)
+        controls_widget.setLayout(controls_layout)
+        controls_widget.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Expanding)
+        main_layout.addWidget(controls_widget, 1)
+
+        # Buttons
+        buttons_group = QGroupBox("Controls")
+        buttons_layout = QGridLayout()
+        buttons_layout.setSpacing(5)
+        buttons_layout.setContentsMargins(0, 0, 0, 0)
+        buttons_group.setLayout(buttons_layout)
+        controls_layout.addWidget(buttons_group)
+
+        buttons = [
+            ("Load Image", self.load_image),
+            ("Load Folder", self.load_folder),
+            ("Save Image", self.save_image),
+            ("Save All", self.save_all),
+            ("Apply", self.apply_transformation),
+            ("Apply to All", self.apply_transformation_to_all),
+            ("Apply + Save All", self.apply_and_save_all),
+            ("Reset Image", self.reset_image),
+            ("Reset All", self.reset_all),
+            ("Zoom In", self.zoom_in),
+            ("Zoom Out", self.zoom_out),
+            ("Draw Lines", self.draw_lines),
+            ("Remove Lines", self.remove_lines),
+            ("Previous (A)", self.previous_image),
+            ("Next (D)", self.next_image)
+        ]
+
+        columns = 2
+        for i, (text, method) in enumerate(buttons):
+            button = QPushButton(text)
+            button.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
+            button.setMaximumWidth(140)
+            button.clicked.connect(method)
+            row = i // columns
+            col = i % columns
+            buttons_layout.addWidget(button, row, col)
+
+        # Image info label
+        self.image_info_label = QLabel("No images loaded.")
+        self.image_info_label.setAlignment(Qt.AlignCenter)
+        controls_layout.addWidget(self.image_info_label)
+
+        # Sliders and Controls
+        self.init_sliders(controls_layout)
+
+    def init_sliders(self, controls_layout):
+        # Helper function to create sliders
+        def create_slider(label_text, min_val, max_val, default, tick_interval):
+            layout = QHBoxLayout()
+            layout.setContentsMargins(0, 0, 0, 0)
+            layout.setSpacing(5)
+            label = QLabel(label_text)
+            label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+            slider = QSlider(Qt.Horizontal)
+            slider.setMinimum(min_val)
+            slider.setMaximum(max_val)
+            slider.setValue(default)
+            slider.setTickPosition(QSlider.TicksBelow)
+            slider.setTickInterval(tick_interval)
+            slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+            value_label = QLabel(str(default))
+            value_label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+            slider.valueChanged.connect(lambda value, lbl=value_label: lbl.setText(str(value)))
+            slider.valueChanged.connect(self.update_transformation)
+            layout.addWidget(label)
+            layout.addWidget(slider)
+            layout.addWidget(value_label)
+            return slider, value_label, layout
+
+        # 1. Perspective Controls
+        perspective_group = QGroupBox("Perspective Controls")
+        perspective_layout = QVBoxLayout()
+        perspective_layout.setContentsMargins(5, 5, 5, 5)
+        perspective_layout.setSpacing(5)
+        perspective_group.setLayout(perspective_layout)
+        controls_layout.addWidget(perspective_group)
+
+        # Corner Sliders
+        self.corners = []
+        corner_labels = ["Top-Left (X)", "Top-Left (Y)",
+                         "Top-Right (X)", "Top-Right (Y)",
+                         "Bottom-Right (X)", "Bottom-Right (Y)",
+                         "Bottom-Left (X)", "Bottom-Left (Y)"]
+        corner_default_values = [0, 0, 1920, 0, 1920, 1080, 0, 1080]
+
+        for i, label in enumerate(corner_labels):
+            # Adjust max_val based on whether it's X or Y
+            max_val = 1920 if 'X' in label else 1080
+            slider, value_label, slider_layout = create_slider(
+                label_text=label,
+                min_val=0,
+                max_val=max_val,
+                default=corner_default_values[i],
+                tick_interval=100
+            )
+            perspective_layout.addLayout(slider_layout)
+            self.corners.append(slider)
+
+        # 2. Transformation Controls
+        transformation_group = QGroupBox("Transformation Controls")
+        transformation_layout = QVBoxLayout()
+        transformation_layout.setContentsMargins(5, 5, 5, 5)
+        transformation_layout.setSpacing(5)
+        transformation_group.setLayout(transformation_layout)
+        controls_layout.addWidget(transformation_group)
+
+        # X Translation
+        self.x_translation_slider, self.x_translation_value_label, x_trans_layout = create_slider(
+            label_text="X Translation:",
+            min_val=-500,
+            max_val=500,
+            default=0,
+            tick_interval=100
+        )
+        transformation_layout.addLayout(x_trans_layout)
+
+        # Y Translation
+        self.y_translation_slider, self.y_translation_value_label, y_trans_layout = create_slider(
+            label_text="Y Translation:",
+            min_val=-500,
+            max_val=500,
+            default=0,
+            tick_interval=100
+        )
+        transformation_layout.addLayout(y_trans_layout)
+
+        # Scale
+        self.scale_slider, self.scale_value_label, scale_layout = create_slider(
+            label_text="Scale (%):",
+            min_val=10,
+            max_val=500,
+            default=100,
+            tick_interval=10
+        )
+        transformation_layout.addLayout(scale_layout)
+
+        # Rotation
+        self.rotation_slider, self.rotation_value_label, rotation_layout = create_slider(
+            label_text="Rotation (°):",
+            min_val=-360,
+            max_val=360,
+            default=0,
+            tick_interval=30
+        )
+        transformation_layout.addLayout(rotation_layout)
+
+        # Crop X
+        self.crop_x_slider, self.crop_x_value_label, crop_x_layout = create_slider(
+            label_text="Crop X:",
+            min_val=0,
+            max_val=1920,
+            default=0,
+            tick_interval=100
+        )
+        transformation_layout.addLayout(crop_x_layout)
+
+        # Crop Y
+        self.crop_y_slider, self.crop_y_value_label, crop_y_layout = create_slider(
+            label_text="Crop Y:",
+            min_val=0,
+            max_val=1080,
+            default=0,
+            tick_interval=100
+        )
+        transformation_layout.addLayout(crop_y_layout)
+
+        # Crop Width
+        self.crop_width_slider, self.crop_width_value_label, crop_w_layout = create_slider(
+            label_text="Crop Width:",
+            min_val=1,
+            max_val=1920,
+            default=1920,
+            tick_interval=100
+        )
+        transformation_layout.addLayout(crop_w_layout)
+
+        # Crop Height
+        self.crop_height_slider, self.crop_height_value_label, crop_h_layout = create_slider(
+            label_text="Crop Height:",
+            min_val=1,
+            max_val=1080,
+            default=1080,
+            tick_interval=100
+        )
+        transformation_layout.addLayout(crop_h_layout)
+
+    def setup_shortcuts(self):
+        # Previous Image Shortcut (A key)
+        self.shortcut_prev = QShortcut(QKeySequence('A'), self)
+        self.shortcut_prev.setContext(Qt.ApplicationShortcut)
+        self.shortcut_prev.activated.connect(self.previous_image)
+
+        # Next Image Shortcut (D key)
+        self.shortcut_next = QShortcut(QKeySequence('D'), self)
+        self.shortcut_next.setContext(Qt.ApplicationShortcut)
+        self.shortcut_next.activated.connect(self.next_image)
+
+        # Zoom In: Ctrl + +
+        self.shortcut_zoom_in = QShortcut(QKeySequence('Ctrl++'), self)
+        self.shortcut_zoom_in.setContext(Qt.ApplicationShortcut)
+        self.shortcut_zoom_in.activated.connect(self.zoom_in)
+
+        # Zoom Out: Ctrl + -
+        self.shortcut_zoom_out = QShortcut(QKeySequence('Ctrl+-'), self)
+        self.shortcut_zoom_out.setContext(Qt.ApplicationShortcut)
+        self.shortcut_zoom_out.activated.connect(self.zoom_out)
+
+    def load_image(self):
+        # Implement load image functionality
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Open Image", "", "Image files (*.jpg *.jpeg *.png)"
+        )
+        if file_path:
+            self.file_paths = [file_path]
+            self.image_dir = os.path.dirname(file_path)
+            self.prefetcher.invalidate()
+            self.current_index = 0
+            self.transformed_images.clear()  # Reset transformed images
+            self.load_current_image()
+
+    def load_folder(self):
+        # Implement load folder functionality
+        folder_path = QFileDialog.getExistingDirectory(
+            self, "Select Folder", ""
+        )
+        if folder_path:
+            self.file_paths = list_images(folder_path, self.include_subfolders)
+            self.image_dir = folder_path
+            # The files may have changed on disk since they were last buffered
+            self.prefetcher.invalidate()
+            if not self.file_paths:
+                QMessageBox.warning(self, "No Images", "No images found in the selected folder.")
+                return
+            self.current_index = 0
+            self.transformed_images.clear()  # Reset transformed images
+            self.load_current_image()
+
+    def load_current_image(self):
+        if 0 <= self.current_index < len(self.file_paths):
+            file_path = self.file_paths[self.current_index]
+            self.prefetcher.update(self.file_paths, self.current_index)
+            if file_path in self.transformed_images:
+                # Use the transformed image if available
+                self.transformed_img = self.transformed_images[file_path]
+                try:
+                    # Display the transformed image directly
+                    self.update_display_image(self.transformed_img)
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"Failed to display transformed image: {e}")
+                    self.image_view.setText("Failed to display image.")
+                    self.image_info_label.setText("No images loaded.")
+            else:
+                try:
+                    self.img = self.prefetcher.load(file_path)
+                    if self.img is None:
+                        raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
+                    self.transformed_img = None
+                    # Reset transformation-related variables
+                    self.lines = []
+                    self.reset_sliders()
+                    self.update_display_image(self.img)
+                    self.update_image_info()
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"Failed to load image: {file_path}\n{e}")
+                    self.img = None
+                    self.transformed_img = None
+                    self.image_view.setText("Failed to load image.")
+                    self.image_info_label.setText("No images loaded.")
+        else:
+            QMessageBox.warning(self, "Index Error", "Image index out of range.")
+
+    def update_display_image(self, img):
+        if img is None:
+            self.image_view.setText("No image to display.")
+            return
+        try:
+            self.image_view.set_image(img)
+        except Exception as e:
+            QMessageBox.critical(self, "Image Error", f"Failed to convert image for display: {e}")
+            self.image_view.setText("Failed to display image.")
+            return
+        self.image_view.set_zoom(self.scale_factor)
+        self.image_view.set_lines(self.lines)
+
+    def apply_transformation(self):
+        if self.img is None:
+            QMessageBox.warning(self, "No Image", "No image loaded to apply transformations.")
+            return
+
+        try:
+            # Apply transformations
+            transformed_img = self.apply_transformations(self.img)
+            self.transformed_img = transformed_img
+            self.transformed_images[self.file_paths[self.current_index]] = transformed_img
+            self.update_display_image(self.transformed_img)
+        except Exception as e:
+            QMessageBox.critical(self, "Transformation Error", f"An error occurred during transformation:\n{e}")
+
+    def apply_transformation_to_all(self):
+        if len(self.file_paths) == 0:
+            QMessageBox.warning(self, "No Images", "No images loaded to apply transformations.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A batch is already running.")
+            return
+
+        self.transformed_images.clear()  # Reset transformed images
+
+        # Slider geometry is fixed for the whole batch
+        params = self.get_transformation_params()
+
+        def process(file_path):
+            # Reuse the remap tables built for the first image of this size
+            return self.apply_transformations_cached(read_image(file_path), params)
+
+        self.batch_worker = start_batch_worker(
+            self, self.file_paths, process, "Applying Transformations",
+            on_result=self.store_transformed_image,
+            on_finished=self.on_transformation_batch_finished
+        )
+
+    def apply_and_save_all(self):
+        """
+        Streaming export: each image is read, transformed and written by a worker
+        without being kept, so peak memory is a few frames regardless of folder size.
+        """
+        if len(self.file_paths) == 0:
+            QMessageBox.warning(self, "No Images", "No images loaded to apply transformations.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A batch is already running.")
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(
+            self, "Select Save Folder", ""
+        )
+        if not save_folder:
+            return
+
+        params = self.get_transformation_params()
+        root = image_root(self.file_paths, self.image_dir or None)
+
+        def process(file_path):
+            # Geometry does not depend on channel order, so stay in BGR from decode to encode
+            img = read_image(file_path)
+            transformed_img = self.apply_transformations_cached(img, params)
+            save_path = os.path.join(save_folder, relative_image_path(file_path, root))
+            write_image(save_path, transformed_img)
+            self.prefetcher.invalidate(save_path)
+
+        self.batch_worker = start_batch_worker(self, self.file_paths, process, "Applying and Saving Transformations")
+
+    def store_transformed_image(self, file_path, transformed_img):
+        self.transformed_images[file_path] = transformed_img
+
+    def on_transformation_batch_finished(self, failures, cancelled):
+        # Update the current image display if necessary
+        self.load_current_image()
+
+    def get_transformation_params(self):
+        return TransformationParams(
+            corners=tuple(slider.value() for slider in self.corners),
+            x_translation=self.x_translation_slider.value(),
+            y_translation=self.y_translation_slider.value(),
+            scale=self.scale_slider.value(),
+            rotation=self.rotation_slider.value(),
+            crop_x=self.crop_x_slider.value(),
+            crop_y=self.crop_y_slider.value(),
+            crop_width=self.crop_width_slider.value(),
+            crop_height=self.crop_height_slider.value()
+        )
+
+    def apply_transformations(self, img, params=None):
+        if params is None:
+            params = self.get_transformation_params()
+        return apply_transformations(img, params)
+
+    def apply_transformations_cached(self, img, params):
+        return apply_transformations_cached(img, params, self.remap_cache)
+
+    def build_transformation_matrix(self, w, h, params=None):
+        if params is None:
+            params = self.get_transformation_params()
+        return build_transformation_matrix(w, h, params)
+
+    def validate_points(self, points):
+        return validate_points(points)
+
+    def update_transformation(self):
+        pass  # Optional: Implement real-time transformation updates here
+
+    def reset_sliders(self):
+        # Reset sliders to their default values and adjust maximums based on image dimensions
+        img_to_use = self.transformed_img if self.transformed_img is not None else self.img
+        if img_to_use is not None:
+            img_height, img_width = img_to_use.shape[:2]
+        else:
+            img_height, img_width = 1080, 1920  # default
+
+        # Update corner sliders
+        for i, slider in enumerate(self.corners):
+            if i % 2 == 0:  # X sliders
+                slider.setMaximum(img_width)
+                if i in [0, 6]:  # Top-Left X and Bottom-Left X
+                    slider.setValue(0)
+                else:  # Top-Right X and Bottom-Right X
+                    slider.setValue(img_width)
+            else:  # Y sliders
+                slider.setMaximum(img_height)
+                if i in [1, 3]:  # Top-Left Y and Top-Right Y
+                    slider.setValue(0)
+                else:  # Bottom-Right Y and Bottom-Left Y
+                    slider.setValue(img_height)
+
+        # Update translation sliders
+        self.x_translation_slider.setMinimum(-img_width // 2)
+        self.x_translation_slider.setMaximum(img_width // 2)
+        self.x_translation_slider.setValue(0)
+
+        self.y_translation_slider.setMinimum(-img_height // 2)
+        self.y_translation_slider.setMaximum(img_height // 2)
+        self.y_translation_slider.setValue(0)
+
+        # Update scale slider
+        self.scale_slider.setValue(100)  # Default scale is 100%
+
+        # Update rotation slider
+        self.rotation_slider.setValue(0)
+
+        # Update crop sliders
+        self.crop_x_slider.setMaximum(img_width)
+        self.crop_x_slider.setValue(0)
+
+        self.crop_y_slider.setMaximum(img_height)
+        self.crop_y_slider.setValue(0)
+
+        self.crop_width_slider.setMaximum(img_width)
+        self.crop_width_slider.setValue(img_width)
+
+        self.crop_height_slider.setMaximum(img_height)
+        self.crop_height_slider.setValue(img_height)
+
+    def save_image(self):
+        if self.transformed_img is None:
+            QMessageBox.critical(self, "Error", "No transformed image to save!")
+            return
+
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Image", "", "PNG files (*.png);;JPEG files (*.jpg *.jpeg)"
+        )
+        if save_path:
+            try:
+                cv2.imwrite(save_path, self.transformed_img)
+                self.prefetcher.invalidate(save_path)
+                QMessageBox.information(self, "Saved", f"Image saved to {save_path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Save Error", f"Failed to save image: {e}")
+
+    def save_all(self):
+        if not self.file_paths:
+            QMessageBox.warning(self, "No Images", "No images loaded to save.")
+            return
+
+        if not self.transformed_images:
+            QMessageBox.warning(self, "No Transformations", "No transformations applied to save.")
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(
+            self, "Select Save Folder", ""
+        )
+        if not save_folder:
+            return
+
+        root = image_root(self.file_paths, self.image_dir or None)
+        for file_path, transformed_img in self.transformed_images.items():
+            try:
+                save_path = os.path.join(save_folder, relative_image_path(file_path, root))
+                write_image(save_path, transformed_img)
+                self.prefetcher.invalidate(save_path)
+            except Exception as e:
+                QMessageBox.warning(self, "Save Error", f"Failed to save image {file_path}: {e}")
+                continue
+
+        QMessageBox.information(self, "Save All", "All transformed images have been saved successfully.")
+
+    def update_image_info(self):
+        if self.file_paths:
+            self.image_info_label.setText(
+                f"Image {self.current_index + 1} of {len(self.file_paths)}"
+            )
+        else:
+            self.image_info_label.setText("No images loaded.")
+
+    def reset_image(self):
+        if self.file_paths and self.current_index >= 0:
+            # Remove any transformed image for current image
+            file_path = self.file_paths[self.current_index]
+            if file_path in self.transformed_images:
+                del self.transformed_images[file_path]
+            self.transformed_img = None
+            self.lines = []
+            self.reset_sliders()
+            self.load_current_image()
+        else:
+            QMessageBox.warning(self, "No Image", "No image loaded to reset.")
+
+    def reset_all(self):
+        if not self.file_paths:
+            return
+        self.transformed_images.clear()
+        self.transformed_img = None
+        self.lines = []
+        self.reset_sliders()
+        self.load_current_image()
+
+    def draw_lines(self):
+        if self.img is None and self.transformed_img is None:
+            QMessageBox.critical(self, "Error", "No image loaded!")
+            return
+
+        img_to_draw = self.transformed_img if self.transformed_img is not None else self.img
+        h, w = img_to_draw.shape[:2]
+
+        line_y, ok = QInputDialog.getInt(
+            self, "Draw Line", f"Enter the Y position for the line (0 to {h}):", 0, 0, h, 1
+        )
+        if ok:
+            if 0 <= line_y <= h:
+                self.lines.append(line_y)
+                self.update_display_image(img_to_draw)
+            else:
+                QMessageBox.warning(self, "Invalid Input", f"Y position must be between 0 and {h}.")
+
+    def remove_lines(self):
+        self.lines.clear()
+        self.update_display_image(self.img if self.transformed_img is None else self.transformed_img)
+
+    def zoom_in(self):
+        if self.scale_factor < 5.0:
+            self.scale_factor *= 1.1
+            self.image_view.set_zoom(self.scale_factor)
+
+    def zoom_out(self):
+        if self.scale_factor > 0.1:
+            self.scale_factor /= 1.1
+            self.image_view.set_zoom(self.scale_factor)
+
+    def next_image(self):
+        if not self.file_paths:
+            QMessageBox.warning(self, "No Images", "No images loaded.")
+            return
+
+        if self.current_index < len(self.file_paths) - 1:
+            self.current_index += 1
+            self.load_current_image()
+        else:
+            QMessageBox.information(self, "End", "This is the last image.")
+
+    def previous_image(self):
+        if not self.file_paths:
+            QMessageBox.warning(self, "No Images", "No images loaded.")
+            return
+
+        if self.current_index > 0:
+            self.current_index -= 1
+            self.load_current_image()
+        else:
+            QMessageBox.information(self, "Start", "This is the first image.")
+
+
+
+class HCTAutoLabelTab(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setFocusPolicy(Qt.StrongFocus)
+
+        # Initialize variables
+        self.image = None
+        self.original_image = None
+        self.image_dir = ''
+        self.current_image_path = ''
+        self.zoom_level = 1.0
+        self.image_list = []
+        self.current_image_index = 0
+        # Detections are kept as vectors and painted as an overlay; source frames are never drawn into
+        self.detections = {}  # path -> (N, 3) float32 circles (x, y, r)
+        self.bounding_boxes = BoxStore()  # path -> (x, y, w, h, class) structured array
+        self.rois = RoiSet()  # Regions detection is limited to, per folder or image
+        self.offset = 10
+        self.prefetcher = ImagePrefetcher()
+        self.preprocess_cache = PreprocessCache()
+        self.batch_worker = None
+        self.tune_worker = None
+        self.video_worker = None
+        self.include_subfolders = False
+
+        # Setup UI
+        self.init_ui()
+
+    def init_ui(self):
+        # Main layout
+        main_layout = QVBoxLayout()
+        self.setLayout(main_layout)
+
+        # Image display
+        self.image_view = ImageView()
+        self.image_view.roi_drawn.connect(self.add_roi)
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setWidget(self.image_view)
+        main_layout.addWidget(self.scroll_area, stretch=5)
+
+        # Buttons and sliders
+        self.create_buttons(main_layout)
+        self.create_roi_controls(main_layout)
+        self.create_sliders(main_layout)
+
+        # Setup keyboard shortcuts
+        #self.setup_shortcuts()
+
+        # Set focus policy and focus
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.setFocus()
+
+    """
+    def setup_shortcuts(self):
+        # Previous Image Shortcut (A key)
+        self.shortcut_prev = QShortcut(QKeySequence('A'), self)
+        self.shortcut_prev.setContext(Qt.ApplicationShortcut)
+        self.shortcut_prev.activated.connect(self.previous_image)
+
+        # Next Image Shortcut (D key)
+        self.shortcut_next = QShortcut(QKeySequence('D'), self)
+        self.shortcut_next.setContext(Qt.ApplicationShortcut)
+        self.shortcut_next.activated.connect(self.next_image)
+
+        # Zoom In: Ctrl + +
+        self.shortcut_zoom_in = QShortcut(QKeySequence('Ctrl++'), self)
+        self.shortcut_zoom_in.setContext(Qt.ApplicationShortcut)
+        self.shortcut_zoom_in.activated.connect(self.zoom_in)
+
+        # Zoom Out: Ctrl + -
+        self.shortcut_zoom_out = QShortcut(QKeySequence('Ctrl+-'), self)
+        self.shortcut_zoom_out.setContext(Qt.ApplicationShortcut)
+        self.shortcut_zoom_out.activated.connect(self.zoom_out)
+    """
+
+    def create_buttons(self, layout):
+        # Buttons layout with two rows using QHBoxLayout
+        buttons_layout = QVBoxLayout()
+
+        # First row of buttons
+        button_row1 = QHBoxLayout()
+        button_row1.setSpacing(5)
+
+        buttons1 = [
+            ('Zoom In', self.zoom_in),
+            ('Zoom Out', self.zoom_out),
+            ('Load Image', self.load_image),
+            ('Save Image', self.save_image),
+            ('Reset Image', self.reset_image),
+            ('Reset All', self.reset_all)
+        ]
+
+        for text, method in buttons1:
+            button = QPushButton(text)
+            button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+            button.clicked.connect(method)
+            button_row1.addWidget(button)
+
+        buttons_layout.addLayout(button_row1)
+
+        # Second row of buttons
+        button_row2 = QHBoxLayout()
+        button_row2.setSpacing(5)
+
+        buttons2 = [
+            ('Apply HCT', self.apply_hct),
+            ('Apply HCT To All', self.apply_hct_all),
+            ('Apply HCT with BBoxes', self.apply_hct_with_bboxes),
+            ('Apply HCT with BBoxes To All', self.apply_hct_with_bboxes_all),
+            ('Apply HCT with BBoxes + Save All', self.apply_hct_with_bboxes_and_save_all),
+            ('Apply HCT + Save Labels Only', self.apply_hct_and_save_labels_all),
+            ('Save All', self.save_all),
+            ('Save Annotations', self.save_annotations),
+            ('Save All Annotations', self.save_all_annotations),
+            ('Export Detections as Patches', self.export_patches),
+            ('Label Video', self.label_video),
+            ('Auto-Tune', self.auto_tune),
+            ('Reset Sliders', self.reset_sliders),
+            ('Load/Open Directory', self.load_directory),
+            ('Previous', self.previous_image),
+            ('Next', self.next_image),
+            ('?', self.show_help)
+        ]
+
+        for text, method in buttons2:
+            button = QPushButton(text)
+            button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+            button.clicked.connect(method)
+            button_row2.addWidget(button)
+
+        buttons_layout.addLayout(button_row2)
+
+        layout.addLayout(buttons_layout)
+
+    def create_roi_controls(self, layout):
+        # Regions of interest: drawn on the image, for its folder, the image alone or every image
+        roi_layout = QHBoxLayout()
+        roi_label = QLabel('Region of Interest')
+        roi_label.setFixedWidth(250)
+        roi_layout.addWidget(roi_label)
+        self.roi_scope_selector = QComboBox()
+        self.roi_scope_selector.addItems(ROI_SCOPES)
+        roi_layout.addWidget(self.roi_scope_selector)
+        for text, method in [
+            ('Draw ROI Rectangle', lambda: self.draw_roi('rect')),
+            ('Draw ROI Polygon', lambda: self.draw_roi('polygon')),
+            ('Clear ROIs', self.clear_rois),
+            ('Load ROIs', self.load_rois),
+            ('Save ROIs', self.save_rois)
+        ]:
+            button = QPushButton(text)
+            button.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+            button.clicked.connect(method)
+            roi_layout.addWidget(button)
+        layout.addLayout(roi_layout)
+
+    def draw_roi(self, shape):
+        if self.image is None:
+            QMessageBox.warning(self, "No Image", "Load an image to draw a region of interest on.")
+            return
+        self.image_view.start_roi(shape)
+
+    def add_roi(self, roi):
+        """Add a drawn ROI to the selected scope of the current image."""
+        scope = self.roi_scope_selector.currentText()
+        path = self.current_image_path
+        self.rois.set_scoped(scope, path, self.rois.scoped(scope, path) + [roi])
+        self.rois_changed()
+
+    def clear_rois(self):
+        """Remove the ROIs of the selected scope; the image then falls back to the next scope."""
+        if self.current_image_path:
+            self.rois.set_scoped(self.roi_scope_selector.currentText(), self.current_image_path, [])
+            self.rois_changed()
+
+    def rois_changed(self):
+        self.show_detections()
+        self.update_transformation_parameters()
+
+    def load_rois(self):
+        """Read the roi section of a JSON file (Save ROIs or File > Export Batch Parameters)."""
+        load_path, _ = QFileDialog.getOpenFileName(self, "Load ROIs", "", "JSON files (*.json)")
+        if load_path:
+            try:
+                self.rois = RoiSet.from_dict(load_params(load_path).get('roi'))
+                self.rois_changed()
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to load ROIs: {e}")
+
+    def save_rois(self):
+        """Write the ROIs as a JSON roi section, for Load ROIs and "batch hct --roi"."""
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save ROIs", "", "JSON files (*.json)")
+        if save_path:
+            try:
+                save_params(save_path, {'roi': self.rois.to_dict()})
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save ROIs: {e}")
+
+    def create_sliders(self, layout):
+        # Sliders layout
+        slider_layout = QVBoxLayout()
+
+        # Adjust dp_slider for floating-point values
+        sliders = [
+            # Label, Attribute name, Default, Min, Max, Step, Mapping Function
+            ('dp - Inverse ratio of resolution', 'dp', 100, 10, 1000, 10, lambda x: x / 100.0),
+            ('minDist - Min distance between circles', 'minDist', 20, 1, 500, 10, lambda x: x),
+            ('param1 - Upper threshold for Canny', 'param1', 50, 1, 300, 10, lambda x: x),
+            ('param2 - Threshold for center detection', 'param2', 30, 1, 100, 5, lambda x: x),
+            ('minRadius - Minimum circle radius', 'minRadius', 0, 0, 100, 5, lambda x: x),
+            ('maxRadius - Maximum circle radius', 'maxRadius', 0, 0, 200, 10, lambda x: x)
+        ]
+
+        for i, (label_text, attr, default, min_val, max_val, tick_interval, mapping) in enumerate(sliders):
+            slider, value_label, slider_layout_inner = self.create_slider(label_text, min_val, max_val, default, tick_interval, mapping)
+            slider_layout.addLayout(slider_layout_inner)
+            setattr(self, f"{attr}_slider", slider)
+            setattr(self, f"{attr}_value_label", value_label)
+
+        # Class number selector
+        class_layout = QHBoxLayout()
+        class_label = QLabel('Class Number')
+        class_label.setFixedWidth(250)
+        class_layout.addWidget(class_label)
+        self.class_number_selector = QSpinBox()
+        self.class_number_selector.setMinimum(0)
+        self.class_number_selector.setMaximum(99)
+        self.class_number_selector.setValue(0)
+        class_layout.addWidget(self.class_number_selector)
+        class_value_label = QLabel(str(self.class_number_selector.value()))
+        class_value_label.setFixedWidth(50)
+        class_layout.addWidget(class_value_label)
+        self.class_number_selector.valueChanged.connect(lambda value: class_value_label.setText(str(value)))
+        slider_layout.addLayout(class_layout)
+
+        # Offset input for bounding boxes
+        offset_layout = QHBoxLayout()
+        offset_label = QLabel('Bounding Box Offset (pixels)')
+        offset_label.setFixedWidth(250)
+        offset_layout.addWidget(offset_label)
+        self.offset_input = QSpinBox()
+        self.offset_input.setMinimum(0)
+        self.offset_input.setMaximum(100)
+        self.offset_input.setValue(self.offset)
+        offset_layout.addWidget(self.offset_input)
+        offset_value_label = QLabel(str(self.offset_input.value()))
+        offset_value_label.setFixedWidth(50)
+        offset_layout.addWidget(offset_value_label)
+        self.offset_input.valueChanged.connect(
+            lambda value: (offset_value_label.setText(str(value)), self.set_offset(value))
+        )
+        slider_layout.addLayout(offset_layout)
+
+        # Label format written by Save All Annotations
+        format_layout = QHBoxLayout()
+        format_label = QLabel('Annotation Format')
+        format_label.setFixedWidth(250)
+        format_layout.addWidget(format_label)
+        self.annotation_format_selector = QComboBox()
+        self.annotation_format_selector.addItems(EXPORT_FORMATS)
+        format_layout.addWidget(self.annotation_format_selector)
+        slider_layout.addLayout(format_layout)
+
+        # Persist the grayscale/blur preprocessing between sessions
+        self.disk_cache_checkbox = QCheckBox('Cache Preprocessing on Disk')
+        self.disk_cache_checkbox.toggled.connect(self.toggle_disk_cache)
+        slider_layout.addWidget(self.disk_cache_checkbox)
+
+        # full: Hough on every pixel; reduced: 2x/4x/8x smaller decode when minRadius allows it;
+        # pyramid: vote on the reduced frame, then refine each circle at full resolution
+        detection_layout = QHBoxLayout()
+        detection_label = QLabel('Detection Mode')
+        detection_label.setFixedWidth(250)
+        detection_layout.addWidget(detection_label)
+        self.detection_mode_selector = QComboBox()
+        self.detection_mode_selector.addItems(DETECTION_MODES)
+        detection_layout.addWidget(self.detection_mode_selector)
+        # The reduction the mode actually uses for the current radii
+        self.detection_scale_label = QLabel()
+        detection_layout.addWidget(self.detection_scale_label)
+        slider_layout.addLayout(detection_layout)
+
+        # numpy keeps the votes of the loaded image, so retuning only reruns peak extraction;
+        # opencv_alt and contour read param2 as a percentage
+        backend_layout = QHBoxLayout()
+        backend_label = QLabel('Detector Backend')
+        backend_label.setFixedWidth(250)
+        backend_layout.addWidget(backend_label)
+        self.backend_selector = QComboBox()
+        self.backend_selector.addItems(HCT_BACKENDS)
+        backend_layout.addWidget(self.backend_selector)
+        slider_layout.addLayout(backend_layout)
+
+        # Redetect on the current image whenever a parameter changes
+        self.live_preview_checkbox = QCheckBox('Live Preview')
+        self.live_preview_checkbox.toggled.connect(self.update_transformation_parameters)
+        self.detection_mode_selector.currentIndexChanged.connect(self.update_transformation_parameters)
+        self.backend_selector.currentIndexChanged.connect(self.backend_changed)
+        slider_layout.addWidget(self.live_preview_checkbox)
+
+        # Off: Save Image / Save All write the source pixels; the detections go to the label files
+        self.burn_overlay_checkbox = QCheckBox('Draw Detections into Saved Images')
+        slider_layout.addWidget(self.burn_overlay_checkbox)
+
+        layout.addLayout(slider_layout)
+        self.update_detection_scale()
+
+    def backend_changed(self):
+        """param1 and param2 mean different things per backend, so load the new backend's defaults."""
+        defaults = dict(DEFAULT_HCT_PARAMS, **circle_backend(self.get_hct_backend()).defaults)
+        self.set_hct_params({name: defaults[name] for name in ('param1', 'param2')})
+        self.update_transformation_parameters()
+
+    def toggle_disk_cache(self, checked):
+        self.preprocess_cache.cache_dir = DEFAULT_CACHE_DIR if checked else None
+
+    def create_slider(self, label_text, min_val, max_val, default, tick_interval, mapping):
+        layout = QHBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(5)
+        label = QLabel(label_text)
+        label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        slider = QSlider(Qt.Horizontal)
+        slider.setMinimum(min_val)
+        slider.setMaximum(max_val)
+        slider.setValue(default)
+        slider.setTickPosition(QSlider.TicksBelow)
+        slider.setTickInterval(tick_interval)
+        slider.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+        value_label = QLabel(str(mapping(default)))
+        value_label.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+        slider.valueChanged.connect(lambda value, lbl=value_label, m=mapping: lbl.setText(str(m(value))))
+        slider.valueChanged.connect(lambda value, m=mapping: self.update_transformation_parameters())
+        layout.addWidget(label)
+        layout.addWidget(slider)
+        layout.addWidget(value_label)
+        return slider, value_label, layout
+
+    def update_transformation_parameters(self):
+        self.update_detection_scale()
+        if self.live_preview_checkbox.isChecked():
+            self.preview_hct()
+
+    def update_detection_scale(self):
+        """Show the reduction of reduced and pyramid modes, which fall back to full resolution for small minRadius."""
+        factor, _ = detection_factors(self.get_hct_params(), self.get_detection_mode())
+        self.detection_scale_label.setText(f"{factor}x reduced" if factor > 1 else "full resolution")
+
+    def preview_hct(self):
+        """Overlay the current parameters' circles on the image, without storing them."""
+        if not self.current_image_path or self.image is None:
+            return
+        try:
+            circles = detect_circles_in_file(
+                self.current_image_path, self.get_hct_params(), self.get_detection_mode(),
+                self.preprocess_cache, self.get_hct_backend(), self.rois.for_path(self.current_image_path)
+            )
+            self.image_view.set_overlay(None if circles is None else circles[0])
+        except Exception as e:
+            # Sliders fire continuously, so report in the log rather than a dialog per step
+            logging.warning(f"HCT preview failed: {e}")
+
+    def set_offset(self, value):
+        self.offset = value
+
+    def load_image(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Load Image", "", "Images (*.png *.jpg *.jpeg *.bmp)"
+        )
+        if file_path:
+            # Reset image_list to contain only the selected single image
+            self.image_list = [file_path]
+            self.image_dir = os.path.dirname(file_path)
+            self.prefetcher.invalidate()
+            clear_vote_cache()
+            self.current_image_index = 0
+            self.augmented_images = [None] * len(self.image_list)
+            self.load_current_image()
+
+    def load_directory(self):
+        directory = QFileDialog.getExistingDirectory(self, "Load Directory", "")
+        if directory:
+            self.image_dir = directory
+            # The files may have changed on disk since they were last buffered
+            self.prefetcher.invalidate()
+            # Votes of the previous folder's frames would otherwise hold their budget
+            clear_vote_cache()
+            self.image_list = list_images(directory, self.include_subfolders)
+            if self.image_list:
+                self.current_image_index = 0
+                self.augmented_images = [None] * len(self.image_list)
+                self.load_current_image()
+            else:
+                QMessageBox.warning(self, "No Images", "No supported images found in the directory.")
+
+    def load_current_image(self):
+        if self.image_list:
+            self.current_image_path = self.image_list[self.current_image_index]
+            self.prefetcher.update(self.image_list, self.current_image_index)
+            # Frames are shared with the prefetcher, not copied: nothing draws into them
+            self.original_image = self.prefetcher.load(self.current_image_path)
+            if self.original_image is not None:
+                self.image = self.original_image
+                self.display_image(self.image)
+                self.show_detections()
+            else:
+                QMessageBox.critical(self, "Error", f"Failed to load image: {os.path.basename(self.current_image_path)}")
+
+    def show_detections(self):
+        """Overlay the stored circles and boxes of the current image."""
+        path = self.current_image_path
+        self.image_view.set_overlay(self.detections.get(path), self.bounding_boxes.coordinates(path))
+        self.image_view.set_rois(self.rois.for_path(path))
+
+    def store_detections(self, path, circles, boxes=None, size=None):
+        """
+        Keep circles, a (1, N, 3) HoughCircles result or None, and with boxes given
+        replace the path's boxes, so rerunning detection never duplicates them. size is
+        the (width, height) detected on, kept for the label exporters.
+        """
+        if circles is not None:
+            self.detections[path] = circles[0]
+        else:
+            self.detections.pop(path, None)
+        if boxes is not None:
+            self.bounding_boxes.set(path, boxes, size)
+        if path == self.current_image_path:
+            self.show_detections()
+
+    def render_annotated(self, path, img=None):
+        """A colour copy of path with its stored circles and boxes drawn in, for saving."""
+        img = read_image(path) if img is None else img.copy()
+        circles = self.detections.get(path)
+        if circles is not None:
+            draw_circles(img, circles[np.newaxis])
+        draw_boxes(img, box_tuples(self.bounding_boxes.get(path)))
+        return img
+
+    def display_image(self, image):
+        try:
+            self.image_view.set_image(image)
+            self.image_view.set_zoom(self.zoom_level)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to display image: {e}")
+
+    def zoom_in(self):
+        if self.image is not None:
+            self.zoom_level *= 1.25
+            self.image_view.set_zoom(self.zoom_level)
+
+    def zoom_out(self):
+        if self.image is not None:
+            self.zoom_level /= 1.25
+            self.image_view.set_zoom(self.zoom_level)
+
+    def reset_image(self):
+        if not self.image_list or self.current_image_index < 0:
+            QMessageBox.warning(self, "No Image", "No image loaded to reset.")
+            return
+
+        try:
+            # The pixels were never changed, so resetting drops the detections
+            path = self.image_list[self.current_image_index]
+            self.detections.pop(path, None)
+            self.bounding_boxes.remove(path)
+            self.load_current_image()
+            QMessageBox.information(self, "Reset Image", "Image has been reset to its original state.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to reset image: {e}")
+
+    def reset_all(self):
+        if self.image_list:
+            # Do not reset zoom level to preserve current zoom
+            self.detections.clear()
+            self.bounding_boxes.clear()
+            self.load_current_image()
+
+    def get_hct_params(self):
+        return {
+            'dp': getattr(self, 'dp_slider').value() / 100.0,  # Adjusted for float
+            'minDist': getattr(self, 'minDist_slider').value(),
+            'param1': getattr(self, 'param1_slider').value(),
+            'param2': getattr(self, 'param2_slider').value(),
+            'minRadius': getattr(self, 'minRadius_slider').value(),
+            'maxRadius': getattr(self, 'maxRadius_slider').value()
+        }
+
+    def get_detection_mode(self):
+        return self.detection_mode_selector.currentText()
+
+    def set_hct_params(self, params):
+        for name, value in params.items():
+            getattr(self, f"{name}_slider").setValue(int(round(value * 100)) if name == 'dp' else int(value))
+
+    def auto_tune(self):
+        """
+        Search HCT parameters that reproduce the reference YOLO labels of the loaded
+        images, then set the sliders to the best set found.
+        """
+        if not self.image_list:
+            QMessageBox.warning(self, "No Images", "Load the images to tune on first.")
+            return
+        if self.tune_worker is not None and self.tune_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "Auto-tune is already running.")
+            return
+
+        labels_dir = QFileDialog.getExistingDirectory(self, "Select Reference Labels Folder", "")
+        if not labels_dir:
+            return
+        try:
+            samples = load_reference_set(self.image_list, labels_dir, self.image_dir or None)
+            space = default_search_space(samples, self.offset)
+        except Exception as e:
+            QMessageBox.warning(self, "Auto-Tune", f"Cannot tune against {labels_dir}: {e}")
+            return
+
+        # Keep every candidate representable by the sliders
+        for name, values in space.items():
+            slider = getattr(self, f"{name}_slider")
+            scale = 100 if name == 'dp' else 1
+            low, high = slider.minimum() / scale, slider.maximum() / scale
+            space[name] = sorted({min(max(value, low), high) for value in values})
+
+        # Trials share the tab's cache, so images already detected on are not decoded again
+        tuner = Tuner(
+            samples, self.offset, self.class_number_selector.value(),
+            mode=self.get_detection_mode(), backend=self.get_hct_backend(), cache=self.preprocess_cache,
+            rois=self.rois
+        )
+        self.tune_worker = TuneWorker(tuner, space, self.get_hct_params(), self)
+        dialog = QProgressDialog(f"Auto-tuning on {len(samples)} labelled images...", "Cancel", 0, 0, self)
+        dialog.setWindowTitle("Auto-Tune")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(self.tune_worker.cancel)
+        self.tune_worker.progress.connect(lambda done, total: (dialog.setMaximum(total), dialog.setValue(done)))
+        self.tune_worker.tuned.connect(lambda results: (dialog.close(), self.show_tune_results(results, len(samples))))
+        self.tune_worker.cancelled.connect(lambda: (
+            dialog.close(), QMessageBox.information(self, "Auto-Tune", "Auto-tune cancelled; the sliders are unchanged.")
+        ))
+        self.tune_worker.failed.connect(
+            lambda error: (dialog.close(), QMessageBox.critical(self, "Auto-Tune", f"Auto-tune failed: {error}"))
+        )
+        self.tune_worker.start()
+
+    def show_tune_results(self, results, image_count):
+        if not results:
+            return
+        best = min(results, key=rank_key)
+        self.set_hct_params(best['params'])
+        QMessageBox.information(
+            self, "Auto-Tune",
+            f"Sliders set to the best of {len(results)} finalists on {image_count} images "
+            f"(precision {best['precision']:.3f}, recall {best['recall']:.3f}).\n\n"
+            f"Precision / recall / runtime frontier:\n{format_results(pareto_frontier(results))}"
+        )
+
+    def get_hct_backend(self):
+        return self.backend_selector.currentText()
+
+    def apply_hct_with_bboxes_and_save_all(self):
+        """
+        Streaming export: detect and write every image on worker threads, each file
+        decoded once, detections drawn in only with Draw Detections into Saved Images.
+        Only the circles and boxes are kept, so memory does not grow with the folder.
+        """
+        if not self.image_list:
+            QMessageBox.warning(self, "No Images", "No images loaded to save.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A batch is already running.")
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", "")
+        if not save_folder:
+            return
+
+        params = self.get_hct_params()
+        offset = self.offset
+        class_num = self.class_number_selector.value()
+
+        mode = self.get_detection_mode()
+        backend = self.get_hct_backend()
+        rois = self.rois
+        root = image_root(self.image_list, self.image_dir or None)
+        burn = self.burn_overlay_checkbox.isChecked()
+
+        def process(path):
+            img = read_image(path)
+            # One file per batch thread, so tiled mode stays on this thread
+            circles = detect_circles_in_frame(img, params, mode, backend, rois.for_path(path), tile_workers=1)
+            boxes = boxes_from_circles(circles, offset, class_num, img.shape)
+            if burn and circles is not None:
+                draw_circles(img, circles)
+                draw_boxes(img, box_tuples(boxes))
+            save_path = os.path.join(save_folder, relative_image_path(path, root))
+            write_image(save_path, img)
+            self.prefetcher.invalidate(save_path)
+            return circles, boxes, (img.shape[1], img.shape[0])
+
+        self.batch_worker = start_batch_worker(
+            self, self.image_list, process, "Applying HCT and Saving",
+            on_result=lambda path, result: self.store_detections(path, *result)
+        )
+
+    def apply_hct_and_save_labels_all(self):
+        """
+        Labels-only streaming export: detect on the cached grayscale input and write one
+        YOLO file per image. No colour frame is decoded and no annotated copy is made;
+        the image size comes from the file header.
+        """
+        if not self.image_list:
+            QMessageBox.warning(self, "No Images", "No images loaded to label.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A batch is already running.")
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder for Annotations", "")
+        if not save_folder:
+            return
+
+        params = self.get_hct_params()
+        offset = self.offset
+        class_num = self.class_number_selector.value()
+        mode = self.get_detection_mode()
+        backend = self.get_hct_backend()
+        rois = self.rois
+        root = image_root(self.image_list, self.image_dir or None)
+
+        def process(path):
+            # One file per batch thread, so tiled mode stays on this thread
+            circles = detect_circles_in_file(
+                path, params, mode, self.preprocess_cache, backend, rois.for_path(path), tile_workers=1
+            )
+            width, height = read_image_size(path)
+            boxes = boxes_from_circles(circles, offset, class_num, (height, width))
+            annotation_path = label_path(save_folder, path, '.txt', root)
+            os.makedirs(os.path.dirname(annotation_path), exist_ok=True)
+            write_yolo_labels(annotation_path, boxes, width, height)
+            return circles, boxes, (width, height)
+
+        self.batch_worker = start_batch_worker(
+            self, self.image_list, process, "Applying HCT and Saving Labels",
+            on_result=lambda path, result: self.store_detections(path, *result)
+        )
+
+    def apply_hct(self):
+        if self.image is not None:
+            try:
+                # Grayscale + blur of the unannotated file, cached across parameter changes
+                params = self.get_hct_params()
+                circles = detect_circles_in_file(
+                    self.current_image_path, params, self.get_detection_mode(), self.preprocess_cache,
+                    self.get_hct_backend(), self.rois.for_path(self.current_image_path)
+                )
+
+                if circles is not None:
+                    self.store_detections(self.current_image_path, circles)
+                else:
+                    QMessageBox.information(self, "No Circles", "No circles were detected with the current parameters.")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to apply HCT: {e}")
+
+    def apply_hct_all(self):
+        if self.image_list:
+            params = self.get_hct_params()
+            mode = self.get_detection_mode()
+            backend = self.get_hct_backend()
+            rois = self.rois
+            for path in self.image_list:
+                try:
+                    # Detection decodes straight to grayscale (or reuses earlier runs);
+                    # only the circles are kept, so no colour frame is decoded at all
+                    circles = detect_circles_in_file(path, params, mode, self.preprocess_cache, backend, rois.for_path(path))
+                    self.store_detections(path, circles)
+                except Exception as e:
+                    QMessageBox.warning(self, "Error", f"Failed to apply HCT to {os.path.basename(path)}: {e}")
+
+    def apply_hct_with_bboxes(self):
+        if self.image is not None:
+            try:
+                # Grayscale + blur of the unannotated file, cached across parameter changes
+                params = self.get_hct_params()
+                circles = detect_circles_in_file(
+                    self.current_image_path, params, self.get_detection_mode(), self.preprocess_cache,
+                    self.get_hct_backend(), self.rois.for_path(self.current_image_path)
+                )
+
+                if circles is not None:
+                    # Store the circles and their bounding boxes with the class number
+                    class_num = self.class_number_selector.value()
+                    boxes = boxes_from_circles(circles, self.offset, class_num, self.image.shape)
+                    height, width = self.image.shape[:2]
+                    self.store_detections(self.current_image_path, circles, boxes, (width, height))
+                else:
+                    QMessageBox.information(self, "No Circles", "No circles were detected with the current parameters.")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to apply HCT with bounding boxes: {e}")
+
+    def apply_hct_with_bboxes_all(self):
+        if self.image_list:
+            params = self.get_hct_params()
+            class_num = self.class_number_selector.value()
+            mode = self.get_detection_mode()
+            backend = self.get_hct_backend()
+            rois = self.rois
+            for path in self.image_list:
+                try:
+                    # Detection decodes straight to grayscale (or reuses earlier runs), and
+                    # the boxes are clipped to the size in the file header, so no colour
+                    # frame is decoded at all
+                    circles = detect_circles_in_file(path, params, mode, self.preprocess_cache, backend, rois.for_path(path))
+                    width, height = read_image_size(path)
+                    boxes = boxes_from_circles(circles, self.offset, class_num, (height, width))
+                    self.store_detections(path, circles, boxes, (width, height))
+                except Exception as e:
+                    QMessageBox.warning(self, "Error", f"Failed to apply HCT with bounding boxes to {os.path.basename(path)}: {e}")
+
+    def save_image(self):
+        if self.image is not None:
+            save_path, _ = QFileDialog.getSaveFileName(
+                self, "Save Image", "", "PNG files (*.png);;JPEG files (*.jpg *.jpeg);;BMP files (*.bmp)"
+            )
+            if save_path:
+                try:
+                    img = self.image
+                    if self.burn_overlay_checkbox.isChecked():
+                        img = self.render_annotated(self.current_image_path, img)
+                    cv2.imwrite(save_path, img)
+                    self.prefetcher.invalidate(save_path)
+                    QMessageBox.information(self, "Saved", f"Image saved to {save_path}")
+                except Exception as e:
+                    QMessageBox.critical(self, "Error", f"Failed to save image: {e}")
+
+    def save_all(self):
+        if not self.image_list:
+            QMessageBox.warning(self, "No Images", "No images loaded to save.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A batch is already running.")
+            return
+
+        paths = [path for path in self.image_list if path in self.detections or path in self.bounding_boxes]
+        if not paths:
+            QMessageBox.warning(self, "No Detections", "Apply HCT before saving the detected images.")
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", "")
+        if not save_folder:
+            return
+
+        # Annotated copies exist only on the worker threads, one image at a time
+        burn = self.burn_overlay_checkbox.isChecked()
+        root = image_root(self.image_list, self.image_dir or None)
+
+        def process(path):
+            img = self.render_annotated(path) if burn else read_image(path)
+            save_path = os.path.join(save_folder, relative_image_path(path, root))
+            write_image(save_path, img)
+            self.prefetcher.invalidate(save_path)
+
+        self.batch_worker = start_batch_worker(self, paths, process, "Saving Images")
+
+    def save_annotations(self):
+        if not len(self.bounding_boxes.get(self.current_image_path)):
+            QMessageBox.warning(self, "No Annotations", "No annotations to save.")
+            return
+
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save Annotations", "", "Text files (*.txt)"
+        )
+        if save_path:
+            try:
+                # Dimensions recorded at detection time, else those of the loaded image
+                size = self.bounding_boxes.size(self.current_image_path)
+                if size is None:
+                    if self.image is None:
+                        raise ValueError("No image loaded to retrieve dimensions.")
+                    size = (self.image.shape[1], self.image.shape[0])
+                write_yolo_labels(save_path, self.bounding_boxes.get(self.current_image_path), *size)
+                QMessageBox.information(self, "Saved", f"Annotations saved to {save_path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Error", f"Failed to save annotations:\n{e}")
+
+    def save_all_annotations(self):
+        if not self.bounding_boxes:
+            QMessageBox.warning(self, "No Annotations", "No annotations to save.")
+            return
+
+        annotation_format = self.annotation_format_selector.currentText()
+        if annotation_format == 'coco':
+            self.save_coco_annotations()
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder for Annotations", "")
+        if not save_folder:
+            return
+
+        try:
+            # Sizes were recorded at detection time, so no image is opened here
+            if annotation_format == 'voc':
+                count = export_voc(self.bounding_boxes, save_folder, root=self.image_dir or None)
+            else:
+                count = export_yolo(self.bounding_boxes, save_folder, root=self.image_dir or None)
+            QMessageBox.information(self, "Save All Annotations", f"Annotations for {count} images have been saved successfully.")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save annotations for some images:\n{e}")
+
+    def export_patches(self):
+        """
+        Crop every stored bounding box (offset margin included) into its own image for
+        classifier training, one decode per source image on worker threads, and write
+        a CSV manifest mapping each patch to its image, box and circle radius.
+        """
+        if not self.bounding_boxes:
+            QMessageBox.warning(self, "No Annotations", "Apply HCT with BBoxes before exporting patches.")
+            return
+
+        if self.batch_worker is not None and self.batch_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A batch is already running.")
+            return
+
+        save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder for Patches", "")
+        if not save_folder:
+            return
+        size, ok = QInputDialog.getInt(
+            self, "Export Detections as Patches", "Patch size in pixels (0 keeps the box size):", 0, 0, 4096
+        )
+        if not ok:
+            return
+
+        # Snapshot the boxes, so detections run while exporting do not mix into it
+        boxes_by_path = dict(self.bounding_boxes.items())
+        root = image_root(boxes_by_path, self.image_dir or None)
+        rows = {}
+
+        def finished(failures, cancelled):
+            manifest_path = os.path.join(save_folder, PATCH_MANIFEST_NAME)
+            try:
+                write_patch_manifest(manifest_path, [row for path in boxes_by_path for row in rows.get(path, [])])
+            except OSError as e:
+                QMessageBox.critical(self, "Error", f"Failed to write {manifest_path}:\n{e}")
+
+        self.batch_worker = start_batch_worker(
+            self, list(boxes_by_path), lambda path: write_patches(path, boxes_by_path[path], save_folder, size, root=root),
+            "Exporting Patches", on_result=rows.__setitem__, on_finished=finished
+        )
+
+    def label_video(self):
+        """
+        Label circles through a video: full detection on keyframes, tracking around the
+        previous frame's circles in between, and a YOLO file per frame.
+        """
+        if self.video_worker is not None and self.video_worker.isRunning():
+            QMessageBox.warning(self, "Busy", "A video is already being labelled.")
+            return
+
+        patterns = ' '.join(f"*{extension}" for extension in VIDEO_FORMATS)
+        source, _ = QFileDialog.getOpenFileName(self, "Select Video", "", f"Videos ({patterns});;All files (*)")
+        if not source:
+            return
+        labels_dir = QFileDialog.getExistingDirectory(self, "Select Save Folder for Frame Labels", "")
+        if not labels_dir:
+            return
+        # Training needs the frames next to their labels; skip them when they are extracted elsewhere
+        answer = QMessageBox.question(
+            self, "Label Video", "Also save every frame as an image next to its label file?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        frames_dir = labels_dir if answer == QMessageBox.Yes else None
+
+        self.video_worker = VideoLabelWorker(
+            source, self.get_hct_params(), labels_dir, self.offset, self.class_number_selector.value(),
+            frames_dir, self.get_hct_backend(), self.rois.for_path(source), self
+        )
+        dialog = QProgressDialog(f"Labelling {os.path.basename(source)}...", "Cancel", 0, 0, self)
+        dialog.setWindowTitle("Label Video")
+        dialog.setWindowModality(Qt.WindowModal)
+        dialog.setMinimumDuration(0)
+        dialog.canceled.connect(self.video_worker.cancel)
+        self.video_worker.progress.connect(lambda done, total: (dialog.setMaximum(total), dialog.setValue(done)))
+        self.video_worker.labelled.connect(lambda stats: (dialog.close(), QMessageBox.information(
+            self, "Label Video",
+            f"Labelled {stats['frames']} frames: {stats['keyframes']} full detections "
+            f"({stats['fallbacks']} after lost tracks) and {stats['tracked']} tracked frames, "
+            f"{stats['detect_seconds'] / max(1, stats['frames']) * 1000:.1f} ms detection per frame."
+        )))
+        self.video_worker.failed.connect(
+            lambda error: (dialog.close(), QMessageBox.critical(self, "Label Video", f"Failed to label the video: {error}"))
+        )
+        self.video_worker.start()
+
+    def save_coco_annotations(self):
+        """Stream every image's boxes, with circle radii, into one COCO JSON file, optionally merged into it."""
+        save_path, _ = QFileDialog.getSaveFileName(
+            self, "Save COCO Annotations", "", "JSON files (*.json)", options=QFileDialog.DontConfirmOverwrite
+        )
+        if not save_path:
+            return
+
+        merge = False
+        if os.path.exists(save_path):
+            answer = QMessageBox.question(
+                self, "Save COCO Annotations",
+                f"{os.path.basename(save_path)} already exists. Merge into it?\n\n"
+                "Yes keeps its other images and annotations; No replaces the file.",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
+            )
+            if answer == QMessageBox.Cancel:
+                return
+            merge = answer == QMessageBox.Yes
+
+        try:
+            images, annotations = export_coco(self.bounding_boxes, save_path, merge=merge, root=self.image_dir or None)
+            QMessageBox.information(
+                self, "Save All Annotations", f"{annotations} annotations on {images} images saved to {save_path}"
+            )
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to save COCO annotations:\n{e}")
+
+    def reset_sliders(self):
+        sliders = ['dp', 'minDist', 'param1', 'param2', 'minRadius', 'maxRadius']
+        defaults = [100, 20, 50, 30, 0, 0]  # dp default adjusted to 100 (1.0)
+        for slider, default in zip(sliders, defaults):
+            getattr(self, f"{slider}_slider").setValue(default)
+        self.class_number_selector.setValue(0)
+        self.offset_input.setValue(10)
+        QMessageBox.information(self, "Sliders Reset", "All sliders have been reset to default values.")
+
+    def show_help(self):
+        help_text = (
+            "HCT & Auto Labeling Help:\n\n"
+            "Use the buttons to perform various actions such as loading images, applying HCT transformations, "
+            "saving images and annotations, and navigating through images.\n\n"
+            "Adjust the sliders to set parameters for HCT transformations.\n"
+            "Use the 'Apply' buttons to apply transformations to the current image or all images.\n"
+            "Save your work using the 'Save' buttons.\n\n"
+            "Keyboard Shortcuts:\n"
+            "- Press 'A' to go to the previous image.\n"
+            "- Press 'D' to go to the next image.\n"
+            "- Zoom In: Ctrl + +\n"
+            "- Zoom Out: Ctrl + -\n\n"
+            "Bounding Boxes:\n"
+            "- 'Apply HCT with BBoxes' will detect circles and draw bounding boxes around them.\n"
+            "- Detections are drawn over the image only; enable 'Draw Detections into Saved Images' to save them in the pixels.\n"
+            "- 'Apply HCT + Save Labels Only' writes YOLO labels for every image without decoding colour images.\n"
+            "- Adjust the 'Bounding Box Offset' to change the size of the bounding boxes.\n"
+            "- Set the 'Class Number' for each bounding box.\n\n"
+            "Detector Backend:\n"
+            "- opencv and numpy: Hough gradient votes; param2 is the vote threshold.\n"
+            "- opencv_alt: HOUGH_GRADIENT_ALT; param2 is the circle perfectness in percent.\n"
+            "- contour: outlines of thresholded blobs; param2 is the minimum roundness in percent.\n"
+            "- Changing the backend loads its default param1 and param2.\n\n"
+            "Regions of Interest:\n"
+            "- 'Draw ROI Rectangle' (drag) or 'Draw ROI Polygon' (click the corners, double-click to close) limits detection to that region.\n"
+            "- The scope selects whether a new ROI applies to the image's folder, the image alone, or every image.\n"
+            "- Circles must lie inside an ROI to be found; 'Save ROIs' writes them for 'batch hct --roi'."
+        )
+        QMessageBox.information(self, "Help", help_text)
+
+    def previous_image(self):
+        if self.image_list:
+            if self.current_image_index > 0:
+                self.current_image_index -= 1
+                self.load_current_image()
+            else:
+                QMessageBox.information(self, "Start", "This is the first image.")
+        else:
+            QMessageBox.warning(self, "No Images", "No images loaded.")
+
+    def next_image(self):
+        if self.image_list:
+            if self.current_image_index < len(self.image_list) - 1:
+                self.current_image_index += 1
+                self.load_current_image()
+            else:
+                QMessageBox.information(self, "End", "This is the last image.")
+        else:
+            QMessageBox.warning(self, "No Images", "No images loaded.")
+
+
+import sys
+import os
+import cv2
+import numpy as np
+import logging
+from PyQt5.QtWidgets import (
+    QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
+    QScrollArea, QSlider, QSpinBox, QCheckBox, QFileDialog,
+    QMessageBox, QSizePolicy
+)
+from PyQt5.QtGui import QImage, QPixmap
+from PyQt5.QtCore import Qt
+
+# Configure logging
+logging.basicConfig(level=logging.DEBUG, filename='app.log',
+                    format='%(asctime)s - %(levelname)s - %(message)s')
+
+class ImageAugmentationTab(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setFocusPolicy(Qt.StrongFocus)
+
+        # Initialize variables
+        self.original_image = None
+        self.current_image = None
+        self.image_list = []
+        self.current_image_index = 0
+        self.zoom_level = 1.0
+        self.image_dir = ''
+        self.augmented_images = ImageStore()
+        self.processed_images = {}
+        self.prefetcher = ImagePrefetcher()
+        self.batch_worker = None
+        self.include_subfolders = False
+
+        # Setup UI
+        self.init_ui()
+
+    def init_ui(self):
+        try:
+            main_layout = QVBoxLayout()
+            self.setLayout(main_layout)
+
+            # Image display
+            self.image_view = ImageView()
+            self.scroll_area = QScrollArea()
+            self.scroll_area.setWidgetResizable(True)
+            self.scroll_area.setWidget(self.image_view)
+            main_layout.addWidget(self.scroll_area, stretch=8)
+
+            # Buttons and sliders
+            self.create_buttons(main_layout)
+            self.create_sliders(layout=main_layout)
+
+            logging.debug("ImageAugmentationTab UI initialized successfully.")
+        except Exception as e:
+            logging.error(f"Failed to initialize UI: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to initialize UI: {e}")
+
+    def create_buttons(self, layout):
+        try:
+            button_row = QHBoxLayout()
+            button_row.setSpacing(5)
+
+            buttons = [
+                ('Load Image', self.load_image),
+                ('Load Directory', self.load_directory),
+                ('Apply AUG', self.apply_augmentation),
+                ('Apply AUG To All', self.apply_augmentation_all),
+                ('Apply AUG + Save All', self.apply_augmentation_and_save_all),
+                ('Save Image', self.save_image),
+                ('Save All', self.save_all_images),
+                ('Reset Image', self.reset_image),
+                ('Reset All', self.reset_all_images),
+                ('Reset Sliders', self.reset_sliders),
+                ('Previous', self.previous_image),
+                ('Next', self.next_image),
+                ('Zoom In', self.zoom_in),
+                ('Zoom Out', self.zoom_out),
+                ('?', self.show_help)
+            ]
+
+            for text, method in buttons:
+                button = QPushButton(text)
+                if text == '?':
+                    button.setFixedSize(30, 30)
+                    button.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Fixed)
+                    button.setToolTip("Show Help")
+                    button.setStyleSheet("font-weight: bold;")
+                else:
+                    button.setSizePolicy(QSizePolicy.Minimum, QSizePolicy.Fixed)
+                    button.setToolTip(f"{text} Button")
+
+                # Connect button to method
+                try:
+                    button.clicked.connect(method)
+                except AttributeError as attr_err:
+                    logging.error(f"Failed to connect button '{text}' to method '{method}': {attr_err}")
+                    QMessageBox.critical(self, "Error", f"Failed to connect button '{text}' to its function.")
+                    return
+
+                button_row.addWidget(button)
+
+            button_row.addStretch()
+            layout.addLayout(button_row)
+
+            logging.debug("Buttons created and connected successfully.")
+        except Exception as e:
+            logging.error(f"Failed to create buttons: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to create buttons: {e}")
+
+    def create_sliders(self, layout):
+        try:
+            slider_layout = QVBoxLayout()
+            slider_layout.setSpacing(5)
+
+            # Define slider configurations
+            sliders_info = [
+                {'name': 'white_balance', 'label': 'White Balance', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
+                {'name': 'hsv_h', 'label': 'HSV Hue', 'min': -180, 'max': 180, 'default': 0, 'factor': 1},
+                {'name': 'hsv_s', 'label': 'HSV Saturation', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
+                {'name': 'hsv_v', 'label': 'HSV Value', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
+                {'name': 'degrees', 'label': 'Rotation Degrees', 'min': -180, 'max': 180, 'default': 0, 'factor': 1},
+                {'name': 'translate', 'label': 'Translate', 'min': -100, 'max': 100, 'default': 0, 'factor': 1},
+                {'name': 'scale', 'label': 'Scale (%)', 'min': 50, 'max': 150, 'default': 100, 'factor': 1},
+                {'name': 'shear', 'label': 'Shear', 'min': -45, 'max': 45, 'default': 0, 'factor': 1},
+                {'name': 'noise', 'label': 'Noise Level', 'min': 0, 'max': 100, 'default': 0, 'factor': 1},
+            ]
+
+            for info in sliders_info:
+                slider = QSlider(Qt.Horizontal)
+                slider.setMinimum(info['min'])
+                slider.setMaximum(info['max'])
+                slider.setValue(info['default'])
+                slider.setObjectName(info['name'])
+                slider.setTickPosition(QSlider.TicksBelow)
+                slider.setTickInterval((info['max'] - info['min']) // 10)
+
+                value_label = QLabel(f"{info['default'] * info['factor']:.2f}")
+                value_label.setFixedWidth(60)
+
+                # Connect slider to update label
+                slider.valueChanged.connect(
+                    lambda value, s=slider, l=value_label, f=info['factor']: self.update_value_label(s, l, f)
+                )
+
+                h_layout = QHBoxLayout()
+                param_label = QLabel(info['label'])
+                param_label.setFixedWidth(150)
+                h_layout.addWidget(param_label)
+                h_layout.addWidget(slider)
+                h_layout.addWidget(value_label)
+                slider_layout.addLayout(h_layout)
+
+                # Assign sliders and labels to attributes
+                setattr(self, f"{info['name']}_slider", slider)
+                setattr(self, f"{info['name']}_value_label", value_label)
+
+            # Combine Flip Checkboxes and Padding Controls in the Same Row
+            combined_layout = QHBoxLayout()
+            combined_layout.setSpacing(10)  # Minimal spacing
+
+            # Flip Checkboxes
+            flip_layout = QHBoxLayout()
+            flip_layout.setSpacing(5)
+            self.flipud_checkbox = QCheckBox('Flip Up-Down')
+            self.fliplr_checkbox = QCheckBox('Flip Left-Right')
+            flip_layout.addWidget(self.flipud_checkbox)
+            flip_layout.addWidget(self.fliplr_checkbox)
+
+            # Fill for the areas rotation, translation and shear uncover
+            flip_layout.addWidget(QLabel("Border:"))
+            self.border_selector = QComboBox()
+            self.border_selector.addItems(BORDER_MODES)
+            flip_layout.addWidget(self.border_selector)
+
+            # Padding Controls
+            padding_layout = QHBoxLayout()
+            padding_layout.setSpacing(5)
+
+            self.padding_checkbox = QCheckBox("Add Padding")
+            self.padding_checkbox.stateChanged.connect(self.toggle_padding)
+            padding_layout.addWidget(self.padding_checkbox)
+
+            padding_width_label = QLabel("Width (px):")
+            padding_layout.addWidget(padding_width_label)
+
+            self.padding_width_spin = QSpinBox()
+            self.padding_width_spin.setMinimum(0)
+            self.padding_width_spin.setMaximum(10000)  # Allow large padding if needed
+            self.padding_width_spin.setValue(0)
+            self.padding_width_spin.setEnabled(False)
+            padding_layout.addWidget(self.padding_width_spin)
+
+            padding_height_label = QLabel("Height (px):")
+            padding_layout.addWidget(padding_height_label)
+
+            self.padding_height_spin = QSpinBox()
+            self.padding_height_spin.setMinimum(0)
+            self.padding_height_spin.setMaximum(10000)  # Allow large padding if needed
+            self.padding_height_spin.setValue(0)
+            self.padding_height_spin.setEnabled(False)
+            padding_layout.addWidget(self.padding_height_spin)
+
+            # Add Flip and Padding to Combined Layout
+            combined_layout.addLayout(flip_layout)
+            combined_layout.addStretch()
+            combined_layout.addLayout(padding_layout)
+
+            slider_layout.addLayout(combined_layout)
+            layout.addLayout(slider_layout)
+
+            logging.debug("Sliders created and connected successfully.")
+        except Exception as e:
+            logging.error(f"Failed to create sliders: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to create sliders: {e}")
+
+    def update_value_label(self, slider, label, factor):
+        try:
+            value = slider.value() * factor
+            label.setText(f"{value:.2f}")
+        except Exception as e:
+            logging.error(f"Failed to update slider label: {e}")
+            label.setText("Error")
+
+    def toggle_padding(self, state):
+        try:
+            enabled = state == Qt.Checked
+            self.padding_width_spin.setEnabled(enabled)
+            self.padding_height_spin.setEnabled(enabled)
+            logging.debug(f"Padding toggled: {'Enabled' if enabled else 'Disabled'}.")
+        except Exception as e:
+            logging.error(f"Failed to toggle padding: {e}")
+
+    def load_image(self):
+        try:
+            file_path, _ = QFileDialog.getOpenFileName(
+                self, "Load Image", "", "Images (*.png *.jpg *.jpeg *.bmp)"
+            )
+            if file_path:
+                logging.debug(f"Loading image from {file_path}")
+                self.original_image = cv2.imread(file_path)
+                if self.original_image is None:
+                    raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
+                if self.original_image.shape[0] > 5000 or self.original_image.shape[1] > 5000:
+                    raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
+                self.current_image = self.original_image
+                self.image_list = [file_path]
+                self.image_dir = os.path.dirname(file_path)
+                self.prefetcher.invalidate()
+                self.current_image_index = 0
+                self.augmented_images.clear()
+                self.display_image(self.current_image)
+                logging.debug("Image loaded and displayed successfully.")
+        except Exception as e:
+            logging.error(f"Failed to load image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to load image: {e}")
+
+    def load_directory(self):
+        try:
+            directory = QFileDialog.getExistingDirectory(self, "Load Directory", "")
+            if directory:
+                logging.debug(f"Loading directory: {directory}")
+                self.image_list = list_images(directory, self.include_subfolders)
+                self.image_dir = directory
+                # The files may have changed on disk since they were last buffered
+                self.prefetcher.invalidate()
+                if self.image_list:
+                    self.current_image_index = 0
+                    self.augmented_images.clear()
+                    self.load_current_image()
+                    logging.debug("Directory loaded successfully.")
+                else:
+                    QMessageBox.warning(self, "No Images", "No supported images found in the directory.")
+        except Exception as e:
+            logging.error(f"Failed to load directory: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to load directory: {e}")
+
+    def load_current_image(self):
+        try:
+            if self.image_list:
+                self.current_image_path = self.image_list[self.current_image_index]
+                logging.debug(f"Loading current image: {self.current_image_path}")
+                self.prefetcher.update(self.image_list, self.current_image_index)
+                # Results are never modified in place, so frames are shared rather than copied
+                if self.current_image_index in self.augmented_images:
+                    self.current_image = self.augmented_images[self.current_image_index]
+                    self.display_image(self.current_image)
+                else:
+                    self.original_image = self.prefetcher.load(self.current_image_path)
+                    if self.original_image is None:
+                        raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
+                    if self.original_image.shape[0] > 5000 or self.original_image.shape[1] > 5000:
+                        raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
+                    self.current_image = self.original_image
+                    self.augmented_images[self.current_image_index] = self.current_image
+                    self.display_image(self.current_image)
+                logging.debug("Current image loaded and displayed successfully.")
+        except Exception as e:
+            logging.error(f"Failed to load current image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to load image: {e}")
+
+    def display_image(self, image):
+        try:
+            if image is None:
+                raise ValueError("Image is None.")
+            if len(image.shape) != 3 or image.shape[2] != 3:
+                raise ValueError("Image must be a 3-channel BGR image.")
+
+            # Limit zoom to prevent excessive scaling
+            if self.zoom_level > 5.0:
+                self.zoom_level = 5.0
+            elif self.zoom_level < 0.1:
+                self.zoom_level = 0.1
+
+            self.image_view.set_image(image)
+            self.image_view.set_zoom(self.zoom_level)
+            logging.debug("Image displayed successfully.")
+        except Exception as e:
+            logging.error(f"Failed to display image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to display image: {e}")
+
+    def get_augmentation_params(self):
+        return {
+            'white_balance': self.white_balance_slider.value(),
+            'hsv_h': self.hsv_h_slider.value(),
+            'hsv_s': self.hsv_s_slider.value() / 100.0,  # Scale saturation
+            'hsv_v': self.hsv_v_slider.value() / 100.0,  # Scale value
+            'degrees': self.degrees_slider.value(),
+            'translate': self.translate_slider.value(),
+            'scale': self.scale_slider.value() / 100.0,
+            'shear': self.shear_slider.value(),
+            'noise': self.noise_slider.value(),
+            'flipud': self.flipud_checkbox.isChecked(),
+            'fliplr': self.fliplr_checkbox.isChecked(),
+            'border': self.border_selector.currentText(),
+            'padding': self.padding_checkbox.isChecked(),
+            'padding_width': self.padding_width_spin.value(),
+            'padding_height': self.padding_height_spin.value()
+        }
+
+    def apply_augmentation(self):
+        try:
+            if not self.image_list:
+                QMessageBox.warning(self, "No Image", "No image loaded to apply augmentations.")
+                return
+
+            # Start with the original image to prevent cumulative transformations
+            path = self.image_list[self.current_image_index]
+            original_img = cv2.imread(path)
+            if original_img is None:
+                raise ValueError("Original image data is None. Possibly unsupported image format or corrupted file.")
+            if original_img.shape[0] > 5000 or original_img.shape[1] > 5000:
+                raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
+
+            params = self.get_augmentation_params()
+            img = augment_image(original_img, params)
+            if padding_was_skipped(img, params):
+                QMessageBox.warning(self, "Invalid Padding", "Desired padding dimensions must be greater than or equal to the current image dimensions.")
+
+            # Update augmented_images list
+            self.augmented_images[self.current_image_index] = img
+            self.current_image = img
+            self.display_image(self.current_image)
+            logging.debug("Augmentation applied successfully.")
+            QMessageBox.information(self, "Augmentation Applied", "Augmentations have been applied to the current image.")
+        except Exception as e:
+            logging.error(f"Failed to apply augmentation: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to apply augmentation: {e}")
+
+    def apply_augmentation_all(self):
+        try:
+            if not self.image_list:
+                QMessageBox.warning(self, "No Images", "No images loaded to apply augmentations.")
+                return
+
+            params = self.get_augmentation_params()
+            for idx, path in enumerate(self.image_list):
+                img = cv2.imread(path)
+                if img is not None:
+                    if img.shape[0] > 5000 or img.shape[1] > 5000:
+                        logging.warning(f"Image {path} exceeds maximum dimensions. Skipping.")
+                        continue
+                    # Start with the original image to prevent cumulative transformations
+                    aug_img = augment_image(img, params)
+
+                    # Update augmented_images list
+                    self.augmented_images[idx] = aug_img
+                    logging.debug(f"Augmentation applied to image: {path}")
+                else:
+                    logging.warning(f"Failed to read image {path}. Skipping.")
+
+            self.load_current_image()
+            QMessageBox.information(self, "Augmentation Applied", "Augmentations have been applied to all images.")
+            logging.debug("Augmentation applied to all images successfully.")
+        except Exception as e:
+            logging.error(f"Failed to apply augmentation to all images: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to apply augmentation to all images: {e}")
+
+    def apply_augmentation_and_save_all(self):
+        """
+        Streaming export: augment and write every image on worker threads
+        without keeping the results, so memory does not grow with the folder.
+        """
+        try:
+            if not self.image_list:
+                QMessageBox.warning(self, "No Images", "No images loaded to apply augmentations.")
+                return
+
+            if self.batch_worker is not None and self.batch_worker.isRunning():
+                QMessageBox.warning(self, "Busy", "A batch is already running.")
+                return
+
+            save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", "")
+            if not save_folder:
+                return
+
+            params = self.get_augmentation_params()
+            root = image_root(self.image_list, self.image_dir or None)
+
+            def process(path):
+                img = read_image(path)
+                if img.shape[0] > 5000 or img.shape[1] > 5000:
+                    raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
+                img = augment_image(img, params)
+                save_path = os.path.join(save_folder, relative_image_path(path, root))
+                write_image(save_path, img)
+                self.prefetcher.invalidate(save_path)
+
+            self.batch_worker = start_batch_worker(self, self.image_list, process, "Augmenting and Saving")
+            logging.debug("Streaming augmentation export started.")
+        except Exception as e:
+            logging.error(f"Failed to start augmentation export: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to start augmentation export: {e}")
+
+    def save_image(self):
+        try:
+            if self.current_image is None:
+                QMessageBox.warning(self, "No Image", "No augmented image to save.")
+                return
+            save_path, _ = QFileDialog.getSaveFileName(
+                self, "Save Augmented Image", "", "PNG files (*.png);;JPEG files (*.jpg *.jpeg);;BMP files (*.bmp)"
+            )
+            if save_path:
+                cv2.imwrite(save_path, self.current_image)
+                self.prefetcher.invalidate(save_path)
+                QMessageBox.information(self, "Saved", f"Image saved to {save_path}")
+                logging.debug(f"Image saved to {save_path}")
+        except Exception as e:
+            logging.error(f"Failed to save image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to save image: {e}")
+
+    def save_all_images(self):
+        try:
+            if not self.image_list:
+                QMessageBox.warning(self, "No Images", "No images loaded to save.")
+                return
+
+            save_folder = QFileDialog.getExistingDirectory(self, "Select Save Folder", "")
+            if not save_folder:
+                return
+
+            root = image_root(self.image_list, self.image_dir or None)
+            for idx, path in enumerate(self.image_list):
+                if idx in self.augmented_images:
+                    img = self.augmented_images[idx]
+                else:
+                    img = cv2.imread(path)
+                    if img is None:
+                        logging.warning(f"Failed to read image {path}. Skipping.")
+                        continue
+
+                save_path = os.path.join(save_folder, relative_image_path(path, root))
+                write_image(save_path, img)
+                self.prefetcher.invalidate(save_path)
+                logging.debug(f"Image saved to {save_path}")
+
+            QMessageBox.information(self, "Save All", "All augmented images have been saved successfully.")
+            logging.debug("All augmented images saved successfully.")
+        except Exception as e:
+            logging.error(f"Failed to save all images: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to save all images: {e}")
+
+    def reset_image(self):
+        try:
+            if not self.image_list:
+                QMessageBox.warning(self, "No Image", "No image loaded to reset.")
+                return
+
+            # Reset the current image to original
+            path = self.image_list[self.current_image_index]
+            self.original_image = cv2.imread(path)
+            if self.original_image is None:
+                raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
+            if self.original_image.shape[0] > 5000 or self.original_image.shape[1] > 5000:
+                raise ValueError("Image dimensions exceed the maximum allowed size of 5000px.")
+            self.current_image = self.original_image
+            self.augmented_images[self.current_image_index] = self.current_image
+            self.display_image(self.current_image)
+            QMessageBox.information(self, "Reset Image", "Image has been reset to its original state.")
+            logging.debug("Image reset to original successfully.")
+        except Exception as e:
+            logging.error(f"Failed to reset image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to reset image: {e}")
+
+    def reset_all_images(self):
+        try:
+            if not self.image_list:
+                QMessageBox.warning(self, "No Images", "No images loaded to reset.")
+                return
+
+            for idx, path in enumerate(self.image_list):
+                img = cv2.imread(path)
+                if img is not None:
+                    if img.shape[0] > 5000 or img.shape[1] > 5000:
+                        logging.warning(f"Image {path} exceeds maximum dimensions. Skipping.")
+                        continue
+                    self.augmented_images[idx] = img
+                    logging.debug(f"Image reset: {path}")
+                else:
+                    logging.warning(f"Failed to read image {path}. Skipping.")
+
+            self.load_current_image()
+            QMessageBox.information(self, "Reset All", "All images have been reset to their original state.")
+            logging.debug("All images reset successfully.")
+        except Exception as e:
+            logging.error(f"Failed to reset all images: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to reset all images: {e}")
+
+    def zoom_in(self):
+        try:
+            if self.current_image is not None:
+                self.zoom_level *= 1.25
+                if self.zoom_level > 5.0:
+                    self.zoom_level = 5.0
+                self.image_view.set_zoom(self.zoom_level)
+                logging.debug(f"Zoomed in to {self.zoom_level}x.")
+        except Exception as e:
+            logging.error(f"Failed to zoom in: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to zoom in: {e}")
+
+    def zoom_out(self):
+        try:
+            if self.current_image is not None:
+                self.zoom_level /= 1.25
+                if self.zoom_level < 0.1:
+                    self.zoom_level = 0.1
+                self.image_view.set_zoom(self.zoom_level)
+                logging.debug(f"Zoomed out to {self.zoom_level}x.")
+        except Exception as e:
+            logging.error(f"Failed to zoom out: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to zoom out: {e}")
+
+    def reset_sliders(self):
+        try:
+            # Reset all sliders to default values
+            self.white_balance_slider.setValue(0)
+            self.hsv_h_slider.setValue(0)
+            self.hsv_s_slider.setValue(0)
+            self.hsv_v_slider.setValue(0)
+            self.degrees_slider.setValue(0)
+            self.translate_slider.setValue(0)
+            self.scale_slider.setValue(100)
+            self.shear_slider.setValue(0)
+            self.noise_slider.setValue(0)
+
+            # Reset checkboxes
+            self.flipud_checkbox.setChecked(False)
+            self.fliplr_checkbox.setChecked(False)
+            self.padding_checkbox.setChecked(False)
+            self.border_selector.setCurrentText('reflect')
+
+            # Reset padding spin boxes
+            self.padding_width_spin.setValue(0)
+            self.padding_height_spin.setValue(0)
+
+            # Reset zoom level
+            self.zoom_level = 1.0
+            if self.current_image is not None:
+                self.display_image(self.current_image)
+
+            QMessageBox.information(self, "Sliders Reset", "All sliders and controls have been reset to default values.")
+            logging.debug("All sliders and controls reset successfully.")
+        except Exception as e:
+            logging.error(f"Failed to reset sliders: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to reset sliders: {e}")
+
+    def show_help(self):
+        help_text = (
+            "Image Augmentation Help:\n\n"
+            "1. **Load Image**: Load a single image for augmentation.\n"
+            "2. **Load Directory**: Load all supported images from a directory.\n"
+            "3. **Apply AUG**: Apply the selected augmentations to the current image.\n"
+            "4. **Apply AUG To All**: Apply the selected augmentations to all loaded images.\n"
+            "5. **Save Image**: Save the augmented version of the current image.\n"
+            "6. **Save All**: Save all augmented images to a selected folder.\n"
+            "7. **Reset Image**: Reset the current image to its original state.\n"
+            "8. **Reset All**: Reset all images to their original states.\n"
+            "9. **Reset Sliders**: Reset all augmentation parameters to their default values.\n"
+            "10. **Previous/Next**: Navigate through loaded images.\n"
+            "11. **Zoom In/Out**: Adjust the zoom level of the displayed image.\n\n"
+            "**Augmentation Parameters:**\n"
+            "- **White Balance**: Adjust the overall White Balance of the image.\n"
+            "- **HSV Hue/Saturation/Value**: Modify the color properties.\n"
+            "- **Rotation Degrees**: Rotate the image by the specified degrees.\n"
+            "- **Translate**: Shift the image horizontally and vertically.\n"
+            "- **Scale (%)**: Resize the image by the specified percentage.\n"
+            "- **Shear**: Apply a shearing transformation.\n"
+            "- **Noise Level**: Add random noise to the image.\n\n"
+            "**Flipping Options:**\n"
+            "- **Flip Up-Down**: Vertically flip the image.\n"
+            "- **Flip Left-Right**: Horizontally flip the image.\n\n"
+            "**Padding:**\n"
+            "- **Add Padding**: When checked, specify the desired total width and height in pixels.\n"
+            "- **Width (px)** and **Height (px)**: Enter the desired total dimensions. The application will calculate the necessary padding to reach these sizes.\n\n"
+            "Ensure that the desired padding dimensions are greater than or equal to the original image dimensions to prevent unexpected behavior."
+        )
+        QMessageBox.information(self, "Help", help_text)
+        logging.debug("Help dialog shown.")
+
+    def previous_image(self):
+        try:
+            if self.image_list and self.current_image_index > 0:
+                self.current_image_index -= 1
+                self.load_current_image()
+                logging.debug(f"Moved to previous image: Index {self.current_image_index}")
+            else:
+                QMessageBox.information(self, "Start", "This is the first image.")
+        except Exception as e:
+            logging.error(f"Failed to go to previous image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to go to previous image: {e}")
+
+    def next_image(self):
+        try:
+            if self.image_list and self.current_image_index < len(self.image_list) - 1:
+                self.current_image_index += 1
+                self.load_current_image()
+                logging.debug(f"Moved to next image: Index {self.current_image_index}")
+            else:
+                QMessageBox.information(self, "End", "This is the last image.")
+        except Exception as e:
+            logging.error(f"Failed to go to next image: {e}")
+            QMessageBox.critical(self, "Error", f"Failed to go to next image: {e}")
+
+
+def main():
+    app = QApplication(sys.argv)
+    window = ComprehensiveImageEditor()
+    window.show()
+    sys.exit(app.exec_())
+
+
+if __name__ == '__main__':
+    main()
+
+
+
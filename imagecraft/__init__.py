@@ -0,0 +1,4 @@
+"""
+Qt-free image pipelines behind the ImageCraft tabs, shared by the GUI
+(ImageCraft.py) and the headless batch CLI (python -m imagecraft).
+"""
@@ -0,0 +1,170 @@
+"""YOLO-style augmentation pipeline used by the Image Augmentation tab and the batch CLI."""
+
+import logging
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUGMENTATION_PARAMS = {
+    'white_balance': 0,
+    'hsv_h': 0,
+    'hsv_s': 0.0,
+    'hsv_v': 0.0,
+    'degrees': 0,
+    'translate': 0,
+    'scale': 1.0,
+    'shear': 0,
+    'noise': 0,
+    'flipud': False,
+    'fliplr': False,
+    'border': 'reflect',
+    'padding': False,
+    'padding_width': 0,
+    'padding_height': 0
+}
+
+# Fill for the pixels the geometric warp brings in from outside the image
+BORDER_MODES = {
+    'reflect': cv2.BORDER_REFLECT,
+    'replicate': cv2.BORDER_REPLICATE,
+    'constant': cv2.BORDER_CONSTANT,
+    'wrap': cv2.BORDER_WRAP,
+}
+
+
+def geometry_matrix(params, width, height):
+    """
+    Rotation, translation, scale and shear of params as one 2x3 affine matrix and the
+    (width, height) of its output, or None when they leave the image unchanged. The
+    steps compose in that order, as one warp each would: rotation about the centre
+    and translation keep the size, scale resizes the canvas like cv2.resize, and
+    shear widens it by the sheared height.
+    """
+    matrix = np.eye(3)
+    degrees = params['degrees']
+    if degrees != 0:
+        matrix = np.vstack([cv2.getRotationMatrix2D((width // 2, height // 2), degrees, 1.0), [0, 0, 1]]) @ matrix
+    translate = params['translate']
+    if translate != 0:
+        matrix = np.array([[1, 0, translate], [0, 1, translate], [0, 0, 1]]) @ matrix
+    scale = params['scale']
+    if scale != 1.0:
+        # cv2.resize aligns pixel centres: x' = (x + 0.5) * scale - 0.5
+        offset = 0.5 * scale - 0.5
+        matrix = np.array([[scale, 0, offset], [0, scale, offset], [0, 0, 1]]) @ matrix
+        width, height = max(1, round(width * scale)), max(1, round(height * scale))
+    shear = params['shear']
+    if shear != 0:
+        tan = np.tan(np.radians(shear))
+        matrix = np.array([[1, tan, 0], [0, 1, 0], [0, 0, 1]]) @ matrix
+        width += int(abs(tan) * height)
+    if np.array_equal(matrix, np.eye(3)):
+        return None
+    return matrix[:2], (width, height)
+
+
+def augment_image(img, params):
+    """
+    Apply the augmentation pipeline and return the result; img is not modified.
+    Padding is skipped (and logged) when the requested size is smaller than the result.
+    img is a BGR frame, as decoded by OpenCV.
+    """
+    # Apply white balance
+    wb_value = params['white_balance']
+    if wb_value != 0:
+        if wb_value > 0:
+            img = cv2.convertScaleAbs(img, alpha=1, beta=wb_value * 2.55)
+        elif wb_value < 0:
+            factor = 1 + (wb_value / 100.0)
+            img = cv2.convertScaleAbs(img, alpha=factor, beta=0)
+
+    # Apply HSV adjustments
+    hsv_h = params['hsv_h']
+    hsv_s = params['hsv_s']
+    hsv_v = params['hsv_v']
+    if hsv_h != 0 or hsv_s != 0 or hsv_v != 0:
+        hsv = cv2.cvtColor(img, cv2.COLOR_BGR2HSV).astype(float)
+        hsv[:, :, 0] = (hsv[:, :, 0] + hsv_h) % 180
+        hsv[:, :, 1] = np.clip(hsv[:, :, 1] * (1 + hsv_s), 0, 255)
+        hsv[:, :, 2] = np.clip(hsv[:, :, 2] * (1 + hsv_v), 0, 255)
+        hsv = hsv.astype(np.uint8)
+        img = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+
+    # Apply rotation, translation, scaling and shear in one resample
+    border = BORDER_MODES.get(params['border'])
+    if border is None:
+        raise ValueError(f"Unknown border mode {params['border']!r}; expected one of {', '.join(BORDER_MODES)}")
+    geometry = geometry_matrix(params, img.shape[1], img.shape[0])
+    if geometry is not None:
+        matrix, size = geometry
+        if params['degrees'] == params['translate'] == params['shear'] == 0:
+            # Scaling alone samples nothing outside the image, and cv2.resize is faster. Pass
+            # fx/fy rather than size: with a size, resize maps by width/new_width instead
+            img = cv2.resize(img, None, fx=params['scale'], fy=params['scale'], interpolation=cv2.INTER_LINEAR)
+        else:
+            img = cv2.warpAffine(img, matrix, size, flags=cv2.INTER_LINEAR, borderMode=border)
+
+    # Apply noise
+    noise_level = params['noise']
+    if noise_level > 0:
+        noise = np.random.randint(0, noise_level, img.shape, dtype='uint8')
+        img = cv2.add(img, noise)
+
+    # Apply flipping
+    if params['flipud']:
+        img = cv2.flip(img, 0)  # Flip vertically
+    if params['fliplr']:
+        img = cv2.flip(img, 1)  # Flip horizontally
+
+    # Apply padding if enabled
+    if params['padding']:
+        desired_width = params['padding_width']
+        desired_height = params['padding_height']
+
+        if desired_width < img.shape[1] or desired_height < img.shape[0]:
+            logger.warning("Desired padding dimensions are smaller than current dimensions. Skipping padding.")
+        else:
+            img = apply_padding(img, desired_width, desired_height)
+
+    return img
+
+
+def padding_was_skipped(img, params):
+    return params['padding'] and (
+        img.shape[1] > params['padding_width'] or img.shape[0] > params['padding_height']
+    )
+
+
+def apply_padding(img, desired_width, desired_height):
+    try:
+        original_height, original_width = img.shape[:2]
+
+        # Calculate required padding
+        pad_width = max(desired_width - original_width, 0)
+        pad_height = max(desired_height - original_height, 0)
+
+        pad_left = pad_width // 2
+        pad_right = pad_width - pad_left
+        pad_top = pad_height // 2
+        pad_bottom = pad_height - pad_top
+
+        if pad_width > 0 or pad_height > 0:
+            img = cv2.copyMakeBorder(
+                img,
+                top=pad_top,
+                bottom=pad_bottom,
+                left=pad_left,
+                right=pad_right,
+                borderType=cv2.BORDER_CONSTANT,
+                value=[255, 255, 255]  # White padding
+            )
+            logger.debug(f"Applied padding: Left={pad_left}px, Right={pad_right}px, Top={pad_top}px, Bottom={pad_bottom}px")
+        else:
+            logger.debug("No padding applied as desired size is smaller or equal to original size.")
+
+        return img
+    except Exception as e:
+        logger.error(f"Failed to apply padding: {e}")
+        return img  # Return original image if padding fails
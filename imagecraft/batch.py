@@ -0,0 +1,59 @@
+"""Thread-pool batch runner shared by the GUI workers and the headless CLI."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import cv2
+
+
+def run_batch(paths, process, max_workers=None, chunk_size=1, is_cancelled=None):
+    """
+    Run process(path) for every path on a thread pool and yield (path, result, error)
+    as files complete. OpenCV releases the GIL inside decode, warp and encode calls,
+    so the pool scales across cores. Paths are handed out in chunks of chunk_size and
+    only a bounded window of chunks is in flight, which keeps memory flat and lets
+    is_cancelled() stop the batch quickly.
+    """
+    paths = list(paths)
+    max_workers = max_workers or os.cpu_count() or 1
+    chunk_size = max(1, chunk_size)
+    chunks = iter([paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)])
+
+    def process_chunk(chunk):
+        results = []
+        for path in chunk:
+            try:
+                results.append((path, process(path), None))
+            except Exception as e:
+                results.append((path, None, e))
+        return results
+
+    pending = set()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            while len(pending) < 2 * max_workers and not (is_cancelled and is_cancelled()):
+                chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                pending.add(executor.submit(process_chunk, chunk))
+            if not pending:
+                break
+
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                yield from future.result()
+
+
+def read_image(path, flags=cv2.IMREAD_COLOR):
+    img = cv2.imread(path, flags)
+    if img is None:
+        raise ValueError("Image data is None. Possibly unsupported image format or corrupted file.")
+    return img
+
+
+def write_image(save_path, img_bgr):
+    # Outputs mirror the subfolders of recursively loaded inputs, so create them on the way
+    os.makedirs(os.path.dirname(save_path) or '.', exist_ok=True)
+    if not cv2.imwrite(save_path, img_bgr):
+        raise ValueError(f"Failed to write {save_path}")
+
@@ -0,0 +1,131 @@
+"""Speed/recall benchmark of the HCT detection modes and backends on synthetic circle images."""
+
+import os
+import shutil
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from . import hct
+
+
+def synthetic_circles(width, height, count, min_radius, max_radius, rng, noise=20):
+    """
+    BGR image with up to count non-overlapping dark discs on a noisy light background,
+    and the (x, y, r) of every disc drawn.
+    """
+    img = np.full((height, width, 3), 190, np.uint8)
+    truth = []
+    for _ in range(count * 20):
+        if len(truth) == count:
+            break
+        r = int(rng.integers(min_radius, max_radius + 1))
+        if 2 * r >= min(width, height):
+            continue
+        x = int(rng.integers(r, width - r))
+        y = int(rng.integers(r, height - r))
+        if all((x - tx) ** 2 + (y - ty) ** 2 > (r + tr + 4) ** 2 for tx, ty, tr in truth):
+            shade = int(rng.integers(30, 110))
+            cv2.circle(img, (x, y), r, (shade, shade, shade), -1, cv2.LINE_AA)
+            truth.append((x, y, r))
+    noise_img = rng.normal(0, noise, img.shape)
+    img = np.clip(img + noise_img, 0, 255).astype(np.uint8)
+    return img, truth
+
+
+def match_circles(detected, truth):
+    """
+    Greedily pair detections with true circles whose centre lies within a tenth of
+    the true radius (at least 3 px). Returns (matches, centre errors, radius errors).
+    """
+    detected = [] if detected is None else [tuple(c) for c in detected[0, :].astype(float)]
+    used = set()
+    centre_errors, radius_errors = [], []
+    for tx, ty, tr in truth:
+        tolerance = max(3.0, 0.1 * tr)
+        best, best_distance = None, None
+        for i, (x, y, r) in enumerate(detected):
+            distance = np.hypot(x - tx, y - ty)
+            if i not in used and distance <= tolerance and (best is None or distance < best_distance):
+                best, best_distance = i, distance
+        if best is not None:
+            used.add(best)
+            centre_errors.append(best_distance)
+            radius_errors.append(abs(detected[best][2] - tr))
+    return len(used), centre_errors, radius_errors
+
+
+def benchmark_params(min_radius, max_radius, backend='opencv'):
+    """HCT parameters bracketing the synthetic radius range, with the backend's own defaults."""
+    return dict(
+        hct.DEFAULT_HCT_PARAMS,
+        **hct.circle_backend(backend).defaults,
+        minDist=int(min_radius * 1.8),  # The synthetic circles never overlap
+        minRadius=int(min_radius * 0.9),
+        maxRadius=int(max_radius * 1.1)
+    )
+
+
+def run_hct_benchmark(modes=hct.DETECTION_MODES, images=4, width=6000, height=4000, count=10,
+                      min_radius=100, max_radius=300, params=None, image_format='jpg', seed=0, backends=('opencv',)):
+    """
+    Write synthetic images to a temp folder and time detect_circles_in_file for each
+    mode and backend, decode included. Returns one dict per pair with seconds per
+    image, recall, precision and mean centre/radius errors in pixels. Without params
+    each backend gets benchmark_params.
+    """
+    rng = np.random.default_rng(seed)
+    workdir = tempfile.mkdtemp(prefix="imagecraft_bench_")
+    try:
+        samples = []
+        for i in range(images):
+            img, truth = synthetic_circles(width, height, count, min_radius, max_radius, rng)
+            path = os.path.join(workdir, f"circles_{i}.{image_format}")
+            cv2.imwrite(path, img)
+            samples.append((path, truth))
+
+        rows = []
+        for mode, backend in [(mode, backend) for backend in backends for mode in modes]:
+            backend_params = params or benchmark_params(min_radius, max_radius, backend)
+            elapsed = 0.0
+            true_total = detected_total = matched_total = 0
+            centre_errors, radius_errors = [], []
+            for path, truth in samples:
+                start = time.perf_counter()
+                circles = hct.detect_circles_in_file(path, backend_params, mode, backend=backend)
+                elapsed += time.perf_counter() - start
+
+                matches, centres, radii = match_circles(circles, truth)
+                true_total += len(truth)
+                detected_total += 0 if circles is None else circles.shape[1]
+                matched_total += matches
+                centre_errors.extend(centres)
+                radius_errors.extend(radii)
+            rows.append({
+                'size': f"{width}x{height}",
+                'mode': mode,
+                'backend': backend,
+                'seconds_per_image': elapsed / len(samples),
+                'recall': matched_total / true_total if true_total else 0.0,
+                'precision': matched_total / detected_total if detected_total else 0.0,
+                'centre_error': float(np.mean(centre_errors)) if centre_errors else float('nan'),
+                'radius_error': float(np.mean(radius_errors)) if radius_errors else float('nan'),
+            })
+        return rows
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def format_rows(rows):
+    lines = [
+        f"{'size':<11}{'mode':<10}{'backend':<12}{'s/image':>10}{'recall':>9}{'precision':>11}"
+        f"{'centre px':>11}{'radius px':>11}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['size']:<11}{row['mode']:<10}{row['backend']:<12}{row['seconds_per_image']:>10.3f}{row['recall']:>9.3f}{row['precision']:>11.3f}"
+            f"{row['centre_error']:>11.2f}{row['radius_error']:>11.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,184 @@
+"""Columnar bounding-box store: one NumPy structured array per image, indexed by image id."""
+
+import threading
+
+import numpy as np
+
+# 22 bytes per box; image ids live in the index, not in every row. radius is the
+# detected circle's radius, 0 for boxes that did not come from a circle
+BOX_DTYPE = np.dtype([
+    ('x', np.int32), ('y', np.int32), ('w', np.int32), ('h', np.int32), ('class', np.uint16), ('radius', np.float32)
+])
+YOLO_FIELDS = ['x', 'y', 'w', 'h', 'class']
+QUERY_DTYPE = np.dtype(BOX_DTYPE.descr + [('image', np.uint32)])
+
+
+def empty_boxes():
+    return np.zeros(0, BOX_DTYPE)
+
+
+def boxes_from_circles(circles, offset, class_num, shape):
+    """
+    Boxes around each circle of a (1, N, 3) HoughCircles result, grown by offset and
+    clipped to the image, as a BOX_DTYPE array. Vectorized; truncates like int().
+    """
+    height, width = shape[:2]
+    if circles is None:
+        return empty_boxes()
+    circles = np.asarray(circles).reshape(-1, 3)
+    cx, cy, r = circles.astype(np.int64).T
+    boxes = np.empty(len(cx), BOX_DTYPE)
+    boxes['x'] = np.maximum(cx - r - offset, 0)
+    boxes['y'] = np.maximum(cy - r - offset, 0)
+    boxes['w'] = np.minimum(2 * r + 2 * offset, width - boxes['x'])
+    boxes['h'] = np.minimum(2 * r + 2 * offset, height - boxes['y'])
+    boxes['class'] = class_num
+    boxes['radius'] = circles[:, 2]
+    return boxes
+
+
+def box_tuples(boxes):
+    """(x, y, w, h, class) tuples of a BOX_DTYPE array."""
+    return boxes[YOLO_FIELDS].tolist()
+
+
+def as_box_array(boxes):
+    """BOX_DTYPE array from a BOX_DTYPE array or an iterable of (x, y, w, h, class[, radius])."""
+    if isinstance(boxes, np.ndarray) and boxes.dtype == BOX_DTYPE:
+        return boxes
+    boxes = [tuple(box) + (0,) * (len(BOX_DTYPE) - len(box)) for box in boxes]
+    return np.array(boxes, BOX_DTYPE) if boxes else empty_boxes()
+
+
+class BoxStore:
+    """
+    Bounding boxes of many images. Each image gets a stable integer id and one
+    BOX_DTYPE array; setting an image's boxes replaces them, so rerunning detection
+    never duplicates. The image size seen at detection time is kept alongside, so
+    exporters need not open the image again. Queries by class or size run over a
+    concatenated copy of every image's boxes with their image ids, rebuilt only after
+    the store changes.
+    """
+
+    def __init__(self):
+        self._paths = []  # image id -> path
+        self._ids = {}    # path -> image id
+        self._boxes = {}  # image id -> BOX_DTYPE array, only for images that have boxes
+        self._sizes = {}  # image id -> (width, height) at detection time
+        self._merged = None  # QUERY_DTYPE array of every box, or None when stale
+        self._lock = threading.Lock()
+
+    def image_id(self, path):
+        """The id of path, registering it on first use."""
+        with self._lock:
+            image_id = self._ids.get(path)
+            if image_id is None:
+                image_id = self._ids[path] = len(self._paths)
+                self._paths.append(path)
+            return image_id
+
+    def path(self, image_id):
+        return self._paths[image_id]
+
+    def set(self, path, boxes, size=None):
+        """
+        Replace the boxes of path with boxes (a BOX_DTYPE array or (x, y, w, h, class)
+        tuples), recording the image's (width, height) when size is given.
+        """
+        boxes = as_box_array(boxes)
+        image_id = self.image_id(path)
+        with self._lock:
+            if size is not None:
+                self._sizes[image_id] = (int(size[0]), int(size[1]))
+            if len(boxes):
+                self._boxes[image_id] = boxes
+            else:
+                self._boxes.pop(image_id, None)
+            self._merged = None
+
+    def set_circles(self, path, circles, offset, class_num, shape):
+        """Replace the boxes of path with the boxes around circles; returns them."""
+        boxes = boxes_from_circles(circles, offset, class_num, shape)
+        self.set(path, boxes, (shape[1], shape[0]))
+        return boxes
+
+    def get(self, path):
+        """The BOX_DTYPE boxes of path; empty when it has none."""
+        image_id = self._ids.get(path)
+        return self._boxes.get(image_id, empty_boxes()) if image_id is not None else empty_boxes()
+
+    def size(self, path):
+        """(width, height) of path recorded at detection time, or None."""
+        return self._sizes.get(self._ids.get(path))
+
+    def coordinates(self, path):
+        """(N, 4) int32 x, y, w, h of the boxes of path."""
+        boxes = self.get(path)
+        return np.stack([boxes['x'], boxes['y'], boxes['w'], boxes['h']], axis=1)
+
+    def remove(self, path):
+        image_id = self._ids.get(path)
+        with self._lock:
+            if self._boxes.pop(image_id, None) is not None:
+                self._merged = None
+
+    def clear(self):
+        with self._lock:
+            self._boxes.clear()
+            self._merged = None
+
+    def __contains__(self, path):
+        return self._ids.get(path) in self._boxes
+
+    def __len__(self):
+        """Number of images with boxes."""
+        return len(self._boxes)
+
+    def __bool__(self):
+        return bool(self._boxes)
+
+    def items(self):
+        """(path, boxes) of every image with boxes, in the order the images were first seen."""
+        return [(self._paths[image_id], self._boxes[image_id]) for image_id in sorted(self._boxes)]
+
+    @property
+    def count(self):
+        return sum(len(boxes) for boxes in self._boxes.values())
+
+    @property
+    def nbytes(self):
+        return sum(boxes.nbytes for boxes in self._boxes.values())
+
+    def merged(self):
+        """Every box with its image id, as one QUERY_DTYPE array ordered by image id."""
+        with self._lock:
+            if self._merged is None:
+                ids = sorted(self._boxes)
+                arrays = [self._boxes[image_id] for image_id in ids]
+                boxes = np.concatenate(arrays) if arrays else empty_boxes()
+                merged = np.empty(len(boxes), QUERY_DTYPE)
+                for name in BOX_DTYPE.names:
+                    merged[name] = boxes[name]
+                merged['image'] = np.repeat(np.array(ids, np.uint32), [len(a) for a in arrays])
+                self._merged = merged
+            return self._merged
+
+    def query(self, class_num=None, min_size=None, max_size=None, paths=None):
+        """
+        Boxes matching every given filter, as QUERY_DTYPE records. Size is the larger
+        box side in pixels; paths limits the search to those images.
+        """
+        merged = self.merged()
+        keep = np.ones(len(merged), bool)
+        if class_num is not None:
+            keep &= merged['class'] == class_num
+        if min_size is not None or max_size is not None:
+            size = np.maximum(merged['w'], merged['h'])
+            if min_size is not None:
+                keep &= size >= min_size
+            if max_size is not None:
+                keep &= size <= max_size
+        if paths is not None:
+            ids = [self._ids[path] for path in paths if path in self._ids]
+            keep &= np.isin(merged['image'], ids)
+        return merged[keep]
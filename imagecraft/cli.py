@@ -0,0 +1,347 @@
+"""
+Headless batch entry point:
+
+    python -m imagecraft batch transform --params params.json --input IN --output OUT
+    python -m imagecraft batch hct --params params.json --input IN --labels LABELS --no-images
+    python -m imagecraft batch hct --params params.json --roi rois.json --input IN --output OUT
+    python -m imagecraft batch augment --params params.json --input IN --output OUT
+    python -m imagecraft bench hct --detection full pyramid
+    python -m imagecraft bench hct --detection full --backend opencv opencv_alt contour --size 1500x1000 6000x4000
+    python -m imagecraft tune hct --input IN --labels LABELS --output tuned.json
+    python -m imagecraft video hct --input VIDEO --params params.json --labels LABELS
+
+Runs the same pipelines as the GUI tabs without importing PyQt5.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from . import augment, bench, hct, transform, tune, video
+from .batch import read_image, run_batch, write_image
+from .export import label_path
+from .index import image_root, list_images, read_image_size, relative_image_path
+from .preprocess import PreprocessCache
+from .roi import RoiSet
+from .params import (
+    augmentation_params_from_dict, hct_params_from_dict, load_params, save_params,
+    transformation_params_from_dict
+)
+
+OUTPUT_FORMATS = ('same', 'png', 'jpg', 'bmp')
+
+
+def collect_inputs(inputs, recursive=False):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(list_images(item, recursive))
+        elif os.path.isfile(item):
+            paths.append(item)
+        else:
+            raise FileNotFoundError(f"No such file or directory: {item}")
+    return paths
+
+
+def input_root(inputs, paths):
+    """The folder outputs mirror the subfolders of: the input folder when there is just one."""
+    folder = inputs[0] if len(inputs) == 1 and os.path.isdir(inputs[0]) else None
+    return image_root(paths, folder)
+
+
+def output_path(folder, path, output_format, root=None):
+    name = relative_image_path(path, root)
+    if output_format != 'same':
+        name = os.path.splitext(name)[0] + '.' + output_format
+    return os.path.join(folder, name)
+
+
+def make_transform_job(args, sections, root):
+    params = transformation_params_from_dict(sections.get('transform'))
+    remap_cache = transform.RemapCache()
+
+    def process(path):
+        # Geometry does not depend on channel order, so stay in BGR from decode to encode
+        img = read_image(path)
+        write_image(output_path(args.output, path, args.format, root),
+                    transform.apply_transformations_cached(img, params, remap_cache))
+
+    return process
+
+
+def load_rois(roi_path, sections):
+    """The RoiSet of the roi section of roi_path when given, else of the parameter file."""
+    return RoiSet.from_dict((load_params(roi_path) if roi_path else sections).get('roi'))
+
+
+def make_hct_job(args, sections, root):
+    params, offset, class_num = hct_params_from_dict(sections.get('hct'))
+    rois = load_rois(args.roi, sections)
+    labels_dir = args.labels or args.output
+    # Each file is seen once per run, so only a persistent cache can be reused
+    cache = PreprocessCache(max_bytes=0, cache_dir=args.cache_dir) if args.cache_dir else None
+    # Files already run one per worker thread; only a single worker leaves room for tile threads
+    tile_workers = None if args.workers == 1 else 1
+
+    def process(path):
+        if args.no_images:
+            # Labels only: decode straight to grayscale, and never allocate the colour frame
+            img = None
+            width, height = read_image_size(path)
+        else:
+            img = read_image(path)
+            height, width = img.shape[:2]
+        # With --no-images and --cache-dir a cache hit skips the decode as well as the blur
+        circles = hct.detect_circles_in_file(
+            path, params, args.detection, cache, args.backend, rois.for_path(path), tile_workers
+        )
+        boxes = []
+        if circles is not None:
+            if args.no_images:
+                boxes = hct.circles_to_boxes(circles, offset, class_num, (height, width))
+            else:
+                boxes = hct.draw_circles(img, circles, offset, class_num)
+        if not args.no_images:
+            write_image(output_path(args.output, path, args.format, root), img)
+        if labels_dir:
+            annotation_path = label_path(labels_dir, path, '.txt', root)
+            os.makedirs(os.path.dirname(annotation_path), exist_ok=True)
+            hct.write_yolo_labels(annotation_path, boxes, width, height)
+        return len(boxes)
+
+    return process
+
+
+def make_augment_job(args, sections, root):
+    params = augmentation_params_from_dict(sections.get('augment'))
+
+    def process(path):
+        img = augment.augment_image(read_image(path), params)
+        write_image(output_path(args.output, path, args.format, root), img)
+
+    return process
+
+
+JOBS = {
+    'transform': make_transform_job,
+    'hct': make_hct_job,
+    'augment': make_augment_job
+}
+
+
+def run_batch_command(args):
+    if args.task == 'hct':
+        if args.no_images and not (args.labels or args.output):
+            raise SystemExit("hct --no-images needs --labels or --output")
+        if not args.no_images and not args.output:
+            raise SystemExit("--output is required unless --no-images is given")
+    elif not args.output:
+        raise SystemExit("--output is required")
+
+    for folder in (args.output, getattr(args, 'labels', None)):
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+
+    sections = load_params(args.params) if args.params else {}
+    paths = collect_inputs(args.input, args.recursive)
+    process = JOBS[args.task](args, sections, input_root(args.input, paths))
+
+    failures = []
+    start = time.perf_counter()
+    done = 0
+    for path, _, error in run_batch(paths, process, args.workers, args.chunk_size):
+        done += 1
+        if error is not None:
+            failures.append((path, error))
+        if not args.quiet and (done % 50 == 0 or done == len(paths)):
+            elapsed = time.perf_counter() - start
+            rate = done / elapsed if elapsed > 0 else 0.0
+            print(f"\r{done}/{len(paths)} images ({rate:.1f} images/s)", end='', file=sys.stderr, flush=True)
+    if not args.quiet and paths:
+        print(file=sys.stderr)
+
+    for path, error in failures:
+        print(f"Failed: {path}: {error}", file=sys.stderr)
+    print(f"Processed {done - len(failures)} of {len(paths)} images in {time.perf_counter() - start:.2f}s.",
+          file=sys.stderr)
+    return 1 if failures else 0
+
+
+def parse_size(text):
+    width, _, height = text.lower().partition('x')
+    return int(width), int(height)
+
+
+def run_bench_command(args):
+    params = None
+    if args.params:
+        params, _, _ = hct_params_from_dict(load_params(args.params).get('hct'))
+    sizes = ', '.join(f"{width}x{height}" for width, height in args.size)
+    print(f"{args.images} synthetic {sizes} {args.format} images, "
+          f"{args.circles} circles of radius {args.radius[0]}-{args.radius[1]} px each", file=sys.stderr)
+    rows = []
+    for width, height in args.size:
+        rows.extend(bench.run_hct_benchmark(
+            args.detection, args.images, width, height, args.circles, args.radius[0], args.radius[1],
+            params, args.format, args.seed, args.backend
+        ))
+    print(bench.format_rows(rows))
+    return 0
+
+
+def parse_grid_values(text):
+    name, _, values = text.partition('=')
+    if name not in tune.TUNED_PARAMS or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=V1,V2,... with NAME one of {', '.join(tune.TUNED_PARAMS)}")
+    cast = float if name == 'dp' else int
+    return name, [cast(value) for value in values.split(',')]
+
+
+def run_tune_command(args):
+    sections = load_params(args.params) if args.params else {}
+    base, offset, class_num = hct_params_from_dict(sections.get('hct'))
+    if args.offset is not None:
+        offset = args.offset
+    paths = collect_inputs(args.input, args.recursive)
+    samples = tune.load_reference_set(paths, args.labels, input_root(args.input, paths))
+    rois = load_rois(args.roi, sections)
+    tuner = tune.Tuner(samples, offset, class_num, args.iou, args.detection, args.backend, args.workers, rois=rois)
+    space = tune.default_search_space(samples, offset)
+    space['param1'] = tuner.usable_canny_thresholds(space['param1'])
+    space.update(dict(args.grid or []))
+    configs = tune.expand_grid(space, base)
+    print(f"{len(configs)} parameter sets, {len(samples)} labelled images, {args.search} search", file=sys.stderr)
+
+    start = time.perf_counter()
+
+    def progress(done, total):
+        if not args.quiet:
+            print(f"\r{done}/{total} trials ({time.perf_counter() - start:.1f}s)", end='', file=sys.stderr, flush=True)
+
+    if args.search == 'halving':
+        results = tuner.successive_halving(configs, args.eta, progress)
+    else:
+        results = tuner.grid_search(configs, progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+
+    print(tune.format_results(tune.pareto_frontier(results)))
+    best = min(results, key=tune.rank_key)
+    if args.output:
+        sections['hct'] = dict(base, **best['params'], offset=offset, class_num=class_num)
+        save_params(args.output, sections)
+        print(f"Saved the best parameters (F1 {best['f1']:.3f}) to {args.output}", file=sys.stderr)
+    return 0
+
+
+def run_video_command(args):
+    sections = load_params(args.params) if args.params else {}
+    params, offset, class_num = hct_params_from_dict(sections.get('hct'))
+    rois = load_rois(args.roi, sections).for_path(args.input)
+    start = time.perf_counter()
+
+    def progress(done, total):
+        if not args.quiet:
+            print(f"\r{done}/{total} frames ({time.perf_counter() - start:.1f}s)", end='', file=sys.stderr, flush=True)
+
+    stats = video.label_video(
+        args.input, params, args.labels, offset, class_num, args.frames, args.frame_format,
+        args.keyframe_interval, args.backend, progress, rois=rois
+    )
+    if not args.quiet:
+        print(file=sys.stderr)
+    frames = max(1, stats['frames'])
+    print(f"{stats['frames']} frames: {stats['keyframes']} full detections ({stats['fallbacks']} after lost tracks), "
+          f"{stats['tracked']} tracked, {stats['detect_seconds'] / frames * 1000:.1f} ms detection per frame")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m imagecraft', description="ImageCraft headless tools.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help="Run a tab pipeline over files or folders.")
+    batch.add_argument('task', choices=sorted(JOBS), help="Pipeline to run.")
+    batch.add_argument('--params', help="JSON parameter file (File > Export Batch Parameters in the GUI).")
+    batch.add_argument('--input', nargs='+', required=True, help="Image files and/or folders.")
+    batch.add_argument('--recursive', action='store_true', help="Include images in subfolders of input folders.")
+    batch.add_argument('--output', help="Folder for processed images.")
+    batch.add_argument('--labels', help="hct: folder for YOLO .txt labels (defaults to --output).")
+    batch.add_argument('--no-images', action='store_true', help="hct: write labels only.")
+    batch.add_argument('--detection', choices=hct.DETECTION_MODES, default='full',
+                       help="hct: full resolution, a 2x/4x/8x reduced decode, reduced candidates "
+                            "refined at full resolution (pyramid), or full resolution on overlapping tiles "
+                            "(tiled, needs maxRadius). Reduction is chosen from minRadius.")
+    batch.add_argument('--backend', choices=hct.HCT_BACKENDS, default='opencv',
+                       help="hct: circle detector; opencv_alt and contour read param2 as a percentage.")
+    batch.add_argument('--roi', help="hct: JSON file whose roi section limits detection to regions of interest "
+                                      "(default: the roi section of --params).")
+    batch.add_argument('--cache-dir', help="hct: keep blurred grayscale inputs here so reruns with new parameters skip decode and blur.")
+    batch.add_argument('--format', choices=OUTPUT_FORMATS, default='same', help="Output image format.")
+    batch.add_argument('--workers', type=int, default=None, help="Worker threads (default: CPU count).")
+    batch.add_argument('--chunk-size', type=int, default=1, help="Files handed to a worker at a time.")
+    batch.add_argument('--quiet', action='store_true', help="Do not print progress.")
+    batch.set_defaults(func=run_batch_command)
+
+    bench_parser = commands.add_parser('bench', help="Benchmark detection modes and backends on synthetic images.")
+    bench_parser.add_argument('task', choices=['hct'], help="Pipeline to benchmark.")
+    bench_parser.add_argument('--detection', nargs='+', choices=hct.DETECTION_MODES, default=list(hct.DETECTION_MODES),
+                              help="Detection modes to compare.")
+    bench_parser.add_argument('--backend', nargs='+', choices=hct.HCT_BACKENDS, default=['opencv'],
+                              help="Circle detectors to compare.")
+    bench_parser.add_argument('--params', help="JSON parameter file; by default parameters bracket --radius.")
+    bench_parser.add_argument('--images', type=int, default=4, help="Number of synthetic images.")
+    bench_parser.add_argument('--size', type=parse_size, nargs='+', default=[(6000, 4000)],
+                              help="Image sizes as WIDTHxHEIGHT; each gets its own synthetic images.")
+    bench_parser.add_argument('--circles', type=int, default=10, help="Circles per image.")
+    bench_parser.add_argument('--radius', type=int, nargs=2, default=(100, 300), metavar=('MIN', 'MAX'),
+                              help="Radius range of the synthetic circles.")
+    bench_parser.add_argument('--format', choices=('jpg', 'png'), default='jpg', help="Encoding of the synthetic images.")
+    bench_parser.add_argument('--seed', type=int, default=0, help="Random seed.")
+    bench_parser.set_defaults(func=run_bench_command)
+
+    tune_parser = commands.add_parser('tune', help="Search parameters that reproduce reference labels.")
+    tune_parser.add_argument('task', choices=['hct'], help="Pipeline to tune.")
+    tune_parser.add_argument('--input', nargs='+', required=True, help="Image files and/or folders.")
+    tune_parser.add_argument('--recursive', action='store_true', help="Include images in subfolders of input folders.")
+    tune_parser.add_argument('--labels', required=True, help="Folder of reference YOLO .txt labels; unlabelled images are skipped.")
+    tune_parser.add_argument('--params', help="JSON parameter file with the starting hct section and box offset.")
+    tune_parser.add_argument('--roi', help="JSON file whose roi section limits detection and scoring to regions of "
+                                           "interest (default: the roi section of --params).")
+    tune_parser.add_argument('--output', help="Write --params with the best hct parameters to this JSON file.")
+    tune_parser.add_argument('--search', choices=tune.SEARCH_METHODS, default='halving',
+                             help="Successive halving (scores everything on a few images first) or the full grid.")
+    tune_parser.add_argument('--eta', type=int, default=3, help="halving: keep 1/ETA of the parameter sets per round.")
+    tune_parser.add_argument('--grid', type=parse_grid_values, action='append', metavar='NAME=V1,V2',
+                             help="Replace the candidate values of one parameter; repeatable.")
+    tune_parser.add_argument('--offset', type=int, help="Box offset the reference labels were drawn with.")
+    tune_parser.add_argument('--iou', type=float, default=tune.DEFAULT_IOU_THRESHOLD, help="IoU for a detection to match a label.")
+    tune_parser.add_argument('--detection', choices=hct.DETECTION_MODES, default='full', help="Detection mode to tune.")
+    tune_parser.add_argument('--backend', choices=hct.HCT_BACKENDS, default='opencv', help="Circle detector.")
+    tune_parser.add_argument('--workers', type=int, default=None, help="Worker threads (default: CPU count).")
+    tune_parser.add_argument('--quiet', action='store_true', help="Do not print progress.")
+    tune_parser.set_defaults(func=run_tune_command)
+
+    video_parser = commands.add_parser('video', help="Label circles through a video or frame sequence.")
+    video_parser.add_argument('task', choices=['hct'], help="Pipeline to run.")
+    video_parser.add_argument('--input', required=True,
+                              help="Video file, image sequence pattern (frames/img_%%04d.png) or folder of frames.")
+    video_parser.add_argument('--params', help="JSON parameter file (File > Export Batch Parameters in the GUI).")
+    video_parser.add_argument('--roi', help="JSON file whose roi section limits detection to regions of interest "
+                                            "(default: the roi section of --params).")
+    video_parser.add_argument('--labels', required=True, help="Folder for one YOLO .txt label file per frame.")
+    video_parser.add_argument('--frames', help="Also write every frame here, named like its label file.")
+    video_parser.add_argument('--frame-format', choices=('jpg', 'png', 'bmp'), default='jpg', help="Format of --frames.")
+    video_parser.add_argument('--keyframe-interval', type=int, default=video.DEFAULT_KEYFRAME_INTERVAL,
+                              help="Run full-frame detection every N frames; frames in between track the previous circles.")
+    video_parser.add_argument('--backend', choices=hct.HCT_BACKENDS, default='opencv',
+                              help="Circle detector.")
+    video_parser.add_argument('--quiet', action='store_true', help="Do not print progress.")
+    video_parser.set_defaults(func=run_video_command)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
@@ -0,0 +1,50 @@
+"""Circle detection from blob outlines instead of Hough votes: threshold, trace, fit."""
+
+import math
+
+import cv2
+import numpy as np
+
+
+def contour_circles(blurred, params):
+    """
+    Circles of the Otsu-thresholded blobs of a blurred grayscale frame, dark on light
+    or light on dark. Each outline is fitted with cv2.fitEllipse (centre, and the mean
+    semi-axis as radius) and kept when that radius is within minRadius..maxRadius (0:
+    no limit) and the blob fills at least param2 percent of its cv2.minEnclosingCircle.
+    Circles closer than minDist keep the rounder one. dp and param1 are not used.
+    Returns (1, N, 3) float32 like cv2.HoughCircles, or None.
+    """
+    min_radius, max_radius = params['minRadius'], params['maxRadius']
+    min_roundness = min(params['param2'], 100) / 100
+    _, binary = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    # RETR_LIST traces blobs and the holes in them, so discs of either polarity get an outline
+    contours, _ = cv2.findContours(binary, cv2.RETR_LIST, cv2.CHAIN_APPROX_NONE)
+
+    # An outline shorter than the circumference of the smallest circle cannot be one
+    min_length = max(5, math.pi * min_radius)
+    found = []
+    for contour in contours:
+        if len(contour) < min_length:
+            continue
+        _, r_enclosing = cv2.minEnclosingCircle(contour)
+        if r_enclosing < min_radius or (max_radius > 0 and r_enclosing > max_radius * 1.5):
+            continue
+        roundness = cv2.contourArea(contour) / (math.pi * r_enclosing ** 2)
+        if roundness < min_roundness:
+            continue
+        (cx, cy), (axis_a, axis_b), _ = cv2.fitEllipse(contour)
+        r = (axis_a + axis_b) / 4
+        if r < min_radius or (max_radius > 0 and r > max_radius):
+            continue
+        found.append((cx, cy, r, roundness))
+    if not found:
+        return None
+
+    found.sort(key=lambda circle: -circle[3])
+    kept = []
+    min_dist = params['minDist']
+    for cx, cy, r, _ in found:
+        if all((cx - kx) ** 2 + (cy - ky) ** 2 >= min_dist ** 2 for kx, ky, _ in kept):
+            kept.append((cx, cy, r))
+    return np.array([kept], np.float32)
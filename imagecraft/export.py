@@ -0,0 +1,452 @@
+"""
+Label exporters for BoxStore contents: per-image YOLO and Pascal VOC files written
+in parallel, a streaming COCO JSON writer, and per-box image patches with a CSV
+manifest. Every label file is written atomically.
+"""
+
+import contextlib
+import csv
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from xml.sax.saxutils import escape
+
+import cv2
+import numpy as np
+
+from .batch import read_image, write_image
+from .boxes import as_box_array
+from .index import image_root, read_image_size, relative_image_path
+
+EXPORT_FORMATS = ('yolo', 'coco', 'voc')
+YOLO_LINE_FORMAT = "%d %.6f %.6f %.6f %.6f\n"
+COCO_ANNOTATION_FORMAT = (
+    '{"id": %d, "image_id": %d, "category_id": %d, "bbox": [%d, %d, %d, %d], "area": %d, "iscrowd": 0'
+)
+VOC_OBJECT_FORMAT = (
+    "  <object>\n    <name>%s</name>\n    <pose>Unspecified</pose>\n    <truncated>0</truncated>\n"
+    "    <difficult>0</difficult>\n    <bndbox>\n      <xmin>%d</xmin>\n      <ymin>%d</ymin>\n"
+    "      <xmax>%d</xmax>\n      <ymax>%d</ymax>\n    </bndbox>\n"
+)
+PATCH_MANIFEST_NAME = 'patches.csv'
+PATCH_MANIFEST_FIELDS = ('patch', 'image', 'box', 'class', 'x', 'y', 'w', 'h', 'radius')
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def yolo_text(boxes, image_width, image_height):
+    """
+    YOLO label text for boxes (a BOX_DTYPE array or (x, y, w, h, class) tuples):
+    every box is normalized in one NumPy step and all lines are formatted at once.
+    """
+    boxes = as_box_array(boxes)
+    if len(boxes) == 0:
+        return ""
+    w = boxes['w'].astype(np.float64)
+    h = boxes['h'].astype(np.float64)
+    rows = np.column_stack([
+        boxes['class'],
+        (boxes['x'] + w / 2.0) / image_width,
+        (boxes['y'] + h / 2.0) / image_height,
+        w / image_width,
+        h / image_height,
+    ])
+    return (YOLO_LINE_FORMAT * len(rows)) % tuple(rows.ravel().tolist())
+
+
+@contextlib.contextmanager
+def atomic_open(path):
+    """Text file that replaces path only once it is complete, so readers never see a partial file."""
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def write_text_atomic(path, text):
+    with atomic_open(path) as f:
+        f.write(text)
+
+
+def label_path(labels_dir, image_path, extension='.txt', root=None):
+    """Label file of image_path: its path relative to root (see relative_image_path) under labels_dir."""
+    return os.path.join(labels_dir, os.path.splitext(relative_image_path(image_path, root))[0] + extension)
+
+
+def image_size(store, path):
+    """(width, height) recorded at detection time, else read from the file header."""
+    return store.size(path) or read_image_size(path)
+
+
+def _export_per_image(store, labels_dir, extension, render, max_workers, root):
+    os.makedirs(labels_dir, exist_ok=True)
+    items = store.items()
+    root = image_root([path for path, _ in items], root)
+
+    def write(item):
+        path, boxes = item
+        target = label_path(labels_dir, path, extension, root)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        write_text_atomic(target, render(path, boxes, image_size(store, path)))
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        # Consume the results so the first error is raised here
+        for _ in executor.map(write, items):
+            pass
+    return len(items)
+
+
+def export_yolo(store, labels_dir, max_workers=None, root=None):
+    """
+    Write one YOLO file per image with boxes in store, on a thread pool, mirroring the
+    subfolders of the images under root (see image_root). Image sizes come from the
+    store, recorded at detection time; images stored without one have it read from
+    their file header. Returns the number of files written.
+    """
+    return _export_per_image(
+        store, labels_dir, '.txt', lambda path, boxes, size: yolo_text(boxes, *size), max_workers, root
+    )
+
+
+def class_name(class_names, class_num):
+    return class_names.get(int(class_num), str(int(class_num))) if class_names else str(int(class_num))
+
+
+def voc_text(path, boxes, size, class_names=None, include_radius=True):
+    """Pascal VOC XML for the boxes of one image; coordinates are 1-based and inclusive."""
+    width, height = size
+    boxes = as_box_array(boxes)
+    parts = [
+        "<annotation>\n",
+        f"  <folder>{escape(os.path.basename(os.path.dirname(path)))}</folder>\n",
+        f"  <filename>{escape(os.path.basename(path))}</filename>\n",
+        f"  <size>\n    <width>{width}</width>\n    <height>{height}</height>\n    <depth>3</depth>\n  </size>\n",
+        "  <segmented>0</segmented>\n",
+    ]
+    names = [escape(class_name(class_names, c)) for c in boxes['class'].tolist()]
+    for name, x, y, w, h, radius in zip(names, boxes['x'].tolist(), boxes['y'].tolist(), boxes['w'].tolist(),
+                                        boxes['h'].tolist(), boxes['radius'].tolist()):
+        parts.append(VOC_OBJECT_FORMAT % (name, x + 1, y + 1, x + w, y + h))
+        if include_radius and radius > 0:
+            parts.append(f"    <radius>{radius:.2f}</radius>\n")
+        parts.append("  </object>\n")
+    parts.append("</annotation>\n")
+    return "".join(parts)
+
+
+def export_voc(store, labels_dir, class_names=None, include_radius=True, max_workers=None, root=None):
+    """Write one Pascal VOC .xml per image with boxes in store, on a thread pool, like export_yolo."""
+    return _export_per_image(
+        store, labels_dir, '.xml',
+        lambda path, boxes, size: voc_text(path, boxes, size, class_names, include_radius), max_workers, root
+    )
+
+
+def coco_annotations_text(boxes, image_id, first_id, include_radius=True):
+    """COCO annotation objects for the boxes of one image, comma separated, formatted in one step."""
+    boxes = as_box_array(boxes)
+    if len(boxes) == 0:
+        return ""
+    w = boxes['w'].astype(np.int64)
+    h = boxes['h'].astype(np.int64)
+    columns = [
+        np.arange(first_id, first_id + len(boxes)), np.full(len(boxes), image_id), boxes['class'],
+        boxes['x'], boxes['y'], w, h, w * h,
+    ]
+    item_format = COCO_ANNOTATION_FORMAT
+    if include_radius:
+        item_format += ', "radius": %.2f'
+        columns.append(boxes['radius'])
+    item_format += '}'
+    rows = np.column_stack(columns).astype(np.float64)
+    return ",\n".join([item_format] * len(rows)) % tuple(rows.ravel().tolist())
+
+
+class _JsonArrayWriter:
+    """Writes the items of a JSON array to an open file as they come, commas included."""
+
+    def __init__(self, f):
+        self.f = f
+        self.empty = True
+
+    def write(self, text):
+        if not text:
+            return
+        if not self.empty:
+            self.f.write(",\n")
+        self.f.write(text)
+        self.empty = False
+
+
+class _JsonStreamReader:
+    """
+    Reads the members of a top-level JSON object from an open file a chunk at a time,
+    so arrays such as COCO images and annotations can be walked item by item instead
+    of loading the whole document.
+    """
+
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.f.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self):
+        """The next non-whitespace character, or '' at the end of the file."""
+        while True:
+            self.pos = _JSON_WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"Invalid JSON in {getattr(self.f, 'name', 'file')}: expected {char!r}.")
+        self.pos += 1
+
+    def _value(self):
+        return self._value_and_text()[0]
+
+    def _value_and_text(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A value ending with the buffer may be cut short (a number, say) until more is read
+                if end < len(self.buffer) or self.eof:
+                    start, self.pos = self.pos, end
+                    return value, self.buffer[start:end]
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    raise ValueError(f"Invalid JSON in {getattr(self.f, 'name', 'file')}: {e}") from e
+            self._fill()
+
+    def _items(self):
+        self._expect('[')
+        if self._peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self._value_and_text()
+            if self._peek() != ',':
+                self._expect(']')
+                return
+            self.pos += 1
+
+    def members(self, streamed=()):
+        """
+        (key, value) for each member of the object; the arrays named in streamed come
+        as an iterator of (item, its JSON text) instead, read as it is consumed
+        (whatever is left of it is skipped before the next member).
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(':')
+            if key in streamed and self._peek() == '[':
+                items = self._items()
+                yield key, items
+                for _ in items:
+                    pass
+            else:
+                yield key, self._value()
+            if self._peek() != ',':
+                self._expect('}')
+                return
+            self.pos += 1
+
+
+def _coco_members(json_path, streamed=()):
+    """The members of an existing COCO file, with the arrays in streamed read item by item."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        yield from _JsonStreamReader(f).members(streamed)
+
+
+def _coco_array(json_path, key):
+    """(item, its JSON text) for each item of one array of an existing COCO file, read one at a time."""
+    for name, value in _coco_members(json_path, (key,)):
+        if name == key:
+            yield from value
+            return
+
+
+def export_coco(store, json_path, class_names=None, include_radius=True, merge=False, root=None):
+    """
+    Write the boxes in store as one COCO JSON file, streamed: images and annotations
+    are formatted one image at a time and written straight to disk, so the file never
+    exists as a dict in memory. include_radius adds the circle radius to every
+    annotation as an extra "radius" attribute. Each image's file_name is its path
+    relative to root (see image_root), so images in different subfolders stay apart.
+
+    With merge and an existing json_path, its images, annotations and categories are
+    kept with their ids; images exported again keep their image id, get their current
+    width and height and have their annotations replaced, and new ids continue after
+    the existing ones. The existing file is streamed with _JsonStreamReader: a first
+    pass keeps only file names, ids and the small top-level members, then its images
+    and its annotations are copied one at a time. It is still rewritten in full,
+    to a temp file renamed over the old one: images come before annotations and
+    replaced annotations must go, so nothing can be appended in place. Returns
+    (images written, annotations written).
+    """
+    items = store.items()
+    root = image_root([path for path, _ in items], root)
+    names = [relative_image_path(path, root) for path, _ in items]
+
+    merging = merge and os.path.exists(json_path)
+    existing_ids = {}
+    max_annotation_id = 0
+    others = {}
+    categories = {}
+    if merging:
+        for key, value in _coco_members(json_path, ('images', 'annotations')):
+            if key == 'images':
+                existing_ids.update((image['file_name'], image['id']) for image, _ in value)
+            elif key == 'annotations':
+                max_annotation_id = max((annotation['id'] for annotation, _ in value), default=0)
+            elif key == 'categories':
+                categories.update((category['id'], category) for category in value)
+            else:
+                others[key] = value
+    replaced = {existing_ids[name]: path for name, (path, _) in zip(names, items) if name in existing_ids}
+    next_image_id = max(existing_ids.values(), default=0) + 1
+    next_annotation_id = max_annotation_id + 1
+
+    for _, boxes in items:
+        for class_num in np.unique(boxes['class']).tolist():
+            categories.setdefault(class_num, {'id': class_num, 'name': class_name(class_names, class_num)})
+
+    annotation_count = 0
+    with atomic_open(json_path) as f:
+        f.write('{\n')
+        # Other top-level keys of the existing file (info, licenses, ...) are kept as they are
+        for key, value in others.items():
+            f.write(f'{json.dumps(key)}: {json.dumps(value)},\n')
+        f.write(f'"categories": {json.dumps(sorted(categories.values(), key=lambda c: c["id"]))},\n')
+
+        image_ids = []
+        f.write('"images": [\n')
+        images = _JsonArrayWriter(f)
+        for image, text in _coco_array(json_path, 'images') if merging else ():
+            path = replaced.get(image['id'])
+            if path is not None:
+                # The image may have been resized or re-encoded since the last export
+                image['width'], image['height'] = image_size(store, path)
+                text = json.dumps(image)
+            images.write(text)
+        for name, (path, _) in zip(names, items):
+            image_id = existing_ids.get(name)
+            if image_id is None:
+                image_id = next_image_id
+                next_image_id += 1
+                width, height = image_size(store, path)
+                images.write(json.dumps({'id': image_id, 'file_name': name, 'width': width, 'height': height}))
+            image_ids.append(image_id)
+
+        f.write('\n],\n"annotations": [\n')
+        annotations = _JsonArrayWriter(f)
+        for annotation, text in _coco_array(json_path, 'annotations') if merging else ():
+            if annotation['image_id'] not in replaced:
+                annotations.write(text)
+        for (path, boxes), image_id in zip(items, image_ids):
+            annotations.write(coco_annotations_text(boxes, image_id, next_annotation_id, include_radius))
+            next_annotation_id += len(boxes)
+            annotation_count += len(boxes)
+        f.write('\n]\n}\n')
+    return len(items), annotation_count
+
+
+def _leading_pad(start, length, limit, pad):
+    """Padding before the box: all of it when clipped at 0, none when clipped at limit, half when both."""
+    if start == 0:
+        return pad // 2 if start + length >= limit else pad
+    return 0
+
+
+def cut_patch(img, x, y, w, h, size=None):
+    """
+    The (x, y, w, h) region of img, resized to size x size when size is given. A box
+    clipped by the image border is first padded back to a square with black on the
+    clipped side, so resizing never stretches the object.
+    """
+    patch = img[y:y + h, x:x + w]
+    if not size:
+        return patch
+    if w != h:
+        side = max(w, h)
+        img_height, img_width = img.shape[:2]
+        pad_x, pad_y = side - w, side - h
+        left = _leading_pad(x, w, img_width, pad_x)
+        top = _leading_pad(y, h, img_height, pad_y)
+        patch = cv2.copyMakeBorder(patch, top, pad_y - top, left, pad_x - left, cv2.BORDER_CONSTANT, value=0)
+    interpolation = cv2.INTER_AREA if patch.shape[0] > size else cv2.INTER_LINEAR
+    return cv2.resize(patch, (size, size), interpolation=interpolation)
+
+
+def write_patches(path, boxes, patches_dir, size=None, image_format='png', root=None):
+    """
+    Cut every box of one image out of a single decode and write it as
+    <image stem>_<box index>.<image_format>, in the subfolder of patches_dir that
+    mirrors the image's folder under root (see relative_image_path). Returns one
+    manifest row per patch.
+    """
+    boxes = as_box_array(boxes)
+    if len(boxes) == 0:
+        return []
+    img = read_image(path)
+    stem = os.path.splitext(relative_image_path(path, root))[0]
+    os.makedirs(os.path.dirname(os.path.join(patches_dir, stem)), exist_ok=True)
+    rows = []
+    for index, (x, y, w, h, class_num, radius) in enumerate(boxes.tolist()):
+        patch_name = f"{stem}_{index:04d}.{image_format}"
+        write_image(os.path.join(patches_dir, patch_name), cut_patch(img, x, y, w, h, size))
+        rows.append((patch_name, path, index, class_num, x, y, w, h, round(radius, 2)))
+    return rows
+
+
+def write_patch_manifest(manifest_path, rows):
+    """CSV mapping each patch to its source image, box index, class, box and circle radius."""
+    with atomic_open(manifest_path) as f:
+        writer = csv.writer(f, lineterminator='\n')
+        writer.writerow(PATCH_MANIFEST_FIELDS)
+        writer.writerows(rows)
+
+
+def export_patches(store, patches_dir, size=None, image_format='png', max_workers=None, root=None):
+    """
+    Write a patch for every box in store, each image decoded once, images in parallel,
+    and a PATCH_MANIFEST_NAME manifest next to the patches. Boxes already include the
+    offset margin they were detected with; subfolders under root are mirrored. Returns
+    the number of patches written.
+    """
+    os.makedirs(patches_dir, exist_ok=True)
+    items = store.items()
+    root = image_root([path for path, _ in items], root)
+    rows = []
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        for image_rows in executor.map(
+                lambda item: write_patches(item[0], item[1], patches_dir, size, image_format, root), items):
+            rows.extend(image_rows)
+    write_patch_manifest(os.path.join(patches_dir, PATCH_MANIFEST_NAME), rows)
+    return len(rows)
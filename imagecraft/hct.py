@@ -0,0 +1,403 @@
+"""Hough Circle Transform detection, drawing and YOLO label helpers."""
+
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from .boxes import box_tuples, boxes_from_circles
+from .contour import contour_circles
+from .export import write_text_atomic, yolo_text
+from .hough import numpy_hough_circles
+from .preprocess import DEFAULT_BLUR_KSIZE, decode_gray, preprocess_for_hct, preprocess_frame, reduction_for_radius
+from .roi import roi_bounds, roi_contains
+
+DEFAULT_HCT_PARAMS = {
+    'dp': 1.0,
+    'minDist': 20,
+    'param1': 50,
+    'param2': 30,
+    'minRadius': 0,
+    'maxRadius': 0
+}
+
+# full: single-scale Hough at full resolution
+# reduced: single-scale Hough on a 2x/4x/8x reduced decode
+# pyramid: candidates from a reduced pyramid level, refined at full resolution
+# tiled: full resolution on overlapping tiles, merged across seams
+DETECTION_MODES = ('full', 'reduced', 'pyramid', 'tiled')
+
+# Smallest circle radius, in pyramid pixels, the coarse candidate pass must see. Candidates
+# are refitted at full resolution, so this is half of what a reduced decode keeps
+MIN_PYRAMID_RADIUS = 4
+MIN_TILE_SIZE = 2048
+# Tiles span at least this many max radii, so the 2 * maxRadius overlap stays a small share of each
+TILE_RADIUS_MULTIPLE = 8
+
+
+def opencv_hough_circles(blurred, params):
+    return cv2.HoughCircles(blurred, cv2.HOUGH_GRADIENT, **params)
+
+
+def opencv_hough_alt_circles(blurred, params):
+    """HOUGH_GRADIENT_ALT, with param2 (circle perfectness) given as a percentage."""
+    return cv2.HoughCircles(blurred, cv2.HOUGH_GRADIENT_ALT, **dict(params, param2=min(params['param2'], 100) / 100))
+
+
+# A backend is detect(blurred, params) -> (1, N, 3) float32 circles or None. votes says
+# whether param2 is an accumulator threshold, which shrinks with a reduced frame, or a
+# percentage that does not; defaults override DEFAULT_HCT_PARAMS where their meaning differs.
+CircleBackend = namedtuple('CircleBackend', ['detect', 'votes', 'defaults'])
+
+# opencv: cv2.HoughCircles(HOUGH_GRADIENT), recomputed on every call
+# opencv_alt: HOUGH_GRADIENT_ALT, fewer false circles; param2 is a percentage, and its Scharr
+#   gradients want a much higher Canny threshold (param1) than HOUGH_GRADIENT
+# numpy: votes kept per frame, so retuning param2, minDist or the radii only reruns peak extraction
+# contour: Otsu blobs fitted with ellipses, for high-contrast parts; param2 is the minimum roundness in percent
+CIRCLE_BACKENDS = {
+    'opencv': CircleBackend(opencv_hough_circles, True, {}),
+    'opencv_alt': CircleBackend(opencv_hough_alt_circles, False, {'param1': 300, 'param2': 90}),
+    'numpy': CircleBackend(numpy_hough_circles, True, {}),
+    'contour': CircleBackend(contour_circles, False, {'param2': 80}),
+}
+HCT_BACKENDS = tuple(CIRCLE_BACKENDS)
+
+
+def circle_backend(name):
+    backend = CIRCLE_BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(f"Unknown HCT backend {name!r}; expected one of {', '.join(HCT_BACKENDS)}")
+    return backend
+
+
+def window_backend(name):
+    """
+    Backend for one-off windows and tiles: numpy's vote cache only pays off on whole
+    frames, so those use the identical OpenCV transform.
+    """
+    return 'opencv' if name == 'numpy' else name
+
+
+def detect_circles(gray, params):
+    return hough_circles(cv2.medianBlur(gray, 5), params)
+
+
+def scale_params(params, factor, votes=True):
+    """
+    HoughCircles parameters for a frame reduced by factor. Distances and radii shrink
+    with the frame, and so does an accumulator threshold (votes), since the votes a
+    circle collects are proportional to its circumference.
+    """
+    if factor == 1:
+        return params
+    scaled = dict(params)
+    scaled['minDist'] = max(1, params['minDist'] / factor)
+    if votes:
+        scaled['param2'] = max(1, params['param2'] / factor)
+    scaled['minRadius'] = params['minRadius'] // factor
+    scaled['maxRadius'] = -(-params['maxRadius'] // factor)  # Rounded up; 0 (no limit) stays 0
+    return scaled
+
+
+def hough_circles(blurred, params, factor=1, backend='opencv'):
+    """
+    Only the Hough stage, on a frame that is already grayscale and median-blurred.
+    When the frame was decoded reduced by factor, params are given for the full
+    resolution image and the circles are returned in full-resolution coordinates.
+    """
+    detector = circle_backend(backend)
+    circles = detector.detect(blurred, scale_params(params, factor, detector.votes))
+    if circles is None:
+        return None
+    if factor != 1:
+        # Reduced pixel i covers full-resolution pixels [i * factor, (i + 1) * factor)
+        circles[..., :2] = (circles[..., :2] + 0.5) * factor - 0.5
+        circles[..., 2] *= factor
+    return np.uint16(np.around(circles))
+
+
+def pyramid_reduction(min_radius, max_radius):
+    """
+    Pyramid level (1, 2, 4 or 8) of the coarse pass: the largest that keeps the smallest
+    circles at MIN_PYRAMID_RADIUS px. With no minRadius (0) they are taken to be a quarter
+    of maxRadius, which leaves the largest circles a margin of 4 * MIN_PYRAMID_RADIUS px.
+    """
+    smallest = min_radius or max_radius // 4
+    factor = 1
+    while factor < 8 and smallest >= 2 * factor * MIN_PYRAMID_RADIUS:
+        factor *= 2
+    return factor
+
+
+def pyramid_hough_circles(blurred, params, factor, backend='opencv'):
+    """
+    Coarse-to-fine detection. Candidates come from a Hough pass on the frame reduced
+    by factor with cv2.pyrDown; each one is then re-fitted by a Hough pass restricted
+    to a full-resolution window around it and to radii near its coarse radius.
+    Candidates the full-resolution pass cannot confirm are dropped.
+    """
+    if factor == 1:
+        return hough_circles(blurred, params, backend=backend)
+
+    coarse = blurred
+    for _ in range(factor.bit_length() - 1):
+        coarse = cv2.pyrDown(coarse)
+    candidates = hough_circles(coarse, params, factor, backend)
+    if candidates is None:
+        return None
+
+    height, width = blurred.shape[:2]
+    slack = 2 * factor  # Coarse estimates are good to about one reduced pixel
+    detect = circle_backend(window_backend(backend)).detect
+    refined = []
+    for cx, cy, r in candidates[0, :].astype(int):
+        reach = r + 2 * slack
+        x0, y0 = max(cx - reach, 0), max(cy - reach, 0)
+        x1, y1 = min(cx + reach + 1, width), min(cy + reach + 1, height)
+        found = detect(blurred[y0:y1, x0:x1], dict(
+            params,
+            minDist=max(x1 - x0, y1 - y0),  # At most one circle per window
+            minRadius=max(1, r - slack), maxRadius=r + slack
+        ))
+        if found is not None:
+            fx, fy, fr = found[0, 0]
+            if abs(fx + x0 - cx) <= slack and abs(fy + y0 - cy) <= slack:
+                refined.append((fx + x0, fy + y0, fr))
+    if not refined:
+        return None
+    return np.uint16(np.around(np.array([refined], dtype=np.float32)))
+
+
+def tile_starts(length, tile_size, overlap):
+    """Evenly spaced tile origins covering length, with neighbours overlapping by at least overlap."""
+    if length <= tile_size:
+        return [0]
+    count = math.ceil((length - overlap) / (tile_size - overlap))
+    step = (length - tile_size) / (count - 1)
+    return [round(i * step) for i in range(count)]
+
+
+def tile_grid(width, height, max_radius):
+    """
+    (x0, y0, x1, y1) tiles sized to max_radius. Neighbours overlap by the diameter
+    of the largest circle, so every circle lies entirely inside at least one tile.
+    """
+    if max_radius <= 0:
+        raise ValueError("Tiled detection needs maxRadius > 0 to size the tile overlap.")
+    overlap = 2 * max_radius + 2
+    tile_size = max(MIN_TILE_SIZE, TILE_RADIUS_MULTIPLE * max_radius)
+    return [
+        (x0, y0, min(x0 + tile_size, width), min(y0 + tile_size, height))
+        for y0 in tile_starts(height, tile_size, overlap)
+        for x0 in tile_starts(width, tile_size, overlap)
+    ]
+
+
+def suppress_duplicates(circles, clearance, min_dist):
+    """
+    Greedy distance-based suppression. Circles are visited from the largest clearance
+    down, and one is kept unless its centre lies within min_dist (or a quarter of its
+    radius, for seam duplicates of large circles) of a circle already kept.
+    """
+    kept = np.empty_like(circles)
+    count = 0
+    for x, y, r in circles[np.argsort(-clearance, kind='stable')]:
+        limit = max(min_dist, r / 4)
+        distances = (kept[:count, 0] - x) ** 2 + (kept[:count, 1] - y) ** 2
+        if not np.any(distances < limit ** 2):
+            kept[count] = x, y, r
+            count += 1
+    return kept[:count]
+
+
+def blurred_tile(gray, tile, blur_ksize):
+    """
+    The median blur of one tile of gray, computed from the tile and a blur_ksize // 2
+    margin around it, so its pixels equal those of blurring the whole frame.
+    """
+    x0, y0, x1, y1 = tile
+    height, width = gray.shape[:2]
+    margin = blur_ksize // 2
+    mx0, my0 = max(x0 - margin, 0), max(y0 - margin, 0)
+    mx1, my1 = min(x1 + margin, width), min(y1 + margin, height)
+    blurred = cv2.medianBlur(gray[my0:my1, mx0:mx1], blur_ksize)
+    return blurred[y0 - my0:y1 - my0, x0 - mx0:x1 - mx0]
+
+
+def tiled_hough_circles(blurred, params, max_workers=None, backend='opencv', blur_ksize=None):
+    """
+    Hough detection on overlapping tiles of a full-resolution blurred frame, run on
+    a thread pool of max_workers (pass 1 when files are already processed in parallel).
+    HoughCircles' edge maps and accumulator then scale with the tile, not the image.
+    With blur_ksize, blurred is the unblurred grayscale and each tile is blurred on its
+    own (see blurred_tile), so no second full-size frame is allocated; the frame itself
+    is still decoded whole, as OpenCV cannot decode a region of a PNG or JPEG.
+    Circles are shifted to global coordinates, and the copies found in two tiles are
+    merged, preferring the one that lies furthest inside its tile (a circle cut by a
+    tile border is a partial, less accurate detection).
+    """
+    height, width = blurred.shape[:2]
+    tiles = tile_grid(width, height, params['maxRadius'])
+    if len(tiles) == 1:
+        if blur_ksize is not None:
+            blurred = cv2.medianBlur(blurred, blur_ksize)
+        return hough_circles(blurred, params, backend=backend)
+    detect_tile = circle_backend(window_backend(backend)).detect
+
+    def detect(tile):
+        x0, y0, x1, y1 = tile
+        if blur_ksize is None:
+            found = detect_tile(blurred[y0:y1, x0:x1], params)
+        else:
+            found = detect_tile(blurred_tile(blurred, tile, blur_ksize), params)
+        if found is None:
+            return None
+        local = found[0]
+        x, y, r = local[:, 0], local[:, 1], local[:, 2]
+        inf = np.full_like(x, np.inf)
+        # Distance from each circle to the tile borders that are not image borders
+        clearance = np.minimum.reduce([
+            x - r if x0 > 0 else inf,
+            y - r if y0 > 0 else inf,
+            (x1 - x0 - 1) - (x + r) if x1 < width else inf,
+            (y1 - y0 - 1) - (y + r) if y1 < height else inf,
+        ])
+        return local + np.float32([x0, y0, 0]), clearance
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        results = [result for result in executor.map(detect, tiles) if result is not None]
+    if not results:
+        return None
+
+    circles = suppress_duplicates(
+        np.concatenate([found for found, _ in results]),
+        np.concatenate([clearance for _, clearance in results]),
+        params['minDist']
+    )
+    return np.uint16(np.around(circles[np.newaxis]))
+
+
+def roi_hough_circles(blurred, params, rois, detect, factor=1):
+    """
+    detect(crop) run on the bounding rectangle of each ROI only, for a blurred frame
+    decoded reduced by factor; ROIs are in full-resolution pixels, and detect returns
+    full-resolution circles relative to its crop. Circles are shifted back to image
+    coordinates, those whose centre lies outside their ROI (the corners of a polygon's
+    rectangle) are dropped, and copies found in two overlapping ROIs are merged.
+    """
+    height, width = blurred.shape[:2]
+    found = []
+    for roi in rois:
+        bounds = roi_bounds(roi, width * factor, height * factor)
+        if bounds is None:
+            continue
+        x0, y0, x1, y1 = bounds[0] // factor, bounds[1] // factor, -(-bounds[2] // factor), -(-bounds[3] // factor)
+        circles = detect(blurred[y0:y1, x0:x1])
+        if circles is None:
+            continue
+        circles = circles[0].astype(np.float32) + np.float32([x0 * factor, y0 * factor, 0])
+        found.append(circles[roi_contains(roi, circles[:, 0], circles[:, 1])])
+    circles = np.concatenate(found) if found else np.zeros((0, 3), np.float32)
+    if len(found) > 1:
+        circles = suppress_duplicates(circles, np.zeros(len(circles), np.float32), params['minDist'])
+    if len(circles) == 0:
+        return None
+    return np.uint16(np.around(circles[np.newaxis]))
+
+
+def detection_factors(params, mode):
+    """
+    (reduction, decode reduction) for a detection mode. The pyramid refines at full
+    resolution, so it decodes the full frame and reduces it itself. A reduction of 1
+    means the mode runs at full resolution for these radii, which the GUI shows.
+    """
+    if mode not in DETECTION_MODES:
+        raise ValueError(f"Unknown detection mode {mode!r}; expected one of {', '.join(DETECTION_MODES)}")
+    if mode == 'reduced':
+        factor = reduction_for_radius(params['minRadius'])
+        return factor, factor
+    if mode == 'pyramid':
+        return pyramid_reduction(params['minRadius'], params['maxRadius']), 1
+    return 1, 1
+
+
+def detect_circles_in_file(path, params, mode='full', cache=None, backend='opencv', rois=None, tile_workers=None):
+    """
+    Circles (1, N, 3) in full-resolution coordinates for the image at path, or None.
+    The blurred grayscale input comes from cache (a PreprocessCache) when one is given;
+    with the numpy backend that also lets its votes be reused across calls. With rois
+    (see imagecraft.roi) only the ROIs are searched. tile_workers is the thread count
+    of tiled mode; batch jobs that already run one file per thread pass 1.
+    """
+    factor, decode_factor = detection_factors(params, mode)
+    if mode == 'tiled' and cache is None and not rois:
+        # Blurred tile by tile, so only the grayscale decode is frame-sized
+        return tiled_hough_circles(decode_gray(path), params, tile_workers, backend, DEFAULT_BLUR_KSIZE)
+    if cache is not None:
+        blurred = cache.get(path, decode_factor)
+    else:
+        blurred = preprocess_for_hct(path, factor=decode_factor)
+    return _detect_in_blurred(blurred, params, mode, factor, decode_factor, backend, rois, tile_workers)
+
+
+def detect_circles_in_frame(img, params, mode='full', backend='opencv', rois=None, blur_ksize=DEFAULT_BLUR_KSIZE,
+                            tile_workers=None):
+    """detect_circles_in_file for a BGR frame that is already decoded (see preprocess_frame)."""
+    factor, decode_factor = detection_factors(params, mode)
+    if mode == 'tiled' and not rois:
+        return tiled_hough_circles(preprocess_frame(img, None), params, tile_workers, backend, blur_ksize)
+    blurred = preprocess_frame(img, blur_ksize, decode_factor)
+    return _detect_in_blurred(blurred, params, mode, factor, decode_factor, backend, rois, tile_workers)
+
+
+def _detect_in_blurred(blurred, params, mode, factor, decode_factor, backend, rois, tile_workers=None):
+    def detect(frame):
+        if mode == 'pyramid':
+            return pyramid_hough_circles(frame, params, factor, backend)
+        if mode == 'tiled':
+            return tiled_hough_circles(frame, params, tile_workers, backend)
+        return hough_circles(frame, params, decode_factor, backend)
+
+    if rois:
+        return roi_hough_circles(blurred, params, rois, detect, decode_factor)
+    return detect(blurred)
+
+
+def circles_to_boxes(circles, offset, class_num, shape):
+    """Bounding boxes (x, y, w, h, class) around each circle, grown by offset and clipped to the image."""
+    return box_tuples(boxes_from_circles(circles, offset, class_num, shape))
+
+
+def draw_circles(img, circles, offset=None, class_num=0):
+    """
+    Draw detected circles, and bounding boxes when offset is given, into the BGR img.
+    Returns the (x, y, w, h, class) boxes.
+    """
+    # Green circles, blue centres, red boxes
+    circle_color, center_color = (0, 255, 0), (255, 0, 0)
+    for cx, cy, r in circles[0, :].astype(int):
+        cv2.circle(img, (cx, cy), r, circle_color, 2)
+        cv2.circle(img, (cx, cy), 2, center_color, 3)
+    if offset is None:
+        return []
+
+    boxes = circles_to_boxes(circles, offset, class_num, img.shape)
+    draw_boxes(img, boxes)
+    return boxes
+
+
+def draw_boxes(img, boxes, color=(0, 0, 255)):
+    """Draw (x, y, w, h, class) boxes into the BGR img, red by default."""
+    for x, y, w, h_box, _ in boxes:
+        cv2.rectangle(img, (int(x), int(y)), (int(x + w), int(y + h_box)), color, 2)
+
+
+def format_yolo_lines(boxes, image_width, image_height):
+    return yolo_text(boxes, image_width, image_height).splitlines(keepends=True)
+
+
+def write_yolo_labels(annotation_path, boxes, image_width, image_height):
+    write_text_atomic(annotation_path, yolo_text(boxes, image_width, image_height))
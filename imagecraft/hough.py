@@ -0,0 +1,235 @@
+"""Vectorized NumPy circle Hough transform whose votes are kept for instant retuning."""
+
+import math
+import threading
+import weakref
+
+import cv2
+import numpy as np
+
+VOTE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # Budget for the cumulative accumulators of all cached frames
+
+
+class HoughVotes:
+    """
+    Edge map and gradient-direction centre votes of one blurred frame, for radii in
+    [min_radius, max_radius]. Votes are summed into radius bins and stored as running
+    totals, so the accumulator for any radius window is one subtraction and a new
+    param2, minDist or radius window only reruns peak extraction. The peaks and fitted
+    radii of the last window are kept too, so param2 and minDist alone cost a scan of
+    the strongest peaks. Bins are one radius wide when max_bytes allows it; otherwise a
+    window is widened to whole bins for the centre votes, while the radius of each
+    circle is still fitted inside the exact window.
+    """
+
+    def __init__(self, blurred, param1, dp=1.0, min_radius=0, max_radius=0, max_bytes=VOTE_CACHE_MAX_BYTES):
+        height, width = blurred.shape[:2]
+        self.param1 = param1
+        self.dp = dp
+        self.image_shape = (height, width)
+        self.min_radius = max(1, int(min_radius))
+        self.max_radius = max(self.min_radius, int(max_radius) if max_radius > 0 else max(height, width))
+        self.shape = (math.ceil(height / dp), math.ceil(width / dp))
+        cells = self.shape[0] * self.shape[1]
+
+        # Same edge, gradient and cell conventions as cv2.HOUGH_GRADIENT, so both backends
+        # put a circle's votes in the same cells
+        edges = cv2.Canny(blurred, max(1, param1 // 2), param1)
+        self.edge_y, self.edge_x = np.nonzero(edges)  # Row-major, so edge_y is sorted
+        gx = cv2.Sobel(blurred, cv2.CV_16S, 1, 0, ksize=3, borderType=cv2.BORDER_REPLICATE)
+        gy = cv2.Sobel(blurred, cv2.CV_16S, 0, 1, ksize=3, borderType=cv2.BORDER_REPLICATE)
+        gx = gx[self.edge_y, self.edge_x].astype(np.float32)
+        gy = gy[self.edge_y, self.edge_x].astype(np.float32)
+        magnitude = np.hypot(gx, gy)
+        voting = magnitude >= 1
+        # Positions and unit gradients in accumulator cells
+        x = (self.edge_x[voting] / dp).astype(np.float32)
+        y = (self.edge_y[voting] / dp).astype(np.float32)
+        ux = (gx[voting] / magnitude[voting] / dp).astype(np.float32)
+        uy = (gy[voting] / magnitude[voting] / dp).astype(np.float32)
+
+        radius_count = self.max_radius - self.min_radius + 1
+        bin_count = max(1, min(radius_count, max_bytes // (4 * cells)))
+        self.bin_starts = np.unique(
+            np.linspace(self.min_radius, self.max_radius + 1, bin_count + 1).astype(int)
+        )[:-1]
+        self.cumulative = np.empty((len(self.bin_starts), cells), np.int32)
+        total = np.zeros(cells, np.int32)
+        bin_ends = list(self.bin_starts[1:]) + [self.max_radius + 1]
+        for i, (start, end) in enumerate(zip(self.bin_starts, bin_ends)):
+            indices = []
+            for r in range(start, end):
+                # Every edge pixel votes r px along its gradient, on both sides
+                for sign in (r, -r):
+                    cx = np.floor(x + sign * ux).astype(np.int32)
+                    cy = np.floor(y + sign * uy).astype(np.int32)
+                    inside = (cx >= 0) & (cx < self.shape[1]) & (cy >= 0) & (cy < self.shape[0])
+                    indices.append(cy[inside].astype(np.int64) * self.shape[1] + cx[inside])
+            if indices:
+                total += np.bincount(np.concatenate(indices), minlength=cells).astype(np.int32)
+            self.cumulative[i] = total
+
+        self._window = None  # (min_radius, max_radius, vote floor) of the peaks below
+        self._peaks = None   # (cx, cy, votes) of the window's local maxima, strongest first
+        self._fits = {}      # Peak index -> (radius, support), filled on demand
+        # Guards the three above: a VoteCache hands one instance to every thread tuning the same frame
+        self._lock = threading.RLock()
+
+    @property
+    def nbytes(self):
+        return self.cumulative.nbytes + self.edge_x.nbytes + self.edge_y.nbytes
+
+    def covers(self, min_radius, max_radius):
+        height, width = self.image_shape
+        max_radius = max_radius if max_radius > 0 else max(height, width)
+        return self.min_radius <= max(1, min_radius) and max_radius <= self.max_radius
+
+    def accumulator(self, min_radius, max_radius):
+        """Centre votes of the radii in [min_radius, max_radius], as a 2D accumulator."""
+        first = np.searchsorted(self.bin_starts, max(1, min_radius), side='right') - 1
+        last = np.searchsorted(self.bin_starts, max_radius, side='right') - 1
+        votes = self.cumulative[last] if first <= 0 else self.cumulative[last] - self.cumulative[first - 1]
+        return votes.reshape(self.shape)
+
+    def fit_radius(self, cx, cy, min_radius, max_radius):
+        """(radius, support) of the radius in [min_radius, max_radius] best supported by edge pixels around (cx, cy)."""
+        lo = np.searchsorted(self.edge_y, cy - max_radius - 1, side='left')
+        hi = np.searchsorted(self.edge_y, cy + max_radius + 1, side='right')
+        distances = np.hypot(self.edge_x[lo:hi] - cx, self.edge_y[lo:hi] - cy)
+        distances = np.rint(distances[(distances >= min_radius - 0.5) & (distances < max_radius + 0.5)])
+        if distances.size == 0:
+            return min_radius, 0
+        counts = np.bincount(distances.astype(np.int64) - min_radius, minlength=max_radius - min_radius + 1)
+        # Allow one pixel of slack either side, then favour the radius with the densest circumference
+        support = counts + np.pad(counts[1:], (0, 1)) + np.pad(counts[:-1], (1, 0))
+        best = int(np.argmax(support / np.arange(min_radius, max_radius + 1)))
+        return min_radius + best, int(support[best])
+
+    def peaks(self, min_radius, max_radius, threshold):
+        """
+        Local maxima of the window's accumulator as (cx, cy, votes), strongest first,
+        down to half the threshold, so lowering param2 a little still reuses them.
+        """
+        with self._lock:
+            window = self._window
+            if window is None or window[:2] != (min_radius, max_radius) or threshold < window[2]:
+                floor = threshold // 2
+                acc = self.accumulator(min_radius, max_radius)
+                # A cell is a peak when no 4-neighbour has more votes; plateaus are left to minDist
+                acc_float = acc.astype(np.float32)
+                neighbourhood = cv2.dilate(acc_float, cv2.getStructuringElement(cv2.MORPH_CROSS, (3, 3)))
+                ys, xs = np.nonzero((acc_float == neighbourhood) & (acc > floor))
+                votes = acc[ys, xs]
+                order = np.argsort(-votes, kind='stable')
+                ys, xs, votes = ys[order], xs[order], votes[order]
+                # Sub-cell centres: the vote-weighted mean of each peak's 3x3 neighbourhood
+                padded = np.pad(acc, 1).astype(np.float32)
+                weight = np.zeros(len(ys), np.float32)
+                offset_x = np.zeros(len(ys), np.float32)
+                offset_y = np.zeros(len(ys), np.float32)
+                for dy in (-1, 0, 1):
+                    for dx in (-1, 0, 1):
+                        v = padded[ys + 1 + dy, xs + 1 + dx]
+                        weight += v
+                        offset_x += dx * v
+                        offset_y += dy * v
+                self._peaks = (
+                    (xs + 0.5 + offset_x / weight) * self.dp,
+                    (ys + 0.5 + offset_y / weight) * self.dp,
+                    votes,
+                )
+                self._window = (min_radius, max_radius, floor)
+                self._fits = {}
+            return self._peaks
+
+    def circles(self, params):
+        """Circles (1, N, 3) float32 for params, strongest first, like cv2.HoughCircles; None if none."""
+        height, width = self.image_shape
+        min_radius = max(1, int(params['minRadius']))
+        max_radius = int(params['maxRadius']) if params['maxRadius'] > 0 else max(height, width)
+        threshold = params['param2']
+        with self._lock:
+            xs, ys, votes = self.peaks(min_radius, max_radius, threshold)
+            # votes is descending, so the peaks above the threshold are a prefix
+            candidates = int(np.searchsorted(-votes, -threshold, side='left'))
+
+            min_dist_sq = params['minDist'] ** 2
+            found = np.empty((candidates, 3), np.float32)
+            count = 0
+            for i in range(candidates):
+                cx, cy = xs[i], ys[i]
+                if np.any((found[:count, 0] - cx) ** 2 + (found[:count, 1] - cy) ** 2 < min_dist_sq):
+                    continue
+                fit = self._fits.get(i)
+                if fit is None:
+                    fit = self._fits[i] = self.fit_radius(cx, cy, min_radius, max_radius)
+                r, support = fit
+                if support >= threshold:
+                    found[count] = cx, cy, r
+                    count += 1
+        if count == 0:
+            return None
+        return found[np.newaxis, :count]
+
+
+class VoteCache:
+    """
+    HoughVotes of recently used frames, least recently used first out under a byte
+    budget. Frames are matched by identity through weak references, so a frame served
+    again by PreprocessCache reuses its votes, and votes of a discarded frame go with it.
+    """
+
+    def __init__(self, max_bytes=VOTE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = []  # (weakref to frame, HoughVotes), least recently used first
+        self._lock = threading.Lock()
+
+    def get(self, blurred, params):
+        with self._lock:
+            self._entries = [(ref, votes) for ref, votes in self._entries if ref() is not None]
+            match = None
+            for entry in self._entries:
+                ref, votes = entry
+                if ref() is blurred and votes.param1 == params['param1'] and votes.dp == params['dp']:
+                    match = entry
+                    break
+            if match is not None:
+                self._entries.remove(match)
+                if match[1].covers(params['minRadius'], params['maxRadius']):
+                    self._entries.append(match)
+                    return match[1]
+
+        # Rebuild over the union of the old and new radius windows, so dragging back is free
+        min_radius, max_radius = params['minRadius'], params['maxRadius']
+        if match is not None:
+            min_radius = min(max(1, min_radius), match[1].min_radius)
+            max_radius = max(max_radius, match[1].max_radius) if max_radius > 0 else 0
+        votes = HoughVotes(blurred, params['param1'], params['dp'], min_radius, max_radius, self.max_bytes)
+        with self._lock:
+            self._entries.append((weakref.ref(blurred), votes))
+            while sum(v.nbytes for _, v in self._entries) > self.max_bytes and len(self._entries) > 1:
+                self._entries.pop(0)
+        return votes
+
+    def clear(self):
+        with self._lock:
+            self._entries = []
+
+
+_default_cache = VoteCache()
+
+
+def clear_vote_cache():
+    """
+    Drop the votes numpy_hough_circles keeps by default. They live as long as their
+    frames, which a PreprocessCache can hold well after their folder was closed.
+    """
+    _default_cache.clear()
+
+
+def numpy_hough_circles(blurred, params, cache=_default_cache):
+    """cv2.HoughCircles(HOUGH_GRADIENT) replacement whose votes are reused across calls on the same frame."""
+    votes = cache.get(blurred, params) if cache is not None else HoughVotes(
+        blurred, params['param1'], params['dp'], params['minRadius'], params['maxRadius']
+    )
+    return votes.circles(params)
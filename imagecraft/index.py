@@ -0,0 +1,196 @@
+"""Folder indexing and header-only image dimension probing."""
+
+import logging
+import os
+import re
+import struct
+
+import cv2
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+_DIGITS = re.compile(r'(\d+)')
+
+# JPEG start-of-frame markers; C4 (DHT), C8 (JPG) and CC (DAC) share the range but are not frames
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers that stand alone, without a length field
+_JPEG_STANDALONE_MARKERS = frozenset(range(0xD0, 0xD8)) | {0x01, 0xD8}
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def natural_sort_key(path):
+    """Sort key that orders img2 before img10 and ignores case."""
+    return [int(part) if part.isdigit() else part.lower() for part in _DIGITS.split(path)]
+
+
+def list_images(directory, recursive=False):
+    """
+    Supported image paths in directory, in natural-sort order. Uses os.scandir so file
+    types come from the directory entries themselves, without a stat() per file.
+    With recursive=True subfolders are walked too and sorted by their relative path.
+    """
+    paths = []
+    pending = [directory]
+    while pending:
+        folder = pending.pop()
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in SUPPORTED_FORMATS:
+                        paths.append(entry.path)
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except OSError as e:
+            if folder == directory:
+                raise
+            logger.warning(f"Skipping unreadable folder {folder}: {e}")
+
+    paths.sort(key=lambda path: natural_sort_key(path[len(directory):]))
+    return paths
+
+
+def image_root(paths, root=None):
+    """
+    The folder output names are made relative to: root when every path lies inside it,
+    else the deepest folder holding them all, or None when there is no such folder.
+    """
+    folders = {os.path.abspath(os.path.dirname(path)) for path in paths}
+    if not folders:
+        return None
+    try:
+        if root and os.path.commonpath(folders | {os.path.abspath(root)}) == os.path.abspath(root):
+            return os.path.abspath(root)
+        return os.path.commonpath(folders)
+    except ValueError:
+        # Paths on different drives share no folder
+        return None
+
+
+def relative_image_path(path, root):
+    """
+    path relative to root with '/' separators, so outputs mirror the subfolders of a
+    recursively listed folder instead of colliding on file names; the file name alone
+    when root is None.
+    """
+    if root is None:
+        return os.path.basename(path)
+    return os.path.relpath(os.path.abspath(path), root).replace(os.sep, '/')
+
+
+def _png_size(f):
+    header = f.read(24)
+    if len(header) < 24 or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def _bmp_size(f):
+    header = f.read(26)
+    if len(header) < 26:
+        return None
+    (dib_size,) = struct.unpack('<I', header[14:18])
+    if dib_size == 12:
+        # OS/2 BITMAPCOREHEADER
+        return struct.unpack('<HH', header[18:22])
+    width, height = struct.unpack('<ii', header[18:26])
+    # Negative height marks a top-down bitmap
+    return width, abs(height)
+
+
+def _exif_orientation(segment):
+    """Orientation tag (1-8) from an APP1 segment body, or None."""
+    if not segment.startswith(b'Exif\x00\x00'):
+        return None
+    tiff = segment[6:]
+    if tiff[:2] == b'II':
+        order = '<'
+    elif tiff[:2] == b'MM':
+        order = '>'
+    else:
+        return None
+    try:
+        (ifd_offset,) = struct.unpack(order + 'I', tiff[4:8])
+        (count,) = struct.unpack(order + 'H', tiff[ifd_offset:ifd_offset + 2])
+        for i in range(count):
+            entry = ifd_offset + 2 + 12 * i
+            tag, _, _, value = struct.unpack(order + 'HHIH', tiff[entry:entry + 10])
+            if tag == _EXIF_ORIENTATION_TAG:
+                return value
+    except struct.error:
+        return None
+    return None
+
+
+def _jpeg_size(f):
+    f.read(2)  # SOI
+    orientation = None
+    while True:
+        byte = f.read(1)
+        if not byte:
+            return None
+        if byte != b'\xff':
+            continue
+        marker = f.read(1)
+        while marker == b'\xff':  # Fill bytes
+            marker = f.read(1)
+        if not marker:
+            return None
+        marker = marker[0]
+        if marker in _JPEG_STANDALONE_MARKERS:
+            continue
+        if marker == 0xD9:  # EOI
+            return None
+
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        (length,) = struct.unpack('>H', length_bytes)
+        if length < 2:
+            return None
+        if marker in _JPEG_SOF_MARKERS:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            # cv2.imread applies the EXIF orientation, so report the size it will decode to
+            if orientation in (5, 6, 7, 8):
+                width, height = height, width
+            return width, height
+        if marker == 0xE1 and orientation is None:
+            orientation = _exif_orientation(f.read(length - 2))
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def probe_image_size(path):
+    """
+    (width, height) read from the PNG IHDR, JPEG SOF or BMP header without decoding
+    pixels. Returns None when the header is missing or not recognised.
+    """
+    try:
+        with open(path, 'rb') as f:
+            signature = f.read(8)
+            f.seek(0)
+            if signature == b'\x89PNG\r\n\x1a\n':
+                return _png_size(f)
+            if signature[:2] == b'\xff\xd8':
+                return _jpeg_size(f)
+            if signature[:2] == b'BM':
+                return _bmp_size(f)
+    except OSError as e:
+        logger.warning(f"Failed to read header of {path}: {e}")
+    return None
+
+
+def read_image_size(path):
+    """(width, height) of an image, from its header when possible and by decoding otherwise."""
+    size = probe_image_size(path)
+    if size is not None:
+        return size
+    logger.debug(f"No usable header in {path}; decoding to get its size.")
+    img = cv2.imread(path)
+    if img is None:
+        raise ValueError(f"Cannot load image {path} to get dimensions.")
+    return img.shape[1], img.shape[0]
@@ -0,0 +1,52 @@
+"""
+Batch parameter files: one JSON document with optional "transform", "hct"
+and "augment" sections, written from the GUI and read by the batch CLI.
+"""
+
+import json
+
+from .augment import DEFAULT_AUGMENTATION_PARAMS
+from .hct import DEFAULT_HCT_PARAMS
+from .transform import TransformationParams
+
+DEFAULT_BOX_OFFSET = 10
+
+
+def transformation_params_from_dict(values):
+    values = dict(values or {})
+    unknown = set(values) - set(TransformationParams._fields)
+    if unknown:
+        raise ValueError(f"Unknown transform parameters: {', '.join(sorted(unknown))}")
+    if values.get('corners') is not None:
+        # Tuples keep the parameters hashable for the remap cache
+        values['corners'] = tuple(values['corners'])
+    return TransformationParams(**values)
+
+
+def hct_params_from_dict(values):
+    """Split an "hct" section into HoughCircles arguments, box offset and class number."""
+    values = dict(values or {})
+    offset = values.pop('offset', DEFAULT_BOX_OFFSET)
+    class_num = values.pop('class_num', 0)
+    unknown = set(values) - set(DEFAULT_HCT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown hct parameters: {', '.join(sorted(unknown))}")
+    return {**DEFAULT_HCT_PARAMS, **values}, offset, class_num
+
+
+def augmentation_params_from_dict(values):
+    values = dict(values or {})
+    unknown = set(values) - set(DEFAULT_AUGMENTATION_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown augment parameters: {', '.join(sorted(unknown))}")
+    return {**DEFAULT_AUGMENTATION_PARAMS, **values}
+
+
+def load_params(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_params(path, sections):
+    with open(path, 'w') as f:
+        json.dump(sections, f, indent=2)
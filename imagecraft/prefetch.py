@@ -0,0 +1,108 @@
+"""Background read-ahead of neighbouring images for A/D navigation."""
+
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+
+
+class ImagePrefetcher:
+    """
+    Decodes the images around the current index on a background thread into
+    a small bounded buffer. Moving the index replaces the wanted set, so work
+    for images the user has already skipped past is dropped instead of queued.
+    """
+
+    def __init__(self, loader=cv2.imread, radius=2):
+        self.loader = loader
+        self.radius = radius
+        self._cache = OrderedDict()  # path -> image, limited to the wanted window
+        self._wanted = []  # Paths to decode, highest priority first
+        self._failed = set()
+        self._generation = 0  # Bumped when a buffered or wanted file changes, dropping decodes begun before
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def load(self, path):
+        """Return the image for path, from the buffer when it has been prefetched."""
+        with self._condition:
+            img = self._cache.get(path)
+            generation = self._generation
+        if img is None:
+            img = self.loader(path)
+            if img is not None:
+                with self._condition:
+                    if path in self._wanted and generation == self._generation:
+                        self._cache[path] = img
+        return img
+
+    def update(self, paths, index):
+        """Make index the current position in paths and prefetch its neighbours."""
+        window = [paths[index]] if 0 <= index < len(paths) else []
+        for step in range(1, self.radius + 1):
+            # Forward first, since next_image is the common direction
+            for neighbour in (index + step, index - step):
+                if 0 <= neighbour < len(paths):
+                    window.append(paths[neighbour])
+
+        with self._condition:
+            self._wanted = window
+            self._failed &= set(window)
+            for path in list(self._cache):
+                if path not in window:
+                    del self._cache[path]
+            self._condition.notify()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ImagePrefetcher", daemon=True)
+                self._thread.start()
+
+    def invalidate(self, path=None):
+        """
+        Forget a buffered image (or all of them) after the file changed on disk. path
+        may be spelled differently from the path the image was buffered under.
+        """
+        with self._condition:
+            if path is None:
+                self._cache.clear()
+                self._failed.clear()
+                self._generation += 1
+            else:
+                key = os.path.normcase(os.path.abspath(path))
+                stale = [p for p in {*self._cache, *self._failed, *self._wanted}
+                         if os.path.normcase(os.path.abspath(p)) == key]
+                for p in stale:
+                    self._cache.pop(p, None)
+                    self._failed.discard(p)
+                if stale:
+                    self._generation += 1
+            # Wanted images that were dropped are decoded again
+            self._condition.notify()
+
+    def _next_path(self):
+        for path in self._wanted:
+            if path not in self._cache and path not in self._failed:
+                return path
+        return None
+
+    def _run(self):
+        while True:
+            with self._condition:
+                path = self._next_path()
+                while path is None:
+                    self._condition.wait()
+                    path = self._next_path()
+                generation = self._generation
+            try:
+                img = self.loader(path)
+            except Exception:
+                img = None
+            with self._condition:
+                if generation != self._generation:
+                    # The file was rewritten while it was being decoded; read it again
+                    continue
+                if img is None:
+                    # Leave failures to the foreground load, which reports them
+                    self._failed.add(path)
+                elif path in self._wanted:
+                    self._cache[path] = img
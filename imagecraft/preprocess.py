@@ -0,0 +1,157 @@
+"""Cache of the grayscale + median-blur input to the Hough stage, so HCT retuning skips decode and blur."""
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from .batch import read_image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLUR_KSIZE = 5
+# Smallest circle radius, in decoded pixels, that a reduced-resolution decode may leave
+MIN_REDUCED_RADIUS = 8
+GRAYSCALE_DECODE_FLAGS = {
+    1: cv2.IMREAD_GRAYSCALE,
+    2: cv2.IMREAD_REDUCED_GRAYSCALE_2,
+    4: cv2.IMREAD_REDUCED_GRAYSCALE_4,
+    8: cv2.IMREAD_REDUCED_GRAYSCALE_8,
+}
+PREPROCESS_CACHE_MAX_BYTES = 256 * 1024 * 1024  # In-memory budget for blurred grayscale frames
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'imagecraft', 'hct')
+
+
+def reduction_for_radius(min_radius):
+    """Largest decode reduction (1, 2, 4 or 8) that keeps circles of min_radius at MIN_REDUCED_RADIUS px or more."""
+    factor = 1
+    while factor < 8 and min_radius >= 2 * factor * MIN_REDUCED_RADIUS:
+        factor *= 2
+    return factor
+
+
+def decode_gray(path, factor=1):
+    """
+    Decode straight to grayscale, skipping the colour planes. For JPEG a factor of
+    2, 4 or 8 is applied by libjpeg during decoding, so the full frame never exists.
+    """
+    return read_image(path, GRAYSCALE_DECODE_FLAGS[factor])
+
+
+def preprocess_for_hct(path, blur_ksize=DEFAULT_BLUR_KSIZE, factor=1):
+    """Median-blurred grayscale input for cv2.HoughCircles, decoded straight to grayscale."""
+    return cv2.medianBlur(decode_gray(path, factor), blur_ksize)
+
+
+def preprocess_frame(img, blur_ksize=DEFAULT_BLUR_KSIZE, factor=1):
+    """
+    preprocess_for_hct for a BGR frame that is already decoded, so exports that write
+    the colour frame decode each file once; a blur_ksize of None skips the blur. The
+    decoder's own grayscale conversion can differ from cv2.cvtColor by a level, so
+    circles may differ marginally.
+    """
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    if factor != 1:
+        # The same reduction imread applies to a reduced decode of a non-JPEG file
+        height, width = gray.shape
+        gray = cv2.resize(gray, (max(1, width // factor), max(1, height // factor)),
+                          interpolation=cv2.INTER_LINEAR_EXACT)
+    if blur_ksize is None:
+        return gray
+    return cv2.medianBlur(gray, blur_ksize)
+
+
+class PreprocessCache:
+    """
+    Blurred grayscale frames keyed by (path, mtime, size, blur kernel, reduction). Entries live in
+    memory under a byte budget, least recently used first out, and with cache_dir set
+    are also written there as .npy files that survive across sessions. Editing a file
+    changes its mtime and size, so stale entries are never returned.
+    """
+
+    def __init__(self, max_bytes=PREPROCESS_CACHE_MAX_BYTES, cache_dir=None, blur_ksize=DEFAULT_BLUR_KSIZE):
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self.blur_ksize = blur_ksize
+        self._memory = OrderedDict()  # key -> blurred grayscale, least recently used first
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, path, factor=1):
+        stat = os.stat(path)
+        return os.path.abspath(path), stat.st_mtime_ns, stat.st_size, self.blur_ksize, factor
+
+    def _disk_path(self, key):
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.npy')
+
+    def get(self, path, factor=1):
+        """Blurred grayscale for path, reduced by factor; a miss decodes straight to grayscale."""
+        key = self.key(path, factor)
+        with self._lock:
+            blurred = self._memory.get(key)
+            if blurred is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return blurred
+
+        blurred = self._load_from_disk(key)
+        if blurred is None:
+            blurred = preprocess_for_hct(path, self.blur_ksize, factor)
+            self._save_to_disk(key, blurred)
+            with self._lock:
+                self.misses += 1
+        else:
+            with self._lock:
+                self.hits += 1
+
+        self._remember(key, blurred)
+        return blurred
+
+    def _remember(self, key, blurred):
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = blurred
+            self._memory_bytes += blurred.nbytes
+            while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.nbytes
+
+    def _load_from_disk(self, key):
+        if self.cache_dir is None:
+            return None
+        disk_path = self._disk_path(key)
+        if not os.path.exists(disk_path):
+            return None
+        try:
+            return np.load(disk_path, allow_pickle=False)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cache file {disk_path}: {e}")
+            return None
+
+    def _save_to_disk(self, key, blurred):
+        if self.cache_dir is None:
+            return
+        disk_path = self._disk_path(key)
+        # Write under a private name and rename, so concurrent readers never see a partial file
+        temp_path = f"{disk_path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                np.save(f, blurred, allow_pickle=False)
+            os.replace(temp_path, disk_path)
+        except OSError as e:
+            logger.warning(f"Failed to write cache file {disk_path}: {e}")
+
+    def clear(self):
+        """Drop the in-memory entries; files in cache_dir are kept."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
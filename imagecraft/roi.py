@@ -0,0 +1,142 @@
+"""
+Regions of interest that restrict HCT detection: rectangles and polygons in image
+pixels, defined for every image, per folder or per image, and stored as the "roi"
+section of a batch parameter file:
+
+    "roi": {
+        "default": [{"rect": [x, y, w, h]}],
+        "folders": {"/data/tray_a": [{"polygon": [[x, y], [x, y], [x, y]]}]},
+        "images": {"/data/tray_a/img_0042.jpg": [{"rect": [x, y, w, h]}]}
+    }
+
+Folders and images are keyed by absolute path. An image uses its own ROIs, else
+those of its folder, else the defaults; with none the whole image is searched.
+"""
+
+import os
+
+import cv2
+import numpy as np
+
+ROI_SHAPES = ('rect', 'polygon')
+# Where a set of ROIs applies: the folder of an image, the image itself, or every image
+ROI_SCOPES = ('folder', 'image', 'default')
+
+
+def validate_roi(roi):
+    """A copy of roi with integer coordinates; ValueError when it is not a rect or polygon."""
+    if not isinstance(roi, dict) or len(roi) != 1 or next(iter(roi)) not in ROI_SHAPES:
+        raise ValueError(f"An ROI must be {{'rect': [x, y, w, h]}} or {{'polygon': [[x, y], ...]}}, got {roi!r}")
+    if 'rect' in roi:
+        rect = [int(round(v)) for v in roi['rect']]
+        if len(rect) != 4 or rect[2] <= 0 or rect[3] <= 0:
+            raise ValueError(f"An ROI rect needs [x, y, w, h] with positive size, got {roi['rect']!r}")
+        return {'rect': rect}
+    points = [[int(round(x)), int(round(y))] for x, y in roi['polygon']]
+    if len(points) < 3:
+        raise ValueError(f"An ROI polygon needs at least 3 points, got {len(points)}")
+    return {'polygon': points}
+
+
+def roi_bounds(roi, width, height):
+    """(x0, y0, x1, y1) of roi's bounding rectangle clipped to the image, or None when outside it."""
+    if 'rect' in roi:
+        x, y, w, h = roi['rect']
+        x0, y0, x1, y1 = x, y, x + w, y + h
+    else:
+        points = np.array(roi['polygon'])
+        x0, y0 = points.min(axis=0)
+        x1, y1 = points.max(axis=0) + 1
+    x0, y0 = max(int(x0), 0), max(int(y0), 0)
+    x1, y1 = min(int(x1), width), min(int(y1), height)
+    if x0 >= x1 or y0 >= y1:
+        return None
+    return x0, y0, x1, y1
+
+
+def roi_contains(roi, xs, ys):
+    """Boolean array: which of the points (xs, ys) lie inside roi (polygon borders included)."""
+    xs, ys = np.asarray(xs, np.float32), np.asarray(ys, np.float32)
+    if 'rect' in roi:
+        x, y, w, h = roi['rect']
+        return (xs >= x) & (xs < x + w) & (ys >= y) & (ys < y + h)
+    contour = np.array(roi['polygon'], np.float32).reshape(-1, 1, 2)
+    return np.array([cv2.pointPolygonTest(contour, (float(x), float(y)), False) >= 0 for x, y in zip(xs, ys)], bool)
+
+
+class RoiSet:
+    """The ROIs of a session: defaults for every image, plus per-folder and per-image overrides."""
+
+    def __init__(self, default=None, folders=None, images=None):
+        self.default = [validate_roi(roi) for roi in default or []]
+        self.folders = {}
+        self.images = {}
+        for folder, rois in (folders or {}).items():
+            self.set_folder(folder, rois)
+        for path, rois in (images or {}).items():
+            self.set_image(path, rois)
+
+    @staticmethod
+    def path_key(path):
+        """Key of a folder or image, so the same file is found however its path is spelled."""
+        return os.path.normcase(os.path.abspath(path))
+
+    def for_path(self, path):
+        """The ROIs that apply to the image at path; empty when the whole image is searched."""
+        rois = self.images.get(self.path_key(path))
+        if rois is None:
+            rois = self.folders.get(self.path_key(os.path.dirname(path)))
+        return self.default if rois is None else rois
+
+    def set_default(self, rois):
+        self.default = [validate_roi(roi) for roi in rois]
+
+    def set_folder(self, folder, rois):
+        """ROIs for every image directly inside folder; an empty list removes them."""
+        key = self.path_key(folder)
+        if rois:
+            self.folders[key] = [validate_roi(roi) for roi in rois]
+        else:
+            self.folders.pop(key, None)
+
+    def set_image(self, path, rois):
+        """ROIs for the image at path; an empty list removes them."""
+        key = self.path_key(path)
+        if rois:
+            self.images[key] = [validate_roi(roi) for roi in rois]
+        else:
+            self.images.pop(key, None)
+
+    def scoped(self, scope, path):
+        """The ROIs defined at scope for the image at path, without falling back to another scope."""
+        if scope == 'image':
+            return self.images.get(self.path_key(path), [])
+        if scope == 'folder':
+            return self.folders.get(self.path_key(os.path.dirname(path)), [])
+        return self.default
+
+    def set_scoped(self, scope, path, rois):
+        """Replace the ROIs defined at scope for the image at path."""
+        if scope not in ROI_SCOPES:
+            raise ValueError(f"Unknown ROI scope {scope!r}; expected one of {', '.join(ROI_SCOPES)}")
+        if scope == 'image':
+            self.set_image(path, rois)
+        elif scope == 'folder':
+            self.set_folder(os.path.dirname(path), rois)
+        else:
+            self.set_default(rois)
+
+    def __bool__(self):
+        return bool(self.default or self.folders or self.images)
+
+    def to_dict(self):
+        return {'default': self.default, 'folders': dict(self.folders), 'images': dict(self.images)}
+
+    @classmethod
+    def from_dict(cls, values):
+        """RoiSet from an "roi" section; None or {} gives an empty set."""
+        values = dict(values or {})
+        unknown = set(values) - {'default', 'folders', 'images'}
+        if unknown:
+            raise ValueError(f"Unknown roi keys: {', '.join(sorted(unknown))}")
+        return cls(values.get('default'), values.get('folders'), values.get('images'))
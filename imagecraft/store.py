@@ -0,0 +1,112 @@
+"""Memory-budgeted image container shared by the GUI tabs and the batch runners."""
+
+import os
+import shutil
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import numpy as np
+
+
+IMAGE_STORE_MAX_BYTES = 1024 * 1024 * 1024  # In-memory budget per image store
+
+
+class ImageStore(MutableMapping):
+    """
+    Dict-like container for full-resolution images with a byte budget.
+    The least recently used arrays beyond the budget are spilled to .npy files
+    in a private temp directory and reloaded transparently on access.
+    """
+
+    def __init__(self, max_bytes=IMAGE_STORE_MAX_BYTES, spill_dir=None):
+        self.max_bytes = max_bytes
+        self._spill_dir = spill_dir
+        self._keys = {}  # Every key, in insertion order
+        self._memory = OrderedDict()  # key -> array, least recently used first
+        self._memory_bytes = 0
+        self._disk = {}  # key -> spill file, kept while the file matches the entry
+        self._counter = 0
+        self._lock = threading.RLock()
+        self._finalizer = None
+
+    def _spill_path(self):
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="imagecraft_")
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+        elif not os.path.isdir(self._spill_dir):
+            os.makedirs(self._spill_dir, exist_ok=True)
+        self._counter += 1
+        return os.path.join(self._spill_dir, f"{self._counter}.npy")
+
+    def _remove_spill(self, key):
+        spill_path = self._disk.pop(key, None)
+        if spill_path is not None:
+            try:
+                os.remove(spill_path)
+            except OSError:
+                pass
+
+    def _evict(self):
+        # Always keep the most recent entry in memory, even if it alone exceeds the budget
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            key, img = self._memory.popitem(last=False)
+            self._memory_bytes -= img.nbytes
+            if key not in self._disk:
+                spill_path = self._spill_path()
+                np.save(spill_path, img, allow_pickle=False)
+                self._disk[key] = spill_path
+
+    def __getitem__(self, key):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            if key not in self._disk:
+                raise KeyError(key)
+            img = np.load(self._disk[key], allow_pickle=False)
+            self._memory[key] = img
+            self._memory_bytes += img.nbytes
+            self._evict()
+            return img
+
+    def __setitem__(self, key, img):
+        with self._lock:
+            if key in self._keys:
+                self._discard(key)
+            self._keys[key] = None
+            self._memory[key] = img
+            self._memory_bytes += img.nbytes
+            self._evict()
+
+    def _discard(self, key):
+        del self._keys[key]
+        img = self._memory.pop(key, None)
+        if img is not None:
+            self._memory_bytes -= img.nbytes
+        self._remove_spill(key)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if key not in self._keys:
+                raise KeyError(key)
+            self._discard(key)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._disk):
+                self._remove_spill(key)
+            self._keys.clear()
+            self._memory.clear()
+            self._memory_bytes = 0
@@ -0,0 +1,151 @@
+"""
+Geometry for the Image Transformation tab: perspective, translation,
+rotation/scale and crop composed into one homography.
+"""
+
+import threading
+from collections import OrderedDict, namedtuple
+
+import cv2
+import numpy as np
+
+TransformationParams = namedtuple('TransformationParams', [
+    'corners', 'x_translation', 'y_translation', 'scale', 'rotation',
+    'crop_x', 'crop_y', 'crop_width', 'crop_height'
+])
+# corners, crop_width and crop_height may be None to mean "the full image"
+TransformationParams.__new__.__defaults__ = (None, 0, 0, 100, 0, 0, 0, None, None)
+
+
+def validate_points(points):
+    try:
+        if points.shape != (4, 2):
+            return False
+        if len(np.unique(points, axis=0)) != 4:
+            return False
+        hull = cv2.convexHull(points)
+        return len(hull) == 4
+    except Exception:
+        return False
+
+
+def build_transformation_matrix(w, h, params):
+    """
+    Compose perspective, translation, rotation/scale and crop into a single
+    3x3 homography mapping source pixels to crop pixels.
+    Returns the matrix and the (width, height) of the crop.
+    """
+    dst_points = np.array([[0, 0], [w, 0], [w, h], [0, h]], dtype="float32")
+    if params.corners is None:
+        src_points = dst_points
+    else:
+        src_points = np.array(params.corners, dtype="float32").reshape(4, 2)
+
+    if not validate_points(src_points):
+        raise ValueError("Invalid perspective points.")
+
+    # Perspective transformation
+    try:
+        M_perspective = cv2.getPerspectiveTransform(src_points, dst_points)
+    except cv2.error as e:
+        raise ValueError(f"Perspective transformation failed: {e}")
+
+    # Translation
+    M_translate = np.array([[1, 0, params.x_translation],
+                            [0, 1, params.y_translation],
+                            [0, 0, 1]], dtype=np.float64)
+
+    # Rotation and scaling around the image center
+    center = (w // 2, h // 2)
+    scale = params.scale / 100  # Convert to float
+    rotation = params.rotation
+    M_rotate = np.vstack([cv2.getRotationMatrix2D(center, rotation, scale), [0, 0, 1]])
+
+    # Cropping
+    crop_x = int(params.crop_x)
+    crop_y = int(params.crop_y)
+    crop_w = int(params.crop_width) if params.crop_width is not None else w
+    crop_h = int(params.crop_height) if params.crop_height is not None else h
+
+    # Ensure crop dimensions are within the bounds of the image
+    crop_w = min(crop_w, w - crop_x)
+    crop_h = min(crop_h, h - crop_y)
+
+    if crop_x < 0 or crop_y < 0 or crop_w <= 0 or crop_h <= 0:
+        raise ValueError("Invalid crop dimensions.")
+
+    M_crop = np.array([[1, 0, -crop_x],
+                       [0, 1, -crop_y],
+                       [0, 0, 1]], dtype=np.float64)
+
+    M = M_crop @ M_rotate @ M_translate @ M_perspective
+    return M, (crop_w, crop_h)
+
+
+def apply_transformations(img, params):
+    h, w = img.shape[:2]
+    M, (crop_w, crop_h) = build_transformation_matrix(w, h, params)
+
+    # Resample once, straight into the crop-sized output
+    return cv2.warpPerspective(img, M, (crop_w, crop_h))
+
+
+def apply_transformations_cached(img, params, remap_cache):
+    """
+    Same result as apply_transformations, but the coordinate map is built
+    once per (image size, parameter set) and applied with cv2.remap.
+    """
+    h, w = img.shape[:2]
+    map1, map2 = remap_cache.get_or_build(
+        (w, h, params), lambda: build_transformation_matrix(w, h, params)
+    )
+    return cv2.remap(img, map1, map2, cv2.INTER_LINEAR)
+
+
+class RemapCache:
+    """
+    Bounded LRU cache of fixed-point remap tables.
+    Entries are keyed by image size and transformation parameters, so a batch
+    of same-size images builds its coordinate map once and then only pays for
+    a single cv2.remap pass per image.
+    """
+
+    def __init__(self, max_entries=4):
+        self.max_entries = max_entries
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build_matrix):
+        """
+        Return the tables for key, calling build_matrix() -> (M, out_size) on a miss.
+        Safe to call from batch worker threads; concurrent misses build only once.
+        """
+        with self._lock:
+            tables = self._tables.get(key)
+            if tables is not None:
+                self._tables.move_to_end(key)
+                return tables
+            M, out_size = build_matrix()
+            tables = self.build_tables(M, out_size)
+            self._tables[key] = tables
+            while len(self._tables) > self.max_entries:
+                self._tables.popitem(last=False)
+            return tables
+
+    def clear(self):
+        with self._lock:
+            self._tables.clear()
+
+    @staticmethod
+    def build_tables(M, out_size):
+        # Map every output pixel back to its source coordinate through the inverse homography
+        out_w, out_h = out_size
+        M_inv = np.linalg.inv(M)
+        xs = np.arange(out_w, dtype=np.float64)[np.newaxis, :]
+        ys = np.arange(out_h, dtype=np.float64)[:, np.newaxis]
+        denom = M_inv[2, 0] * xs + M_inv[2, 1] * ys + M_inv[2, 2]
+        denom[np.abs(denom) < 1e-12] = 1e-12
+        map_x = ((M_inv[0, 0] * xs + M_inv[0, 1] * ys + M_inv[0, 2]) / denom).astype(np.float32)
+        map_y = ((M_inv[1, 0] * xs + M_inv[1, 1] * ys + M_inv[1, 2]) / denom).astype(np.float32)
+        # Fixed-point tables are smaller and faster to sample than float maps
+        return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
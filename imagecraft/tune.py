@@ -0,0 +1,290 @@
+"""HCT parameter search against reference YOLO labels: grid or successive halving, in parallel."""
+
+import itertools
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+from . import hct
+from .export import label_path
+from .index import image_root, read_image_size
+from .preprocess import PreprocessCache
+from .roi import roi_contains
+
+DEFAULT_IOU_THRESHOLD = 0.5
+SEARCH_METHODS = ('halving', 'grid')
+TUNED_PARAMS = ('dp', 'minDist', 'param1', 'param2', 'minRadius', 'maxRadius')
+# Circle outlines cover a few percent of an image at most; a Canny threshold that marks
+# more than this is tracing noise, and HoughCircles then takes seconds per image
+MAX_EDGE_FRACTION = 0.05
+
+
+def read_yolo_boxes(label_path, width, height):
+    """(N, 4) pixel boxes (x, y, w, h) from a YOLO .txt file."""
+    boxes = []
+    with open(label_path, 'r') as f:
+        for line in f:
+            fields = line.split()
+            if len(fields) < 5:
+                continue
+            x_center, y_center, w, h = (float(v) for v in fields[1:5])
+            boxes.append(((x_center - w / 2) * width, (y_center - h / 2) * height, w * width, h * height))
+    return np.array(boxes, dtype=np.float64).reshape(-1, 4)
+
+
+def load_reference_set(image_paths, labels_dir, root=None):
+    """
+    (path, reference boxes, (width, height)) for every image with a label file of the
+    same name in labels_dir, in the subfolder mirroring its folder under root as the
+    exporters write them, or directly in labels_dir. Images without one are left out,
+    so a folder can be tuned from the few images that were labelled by hand.
+    """
+    root = image_root(image_paths, root)
+    samples = []
+    for path in image_paths:
+        for reference_path in (label_path(labels_dir, path, '.txt', root), label_path(labels_dir, path)):
+            if os.path.isfile(reference_path):
+                width, height = read_image_size(path)
+                samples.append((path, read_yolo_boxes(reference_path, width, height), (width, height)))
+                break
+    if not samples:
+        raise ValueError(f"No images have a matching label file in {labels_dir}.")
+    return samples
+
+
+def boxes_in_rois(boxes, rois):
+    """The (x, y, w, h) boxes whose centre lies inside one of rois; all of them without rois."""
+    if not rois or len(boxes) == 0:
+        return boxes
+    cx, cy = boxes[:, 0] + boxes[:, 2] / 2, boxes[:, 1] + boxes[:, 3] / 2
+    return boxes[np.logical_or.reduce([roi_contains(roi, cx, cy) for roi in rois])]
+
+
+def box_iou(a, b):
+    """IoU matrix between (N, 4) and (M, 4) boxes given as (x, y, w, h)."""
+    ax1, ay1 = a[:, 0:1], a[:, 1:2]
+    ax2, ay2 = ax1 + a[:, 2:3], ay1 + a[:, 3:4]
+    bx1, by1 = b[:, 0], b[:, 1]
+    bx2, by2 = bx1 + b[:, 2], by1 + b[:, 3]
+    inter = (np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0, None)
+             * np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0, None))
+    union = a[:, 2:3] * a[:, 3:4] + b[:, 2] * b[:, 3] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def count_matches(detected, reference, iou_threshold=DEFAULT_IOU_THRESHOLD):
+    """Detections paired one-to-one with reference boxes, best IoU first."""
+    if len(detected) == 0 or len(reference) == 0:
+        return 0
+    iou = box_iou(detected, reference)
+    pairs = np.argwhere(iou >= iou_threshold)
+    pairs = pairs[np.argsort(-iou[pairs[:, 0], pairs[:, 1]], kind='stable')]
+    used_detected, used_reference = set(), set()
+    for d, r in pairs:
+        if d not in used_detected and r not in used_reference:
+            used_detected.add(d)
+            used_reference.add(r)
+    return len(used_detected)
+
+
+def default_search_space(samples, offset=0):
+    """
+    Candidate values per parameter, bracketing the circle sizes implied by the
+    reference boxes (the larger box side, less the box offset, is a diameter).
+    """
+    boxes = np.concatenate([boxes for _, boxes, _ in samples])
+    if len(boxes) == 0:
+        raise ValueError("The reference labels contain no boxes to tune against.")
+    radii = np.maximum(boxes[:, 2:4].max(axis=1) / 2 - offset, 1)
+    r_min, r_max = float(radii.min()), float(radii.max())
+    return {
+        'dp': [1.0, 1.5],
+        'minDist': sorted({max(1, int(r_min * f)) for f in (1.0, 1.5, 2.0)}),
+        'param1': [30, 50, 100, 150],
+        'param2': [10, 15, 20, 25, 30, 40, 50, 60],
+        'minRadius': sorted({int(r_min * f) for f in (0.6, 0.8, 0.9)}),
+        'maxRadius': sorted({math.ceil(r_max * f) for f in (1.1, 1.25, 1.5)}),
+    }
+
+
+def expand_grid(space, base=None):
+    """Every combination of the values in space, on top of base (DEFAULT_HCT_PARAMS by default)."""
+    base = dict(base or hct.DEFAULT_HCT_PARAMS)
+    names = list(space)
+    return [dict(base, **dict(zip(names, values))) for values in itertools.product(*(space[n] for n in names))]
+
+
+class Tuner:
+    """
+    Scores HCT parameter sets on reference samples. Every trial reads its blurred
+    inputs from one shared PreprocessCache, so each image is decoded and blurred
+    once per run, and trials run on a thread pool (HoughCircles releases the GIL).
+    With the numpy backend trials run one at a time: they share each frame's cached
+    votes, whose peak extraction is serialised per frame anyway. With rois (a RoiSet)
+    detection searches each image's ROIs only, as labelling does, and reference boxes
+    centred outside them are not counted.
+    """
+
+    def __init__(self, samples, offset=0, class_num=0, iou_threshold=DEFAULT_IOU_THRESHOLD,
+                 mode='full', backend='opencv', max_workers=None, cache=None, rois=None):
+        self.rois = rois
+        self.samples = [
+            (path, boxes_in_rois(reference, self.rois_for(path)), size) for path, reference, size in samples
+        ]
+        self.offset = offset
+        self.class_num = class_num
+        self.iou_threshold = iou_threshold
+        self.mode = mode
+        self.backend = backend
+        self.max_workers = 1 if backend == 'numpy' else max_workers or os.cpu_count() or 1
+        self.cache = cache or PreprocessCache()
+        self._warmed = False
+
+    def rois_for(self, path):
+        return self.rois.for_path(path) if self.rois is not None else None
+
+    def warm_cache(self):
+        """Decode and blur every sample once, in parallel, so trial timings measure detection only."""
+        if self._warmed:
+            return
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            list(executor.map(self.cache.get, [path for path, _, _ in self.samples]))
+        self._warmed = True
+
+    def usable_canny_thresholds(self, values):
+        """
+        The param1 values whose Canny edges cover at most MAX_EDGE_FRACTION of the
+        samples; the highest value is kept even when all of them are noisy.
+        """
+        self.warm_cache()
+        usable = []
+        for value in sorted(values):
+            fractions = [
+                np.count_nonzero(cv2.Canny(self.cache.get(path), max(1, value // 2), value)) / (width * height)
+                for path, _, (width, height) in self.samples
+            ]
+            if np.mean(fractions) <= MAX_EDGE_FRACTION:
+                usable.append(value)
+        return usable or [max(values)]
+
+    def evaluate(self, params, samples=None):
+        """Precision, recall, F1 and Hough seconds per image of params over samples."""
+        samples = self.samples if samples is None else samples
+        detected_total = reference_total = matched_total = 0
+        elapsed = 0.0
+        for path, reference, (width, height) in samples:
+            start = time.perf_counter()
+            # Configurations are scored in parallel, so tiles are not split over threads as well
+            circles = hct.detect_circles_in_file(
+                path, params, self.mode, self.cache, self.backend, self.rois_for(path),
+                tile_workers=1 if self.max_workers > 1 else None
+            )
+            elapsed += time.perf_counter() - start
+            detected = np.zeros((0, 4))
+            if circles is not None:
+                boxes = hct.circles_to_boxes(circles, self.offset, self.class_num, (height, width))
+                detected = np.array([box[:4] for box in boxes], dtype=np.float64)
+            detected_total += len(detected)
+            reference_total += len(reference)
+            matched_total += count_matches(detected, reference, self.iou_threshold)
+
+        precision = matched_total / detected_total if detected_total else 0.0
+        recall = matched_total / reference_total if reference_total else 0.0
+        return {
+            'params': {name: params[name] for name in TUNED_PARAMS},
+            'precision': precision,
+            'recall': recall,
+            'f1': 2 * precision * recall / (precision + recall) if precision + recall else 0.0,
+            'seconds_per_image': elapsed / len(samples),
+            'images': len(samples),
+        }
+
+    def evaluate_all(self, configs, samples=None, progress=None, is_cancelled=None):
+        """evaluate() for every config on the thread pool; results keep the order of configs."""
+        self.warm_cache()
+        results = [None] * len(configs)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.evaluate, config, samples): i for i, config in enumerate(configs)}
+            for future in futures:
+                if is_cancelled and is_cancelled():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+                results[futures[future]] = future.result()
+                done += 1
+                if progress:
+                    progress(done, len(configs))
+        return [result for result in results if result is not None]
+
+    def grid_search(self, configs, progress=None, is_cancelled=None):
+        return self.evaluate_all(configs, progress=progress, is_cancelled=is_cancelled)
+
+    def successive_halving(self, configs, eta=3, progress=None, is_cancelled=None):
+        """
+        Score every config on a few images, keep the best 1/eta, and repeat on eta times
+        as many images until the survivors have been scored on all of them. Returns the
+        results of the last rung, which are all on the full sample set; at least eta**2
+        configs reach it, so there is a frontier to choose from.
+        """
+        rungs = 0
+        while len(configs) // eta ** (rungs + 1) >= eta ** 2:
+            rungs += 1
+        total = sum(math.ceil(len(configs) / eta ** i) for i in range(rungs + 1))
+        done = 0
+
+        def rung_progress(rung_done, _):
+            if progress:
+                progress(done + rung_done, total)
+
+        survivors = configs
+        for rung in range(rungs + 1):
+            count = max(1, round(len(self.samples) / eta ** (rungs - rung)))
+            results = self.evaluate_all(survivors, self.samples[:count], rung_progress, is_cancelled)
+            done += len(survivors)
+            if rung == rungs or (is_cancelled and is_cancelled()):
+                return results
+            ranked = sorted(range(len(results)), key=lambda i: rank_key(results[i]))
+            keep = math.ceil(len(survivors) / eta)
+            survivors = [survivors[i] for i in ranked[:keep]]
+        return results
+
+
+def rank_key(result):
+    """Best F1 first, then the faster of equally good parameter sets."""
+    return -result['f1'], result['seconds_per_image']
+
+
+def pareto_frontier(results):
+    """
+    Results that no other result beats on precision, recall and runtime at once, best
+    F1 first. Parameter sets that match nothing are left out, however fast they are.
+    """
+    results = [result for result in results if result['recall'] > 0]
+    frontier = []
+    for result in results:
+        dominated = any(
+            other['precision'] >= result['precision'] and other['recall'] >= result['recall']
+            and other['seconds_per_image'] <= result['seconds_per_image']
+            and (other['precision'], other['recall'], -other['seconds_per_image'])
+            != (result['precision'], result['recall'], -result['seconds_per_image'])
+            for other in results
+        )
+        if not dominated:
+            frontier.append(result)
+    return sorted(frontier, key=rank_key)
+
+
+def format_results(results):
+    lines = [f"{'precision':>9}{'recall':>8}{'f1':>7}{'ms/image':>10}  parameters"]
+    for result in results:
+        params = ' '.join(f"{name}={result['params'][name]}" for name in TUNED_PARAMS)
+        lines.append(
+            f"{result['precision']:>9.3f}{result['recall']:>8.3f}{result['f1']:>7.3f}"
+            f"{result['seconds_per_image'] * 1000:>10.1f}  {params}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,210 @@
+"""HCT over video files and frame sequences: full detection on keyframes, window tracking in between."""
+
+import math
+import os
+import re
+import time
+
+import cv2
+import numpy as np
+
+from . import hct
+from .batch import read_image, write_image
+from .boxes import boxes_from_circles
+from .index import list_images
+from .preprocess import DEFAULT_BLUR_KSIZE
+
+DEFAULT_KEYFRAME_INTERVAL = 30
+# A tracked circle is searched for within this fraction of its radius around its last
+# position, with a radius within this tolerance of its last radius
+TRACK_SEARCH_FRACTION = 0.5
+TRACK_RADIUS_TOLERANCE = 0.2
+VIDEO_FORMATS = ('.mp4', '.avi', '.mov', '.mkv', '.m4v', '.wmv', '.mpg', '.mpeg')
+
+
+def sequence_stem(source):
+    """File-name stem for the frames of source, with any printf frame pattern (frame_%04d.png) removed."""
+    stem = os.path.splitext(os.path.basename(source.rstrip(os.sep)))[0]
+    return re.sub(r'%0?\d*d', '', stem).strip('_-. ') or 'frame'
+
+
+def list_frames(source):
+    """The frame images of a folder source in natural-sort order, or None for a video or sequence pattern."""
+    return list_images(source) if os.path.isdir(source) else None
+
+
+def iter_frames(source, paths=None):
+    """
+    (index, name, BGR frame) for every frame of source, read one at a time: a video
+    file, an image sequence pattern such as frames/img_%04d.png (both through
+    cv2.VideoCapture), or a folder of frame images in natural-sort order. paths is
+    the folder's list_frames listing when the caller already has it.
+    """
+    if paths is None:
+        paths = list_frames(source)
+    if paths is not None:
+        for index, path in enumerate(paths):
+            yield index, os.path.splitext(os.path.basename(path))[0], read_image(path)
+        return
+
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f"Cannot open video or frame sequence {source}")
+    stem = sequence_stem(source)
+    try:
+        index = 0
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            yield index, f"{stem}_{index:06d}", frame
+            index += 1
+    finally:
+        capture.release()
+
+
+def frame_count(source, paths=None):
+    """Number of frames in source, or 0 when the container does not say; paths as for iter_frames."""
+    if paths is None:
+        paths = list_frames(source)
+    if paths is not None:
+        return len(paths)
+    capture = cv2.VideoCapture(source)
+    try:
+        return max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT)))
+    finally:
+        capture.release()
+
+
+class CircleTracker:
+    """
+    Per-frame circles of a frame sequence. The first frame, every keyframe_interval-th
+    frame and every frame after one without circles get full-frame HoughCircles; the
+    frames in between search only a small window around each circle of the previous
+    frame, with the radius range narrowed to that circle. When more than
+    max_lost_fraction of the tracks find nothing, the frame is redetected in full, so
+    objects that leave are dropped at once; objects that enter are picked up at the
+    next keyframe. With rois (see imagecraft.roi) full detection searches only those regions.
+    """
+
+    def __init__(self, params, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, search_fraction=TRACK_SEARCH_FRACTION,
+                 radius_tolerance=TRACK_RADIUS_TOLERANCE, max_lost_fraction=0.0, backend='opencv',
+                 blur_ksize=DEFAULT_BLUR_KSIZE, rois=None):
+        self.params = params
+        self.rois = rois
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.search_fraction = search_fraction
+        self.radius_tolerance = radius_tolerance
+        self.max_lost_fraction = max_lost_fraction
+        self.backend = backend
+        self.blur_ksize = blur_ksize
+        self._circles = np.zeros((0, 3), np.float32)  # Circles of the previous frame
+        self._since_keyframe = 0
+        self.keyframes = 0
+        self.fallbacks = 0
+        self.tracked_frames = 0
+
+    def blur(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        return cv2.medianBlur(gray, self.blur_ksize)
+
+    def detect_full(self, frame):
+        blurred = self.blur(frame)
+        if self.rois:
+            circles = hct.roi_hough_circles(
+                blurred, self.params, self.rois, lambda crop: hct.hough_circles(crop, self.params, backend=self.backend)
+            )
+        else:
+            circles = hct.hough_circles(blurred, self.params, backend=self.backend)
+        return np.zeros((0, 3), np.float32) if circles is None else circles[0].astype(np.float32)
+
+    def track(self, frame):
+        """Circles found near the previous frame's circles, and the number of tracks lost."""
+        height, width = frame.shape[:2]
+        found = []
+        lost = 0
+        min_dist = self.params['minDist']
+        for x, y, r in self._circles.tolist():
+            margin = math.ceil(r * self.search_fraction) + 2
+            x0, y0 = max(0, int(x - r - margin)), max(0, int(y - r - margin))
+            x1, y1 = min(width, int(x + r + margin) + 1), min(height, int(y + r + margin) + 1)
+            window = self.blur(frame[y0:y1, x0:x1])
+            # One circle per window: the strongest within the narrowed radius range
+            window_params = dict(
+                self.params,
+                minDist=max(window.shape),
+                minRadius=max(1, math.floor(r * (1 - self.radius_tolerance))),
+                maxRadius=math.ceil(r * (1 + self.radius_tolerance)),
+            )
+            circles = hct.hough_circles(window, window_params, backend=hct.window_backend(self.backend))
+            if circles is None:
+                lost += 1
+                continue
+            cx, cy, cr = circles[0, 0].astype(np.float32)
+            cx, cy = cx + x0, cy + y0
+            # Two tracks that converged on one circle keep the first
+            if all((cx - fx) ** 2 + (cy - fy) ** 2 >= min_dist ** 2 for fx, fy, _ in found):
+                found.append((cx, cy, cr))
+        return np.array(found, np.float32).reshape(-1, 3), lost
+
+    def update(self, frame):
+        """Circles of the next frame as (1, N, 3) uint16, like HoughCircles, or None."""
+        keyframe = len(self._circles) == 0 or self._since_keyframe + 1 >= self.keyframe_interval
+        if not keyframe:
+            circles, lost = self.track(frame)
+            if lost > self.max_lost_fraction * len(self._circles):
+                keyframe = True
+                self.fallbacks += 1
+            else:
+                self._since_keyframe += 1
+                self.tracked_frames += 1
+        if keyframe:
+            circles = self.detect_full(frame)
+            self._since_keyframe = 0
+            self.keyframes += 1
+        self._circles = circles
+        if len(circles) == 0:
+            return None
+        return np.uint16(np.around(circles))[np.newaxis]
+
+
+def label_video(source, params, labels_dir, offset=0, class_num=0, frames_dir=None, frame_format='jpg',
+                keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, backend='opencv', progress=None, is_cancelled=None,
+                rois=None):
+    """
+    Track circles through source and write a YOLO label file per frame, named after the
+    frame (<video stem>_<frame index>.txt for videos); frames without circles get an
+    empty file. With frames_dir set the frames are written there too, so labels and
+    images pair up for training. Returns frame counts and the seconds spent detecting.
+    """
+    os.makedirs(labels_dir, exist_ok=True)
+    if frames_dir:
+        os.makedirs(frames_dir, exist_ok=True)
+    tracker = CircleTracker(params, keyframe_interval, backend=backend, rois=rois)
+    # A folder is listed once, for the count and the frames
+    paths = list_frames(source)
+    total = frame_count(source, paths)
+    frames = 0
+    detect_seconds = 0.0
+    for index, name, frame in iter_frames(source, paths):
+        if is_cancelled and is_cancelled():
+            break
+        start = time.perf_counter()
+        circles = tracker.update(frame)
+        detect_seconds += time.perf_counter() - start
+
+        height, width = frame.shape[:2]
+        boxes = boxes_from_circles(circles, offset, class_num, (height, width))
+        hct.write_yolo_labels(os.path.join(labels_dir, name + '.txt'), boxes, width, height)
+        if frames_dir:
+            write_image(os.path.join(frames_dir, f"{name}.{frame_format}"), frame)
+        frames += 1
+        if progress:
+            progress(frames, max(total, frames))
+    return {
+        'frames': frames,
+        'keyframes': tracker.keyframes,
+        'tracked': tracker.tracked_frames,
+        'fallbacks': tracker.fallbacks,
+        'detect_seconds': detect_seconds,
+    }
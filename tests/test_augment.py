@@ -0,0 +1,122 @@
+import cv2
+import numpy as np
+import pytest
+
+from imagecraft.augment import (
+    BORDER_MODES, DEFAULT_AUGMENTATION_PARAMS, augment_image, geometry_matrix
+)
+
+WIDTH, HEIGHT = 320, 240
+# Rounding between one fused resample and the staged ones, for content as smooth as smooth_frame:
+# per pixel after a single staged resample (or resize), per pixel and on average after up to four
+TOLERANCE = 2
+COMBINED_TOLERANCE = 3
+COMBINED_MEAN_TOLERANCE = 0.5
+
+
+def staged_geometry(img, params):
+    """The former pipeline: one warp (or resize) per rotation, translation, scale and shear."""
+    border = BORDER_MODES[params['border']]
+    degrees = params['degrees']
+    if degrees != 0:
+        (h, w) = img.shape[:2]
+        M = cv2.getRotationMatrix2D((w // 2, h // 2), degrees, 1.0)
+        img = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=border)
+    translate = params['translate']
+    if translate != 0:
+        M = np.float32([[1, 0, translate], [0, 1, translate]])
+        (h, w) = img.shape[:2]
+        img = cv2.warpAffine(img, M, (w, h), flags=cv2.INTER_LINEAR, borderMode=border)
+    scale = params['scale']
+    if scale != 1.0:
+        img = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    shear = params['shear']
+    if shear != 0:
+        shear_rad = np.radians(shear)
+        M = np.float32([[1, np.tan(shear_rad), 0], [0, 1, 0]])
+        (h, w) = img.shape[:2]
+        new_width = w + int(abs(np.tan(shear_rad)) * h)
+        img = cv2.warpAffine(img, M, (new_width, h), flags=cv2.INTER_LINEAR, borderMode=border)
+    return img
+
+
+def smooth_frame():
+    """Colour frame with smooth structure, so rounding, not aliasing, is what differs."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (HEIGHT // 16, WIDTH // 16, 3), dtype=np.uint8)
+    img = cv2.resize(noise, (WIDTH, HEIGHT), interpolation=cv2.INTER_CUBIC)
+    return cv2.GaussianBlur(img, (0, 0), 3)
+
+
+def geometry_params(**values):
+    params = dict(DEFAULT_AUGMENTATION_PARAMS)
+    params.update(values)
+    return params
+
+
+def interior_mask(params):
+    """Pixels every staged step sampled from inside the image, away from the edges."""
+    inside = staged_geometry(np.full((HEIGHT, WIDTH), 255, np.uint8), geometry_params(**params, border='constant'))
+    return cv2.erode((inside == 255).astype(np.uint8), np.ones((5, 5), np.uint8)).astype(bool)
+
+
+@pytest.mark.parametrize('border', sorted(BORDER_MODES))
+@pytest.mark.parametrize('step', [{'degrees': 17}, {'translate': 13}, {'shear': 10}, {'shear': -25}])
+def test_single_step_matches_staged_warp_exactly(step, border):
+    img = smooth_frame()
+    params = geometry_params(**step, border=border)
+    assert np.array_equal(augment_image(img, params), staged_geometry(img, params))
+
+
+@pytest.mark.parametrize('scale', [0.5, 0.73, 1.5, 2.0])
+def test_scale_alone_resizes_like_staged_pipeline(scale):
+    img = smooth_frame()
+    params = geometry_params(scale=scale)
+    assert np.array_equal(augment_image(img, params), staged_geometry(img, params))
+
+
+@pytest.mark.parametrize('scale', [0.5, 0.73, 1.5, 2.0])
+def test_scale_matrix_aligns_pixel_centres_like_resize(scale):
+    # The scale-only shortcut never uses the matrix, so check its centre offset against cv2.resize directly
+    img = smooth_frame()
+    matrix, size = geometry_matrix(geometry_params(scale=scale), WIDTH, HEIGHT)
+    resized = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+    assert size == (resized.shape[1], resized.shape[0])
+    warped = cv2.warpAffine(img, matrix, size, flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT)
+    difference = np.abs(warped.astype(int) - resized.astype(int))
+    assert difference[2:-2, 2:-2].max() <= TOLERANCE
+
+
+@pytest.mark.parametrize('scale, shear', [(1.0, 20), (0.5, -15), (1.5, 30), (0.73, 5)])
+def test_shear_canvas_matches_staged_size(scale, shear):
+    params = geometry_params(scale=scale, shear=shear)
+    _, size = geometry_matrix(params, WIDTH, HEIGHT)
+    staged = staged_geometry(smooth_frame(), params)
+    assert size == (staged.shape[1], staged.shape[0])
+
+
+COMBINED = [
+    {'degrees': 12, 'translate': 9, 'scale': 0.8, 'shear': 8},
+    {'degrees': -30, 'translate': -15, 'scale': 1.4, 'shear': -12},
+    {'degrees': 5, 'translate': 4, 'scale': 1.25, 'shear': 0},
+]
+
+
+@pytest.mark.parametrize('border', sorted(BORDER_MODES))
+@pytest.mark.parametrize('steps', COMBINED)
+def test_combined_geometry_matches_staged_pipeline_in_the_interior(steps, border):
+    img = smooth_frame()
+    params = geometry_params(**steps, border=border)
+    fused = augment_image(img, params)
+    staged = staged_geometry(img, params)
+    assert fused.shape == staged.shape
+    mask = interior_mask(steps)
+    assert mask.mean() > 0.3
+    difference = np.abs(fused.astype(int) - staged.astype(int))[mask]
+    assert difference.max() <= COMBINED_TOLERANCE
+    assert difference.mean() <= COMBINED_MEAN_TOLERANCE
+
+
+def test_unknown_border_mode_is_rejected():
+    with pytest.raises(ValueError, match='border mode'):
+        augment_image(smooth_frame(), geometry_params(degrees=10, border='mirror'))
@@ -0,0 +1,53 @@
+import numpy as np
+
+from imagecraft.boxes import BoxStore
+
+
+def test_set_replaces_the_boxes_of_an_image():
+    store = BoxStore()
+    store.set('a.png', [(1, 2, 10, 10, 0), (3, 4, 10, 10, 0)], (64, 48))
+    store.set('a.png', [(5, 6, 20, 20, 1)])
+
+    assert store.coordinates('a.png').tolist() == [[5, 6, 20, 20]]
+    assert store.get('a.png')['class'].tolist() == [1]
+    assert store.count == 1
+    # A set without a size keeps the recorded one
+    assert store.size('a.png') == (64, 48)
+
+    store.set('a.png', [])
+    assert 'a.png' not in store and len(store) == 0
+
+
+def test_merged_boxes_follow_sets_and_removals():
+    store = BoxStore()
+    store.set('a.png', [(1, 2, 10, 10, 0)])
+    store.set('b.png', [(3, 4, 10, 10, 0)])
+    assert store.merged()['x'].tolist() == [1, 3]
+    assert store.merged() is store.merged()  # Cached until the store changes
+
+    store.set('a.png', [(7, 8, 10, 10, 0), (9, 9, 10, 10, 0)])
+    assert store.merged()['x'].tolist() == [7, 9, 3]
+    assert store.merged()['image'].tolist() == [store.image_id('a.png')] * 2 + [store.image_id('b.png')]
+
+    store.remove('a.png')
+    assert store.merged()['x'].tolist() == [3]
+    store.clear()
+    assert len(store.merged()) == 0
+
+
+def test_query_filters_by_class_size_and_image():
+    store = BoxStore()
+    store.set('a.png', [(0, 0, 10, 4, 0), (0, 0, 30, 30, 1), (0, 0, 50, 60, 0)])
+    store.set('b.png', [(0, 0, 20, 20, 0), (0, 0, 8, 8, 1)])
+
+    def sides(records):
+        return sorted(np.maximum(records['w'], records['h']).tolist())
+
+    assert sides(store.query()) == [8, 10, 20, 30, 60]
+    assert sides(store.query(class_num=0)) == [10, 20, 60]
+    # Size is the larger side, and both bounds are inclusive
+    assert sides(store.query(min_size=10, max_size=30)) == [10, 20, 30]
+    assert sides(store.query(class_num=0, min_size=15)) == [20, 60]
+    assert sides(store.query(paths=['b.png'])) == [8, 20]
+    assert sides(store.query(class_num=1, paths=['a.png', 'missing.png'])) == [30]
+    assert len(store.query(paths=[])) == 0
@@ -0,0 +1,134 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+from imagecraft import export
+from imagecraft.boxes import BoxStore
+from imagecraft.export import PATCH_MANIFEST_NAME, export_coco, export_patches, export_voc, export_yolo
+from imagecraft.tune import load_reference_set
+
+
+def write_images(root, names, size=(64, 48)):
+    paths = []
+    for name in names:
+        path = os.path.join(root, *name.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        cv2.imwrite(path, np.zeros((size[1], size[0], 3), np.uint8))
+        paths.append(path)
+    return paths
+
+
+def test_coco_keeps_images_with_the_same_name_in_different_subfolders_apart(tmp_path):
+    paths = write_images(str(tmp_path), ['tray_a/img_1.png', 'tray_b/img_1.png'])
+    store = BoxStore()
+    for path in paths:
+        store.set(path, [(1, 2, 10, 10, 0)], (64, 48))
+    json_path = str(tmp_path / 'labels.json')
+
+    assert export_coco(store, json_path, root=str(tmp_path)) == (2, 2)
+    with open(json_path) as f:
+        coco = json.load(f)
+    assert sorted(image['file_name'] for image in coco['images']) == ['tray_a/img_1.png', 'tray_b/img_1.png']
+    assert len({annotation['image_id'] for annotation in coco['annotations']}) == 2
+
+    # Without a root the names are relative to the deepest folder holding every image
+    export_coco(store, json_path)
+    with open(json_path) as f:
+        assert sorted(image['file_name'] for image in json.load(f)['images']) == ['tray_a/img_1.png', 'tray_b/img_1.png']
+
+
+def test_coco_merge_replaces_annotations_and_size_of_images_exported_again(tmp_path):
+    first, second = write_images(str(tmp_path), ['a.png', 'b.png'])
+    json_path = str(tmp_path / 'labels.json')
+    store = BoxStore()
+    store.set(first, [(1, 2, 10, 10, 0)], (64, 48))
+    store.set(second, [(3, 4, 10, 10, 0)], (64, 48))
+    export_coco(store, json_path)
+
+    # a.png was resized since: its entry keeps its id but takes the new size
+    resized = BoxStore()
+    resized.set(first, [(5, 6, 20, 20, 1), (7, 8, 20, 20, 1)], (128, 96))
+    assert export_coco(resized, json_path, merge=True) == (1, 2)
+    with open(json_path) as f:
+        coco = json.load(f)
+    images = {image['file_name']: image for image in coco['images']}
+    assert len(coco['images']) == 2
+    assert (images['a.png']['width'], images['a.png']['height']) == (128, 96)
+    assert (images['b.png']['width'], images['b.png']['height']) == (64, 48)
+    by_image = {}
+    for annotation in coco['annotations']:
+        by_image.setdefault(annotation['image_id'], []).append(annotation['bbox'])
+    assert sorted(by_image[images['a.png']['id']]) == [[5, 6, 20, 20], [7, 8, 20, 20]]
+    assert by_image[images['b.png']['id']] == [[3, 4, 10, 10]]
+
+
+def test_patches_mirror_subfolders_instead_of_overwriting_each_other(tmp_path):
+    images = tmp_path / 'images'
+    paths = write_images(str(images), ['tray_a/img_1.png', 'tray_b/img_1.png'])
+    store = BoxStore()
+    for path in paths:
+        store.set(path, [(1, 2, 10, 10, 0), (20, 20, 8, 8, 0)], (64, 48))
+    patches = tmp_path / 'patches'
+
+    assert export_patches(store, str(patches), root=str(images)) == 4
+    written = sorted(str(path.relative_to(patches)).replace(os.sep, '/') for path in patches.rglob('*.png'))
+    assert written == ['tray_a/img_1_0000.png', 'tray_a/img_1_0001.png', 'tray_b/img_1_0000.png', 'tray_b/img_1_0001.png']
+    with open(patches / PATCH_MANIFEST_NAME) as f:
+        manifest = f.read().splitlines()
+    assert [line.split(',')[0] for line in manifest[1:]] == written
+
+
+def test_label_files_mirror_subfolders_instead_of_overwriting_each_other(tmp_path):
+    images = tmp_path / 'images'
+    paths = write_images(str(images), ['tray_a/img_1.png', 'tray_b/img_1.png'])
+    store = BoxStore()
+    store.set(paths[0], [(1, 2, 10, 10, 0)], (64, 48))
+    store.set(paths[1], [(3, 4, 10, 10, 1)], (64, 48))
+
+    assert export_yolo(store, str(tmp_path / 'yolo'), root=str(images)) == 2
+    assert (tmp_path / 'yolo' / 'tray_a' / 'img_1.txt').read_text().startswith('0 ')
+    assert (tmp_path / 'yolo' / 'tray_b' / 'img_1.txt').read_text().startswith('1 ')
+    # Tuning finds the mirrored reference labels again
+    samples = load_reference_set(paths, str(tmp_path / 'yolo'), str(images))
+    assert [boxes.round().tolist() for _, boxes, _ in samples] == [[[1, 2, 10, 10]], [[3, 4, 10, 10]]]
+
+    assert export_voc(store, str(tmp_path / 'voc'), root=str(images)) == 2
+    assert '<xmin>2</xmin>' in (tmp_path / 'voc' / 'tray_a' / 'img_1.xml').read_text()
+    assert '<xmin>4</xmin>' in (tmp_path / 'voc' / 'tray_b' / 'img_1.xml').read_text()
+
+
+def test_coco_merge_streams_the_existing_file_whatever_its_member_order(tmp_path, monkeypatch):
+    # A tiny chunk size splits numbers, strings and objects across reads
+    monkeypatch.setattr(export._JsonStreamReader, 'CHUNK_SIZE', 7)
+    first, second = write_images(str(tmp_path), ['a.png', 'b.png'])
+    json_path = tmp_path / 'labels.json'
+    json_path.write_text(json.dumps({
+        'annotations': [{'id': 1234567, 'image_id': 10, 'category_id': 0, 'bbox': [1, 2, 3, 4]}],
+        'info': {'description': 'a "quoted", [bracketed] name'},
+        'images': [{'id': 10, 'file_name': 'a.png', 'width': 64, 'height': 48}],
+        'categories': [{'id': 0, 'name': 'spore'}],
+    }, indent=2))
+    store = BoxStore()
+    store.set(second, [(3, 4, 10, 10, 1)], (64, 48))
+
+    assert export_coco(store, str(json_path), merge=True) == (1, 1)
+    coco = json.loads(json_path.read_text())
+    assert coco['info'] == {'description': 'a "quoted", [bracketed] name'}
+    assert [category['id'] for category in coco['categories']] == [0, 1]
+    assert [(image['id'], image['file_name']) for image in coco['images']] == [(10, 'a.png'), (11, 'b.png')]
+    assert [(annotation['id'], annotation['image_id']) for annotation in coco['annotations']] == [
+        (1234567, 10), (1234568, 11)]
+
+
+def test_coco_merge_rejects_a_truncated_file(tmp_path):
+    paths = write_images(str(tmp_path), ['a.png'])
+    json_path = tmp_path / 'labels.json'
+    json_path.write_text('{"images": [{"id": 1, "file_name": "a.png"')
+    store = BoxStore()
+    store.set(paths[0], [(1, 2, 10, 10, 0)], (64, 48))
+    with pytest.raises(ValueError, match='Invalid JSON'):
+        export_coco(store, str(json_path), merge=True)
+    assert json_path.read_text() == '{"images": [{"id": 1, "file_name": "a.png"'
@@ -0,0 +1,42 @@
+import cv2
+import numpy as np
+
+from imagecraft.bench import synthetic_circles
+from imagecraft.hct import blurred_tile, detection_factors, tile_grid, tiled_hough_circles
+
+PARAMS = {'dp': 1.0, 'minDist': 20, 'param1': 50, 'param2': 20, 'minRadius': 10, 'maxRadius': 40}
+
+
+def gray_frame():
+    # Wider than a tile, so the frame is split
+    img, _ = synthetic_circles(3000, 700, 40, 10, 40, np.random.default_rng(2), noise=10)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+
+def test_tiles_blurred_on_their_own_match_the_blurred_frame():
+    gray = gray_frame()
+    blurred = cv2.medianBlur(gray, 5)
+    tiles = tile_grid(gray.shape[1], gray.shape[0], PARAMS['maxRadius'])
+    assert len(tiles) > 1
+    for x0, y0, x1, y1 in tiles:
+        assert np.array_equal(blurred_tile(gray, (x0, y0, x1, y1), 5), blurred[y0:y1, x0:x1])
+
+
+def test_tile_blur_and_worker_count_leave_the_circles_unchanged():
+    gray = gray_frame()
+    expected = tiled_hough_circles(cv2.medianBlur(gray, 5), PARAMS)
+    assert expected is not None
+    assert np.array_equal(tiled_hough_circles(gray, PARAMS, 1, blur_ksize=5), expected)
+
+
+def test_pyramid_reduces_for_radii_a_reduced_decode_would_not():
+    def factors(min_radius, max_radius, mode):
+        return detection_factors(dict(PARAMS, minRadius=min_radius, maxRadius=max_radius), mode)
+
+    # minRadius 10 is too small for a reduced decode, not for the coarse candidate pass
+    assert factors(10, 60, 'reduced') == (1, 1)
+    assert factors(10, 60, 'pyramid') == (2, 1)
+    assert factors(5, 60, 'pyramid') == (1, 1)
+    # Without a minRadius the level follows maxRadius
+    assert factors(0, 200, 'pyramid') == (8, 1)
+    assert factors(0, 30, 'pyramid') == (1, 1)
@@ -0,0 +1,49 @@
+import threading
+
+import cv2
+import numpy as np
+
+from imagecraft.bench import synthetic_circles
+from imagecraft.hough import HoughVotes
+
+WINDOWS = [(5, 25), (40, 80)]
+
+
+def blurred_frame():
+    rng = np.random.default_rng(1)
+    img, _ = synthetic_circles(640, 480, 12, 8, 70, rng, noise=10)
+    return cv2.medianBlur(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY), 5)
+
+
+def window_params(min_radius, max_radius):
+    return {'dp': 1.0, 'minDist': 10, 'param1': 50, 'param2': 15, 'minRadius': min_radius, 'maxRadius': max_radius}
+
+
+def test_concurrent_circles_with_different_windows_match_serial_results():
+    blurred = blurred_frame()
+    expected = {}
+    for window in WINDOWS:
+        circles = HoughVotes(blurred, 50, 1.0, 5, 80).circles(window_params(*window))
+        expected[window] = None if circles is None else circles.copy()
+    assert any(circles is not None for circles in expected.values())
+
+    # One shared instance, as VoteCache hands out to every thread tuning the same frame
+    votes = HoughVotes(blurred, 50, 1.0, 5, 80)
+    mismatches = []
+    start = threading.Barrier(len(WINDOWS))
+
+    def worker(window):
+        start.wait()
+        for _ in range(150):
+            circles = votes.circles(window_params(*window))
+            reference = expected[window]
+            if (circles is None) != (reference is None) or (
+                    circles is not None and not np.array_equal(circles, reference)):
+                mismatches.append(window)
+
+    threads = [threading.Thread(target=worker, args=(window,)) for window in WINDOWS]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert mismatches == []
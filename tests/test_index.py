@@ -0,0 +1,83 @@
+import os
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+from imagecraft.index import list_images, natural_sort_key, probe_image_size, read_image_size, relative_image_path
+
+WIDTH, HEIGHT = 40, 24
+
+
+def frame():
+    return np.zeros((HEIGHT, WIDTH, 3), np.uint8)
+
+
+def exif_segment(orientation, order='<'):
+    """APP1 segment holding only an IFD0 orientation tag."""
+    mark = b'II' if order == '<' else b'MM'
+    tiff = mark + struct.pack(order + 'HI', 42, 8) + struct.pack(order + 'H', 1)
+    tiff += struct.pack(order + 'HHIHH', 0x0112, 3, 1, orientation, 0) + struct.pack(order + 'I', 0)
+    body = b'Exif\x00\x00' + tiff
+    return b'\xff\xe1' + struct.pack('>H', len(body) + 2) + body
+
+
+@pytest.mark.parametrize('extension', ['.png', '.bmp', '.jpg'])
+def test_header_size_matches_the_decoded_image(tmp_path, extension):
+    path = str(tmp_path / f"img{extension}")
+    cv2.imwrite(path, frame())
+    assert probe_image_size(path) == (WIDTH, HEIGHT)
+
+
+@pytest.mark.parametrize('orientation, order, size', [
+    (1, '<', (WIDTH, HEIGHT)), (6, '<', (HEIGHT, WIDTH)), (8, '>', (HEIGHT, WIDTH)),
+])
+def test_jpeg_size_follows_the_exif_orientation(tmp_path, orientation, order, size):
+    encoded = cv2.imencode('.jpg', frame())[1].tobytes()
+    path = str(tmp_path / 'rotated.jpg')
+    with open(path, 'wb') as f:
+        # The APP1 segment goes straight after SOI, ahead of the frame header
+        f.write(encoded[:2] + exif_segment(orientation, order) + encoded[2:])
+    assert probe_image_size(path) == size
+    # The size cv2.imread decodes to, which the header probe stands in for
+    img = cv2.imread(path)
+    assert (img.shape[1], img.shape[0]) == size
+
+
+def test_formats_without_a_probe_are_decoded_for_their_size(tmp_path):
+    path = str(tmp_path / 'img.tiff')
+    cv2.imwrite(path, frame())
+    assert probe_image_size(path) is None
+    assert read_image_size(path) == (WIDTH, HEIGHT)
+
+
+def test_natural_sort_orders_numbers_by_value_and_ignores_case():
+    names = ['img10.png', 'IMG2.png', 'img1.png', 'img2b.png', 'img2a.png']
+    assert sorted(names, key=natural_sort_key) == ['img1.png', 'IMG2.png', 'img2a.png', 'img2b.png', 'img10.png']
+
+
+def test_recursive_listing_sorts_by_relative_path(tmp_path):
+    for name in ['b/img10.png', 'b/img9.png', 'a10/img.png', 'a2/img.png', 'top.png', 'notes.txt']:
+        path = tmp_path.joinpath(*name.split('/'))
+        path.parent.mkdir(exist_ok=True)
+        if name.endswith('.png'):
+            cv2.imwrite(str(path), frame())
+        else:
+            path.write_text('')
+    root = str(tmp_path)
+
+    assert [relative_image_path(path, root) for path in list_images(root)] == ['top.png']
+    assert [relative_image_path(path, root) for path in list_images(root, recursive=True)] == [
+        'a2/img.png', 'a10/img.png', 'b/img9.png', 'b/img10.png', 'top.png'
+    ]
+
+
+def test_relative_image_path_keeps_nested_folders(tmp_path):
+    root = str(tmp_path / 'images')
+    nested = os.path.join(root, 'tray_a', 'day 2', 'img_1.png')
+    assert relative_image_path(nested, root) == 'tray_a/day 2/img_1.png'
+    # However the path is spelled
+    spelled = os.path.join(root, 'tray_b', '..', 'tray_a', 'img_1.png')
+    assert relative_image_path(spelled, root) == 'tray_a/img_1.png'
+    assert relative_image_path(nested, None) == 'img_1.png'
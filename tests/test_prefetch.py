@@ -0,0 +1,34 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from imagecraft.prefetch import ImagePrefetcher
+
+
+def wait_until(condition, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not condition() and time.monotonic() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_invalidate_drops_images_rewritten_on_disk(tmp_path):
+    paths = []
+    for i in range(3):
+        paths.append(str(tmp_path / f"img_{i}.png"))
+        cv2.imwrite(paths[-1], np.full((8, 8, 3), i, np.uint8))
+    prefetcher = ImagePrefetcher()
+    prefetcher.update(paths, 0)
+    assert wait_until(lambda: len(prefetcher._cache) == 3)
+
+    cv2.imwrite(paths[1], np.full((8, 8, 3), 200, np.uint8))
+    # Spelled through another folder, as a save folder joined with a relative path may be
+    prefetcher.invalidate(os.path.join(str(tmp_path), 'sub', '..', 'img_1.png'))
+    assert prefetcher.load(paths[1])[0, 0, 0] == 200
+    assert prefetcher.load(paths[2])[0, 0, 0] == 2
+
+    cv2.imwrite(paths[2], np.full((8, 8, 3), 100, np.uint8))
+    prefetcher.invalidate()
+    assert prefetcher.load(paths[2])[0, 0, 0] == 100
@@ -0,0 +1,68 @@
+import os
+
+import cv2
+import numpy as np
+
+from imagecraft.preprocess import PreprocessCache, preprocess_for_hct
+
+SIZE = (48, 32)  # width, height
+
+
+def write_frame(path, value, size=SIZE):
+    img = np.full((size[1], size[0], 3), value, np.uint8)
+    cv2.circle(img, (size[0] // 2, size[1] // 2), 8, (255, 255, 255), -1)
+    cv2.imwrite(str(path), img)
+    return str(path)
+
+
+def test_rewritten_file_is_decoded_again(tmp_path):
+    path = write_frame(tmp_path / 'img.png', 10)
+    cache = PreprocessCache()
+    first = cache.get(path)
+    assert cache.get(path) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Newer mtime
+    stat = os.stat(path)
+    write_frame(path, 90)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert np.array_equal(cache.get(path), preprocess_for_hct(path))
+    # Same mtime, different size
+    stat = os.stat(path)
+    write_frame(path, 90, (64, 32))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.get(path).shape == (32, 64)
+    assert cache.misses == 3
+
+
+def test_least_recently_used_frames_are_evicted_over_the_budget(tmp_path):
+    paths = [write_frame(tmp_path / f"img_{i}.png", 10 * i) for i in range(3)]
+    frame_bytes = SIZE[0] * SIZE[1]
+    cache = PreprocessCache(max_bytes=2 * frame_bytes)
+    cache.get(paths[0])
+    cache.get(paths[1])
+    cache.get(paths[0])  # paths[1] is now the least recently used
+    cache.get(paths[2])
+
+    assert cache._memory_bytes == 2 * frame_bytes
+    assert [key[0] for key in cache._memory] == [os.path.abspath(paths[0]), os.path.abspath(paths[2])]
+    misses = cache.misses
+    cache.get(paths[0])
+    assert cache.misses == misses
+    cache.get(paths[1])
+    assert cache.misses == misses + 1
+
+
+def test_frames_survive_in_the_disk_cache(tmp_path):
+    path = write_frame(tmp_path / 'img.png', 40)
+    cache_dir = str(tmp_path / 'cache')
+    blurred = PreprocessCache(cache_dir=cache_dir).get(path, 2)
+    assert len(os.listdir(cache_dir)) == 1
+
+    # A new session reads the file instead of decoding
+    cache = PreprocessCache(cache_dir=cache_dir)
+    assert np.array_equal(cache.get(path, 2), blurred)
+    assert (cache.hits, cache.misses) == (1, 0)
+    # A different reduction is a different entry
+    cache.get(path)
+    assert cache.misses == 1 and len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,20 @@
+import os
+
+from imagecraft.roi import RoiSet
+
+
+def test_image_rois_do_not_apply_to_same_named_images_in_other_folders(tmp_path):
+    tray_a = os.path.join(str(tmp_path), 'tray_a', 'img_1.png')
+    tray_b = os.path.join(str(tmp_path), 'tray_b', 'img_1.png')
+    rois = RoiSet(default=[{'rect': [0, 0, 8, 8]}])
+    rois.set_scoped('image', tray_a, [{'rect': [1, 2, 30, 40]}])
+
+    assert rois.for_path(tray_a) == [{'rect': [1, 2, 30, 40]}]
+    assert rois.for_path(tray_b) == [{'rect': [0, 0, 8, 8]}]
+    assert rois.scoped('image', tray_b) == []
+    # However the path is spelled, and after a save and load
+    spelled = os.path.join(str(tmp_path), 'tray_b', '..', 'tray_a', 'img_1.png')
+    assert RoiSet.from_dict(rois.to_dict()).for_path(spelled) == [{'rect': [1, 2, 30, 40]}]
+
+    rois.set_scoped('image', tray_a, [])
+    assert rois.for_path(tray_a) == [{'rect': [0, 0, 8, 8]}]
@@ -0,0 +1,69 @@
+import gc
+import os
+
+import numpy as np
+import pytest
+
+from imagecraft.store import ImageStore
+
+FRAME_BYTES = 16 * 16 * 3
+
+
+def frame(value):
+    return np.full((16, 16, 3), value, np.uint8)
+
+
+def spilled(folder):
+    return sorted(name for name in os.listdir(folder) if name.endswith('.npy'))
+
+
+def test_images_over_the_budget_spill_and_reload_transparently(tmp_path):
+    store = ImageStore(max_bytes=2 * FRAME_BYTES, spill_dir=str(tmp_path))
+    for i in range(4):
+        store[f"img_{i}"] = frame(i)
+
+    # The two least recently used went to disk
+    assert len(spilled(tmp_path)) == 2
+    assert store._memory_bytes == 2 * FRAME_BYTES
+    assert list(store) == [f"img_{i}" for i in range(4)]
+    for i in range(4):
+        assert np.array_equal(store[f"img_{i}"], frame(i))
+    assert store._memory_bytes <= 2 * FRAME_BYTES
+
+
+def test_replacing_or_deleting_an_image_removes_its_spill_file(tmp_path):
+    store = ImageStore(max_bytes=FRAME_BYTES, spill_dir=str(tmp_path))
+    store['a'] = frame(1)
+    store['b'] = frame(2)
+    assert len(spilled(tmp_path)) == 1
+
+    store['a'] = frame(3)
+    assert np.array_equal(store['a'], frame(3))
+    assert np.array_equal(store['b'], frame(2))
+
+    del store['a']
+    del store['b']
+    assert 'a' not in store and len(store) == 0
+    assert spilled(tmp_path) == []
+    with pytest.raises(KeyError):
+        store['a']
+    with pytest.raises(KeyError):
+        del store['a']
+
+
+def test_spill_files_are_cleaned_up(tmp_path):
+    store = ImageStore(max_bytes=FRAME_BYTES, spill_dir=str(tmp_path))
+    for i in range(3):
+        store[i] = frame(i)
+    store.clear()
+    assert spilled(tmp_path) == [] and len(store) == 0
+
+    # A private spill folder goes with the store
+    store = ImageStore(max_bytes=FRAME_BYTES)
+    for i in range(3):
+        store[i] = frame(i)
+    spill_dir = store._spill_dir
+    assert len(spilled(spill_dir)) == 2
+    del store
+    gc.collect()
+    assert not os.path.exists(spill_dir)
@@ -0,0 +1,80 @@
+import cv2
+import numpy as np
+import pytest
+
+from imagecraft.transform import (
+    RemapCache, TransformationParams, apply_transformations, apply_transformations_cached
+)
+
+WIDTH, HEIGHT = 640, 480
+# Interpolation rounding between one fused resample and three staged ones. The staged
+# path also blurs twice more, so the bound holds for content whose gradients stay near
+# 20 levels per pixel, as in smooth_frame; steeper edges differ a little more
+TOLERANCE = 2
+
+
+def staged_transform(img, params):
+    """The Transformation tab's former path: warpPerspective, translation and rotation/scale warpAffine, crop."""
+    h, w = img.shape[:2]
+    dst_points = np.array([[0, 0], [w, 0], [w, h], [0, h]], dtype="float32")
+    src_points = dst_points if params.corners is None else np.array(params.corners, dtype="float32").reshape(4, 2)
+    img = cv2.warpPerspective(img, cv2.getPerspectiveTransform(src_points, dst_points), (w, h))
+    M_translate = np.float32([[1, 0, params.x_translation], [0, 1, params.y_translation]])
+    img = cv2.warpAffine(img, M_translate, (w, h))
+    M_rotate = cv2.getRotationMatrix2D((w // 2, h // 2), params.rotation, params.scale / 100)
+    img = cv2.warpAffine(img, M_rotate, (w, h))
+    crop_w = min(params.crop_width if params.crop_width is not None else w, w - params.crop_x)
+    crop_h = min(params.crop_height if params.crop_height is not None else h, h - params.crop_y)
+    return img[params.crop_y:params.crop_y + crop_h, params.crop_x:params.crop_x + crop_w]
+
+
+def smooth_frame():
+    """Colour frame with smooth structure, so rounding, not aliasing, is what differs."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (HEIGHT // 16, WIDTH // 16, 3), dtype=np.uint8)
+    img = cv2.resize(noise, (WIDTH, HEIGHT), interpolation=cv2.INTER_CUBIC)
+    return cv2.GaussianBlur(img, (0, 0), 3)
+
+
+def interior_mask(params):
+    """Pixels the staged path sampled from inside the frame in every step, away from the edges."""
+    inside = staged_transform(np.full((HEIGHT, WIDTH), 255, np.uint8), params)
+    return cv2.erode((inside == 255).astype(np.uint8), np.ones((5, 5), np.uint8)).astype(bool)
+
+
+COMBINED = [
+    TransformationParams(
+        corners=(20, 10, 620, 30, 600, 470, 10, 450), x_translation=15, y_translation=-10,
+        scale=90, rotation=12, crop_x=40, crop_y=30, crop_width=500, crop_height=380
+    ),
+    TransformationParams(
+        corners=(0, 40, 640, 0, 640, 480, 30, 440), x_translation=-25, y_translation=20,
+        scale=120, rotation=-30, crop_x=100, crop_y=50, crop_width=400, crop_height=300
+    ),
+]
+
+
+@pytest.mark.parametrize('transform', [
+    apply_transformations,
+    lambda img, params: apply_transformations_cached(img, params, RemapCache()),
+])
+def test_identity_matches_staged_path_exactly(transform):
+    img = smooth_frame()
+    params = TransformationParams()
+    assert np.array_equal(transform(img, params), staged_transform(img, params))
+
+
+@pytest.mark.parametrize('params', COMBINED)
+@pytest.mark.parametrize('transform', [
+    apply_transformations,
+    lambda img, params: apply_transformations_cached(img, params, RemapCache()),
+])
+def test_combined_geometry_matches_staged_path_in_the_interior(transform, params):
+    img = smooth_frame()
+    fused = transform(img, params)
+    staged = staged_transform(img, params)
+    assert fused.shape == staged.shape
+    mask = interior_mask(params)
+    assert mask.mean() > 0.5
+    difference = np.abs(fused.astype(int) - staged.astype(int))[mask]
+    assert difference.max() <= TOLERANCE
@@ -0,0 +1,28 @@
+import cv2
+import numpy as np
+
+from imagecraft.roi import RoiSet
+from imagecraft.tune import Tuner
+
+PARAMS = {'dp': 1.0, 'minDist': 20, 'param1': 50, 'param2': 20, 'minRadius': 10, 'maxRadius': 30}
+
+
+def test_tuner_scores_only_the_rois(tmp_path):
+    # Discs on both halves; the ROI covers the left half only
+    img = np.full((200, 400, 3), 190, np.uint8)
+    centres = [(60, 60), (120, 140), (280, 60), (340, 140)]
+    for x, y in centres:
+        cv2.circle(img, (x, y), 20, (40, 40, 40), -1, cv2.LINE_AA)
+    path = str(tmp_path / 'discs.png')
+    cv2.imwrite(path, img)
+    reference = np.array([(x - 20, y - 20, 40, 40) for x, y in centres], np.float64)
+    rois = RoiSet(default=[{'rect': [0, 0, 200, 200]}])
+
+    tuner = Tuner([(path, reference, (400, 200))], max_workers=1, rois=rois)
+    assert tuner.samples[0][1].tolist() == reference[:2].tolist()
+    result = tuner.evaluate(PARAMS)
+    assert (result['precision'], result['recall']) == (1.0, 1.0)
+
+    # Without the ROIs the right-hand discs count too
+    result = Tuner([(path, reference, (400, 200))], max_workers=1).evaluate(PARAMS)
+    assert result['recall'] == 1.0
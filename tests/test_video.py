@@ -0,0 +1,70 @@
+import os
+
+import cv2
+import numpy as np
+
+from imagecraft import video
+from imagecraft.video import CircleTracker, label_video
+
+PARAMS = {'dp': 1.0, 'minDist': 30, 'param1': 50, 'param2': 20, 'minRadius': 10, 'maxRadius': 40}
+
+
+def frame(circles, size=(320, 240)):
+    img = np.full((size[1], size[0], 3), 190, np.uint8)
+    for x, y, r in circles:
+        cv2.circle(img, (x, y), r, (40, 40, 40), -1, cv2.LINE_AA)
+    return img
+
+
+def drifting(step, count=3):
+    """Circles moving two pixels right per frame."""
+    return [(60 + 90 * i + 2 * step, 80 + 40 * i, 18 + 2 * i) for i in range(count)]
+
+
+def centres(circles):
+    return sorted((int(x), int(y)) for x, y, _ in circles[0])
+
+
+def assert_near(found, expected, tolerance=2):
+    assert len(found) == len(expected)
+    for (fx, fy), (ex, ey, _) in zip(found, sorted(expected)):
+        assert abs(fx - ex) <= tolerance and abs(fy - ey) <= tolerance
+
+
+def test_tracking_between_keyframes():
+    tracker = CircleTracker(PARAMS, keyframe_interval=3)
+    for step in range(7):
+        assert_near(centres(tracker.update(frame(drifting(step)))), drifting(step))
+    # Frames 0, 3 and 6 are detected in full, the others tracked
+    assert (tracker.keyframes, tracker.tracked_frames, tracker.fallbacks) == (3, 4, 0)
+
+
+def test_lost_track_falls_back_to_full_detection():
+    tracker = CircleTracker(PARAMS, keyframe_interval=100)
+    for step in range(3):
+        tracker.update(frame(drifting(step)))
+    assert (tracker.keyframes, tracker.tracked_frames) == (1, 2)
+
+    # One circle leaves: its window finds nothing, so the frame is redetected in full
+    remaining = drifting(3)[:2]
+    assert_near(centres(tracker.update(frame(remaining))), remaining)
+    assert (tracker.keyframes, tracker.fallbacks) == (2, 1)
+
+    # And the remaining circles are tracked again
+    tracker.update(frame(drifting(4)[:2]))
+    assert (tracker.keyframes, tracker.tracked_frames) == (2, 3)
+
+
+def test_folder_of_frames_is_listed_once(tmp_path, monkeypatch):
+    frames_dir = tmp_path / 'frames'
+    frames_dir.mkdir()
+    for step in range(4):
+        cv2.imwrite(str(frames_dir / f"f_{step}.png"), frame(drifting(step)))
+    listings = []
+    list_images = video.list_images
+    monkeypatch.setattr(video, 'list_images', lambda *args: listings.append(args) or list_images(*args))
+
+    stats = label_video(str(frames_dir), PARAMS, str(tmp_path / 'labels'))
+    assert stats['frames'] == 4 and len(listings) == 1
+    assert sorted(os.listdir(tmp_path / 'labels')) == [f"f_{step}.txt" for step in range(4)]
+    assert all(len((tmp_path / 'labels' / f"f_{step}.txt").read_text().splitlines()) == 3 for step in range(4))
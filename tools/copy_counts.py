@@ -0,0 +1,169 @@
+"""
+Count the frame copies the Transformation, HCT and Augmentation tabs make per
+navigation and per save, and time them.
+
+Every frame OpenCV decodes is tagged so that its ndarray.copy() calls are
+counted, as are 3-channel cvtColor calls (BGR<->RGB conversions). Each tab
+loads the folder, steps forward with next_image, then saves once; message
+boxes are silenced and the save goes to a temporary file.
+
+    python tools/copy_counts.py FOLDER
+    python tools/copy_counts.py --make-images 6     # 4000x3000 synthetic PNGs
+
+--repo measures another checkout, e.g. a git worktree of an older commit, for a
+before/after comparison. Runs offscreen unless QT_QPA_PLATFORM is set.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+import cv2
+import numpy as np
+from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
+
+counts = {'copy': 0, 'cvt': 0}
+counts_lock = threading.Lock()
+
+
+class CountedArray(np.ndarray):
+    """ndarray view whose copy() calls are counted; copies stay counted."""
+
+    def copy(self, *args, **kwargs):
+        with counts_lock:
+            counts['copy'] += 1
+        return np.ndarray.copy(self, *args, **kwargs).view(CountedArray)
+
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff')
+
+_imread = cv2.imread
+_cvtColor = cv2.cvtColor
+
+
+def counted_imread(*args, **kwargs):
+    img = _imread(*args, **kwargs)
+    return None if img is None else img.view(CountedArray)
+
+
+def counted_cvtColor(src, code, *args, **kwargs):
+    img = _cvtColor(src, code, *args, **kwargs)
+    if img.ndim == 3:
+        with counts_lock:
+            counts['cvt'] += 1
+        img = img.view(CountedArray)
+    return img
+
+
+def reset_counts():
+    with counts_lock:
+        counts['copy'] = counts['cvt'] = 0
+
+
+def settle(app, seconds):
+    """Let the prefetcher and queued signals finish."""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        app.processEvents()
+        time.sleep(0.01)
+
+
+def make_images(folder, count, width=4000, height=3000):
+    """count BGR frames of dark discs on a noisy background, written as PNGs."""
+    rng = np.random.default_rng(0)
+    for i in range(count):
+        img = np.full((height, width, 3), 190, np.uint8)
+        for _ in range(10):
+            r = int(rng.integers(80, 240))
+            centre = (int(rng.integers(r, width - r)), int(rng.integers(r, height - r)))
+            cv2.circle(img, centre, r, (60, 60, 60), -1, cv2.LINE_AA)
+        img = np.clip(img + rng.normal(0, 20, img.shape), 0, 255).astype(np.uint8)
+        cv2.imwrite(os.path.join(folder, f"copy_counts_{i}.png"), img)
+
+
+def measure_tab(app, tab_class, paths, steps, settle_seconds, save_path):
+    tab = tab_class()
+    if hasattr(tab, 'file_paths'):
+        tab.file_paths, tab.current_index = paths, 0
+    else:
+        tab.image_list, tab.current_image_index = paths, 0
+    tab.load_current_image()
+    settle(app, settle_seconds)
+
+    reset_counts()
+    navigation_time = 0.0
+    for _ in range(steps):
+        start = time.perf_counter()
+        tab.next_image()
+        app.processEvents()
+        navigation_time += time.perf_counter() - start
+        settle(app, settle_seconds)
+    navigation = dict(counts)
+
+    if hasattr(tab, 'transformed_img'):
+        # The Transformation tab saves its last applied result
+        tab.transformed_img = tab.img
+    reset_counts()
+    start = time.perf_counter()
+    tab.save_image()
+    save_time = time.perf_counter() - start
+    if os.path.exists(save_path):
+        os.remove(save_path)
+    return navigation, navigation_time / steps, dict(counts), save_time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Count frame copies per navigation and per save in the GUI tabs.")
+    parser.add_argument('folder', nargs='?', help="Folder of images to step through.")
+    parser.add_argument('--make-images', type=int, default=0, metavar='N',
+                        help="Step through N synthetic 4000x3000 PNGs instead of a folder.")
+    parser.add_argument('--steps', type=int, default=4, help="next_image calls averaged per tab (default 4).")
+    parser.add_argument('--settle', type=float, default=1.0,
+                        help="Seconds to wait after each step for prefetching (default 1).")
+    parser.add_argument('--repo', default=REPO, help="ImageCraft checkout to measure (default: this one).")
+    args = parser.parse_args(argv)
+    if not args.folder and not args.make_images:
+        parser.error("give a folder or --make-images N")
+
+    app = QApplication([])
+    cv2.imread, cv2.cvtColor = counted_imread, counted_cvtColor
+    sys.path.insert(0, os.path.abspath(args.repo))
+    import ImageCraft
+
+    for name in ('information', 'warning', 'critical'):
+        setattr(QMessageBox, name, staticmethod(lambda *a, **k: None))
+    workdir = tempfile.mkdtemp(prefix="imagecraft_copies_")
+    save_path = os.path.join(workdir, "saved.png")
+    QFileDialog.getSaveFileName = staticmethod(lambda *a, **k: (save_path, ''))
+    try:
+        if args.make_images:
+            make_images(workdir, args.make_images)
+            folder = workdir
+        else:
+            folder = args.folder
+        paths = sorted(os.path.join(folder, name) for name in os.listdir(folder)
+                       if name.lower().endswith(IMAGE_EXTENSIONS) and name != os.path.basename(save_path))
+        if len(paths) < 2:
+            parser.error("need at least two images to navigate")
+
+        print(f"{len(paths)} images, next_image averaged over {args.steps} steps, then one save_image")
+        for tab_class in (ImageCraft.ImageTransformationTab, ImageCraft.HCTAutoLabelTab,
+                          ImageCraft.ImageAugmentationTab):
+            navigation, navigation_time, save, save_time = measure_tab(
+                app, tab_class, paths, args.steps, args.settle, save_path)
+            print(f"{tab_class.__name__:24s} per navigation: {navigation['copy'] / args.steps:.1f} copies, "
+                  f"{navigation['cvt'] / args.steps:.1f} conversions ({navigation_time * 1000:.0f} ms)   "
+                  f"per save: {save['copy']} copies, {save['cvt']} conversions ({save_time * 1000:.0f} ms)")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()